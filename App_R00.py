@@ -11,9 +11,27 @@ from functions.wind_speed import wind_speed
 from functions.wind_pressure_calc import wind_pressure_calc
 from functions.roof_type_picker import roof_type_picker
 from functions.internal_pressure import internal_pressure
+from functions.mesh_import import show_mesh_pressures
 from functions.wall_less_than_60ft import show_wall_less_than_60ft
+from functions.cladding_layout import show_cladding_layout
+from functions.monte_carlo import show_monte_carlo
+from functions.wind_tunnel import show_wind_tunnel
+from functions.rooftop_loads import show_rooftop_loads
+from functions.mwfrs import show_mwfrs
+from functions.editions import show_edition_comparison
+from functions.report import show_report_export
+from functions.scenarios import show_scenarios
+from functions.result_cache import cached_wind_loads
+from functions.audit_log import engineer_input, record_calculation
+from functions.projects import collect_project_inputs, project_panel
+from functions.profiler import span, start_rerun, finish_rerun
+from functions.metrics import start_exporters, start_rerun_timer, observe_rerun
+
+start_exporters()
 
 authenticate_user()
+rerun_t0 = start_rerun_timer()
+start_rerun()
 
 # print(os.listdir("functions"))
 
@@ -24,33 +42,120 @@ st.markdown("This calculator helps you organize inputs for **ASCE 7 wind load de
 st.markdown("---")
 
 # Step 1 (ONLY here — remove the duplicate number_inputs you had in App_R00.py)
-least_width, longest_width, height = building_dimension()
+with span("building_dimension"):
+    least_width, longest_width, height = building_dimension()
 
 # Step 2: roof type picker (uses height)
-roof_info = roof_type_picker(height)
+with span("roof_type_picker"):
+    roof_info = roof_type_picker(height)
 
 # Step 3
-jurisdiction = code_jurisdiction_1()
+with span("code_jurisdiction_1"):
+    jurisdiction = code_jurisdiction_1()
+edition = jurisdiction["asce_edition"]
 
 # Step 4
-risk_category = risk_category()
+with span("risk_category"):
+    risk_category = risk_category(site=jurisdiction)
 
 # Step 5
-V = wind_speed()
+with span("wind_speed"):
+    V = wind_speed(site=jurisdiction)
 
 # Step 6
-exposure, Kz, q = wind_pressure_calc(height, V)
+with span("wind_pressure_calc"):
+    exposure, Kz, q = wind_pressure_calc(height, V, edition=edition)
 
 # Step 7: Internal pressure classification
-enclosure,gcpi_positive,gcpi_negative = internal_pressure()
+with span("internal_pressure"):
+    enclosure,gcpi_positive,gcpi_negative = internal_pressure(
+        edition=edition,
+        building=(st.session_state["bd_ns"], st.session_state["bd_ew"], height),
+        footprint=st.session_state.get("footprint"),
+    )
+
+# Step 8: full calculation, shared across sessions through the result cache
+Kd = st.session_state["wind_pressure"]["Kd"]
+with span("cached_wind_loads"):
+    results = cached_wind_loads(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition)
 
-# Step 8
+# Optional: GCp derived from wind-tunnel tap data
+gcp_source = None
 if height < 60:
+    with span("show_wind_tunnel"):
+        gcp_source = show_wind_tunnel(q, gcpi_positive, gcpi_negative)
 
-    show_wall_less_than_60ft(
-        height,
-        q,
-        gcpi_positive,
-        gcpi_negative
-    )
+# Step 9
+if height < 60:
+
+    with span("show_wall_less_than_60ft"):
+        show_wall_less_than_60ft(
+            height,
+            q,
+            gcpi_positive,
+            gcpi_negative,
+            results=results,
+            dims=(st.session_state["bd_ns"], st.session_state["bd_ew"]),
+            gcp_source=gcp_source,
+            edition=edition,
+            footprint=st.session_state.get("footprint")
+        )
+
+    # Step 10: cladding panels, zoned with a = f(least_width, h)
+    with span("show_cladding_layout"):
+        show_cladding_layout(
+            least_width,
+            longest_width,
+            height,
+            q,
+            gcpi_positive,
+            gcpi_negative,
+            footprint=st.session_state.get("footprint"),
+            edition=edition,
+        )
+
+    # Step 10b: per-face zones and pressures of an imported building model
+    with span("show_mesh_pressures"):
+        show_mesh_pressures(q, gcpi_positive, gcpi_negative, edition=edition)
+
+    # Step 11: probabilistic wall C&C pressures
+    with span("show_monte_carlo"):
+        show_monte_carlo(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition=edition)
+
+    # Step 12: rooftop equipment and solar panels (uses qh from Step 6)
+    with span("show_rooftop_loads"):
+        show_rooftop_loads(least_width, longest_width, height, edition=edition)
+
+# Step 13: MWFRS, directional procedure (all heights)
+with span("show_mwfrs"):
+    show_mwfrs(least_width, longest_width, height, exposure, V, Kd, gcpi_positive, gcpi_negative,
+               roof_info=roof_info, edition=edition)
+
+# Step 14: the same building under every ASCE 7 edition
+with span("show_edition_comparison"):
+    show_edition_comparison(height, V, exposure, Kd, enclosure, edition)
+
+project_inputs = collect_project_inputs(
+    jurisdiction, height, V, exposure, Kd, enclosure, gcpi_positive, gcpi_negative,
+    edition=edition,
+)
+
+# QA audit trail (queued; written by a background thread)
+with span("record_calculation"):
+    record_calculation(project_inputs, results, who=engineer_input())
+
+# Step 15: what-if scenarios branched from these inputs
+with span("show_scenarios"):
+    show_scenarios(project_inputs, results)
+
+# Step 16: PDF / Excel calc package
+with span("show_report_export"):
+    show_report_export(project_inputs)
+
+# Sidebar: save / load projects
+with span("project_panel"):
+    project_panel(project_inputs, results)
+
+finish_rerun()
+observe_rerun(rerun_t0)
 
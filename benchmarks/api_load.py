@@ -0,0 +1,155 @@
+"""
+Load generator for the calculation API (functions/api_server.py).
+
+Starts the server in-process (or targets --url), then drives the single
+/v1/pressure endpoint and the /v1/batch endpoint from concurrent clients and
+reports throughput and latency percentiles.
+
+Usage (from the repository root):
+
+    python -m benchmarks.api_load --clients 8 --duration 10 --batch-size 5000
+    python -m benchmarks.api_load --url http://127.0.0.1:8600 --label api-main
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _building(rng: random.Random, i: int) -> Dict[str, object]:
+    return {
+        "name": f"B{i}",
+        "height": round(rng.uniform(15, 60), 1),
+        "V": rng.choice([105, 115, 120, 130, 140, 150, 160]),
+        "exposure": rng.choice("BCD"),
+        "area": rng.choice([10, 20, 50, 100, 200, 500]),
+    }
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    s = sorted(samples)
+    pick = lambda p: s[min(len(s) - 1, int(p * len(s)))]
+    return {
+        "p50_ms": pick(0.50) * 1e3,
+        "p90_ms": pick(0.90) * 1e3,
+        "p99_ms": pick(0.99) * 1e3,
+        "mean_ms": statistics.fmean(s) * 1e3,
+    }
+
+
+def drive(host: str, port: int, path: str, make_body, clients: int, duration_s: float,
+          items_per_request: int, headers: Optional[Dict[str, str]] = None) -> Dict[str, object]:
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration_s
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(host, port, timeout=60)
+        local: List[float] = []
+        while time.perf_counter() < stop_at:
+            body = make_body(rng)
+            t0 = time.perf_counter()
+            try:
+                conn.request("POST", path, body=body, headers={"Content-Type": "application/json", **(headers or {})})
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+            elapsed = time.perf_counter() - t0
+            if ok:
+                local.append(elapsed)
+            else:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    return {
+        "endpoint": path,
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "requests_per_s": len(latencies) / wall,
+        "buildings_per_s": len(latencies) * items_per_request / wall,
+        **_percentiles(latencies),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the wind load API")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--label", default="api-latest")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        u = urlparse(args.url)
+        host, port = u.hostname, u.port or 80
+    else:
+        from functions.api_server import make_server
+        server = make_server("127.0.0.1", 0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    batch_rng = random.Random(0)
+    batch_body = json.dumps({"buildings": [_building(batch_rng, i) for i in range(args.batch_size)]}).encode("utf-8")
+
+    results = [
+        drive(host, port, "/v1/pressure", lambda rng: json.dumps(_building(rng, 0)).encode("utf-8"),
+              args.clients, args.duration, 1),
+        drive(host, port, "/v1/batch", lambda rng: batch_body,
+              args.clients, args.duration, args.batch_size),
+        drive(host, port, "/v1/batch", lambda rng: batch_body,
+              args.clients, args.duration, args.batch_size, headers={"Accept": "application/x-ndjson"}),
+    ]
+
+    if server is not None:
+        server.shutdown()
+
+    for r in results:
+        print(f"{r['endpoint']:<14} {r['requests']:>7} req  {r['requests_per_s']:>9.1f} req/s  "
+              f"{r['buildings_per_s']:>11.0f} bldg/s  p50 {r.get('p50_ms', 0):7.2f} ms  "
+              f"p99 {r.get('p99_ms', 0):7.2f} ms  errors {r['errors']}")
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"{args.label}.json"
+    out.write_text(json.dumps({"timestamp": time.time(), "batch_size": args.batch_size, "results": results}, indent=2))
+    print(f"\nSaved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Each simulated engineer is a separate process running App_R00.py through
+Streamlit AppTest: it logs in through authenticate_user with a test secret,
+then loops over changing the building dimensions, choosing an exposure
+category and dragging the C&C effective-area slider. The ICC adoption page
+is served by a local stub server (ICC_ADOPTIONS_BASE_URL), so no request
+leaves the machine.
+
+For every session count in --sessions the harness reports rerun latency
+percentiles, CPU time and RSS per session, and aggregate reruns/s. The
+throughput ceiling is the highest reruns/s seen across the sweep, and the
+saturation point is the first session count that no longer adds at least
+SATURATION_GAIN to it.
+
+Sessions are processes, so unlike a real server they do not share
+st.cache_resource / st.cache_data entries; latencies are those of a warm
+session, not of a shared cache.
+
+Usage (from the repository root):
+
+    python -m benchmarks.load_test --sessions 1 2 4 8 --duration 20
+    python -m benchmarks.load_test --label load-main
+    python -m benchmarks.load_test --compare benchmarks/results/load-main.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.api_load import _percentiles
+from benchmarks.run_benchmarks import AREA_SLIDER_KEY, STUB_ADOPTION_HTML, _versions
+
+TEST_PASSWORD = "load-test"
+SATURATION_GAIN = 0.10
+
+# Values cycled through by the simulated sessions.
+DIMENSIONS = [(80.0, 60.0), (120.0, 45.0), (60.0, 60.0), (200.0, 90.0)]
+EXPOSURES = ["B", "C", "D"]
+AREAS = [10, 20, 50, 100, 200, 500]
+
+
+class _StubAdoptionHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the same adoption page."""
+
+    def do_GET(self):
+        body = STUB_ADOPTION_HTML.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubAdoptionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _login(at) -> None:
+    at.run()
+    if not at.session_state["authenticated"]:
+        at.text_input(key="password_input").set_value(TEST_PASSWORD)
+        at.run()
+    if not at.session_state["authenticated"]:
+        raise RuntimeError("authenticate_user rejected the test password")
+
+
+def _actions(at, n: int):
+    """The n-th user interaction of a session (one rerun each)."""
+    step = n % 3
+    if step == 0:
+        ns, ew = DIMENSIONS[(n // 3) % len(DIMENSIONS)]
+        at.number_input(key="bd_ns").set_value(ns)
+        at.number_input(key="bd_ew").set_value(ew)
+    elif step == 1:
+        at.button(key=f"choose_exposure_{EXPOSURES[(n // 3) % len(EXPOSURES)]}").click()
+    else:
+        at.slider(key=AREA_SLIDER_KEY).set_value(AREAS[(n // 3) % len(AREAS)])
+
+
+def session_worker(session_id: int, duration_s: float, ready, start, results) -> None:
+    """
+    One simulated engineer: log in, report on `ready`, wait for `start`, then
+    rerun the app for `duration_s` and put a summary dict on `results`.
+    """
+    os.chdir(REPO_ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    out: Dict[str, object] = {"session": session_id}
+    try:
+        at = AppTest.from_file(str(REPO_ROOT / "App_R00.py"), default_timeout=120)
+        at.secrets["password"] = TEST_PASSWORD
+        t0 = time.perf_counter()
+        _login(at)
+        out["cold_s"] = time.perf_counter() - t0
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    except Exception as e:
+        out["failed"] = f"{type(e).__name__}: {e}"
+        ready.put(session_id)
+        results.put(out)
+        return
+
+    ready.put(session_id)
+    start.wait()
+
+    latencies: List[float] = []
+    errors = 0
+    cpu0 = time.process_time()
+    t_end = time.perf_counter() + duration_s
+    n = 0
+    while time.perf_counter() < t_end:
+        _actions(at, n)
+        t0 = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - t0)
+        errors += bool(at.exception)
+        n += 1
+
+    out.update({
+        "reruns": len(latencies),
+        "errors": errors,
+        "latencies": latencies,
+        "cpu_s": time.process_time() - cpu0,
+        "rss_bytes": _rss_bytes(),
+    })
+    results.put(out)
+
+
+def run_level(sessions: int, duration_s: float) -> Dict[str, object]:
+    """
+    Runs `sessions` concurrent sessions for `duration_s` and aggregates them.
+    Sessions inherit ICC_ADOPTIONS_BASE_URL from this process. All sessions log in first and are released together, so cold runs and
+    process start-up are not part of the measured window.
+    """
+    ctx = mp.get_context("spawn")
+    ready, start, results = ctx.Queue(), ctx.Event(), ctx.Queue()
+    procs = [
+        ctx.Process(target=session_worker, args=(n, duration_s, ready, start, results), daemon=True)
+        for n in range(sessions)
+    ]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get()
+
+    t0 = time.perf_counter()
+    start.set()
+    per_session = sorted((results.get() for _ in procs), key=lambda s: s["session"])
+    wall = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+
+    ok = [s for s in per_session if "failed" not in s]
+    latencies = [x for s in ok for x in s.pop("latencies")]
+    reruns = sum(s["reruns"] for s in ok)
+    mean = lambda key: statistics.fmean(s[key] for s in ok) if ok else None
+
+    return {
+        "sessions": sessions,
+        "wall_s": wall,
+        "reruns": reruns,
+        "errors": sum(s["errors"] for s in ok),
+        "failed_sessions": [s["failed"] for s in per_session if "failed" in s],
+        "reruns_per_s": reruns / wall if wall else 0.0,
+        **_percentiles(latencies),
+        "cold_s": mean("cold_s"),
+        "cpu_s_per_session": mean("cpu_s"),
+        "cpu_util_per_session": mean("cpu_s") / wall if ok and wall else None,
+        "rss_mb_per_session": mean("rss_bytes") / 2**20 if ok else None,
+        "rss_mb_max": max(s["rss_bytes"] for s in ok) / 2**20 if ok else None,
+        "per_session": per_session,
+    }
+
+
+def throughput_ceiling(levels: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Highest aggregate reruns/s of the sweep, and the first session count
+    after which adding sessions gains less than SATURATION_GAIN.
+    """
+    best = max(levels, key=lambda r: r["reruns_per_s"])
+    saturation = levels[-1]["sessions"]
+    for prev, cur in zip(levels, levels[1:]):
+        if cur["reruns_per_s"] < prev["reruns_per_s"] * (1 + SATURATION_GAIN):
+            saturation = prev["sessions"]
+            break
+    return {
+        "max_reruns_per_s": best["reruns_per_s"],
+        "at_sessions": best["sessions"],
+        "saturates_at_sessions": saturation,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: Dict[str, object], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    base_levels = {r["sessions"]: r for r in baseline.get("levels", [])}
+    print(f"\nComparison against {baseline_path}:")
+    for cur in current["levels"]:
+        base = base_levels.get(cur["sessions"])
+        if base is None or not base.get("p50_ms"):
+            print(f"{cur['sessions']:>4} sessions  (new)")
+            continue
+        print(f"{cur['sessions']:>4} sessions  p50 x{cur.get('p50_ms', 0) / base['p50_ms']:5.2f}  "
+              f"p99 x{cur.get('p99_ms', 0) / base['p99_ms']:5.2f}  "
+              f"reruns/s x{cur['reruns_per_s'] / base['reruns_per_s']:5.2f}")
+    b, c = baseline["ceiling"], current["ceiling"]
+    print(f"ceiling     {b['max_reruns_per_s']:.1f} -> {c['max_reruns_per_s']:.1f} reruns/s  "
+          f"(saturates at {b['saturates_at_sessions']} -> {c['saturates_at_sessions']} sessions)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for App_R00.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="session counts to sweep")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per session count")
+    parser.add_argument("--label", default="load-latest", help="results file name (without .json)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    server = start_stub_server()
+    # Set before spawning: sessions read it when code_jurisdiction_1 is imported.
+    os.environ["ICC_ADOPTIONS_BASE_URL"] = "http://%s:%d" % server.server_address[:2]
+
+    levels = []
+    for n in sorted(set(args.sessions)):
+        r = run_level(n, args.duration)
+        levels.append(r)
+        print(f"{n:>4} sessions  {r['reruns']:>6} reruns  {r['reruns_per_s']:7.2f} reruns/s  "
+              f"p50 {r.get('p50_ms', 0):8.1f} ms  p90 {r.get('p90_ms', 0):8.1f} ms  "
+              f"p99 {r.get('p99_ms', 0):8.1f} ms  CPU {100 * (r['cpu_util_per_session'] or 0):5.1f}%/session  "
+              f"RSS {r['rss_mb_per_session'] or 0:7.1f} MB/session  errors {r['errors']}")
+        for msg in r["failed_sessions"]:
+            print(f"      failed session: {msg}")
+    server.shutdown()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "versions": _versions(),
+        "duration_s": args.duration,
+        "levels": levels,
+        "ceiling": throughput_ceiling(levels),
+    }
+    c = report["ceiling"]
+    print(f"\nThroughput ceiling {c['max_reruns_per_s']:.2f} reruns/s at {c['at_sessions']} sessions "
+          f"(saturates at {c['saturates_at_sessions']} sessions, {c['cpu_count']} CPUs)")
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f"{args.label}.json"
+    out_path.write_text(json.dumps(report, indent=2))
+    print(f"Saved {out_path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmark suite for the wind load calculator.
+
+Times the compute kernels and a headless end-to-end rerun of App_R00.py
+(Streamlit AppTest, ICC lookup stubbed) and writes the results as JSON so
+two versions can be compared.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run_benchmarks --label my-branch
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/main.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from functions.Kz import compute_kz
+from functions.wall_gcp_chart import wall_gcp, create_wall_chart
+from functions.pressure_table import create_wall_pressure_table
+from functions.create_building_visualisation import create_building_visualisation
+from functions.code_jurisdiction import extract_relevant_codes
+from functions.code_jurisdiction_1 import _extract_year_near
+
+# Fixed adoption page used wherever the ICC site would otherwise be fetched.
+STUB_ADOPTION_HTML = (
+    "<html><body><h1>Wisconsin</h1>"
+    "<p>The 2015 International Building Code (IBC) is effective statewide. "
+    "Amendments adopted 2021 IBC with state modifications.</p>"
+    "<p>Energy: 2018 IECC with amendments; 2015 International Energy Conservation Code.</p>"
+    "</body></html>"
+)
+
+# Key of the C&C effective area slider (functions.wall_less_than_60ft) that drives the reruns.
+AREA_SLIDER_KEY = "wall_cc_area"
+
+# Roughly the size of a real adoption page once BeautifulSoup strips the tags.
+ADOPTION_TEXT = " ".join([STUB_ADOPTION_HTML] * 60)
+
+# One state row of the ICC master adoption chart, as pdfplumber extracts it.
+ICC_CHART_ROW = (
+    "Wisconsin 2015 IBC 2015 IRC 2015 IEBC 2015 IECC 2015 IMC 2015 IPC "
+    "2015 IFGC 2015 IFC 2015 IPMC 2015 ISPSC 2015 IWUIC 2015 IZC"
+)
+
+
+def _stubbed_http_get(url: str, timeout_s: int = 25) -> str:
+    return STUB_ADOPTION_HTML
+
+
+def kernel_cases() -> Dict[str, Callable[[], object]]:
+    return {
+        "compute_kz": lambda: [compute_kz(h, e) for e in ("B", "C", "D") for h in range(5, 505, 5)],
+        "wall_gcp": lambda: [wall_gcp(a) for a in range(1, 1001)],
+        "create_wall_chart": lambda: create_wall_chart(10),
+        "create_wall_pressure_table": lambda: create_wall_pressure_table(28.2, 0.18, -0.18),
+        "_extract_year_near": lambda: _extract_year_near(
+            ADOPTION_TEXT, anchors=[" IBC", "International Building Code"], window=180
+        ),
+        "extract_relevant_codes": lambda: extract_relevant_codes(ICC_CHART_ROW),
+        "create_building_visualisation": lambda: create_building_visualisation(80.0, 60.0, 30.0),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int, number: int) -> Dict[str, float]:
+    """
+    Times `number` calls per sample over `repeat` samples (after one warm-up
+    call), then measures the peak traced allocation of a single call.
+    """
+    fn()
+
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - t0) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "peak_alloc_bytes": int(peak),
+    }
+
+
+def bench_app_rerun(repeat: int) -> Dict[str, float]:
+    """
+    Runs App_R00.py headless with AppTest: one cold run, then `repeat` reruns
+    driven by moving the C&C effective area slider.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(REPO_ROOT)
+
+    with mock.patch("functions.code_jurisdiction_1._http_get", _stubbed_http_get):
+        at = AppTest.from_file(str(REPO_ROOT / "App_R00.py"), default_timeout=120)
+        at.secrets["password"] = "benchmark"
+        at.session_state["authenticated"] = True
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        at.run()
+        cold = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if at.exception:
+            raise RuntimeError(f"App_R00.py raised: {at.exception[0].message}")
+
+        samples: List[float] = []
+        for n in range(repeat):
+            at.slider(key=AREA_SLIDER_KEY).set_value(10 + (n * 37) % 990)
+            t0 = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - t0)
+
+    return {
+        "repeat": repeat,
+        "number": 1,
+        "cold_s": cold,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "peak_alloc_bytes": int(peak),
+    }
+
+
+def _versions() -> Dict[str, Optional[str]]:
+    out: Dict[str, Optional[str]] = {"python": platform.python_version()}
+    for name in ("numpy", "pandas", "plotly", "streamlit"):
+        try:
+            out[name] = __import__(name).__version__
+        except Exception:
+            out[name] = None
+    return out
+
+
+def run(repeat: int, number: int, include_app: bool, only: Optional[List[str]] = None) -> Dict[str, object]:
+    results: Dict[str, object] = {}
+
+    for name, fn in kernel_cases().items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, repeat=repeat, number=number)
+        print(f"{name:<32} median {results[name]['median_s'] * 1e3:9.3f} ms")
+
+    if include_app and (not only or "app_rerun" in only):
+        results["app_rerun"] = bench_app_rerun(repeat=max(3, repeat // 2))
+        print(f"{'app_rerun':<32} median {results['app_rerun']['median_s'] * 1e3:9.3f} ms")
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "versions": _versions(),
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nComparison against {baseline_path}:")
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<32} (new)")
+            continue
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        mem = cur["peak_alloc_bytes"] - base["peak_alloc_bytes"]
+        print(f"{name:<32} x{ratio:6.2f} time   {mem:+12d} B peak")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Wind load calculator benchmarks")
+    parser.add_argument("--label", default="latest", help="results file name (without .json)")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="run only these benchmark names")
+    parser.add_argument("--no-app", action="store_true", help="skip the App_R00.py rerun benchmark")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, args.number, include_app=not args.no_app, only=args.only)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RESULTS_DIR / f"{args.label}.json"
+    out_path.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved {out_path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
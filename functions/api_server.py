@@ -0,0 +1,338 @@
+"""
+Local HTTP JSON API over the calculation core, for tools that cannot use the Streamlit UI.
+
+Run from the repository root:
+
+    python -m functions.api_server --port 8600
+
+Endpoints
+---------
+GET  /v1/health
+POST /v1/kz          {"height": 30, "exposure": "C"}
+POST /v1/wall-gcp    {"area": 20}
+POST /v1/pressure    {"height": 30, "V": 115, "exposure": "C",
+                      "Kd": 0.85, "enclosure": "Enclosed Building", "area": 10}
+POST /v1/batch       {"buildings": [{...}, ...]}  or columnar {"height": [...], "V": [...], ...}
+
+`Kd`, `enclosure` and `area` are optional (defaults as for portfolio runs);
+explicit `gcpi_positive` / `gcpi_negative` override the enclosure. Every
+endpoint takes an optional "edition" ("ASCE 7-10", "ASCE 7-16" or "ASCE 7-22",
+default ASCE 7-16); for /v1/batch it is a top-level field.
+
+/v1/batch evaluates buildings in vectorized blocks and streams the response
+with chunked transfer encoding: {"count": n, "results": [...]} by default, or
+one JSON line per building when the request has `Accept: application/x-ndjson`.
+All buildings are validated (missing or non-finite values, height, V, Kd or
+area <= 0) and the first block is computed before the 200 status is sent, so
+bad input gets a 400. Responses are encoded with allow_nan=False; should a
+later block still fail, the chunked body is left unterminated and the
+connection closed, so the client sees a truncated response, never a 200.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from functions.Kz import compute_kz
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.portfolio import OPTIONAL_DEFAULTS, normalize_portfolio
+from functions.pressure_calculation import calculate_pressure, velocity_pressure
+from functions.wall_gcp_chart import wall_gcp
+from functions.wind_load_results import compute_wind_loads_batch
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+BATCH_BLOCK = 4096
+
+_BATCH_FIELDS = (
+    "Kz", "q", "gcp_positive", "gcp_zone4", "gcp_zone5",
+    "zone45_positive", "zone4_negative", "zone5_negative",
+)
+
+
+# Inputs that must be finite and positive
+_POSITIVE_FIELDS = ("height", "V", "Kd", "area")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _edition(payload) -> str:
+    """The request's ASCE 7 edition (validated), or the default."""
+    edition = payload.get("edition") if isinstance(payload, dict) else None
+    if edition is None:
+        return DEFAULT_EDITION
+    try:
+        load_edition(edition)
+    except (TypeError, ValueError):
+        raise BadRequest(f"Unknown ASCE 7 edition: {edition}")
+    return edition
+
+
+def _buildings_frame(payload, edition: str = DEFAULT_EDITION) -> pd.DataFrame:
+    if isinstance(payload, dict):
+        payload = payload.get("buildings", {k: v for k, v in payload.items() if k != "edition"})
+    try:
+        df = pd.DataFrame(payload) if isinstance(payload, list) else pd.DataFrame(dict(payload))
+    except (TypeError, ValueError) as e:
+        raise BadRequest(f"Could not read buildings: {e}")
+    if df.empty:
+        raise BadRequest("No buildings given.")
+    if "name" not in df.columns:
+        df["name"] = np.arange(len(df)).astype(str)
+
+    overrides = {c: df[c] for c in ("gcpi_positive", "gcpi_negative") if c in df.columns}
+    try:
+        df = normalize_portfolio(df, edition)
+        for col in ("height", "V", "Kd", "area"):
+            df[col] = pd.to_numeric(df[col], errors="raise")
+    except (ValueError, TypeError) as e:
+        raise BadRequest(str(e))
+    for col, values in overrides.items():
+        df[col] = pd.to_numeric(values).fillna(df[col])
+    _check_numbers(df)
+    return df
+
+
+def _check_numbers(df: pd.DataFrame) -> None:
+    """BadRequest unless height, V, Kd and area are finite and > 0 and GCpi finite."""
+    for col in _POSITIVE_FIELDS + ("gcpi_positive", "gcpi_negative"):
+        values = df[col].to_numpy(float)
+        bad = ~np.isfinite(values)
+        if col in _POSITIVE_FIELDS:
+            bad |= ~(values > 0)
+        if bad.any():
+            names = ", ".join(df["name"].astype(str).to_numpy()[bad][:10])
+            need = "a positive number" if col in _POSITIVE_FIELDS else "a number"
+            raise BadRequest(f"{col} must be {need} ({bad.sum()} building(s): {names})")
+
+
+def _single_inputs(payload: Dict[str, object], edition: str = DEFAULT_EDITION) -> Dict[str, object]:
+    # Plain-Python counterpart of normalize_portfolio, to keep single requests cheap.
+    r = {**OPTIONAL_DEFAULTS, **{k: v for k, v in payload.items() if v is not None}}
+    try:
+        exposure = str(r["exposure"]).strip().upper()
+        enclosure = load_edition(edition).gcpi.get(r["enclosure"])
+        if exposure not in ("B", "C", "D"):
+            raise BadRequest(f"Unknown exposure category: {r['exposure']}")
+        if enclosure is None:
+            raise BadRequest(f"Unknown enclosure classification in {edition}: {r['enclosure']}")
+        inputs = {
+            "height": float(r["height"]),
+            "V": float(r["V"]),
+            "exposure": exposure,
+            "Kd": float(r["Kd"]),
+            "area": float(r["area"]),
+            "gcpi_positive": float(r.get("gcpi_positive", enclosure[0])),
+            "gcpi_negative": float(r.get("gcpi_negative", enclosure[1])),
+        }
+    except KeyError as e:
+        raise BadRequest(f"Missing field {e}")
+    for k in _POSITIVE_FIELDS:
+        _positive(inputs, k)
+    for k in ("gcpi_positive", "gcpi_negative"):
+        if not math.isfinite(inputs[k]):
+            raise BadRequest(f"{k} must be a number")
+    return inputs
+
+
+def _positive(payload, key: str) -> float:
+    """payload[key] as a finite float > 0, else BadRequest."""
+    try:
+        value = float(payload[key])
+    except KeyError:
+        raise BadRequest(f"Missing field '{key}'")
+    except (TypeError, ValueError):
+        value = math.nan
+    if not (math.isfinite(value) and value > 0):
+        raise BadRequest(f"{key} must be a positive number")
+    return value
+
+
+def single_pressure(payload: Dict[str, object]) -> Dict[str, object]:
+    edition = _edition(payload)
+    r = _single_inputs(payload, edition)
+
+    Kz = compute_kz(r["height"], r["exposure"], edition)
+    q = velocity_pressure(Kz, r["Kd"], r["V"])
+    positive, z4, z5 = wall_gcp(r["area"], edition)
+    gp, gn = r["gcpi_positive"], r["gcpi_negative"]
+
+    return {
+        "edition": edition,
+        "Kz": Kz,
+        "q": q,
+        "gcp": {"zone45_positive": positive, "zone4_negative": z4, "zone5_negative": z5},
+        "pressure_psf": {
+            "zone45_positive": calculate_pressure(q, positive, gp, gn, "positive"),
+            "zone4_negative": calculate_pressure(q, z4, gp, gn, "negative"),
+            "zone5_negative": calculate_pressure(q, z5, gp, gn, "negative"),
+        },
+    }
+
+
+def iter_batch(df: pd.DataFrame, block: int = BATCH_BLOCK,
+               edition: str = DEFAULT_EDITION) -> Iterator[Dict[str, np.ndarray]]:
+    """Evaluates the buildings `block` rows at a time."""
+    for start in range(0, len(df), block):
+        part = df.iloc[start:start + block]
+        out = compute_wind_loads_batch(
+            part["height"].to_numpy(float),
+            part["V"].to_numpy(float),
+            part["exposure"].to_numpy(),
+            part["Kd"].to_numpy(float),
+            part["gcpi_positive"].to_numpy(float),
+            part["gcpi_negative"].to_numpy(float),
+            part["area"].to_numpy(float),
+            edition,
+        )
+        out["name"] = part["name"].astype(str).to_numpy()
+        yield out
+
+
+def _block_rows(block: Dict[str, np.ndarray], sep: str = ", ") -> str:
+    """
+    The block's result objects joined by sep, encoded in one json.dumps call
+    per block; a NaN or infinity raises ValueError instead of producing
+    invalid JSON.
+    """
+    keys = ("name",) + _BATCH_FIELDS
+    columns = [block["name"].tolist()] + [np.round(block[f], 6).tolist() for f in _BATCH_FIELDS]
+    rows = [dict(zip(keys, row)) for row in zip(*columns)]
+    if sep == ", ":
+        return json.dumps(rows, allow_nan=False)[1:-1]
+    return sep.join(json.dumps(row, allow_nan=False) for row in rows)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WindLoadAPI/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive
+    # clients stall ~40 ms per request on delayed ACKs.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- helpers ---
+
+    def _send_json(self, status: int, body: object) -> None:
+        data = json.dumps(body, allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise BadRequest("Request body is empty.")
+        if length > MAX_BODY_BYTES:
+            raise BadRequest(f"Request body larger than {MAX_BODY_BYTES} bytes.")
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as e:
+            raise BadRequest(f"Invalid JSON: {e}")
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _stream_batch(self, df: pd.DataFrame, edition: str) -> None:
+        ndjson = "application/x-ndjson" in (self.headers.get("Accept") or "")
+        sep = "\n" if ndjson else ", "
+        blocks = iter_batch(df, edition=edition)
+        # Errors in the first block still get a 400: nothing has been sent yet
+        first = _block_rows(next(blocks), sep)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson" if ndjson else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            if ndjson:
+                self._write_chunk((first + "\n").encode("utf-8"))
+                for block in blocks:
+                    self._write_chunk((_block_rows(block, sep) + "\n").encode("utf-8"))
+            else:
+                self._write_chunk(f'{{"count": {len(df)}, "results": ['.encode("utf-8") + first.encode("utf-8"))
+                for block in blocks:
+                    self._write_chunk((", " + _block_rows(block, sep)).encode("utf-8"))
+                self._write_chunk(b"]}")
+        except (KeyError, TypeError, ValueError):
+            # The 200 is already out: end the connection without the final
+            # chunk so the client cannot mistake the body for a full result.
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    # --- routes ---
+
+    def do_GET(self):
+        if self.path == "/v1/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+
+            if self.path == "/v1/kz":
+                exposure = str(payload.get("exposure", "")).upper()
+                if exposure not in ("B", "C", "D"):
+                    raise BadRequest("exposure must be B, C or D.")
+                self._send_json(200, {"Kz": compute_kz(_positive(payload, "height"), exposure, _edition(payload))})
+
+            elif self.path == "/v1/wall-gcp":
+                positive, z4, z5 = wall_gcp(_positive(payload, "area"), _edition(payload))
+                self._send_json(200, {"zone45_positive": positive, "zone4_negative": z4, "zone5_negative": z5})
+
+            elif self.path == "/v1/pressure":
+                if not isinstance(payload, dict):
+                    raise BadRequest("Expected a JSON object.")
+                self._send_json(200, single_pressure(payload))
+
+            elif self.path == "/v1/batch":
+                edition = _edition(payload)
+                self._stream_batch(_buildings_frame(payload, edition), edition)
+
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+        except (BadRequest, KeyError, TypeError, ValueError) as e:
+            message = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+            self._send_json(400, {"error": message, "defaults": OPTIONAL_DEFAULTS})
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8600) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Wind load calculation API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Append-only audit log of every calculation (who, inputs, resolved code
+editions, outputs) for QA. "who" is the engineer's name as entered in the
+sidebar; the Streamlit session id is kept alongside it.
+
+Entries are queued by the app and written off the request path by a
+background thread, which batches them into immutable Parquet segments
+(zstd, dictionary-encoded strings). Rows in a segment are sorted by state and
+time, so each row group's statistics cover a narrow range.
+
+A SQLite manifest records every segment's time and V range and the states it
+contains. A query such as "WI, V > 120, last 30 days" first selects the
+segments whose zone maps can match, then reads only those files with the
+filter pushed down to the row groups, so most of the log is never opened.
+Compaction swaps the manifest before deleting the merged files, so a query
+that finds a file gone re-reads the manifest and tries again.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from functions.result_cache import wind_loads_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT_DIR = Path(os.environ.get(
+    "WIND_AUDIT_DIR",
+    Path.home() / ".local" / "share" / "wind_load_calculator" / "audit",
+))
+
+# A segment is written once this many entries are queued, or FLUSH_INTERVAL_S
+# after the oldest queued entry, whichever comes first.
+SEGMENT_ROWS = 65_536
+FLUSH_INTERVAL_S = 30.0
+ROW_GROUP_ROWS = 8_192
+
+# Segments under a quarter of SEGMENT_ROWS (interval flushes on a quiet
+# server) are merged by the writer once this many have accumulated.
+COMPACT_AFTER = 64
+
+# Attempts of a query whose segments are being compacted away under it
+QUERY_ATTEMPTS = 3
+
+SCHEMA = pa.schema([
+    ("ts", pa.float64()),
+    ("who", pa.string()),
+    ("session", pa.string()),
+    ("city", pa.string()),
+    ("state", pa.string()),
+    ("ibc_year", pa.int32()),
+    ("iecc_year", pa.int32()),
+    ("edition", pa.string()),
+    ("height", pa.float64()),
+    ("V", pa.float64()),
+    ("exposure", pa.string()),
+    ("Kd", pa.float64()),
+    ("enclosure", pa.string()),
+    ("gcpi_positive", pa.float64()),
+    ("gcpi_negative", pa.float64()),
+    ("Kz", pa.float64()),
+    ("q", pa.float64()),
+    ("zone4_positive", pa.float64()),
+    ("zone4_negative", pa.float64()),
+    ("zone5_negative", pa.float64()),
+    ("result_key", pa.string()),
+])
+COLUMNS = SCHEMA.names
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    file        TEXT    NOT NULL,
+    rows        INTEGER NOT NULL,
+    bytes       INTEGER NOT NULL,
+    ts_min      REAL    NOT NULL,
+    ts_max      REAL    NOT NULL,
+    v_min       REAL,
+    v_max       REAL
+);
+CREATE TABLE IF NOT EXISTS segment_states (
+    state       TEXT    NOT NULL,
+    segment_id  INTEGER NOT NULL,
+    PRIMARY KEY (state, segment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_segments_ts ON segments(ts_max, ts_min);
+"""
+
+TimeLike = Union[float, datetime, pd.Timestamp, None]
+
+
+def _epoch(t: TimeLike) -> Optional[float]:
+    if t is None:
+        return None
+    if isinstance(t, (int, float)):
+        return float(t)
+    return pd.Timestamp(t).timestamp()
+
+
+class AuditLog:
+    def __init__(self, directory: Path = DEFAULT_AUDIT_DIR, segment_rows: int = SEGMENT_ROWS,
+                 flush_interval_s: float = FLUSH_INTERVAL_S):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_rows = segment_rows
+        self.flush_interval_s = flush_interval_s
+
+        self._conn = sqlite3.connect(str(self.directory / "manifest.sqlite3"), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_MANIFEST_SCHEMA)
+
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    # --- writing -------------------------------------------------------------------
+
+    def log(self, entry: Dict[str, object]) -> None:
+        """Queues one entry (keys from COLUMNS; "ts" defaults to now). Never blocks."""
+        self._ensure_writer()
+        self._queue.put_nowait({"ts": time.time(), **entry})
+
+    def flush(self, timeout: Optional[float] = 30.0) -> None:
+        """Writes everything queued so far as a segment and waits for it."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        buffer: List[Dict[str, object]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                buffer.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval_s
+                if len(buffer) < self.segment_rows:
+                    continue
+
+            if buffer:
+                try:
+                    self.write_segment(buffer)
+                except Exception:
+                    # An audit write failure must never take the writer down.
+                    logger.exception("Audit segment write failed (%d entries)", len(buffer))
+                buffer, deadline = [], None
+                try:
+                    if self._small_segments() >= COMPACT_AFTER:
+                        self.compact()
+                except Exception:
+                    logger.exception("Audit segment compaction failed")
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def write_segment(self, rows: Union[Sequence[Dict[str, object]], pd.DataFrame],
+                      replaces: Sequence[int] = ()) -> Optional[int]:
+        """
+        Writes entries as one immutable segment and registers it in the
+        manifest, dropping the `replaces` segments in the same transaction.
+        Called by the writer thread; also usable for bulk imports.
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(list(rows))
+        if df.empty:
+            return None
+        df = df.reindex(columns=COLUMNS)
+        df["state"] = df["state"].fillna("")
+        df = df.sort_values(["state", "ts"], kind="stable")
+        table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+        name = f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(df['ts'].min()))}-{uuid.uuid4().hex[:8]}.parquet"
+        path = self.directory / name
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression="zstd", row_group_size=ROW_GROUP_ROWS,
+                       use_dictionary=["who", "session", "city", "state", "edition", "exposure", "enclosure"])
+        os.replace(tmp, path)
+
+        v = df["V"].dropna()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO segments (file, rows, bytes, ts_min, ts_max, v_min, v_max) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, len(df), path.stat().st_size, float(df["ts"].min()), float(df["ts"].max()),
+                 float(v.min()) if len(v) else None, float(v.max()) if len(v) else None),
+            )
+            segment_id = int(cur.lastrowid)
+            self._conn.executemany(
+                "INSERT INTO segment_states (state, segment_id) VALUES (?, ?)",
+                [(s, segment_id) for s in df["state"].unique()],
+            )
+            if replaces:
+                marks = ",".join("?" * len(replaces))
+                self._conn.execute(f"DELETE FROM segment_states WHERE segment_id IN ({marks})", list(replaces))
+                self._conn.execute(f"DELETE FROM segments WHERE id IN ({marks})", list(replaces))
+        return segment_id
+
+    def _small_segments(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM segments WHERE rows < ?", (self.segment_rows // 4,)
+            ).fetchone()[0]
+
+    def compact(self) -> int:
+        """
+        Merges small segments, in time order, into segments of up to
+        segment_rows entries. Entries are never changed, only regrouped; the
+        manifest swap is one transaction. Returns the number of segments merged.
+        """
+        with self._lock:
+            small = self._conn.execute(
+                "SELECT id, file, rows FROM segments WHERE rows < ? ORDER BY ts_min",
+                (self.segment_rows // 4,),
+            ).fetchall()
+
+        groups, current, n = [], [], 0
+        for seg in small:
+            if current and n + seg[2] > self.segment_rows:
+                groups.append(current)
+                current, n = [], 0
+            current.append(seg)
+            n += seg[2]
+        groups.append(current)
+
+        merged = 0
+        for group in groups:
+            if len(group) < 2:
+                continue
+            files = [str(self.directory / f) for _, f, _ in group]
+            df = ds.dataset(files, schema=SCHEMA, format="parquet").to_table().to_pandas()
+            self.write_segment(df, replaces=[i for i, _, _ in group])
+            for _, f, _ in group:
+                try:
+                    (self.directory / f).unlink()
+                except OSError:
+                    pass
+            merged += len(group)
+        return merged
+
+    # --- reading ---------------------------------------------------------------------
+
+    def segments(self, state: Optional[str] = None, v_min: Optional[float] = None,
+                 v_max: Optional[float] = None, since: TimeLike = None, until: TimeLike = None) -> pd.DataFrame:
+        """Manifest rows of the segments whose zone maps can hold matching entries."""
+        where: List[str] = []
+        params: List[object] = []
+        if state:
+            where.append("id IN (SELECT segment_id FROM segment_states WHERE state = ?)")
+            params.append(state)
+        if v_min is not None:
+            where.append("v_max >= ?")
+            params.append(float(v_min))
+        if v_max is not None:
+            where.append("v_min <= ?")
+            params.append(float(v_max))
+        if since is not None:
+            where.append("ts_max >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            where.append("ts_min <= ?")
+            params.append(_epoch(until))
+
+        sql = "SELECT id, file, rows, bytes, ts_min, ts_max, v_min, v_max FROM segments"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts_min"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=["id", "file", "rows", "bytes", "ts_min", "ts_max", "v_min", "v_max"])
+
+    def query(self, state: Optional[str] = None, v_min: Optional[float] = None, v_max: Optional[float] = None,
+              since: TimeLike = None, until: TimeLike = None, columns: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Entries matching every given condition, newest first. V bounds are
+        inclusive. `df.attrs["segments_scanned"]` / ["segments_total"] report
+        how much of the log the manifest let the query skip.
+        """
+        for attempt in range(QUERY_ATTEMPTS):
+            try:
+                return self._query(state, v_min, v_max, since, until, columns, limit)
+            except FileNotFoundError:
+                # A compaction replaced some of the segments after the manifest was read
+                if attempt == QUERY_ATTEMPTS - 1:
+                    raise
+
+    def _query(self, state, v_min, v_max, since, until, columns, limit) -> pd.DataFrame:
+        segs = self.segments(state, v_min, v_max, since, until)
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+        cols = list(columns or COLUMNS)
+        if segs.empty:
+            df = pd.DataFrame({c: pd.Series(dtype=SCHEMA.field(c).type.to_pandas_dtype()) for c in cols})
+        else:
+            conditions = []
+            if state:
+                conditions.append(pc.field("state") == state)
+            if v_min is not None:
+                conditions.append(pc.field("V") >= float(v_min))
+            if v_max is not None:
+                conditions.append(pc.field("V") <= float(v_max))
+            if since is not None:
+                conditions.append(pc.field("ts") >= _epoch(since))
+            if until is not None:
+                conditions.append(pc.field("ts") <= _epoch(until))
+            expr = None
+            for c in conditions:
+                expr = c if expr is None else expr & c
+
+            dataset = ds.dataset([str(self.directory / f) for f in segs["file"]], schema=SCHEMA, format="parquet")
+            table = dataset.to_table(columns=sorted(set(cols) | {"ts"}), filter=expr)
+            table = table.sort_by([("ts", "descending")])
+            if limit is not None:
+                table = table.slice(0, int(limit))
+            df = table.to_pandas()[cols]
+
+        df.attrs["segments_scanned"] = len(segs)
+        df.attrs["segments_total"] = int(total)
+        return df
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            n, rows, size, t0, t1 = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(rows), 0), COALESCE(SUM(bytes), 0), MIN(ts_min), MAX(ts_max) FROM segments"
+            ).fetchone()
+        return {"segments": n, "entries": rows, "bytes": size, "first_ts": t0, "last_ts": t1,
+                "queued": self._queue.qsize()}
+
+
+_log: Optional[AuditLog] = None
+_log_lock = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    """Process-wide audit log; queued entries are flushed at interpreter exit."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = AuditLog()
+                atexit.register(_log.flush, 5.0)
+    return _log
+
+
+def calculation_entry(inputs: Dict[str, object], results: Dict[str, object], who: Optional[str],
+                      result_key: Optional[str] = None, session: Optional[str] = None) -> Dict[str, object]:
+    """
+    An audit entry from collect_project_inputs and compute_wind_loads output;
+    the pressures are those at the smallest tabulated effective area.
+    """
+    first = results["wall_pressure"].iloc[0]
+    return {
+        "who": who,
+        "session": session,
+        "city": inputs.get("city"),
+        "state": inputs.get("state"),
+        "ibc_year": inputs.get("ibc_year"),
+        "iecc_year": inputs.get("iecc_year"),
+        "edition": inputs.get("edition"),
+        "height": inputs["height"],
+        "V": inputs["V"],
+        "exposure": inputs["exposure"],
+        "Kd": inputs["Kd"],
+        "enclosure": inputs.get("enclosure"),
+        "gcpi_positive": inputs["gcpi_positive"],
+        "gcpi_negative": inputs["gcpi_negative"],
+        "Kz": float(results["Kz"]),
+        "q": float(results["q"]),
+        "zone4_positive": float(first["Zone 4 Positive (psf)"]),
+        "zone4_negative": float(first["Zone 4 Negative (psf)"]),
+        "zone5_negative": float(first["Zone 5 Negative (psf)"]),
+        "result_key": result_key,
+    }
+
+
+def engineer_input() -> str:
+    """Sidebar field for the engineer's name, logged as "who" with every calculation."""
+    return st.sidebar.text_input("Engineer", key="audit_engineer", placeholder="Name or initials",
+                                 help="Recorded with every calculation in the audit log.").strip()
+
+
+def record_calculation(inputs: Dict[str, object], results: Dict[str, object], who: Optional[str] = None) -> None:
+    """
+    Queues an audit entry for the session's calculation, with `who` (the
+    engineer_input name; empty is logged as missing) and the Streamlit
+    session id. Reruns that leave the inputs, jurisdiction and engineer
+    unchanged are not logged again.
+    """
+    who = (who or "").strip() or None
+    key = wind_loads_key(inputs["height"], inputs["V"], inputs["exposure"], inputs["Kd"],
+                         inputs["gcpi_positive"], inputs["gcpi_negative"], inputs["edition"])
+    fingerprint = (key, inputs.get("city"), inputs.get("state"), inputs.get("ibc_year"),
+                   inputs.get("iecc_year"), inputs.get("enclosure"), who)
+    if st.session_state.get("audit_last") == fingerprint:
+        return
+    st.session_state["audit_last"] = fingerprint
+
+    ctx = get_script_run_ctx()
+    session = ctx.session_id if ctx is not None else None
+    get_audit_log().log(calculation_entry(inputs, results, who, result_key=key, session=session))
@@ -1,15 +1,33 @@
 import streamlit as st
-from functions.create_building_visualisation import create_building_visualisation
+from functions.create_building_visualisation import create_building_visualisation, create_footprint_visualisation
+from functions.footprint import MAX_VERTICES, PRESETS, footprint_properties, format_footprint, parse_footprint, preset_footprint
+from functions.mesh_import import create_mesh_visualisation, mesh_footprint
+from functions.profiler import span
+
+
+def _load_preset():
+    st.session_state["bd_polygon"] = format_footprint(preset_footprint(st.session_state["bd_preset"]))
+
 
 def building_dimension():
     """
     Streamlit step:
-    - asks for NS, EW, height
+    - asks for NS, EW, height, a polygonal footprint and height, or a
+      building model (STL/OBJ)
     - plots building
     - returns (least_width, longest_width, height)
     """
     st.header("Building Dimensions")
 
+    mode = st.radio("Footprint", ["Rectangle", "Polygon", "Model (STL/OBJ)"], horizontal=True, key="bd_mode")
+    if mode != "Model (STL/OBJ)":
+        st.session_state.pop("building_mesh", None)
+    if mode == "Polygon":
+        return _polygon_footprint()
+    st.session_state.pop("footprint", None)
+    if mode == "Model (STL/OBJ)":
+        return _model_footprint()
+
     c1, c2, c3 = st.columns(3)
     ns = c1.number_input("North–South (ft)", min_value=0.01, value=80.0, format="%.2f", key="bd_ns")
     ew = c2.number_input("East–West (ft)", min_value=0.01, value=60.0, format="%.2f", key="bd_ew")
@@ -18,7 +36,83 @@ def building_dimension():
     least_width = float(min(ns, ew))
     longest_width = float(max(ns, ew))
 
-    fig = create_building_visualisation(ns, ew, height)
-    st.plotly_chart(fig, use_container_width=True)
+    with span("plotly_figure"):
+        fig = create_building_visualisation(ns, ew, height)
+    st.plotly_chart(fig, width="stretch")
 
     return least_width, longest_width, float(height)
+
+
+def _polygon_footprint():
+    """
+    Polygon mode: footprint vertices (x along North–South, y along East–West),
+    least dimension by rotating calipers, and the wall segments with their
+    Zone 4/5 lengths. The footprint's bounding box is written to bd_ns/bd_ew
+    for steps that need a rectangle.
+    """
+    if "bd_polygon" not in st.session_state:
+        st.session_state["bd_polygon"] = format_footprint(preset_footprint(PRESETS[0]))
+
+    c1, c2 = st.columns([2, 1])
+    c1.selectbox("Start from", PRESETS, key="bd_preset", on_change=_load_preset)
+    height = c2.number_input("Mean Roof Height (ft)", min_value=0.01, value=30.0, format="%.2f", key="bd_h")
+    text = st.text_area(
+        "Footprint vertices (ft)",
+        key="bd_polygon",
+        height=180,
+        help="One “x, y” pair per line. Separate courtyards from the outer boundary with a blank line. "
+             f"Up to {MAX_VERTICES:,} vertices.",
+    )
+    reentrant = st.checkbox("Zone 5 at reentrant corners", value=True, key="bd_reentrant")
+
+    try:
+        rings = parse_footprint(text)
+        props = footprint_properties(rings, height, reentrant_zone5=reentrant)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    ns, ew = (float(v) for v in props["bbox"])
+    st.session_state["bd_ns"], st.session_state["bd_ew"] = ns, ew
+    st.session_state["footprint"] = {"rings": rings, **props}
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Plan area", f"{props['area']:,.0f} sf")
+    m2.metric("Least dimension", f"{props['least']:.1f} ft")
+    m3.metric("Zone width a", f"{props['a']:.2f} ft")
+    m4.metric("Corners (outside / reentrant)", f"{props['outside_corners']} / {props['reentrant_corners']}")
+
+    with span("plotly_figure"):
+        fig = create_footprint_visualisation(rings, height)
+    st.plotly_chart(fig, width="stretch")
+
+    with st.expander(f"Wall segments ({len(props['walls'])})"):
+        st.dataframe(props["walls"].round(2), width="stretch", hide_index=True)
+
+    return props["least"], props["longest"], float(height)
+
+
+def _model_footprint():
+    """
+    Model mode: dimensions measured from an imported mesh (see
+    functions.mesh_import). Its bounding box is written to bd_ns/bd_ew for
+    steps that need a rectangle.
+    """
+    mesh = mesh_footprint()
+    if mesh is None:
+        st.stop()
+
+    ns, ew = (float(v) for v in mesh["bbox"])
+    st.session_state["bd_ns"], st.session_state["bd_ew"] = ns, ew
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Mean roof height", f"{mesh['height']:.1f} ft")
+    m2.metric("Least dimension", f"{mesh['least']:.1f} ft")
+    m3.metric("Zone width a", f"{mesh['a']:.2f} ft")
+    m4.metric("Faces", f"{len(mesh['triangles']):,}")
+
+    with span("plotly_figure"):
+        fig = create_mesh_visualisation(mesh)
+    st.plotly_chart(fig, width="stretch")
+
+    return mesh["least"], mesh["longest"], float(mesh["height"])
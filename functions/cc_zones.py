@@ -0,0 +1,182 @@
+"""
+Roof C&C zones (Zones 1, 2 and 3, h <= 60 ft, flat and gable roofs θ ≤ 7°)
+shared by the 3D pressure map, rooftop solar panels and imported models.
+
+The zone geometry depends on the edition (`Edition.roof_zoning`):
+
+- "a" (ASCE 7-10 Figure 30.4-2A): Zone 2 is a band of width a along every
+  roof edge, Zone 3 the a x a squares at the corners.
+- "0.6h" (ASCE 7-16 Figure 30.3-2A and later): Zone 2 is a band of width
+  0.6h along every roof edge, Zone 3 an L at each corner made of two strips
+  0.2h wide and 0.6h long. The interior is Zone 1; Zone 1' is not split
+  off, which is conservative.
+
+Both are described by three widths (edge, depth, reach): a point is Zone 3
+when it lies within `depth` of an edge in one direction and within `reach`
+of an edge in another, otherwise Zone 2 when within `edge` of any edge.
+Points are classified from their distances to the roof edges grouped by
+edge direction, so the same rule serves rectangles (two directions),
+polygonal footprints and the eaves of imported models. Near reentrant
+corners of non-rectangular roofs this also gives Zone 3, which is
+conservative.
+"""
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from functions.cladding_layout import zone_width_a
+from functions.editions import DEFAULT_EDITION, load_edition
+
+# Edge directions are grouped in bins of this many degrees
+DIRECTION_BIN_DEG = 15.0
+
+# Rows x columns of a distance block
+BLOCK = 4_000_000
+
+# Most grid lines per axis of roof_zone_cells; footprints needing more are
+# zoned on a coarser grid so the cell count (and the 3D map) stays bounded
+GRID_LINES = 120
+
+
+class RoofZoneWidths(NamedTuple):
+    edge: float
+    depth: float
+    reach: float
+
+
+def roof_zone_widths(least_width, height, edition=DEFAULT_EDITION) -> RoofZoneWidths:
+    """Zone 2 band width and Zone 3 strip depth and reach (ft) for the edition."""
+    if load_edition(edition).roof_zoning == "0.6h":
+        h = float(height)
+        return RoofZoneWidths(0.6 * h, 0.2 * h, 0.6 * h)
+    a = zone_width_a(least_width, height)
+    return RoofZoneWidths(a, a, a)
+
+
+def roof_zone(dist, widths: RoofZoneWidths) -> np.ndarray:
+    """
+    Roof zone (1, 2 or 3) from distances.
+
+    Parameters
+    ----------
+    dist : array_like of shape (N, K)
+        Distance (ft) from each of N points (or areas) to the nearest roof
+        edge in each of K edge directions; np.inf where there is none.
+    widths : RoofZoneWidths
+        From `roof_zone_widths`.
+    """
+    dist = np.atleast_2d(np.asarray(dist, dtype=float))
+    edge, depth, reach = widths
+    inner = dist < depth
+    outer = dist < reach
+    n_outer = outer.sum(axis=1, keepdims=True)
+    zone3 = (inner & (n_outer - outer > 0)).any(axis=1)
+    zone2 = (dist < edge).any(axis=1)
+    return np.where(zone3, 3, np.where(zone2, 2, 1))
+
+
+def rect_roof_zones(x0, y0, x1, y1, roof_length, roof_width, widths: RoofZoneWidths) -> np.ndarray:
+    """
+    Governing (highest) roof zone touched by each rectangle x0..x1, y0..y1 on
+    a roof_length x roof_width roof; points are rectangles of zero size.
+    """
+    dx = np.maximum(0.0, np.minimum(np.asarray(x0, dtype=float), roof_length - np.asarray(x1, dtype=float)))
+    dy = np.maximum(0.0, np.minimum(np.asarray(y0, dtype=float), roof_width - np.asarray(y1, dtype=float)))
+    return roof_zone(np.column_stack([dx, dy]), widths)
+
+
+def edge_distances(points, a, b) -> np.ndarray:
+    """
+    Distance (N, K) from each point (N, 2) to the nearest of the segments a-b
+    (E, 2) in each of the K direction bins present, computed in blocks.
+    """
+    points = np.asarray(points, dtype=float)
+    ab = b - a
+    angle = np.degrees(np.arctan2(ab[:, 1], ab[:, 0])) % 180.0
+    n_bins = int(round(180.0 / DIRECTION_BIN_DEG))
+    direction = np.round(angle / DIRECTION_BIN_DEG).astype(int) % n_bins
+    bins, direction = np.unique(direction, return_inverse=True)
+
+    out = np.full((len(points), len(bins)), np.inf)
+    if len(a) == 0:
+        return out
+    ab2 = np.maximum((ab ** 2).sum(axis=1), 1e-12)
+    step = max(1, BLOCK // len(a))
+    for i in range(0, len(points), step):
+        ap = points[i:i + step, None, :] - a[None, :, :]
+        t = np.clip((ap * ab[None]).sum(axis=2) / ab2, 0.0, 1.0)
+        d = np.sqrt(((ap - t[..., None] * ab[None]) ** 2).sum(axis=2))
+        for k in range(len(bins)):
+            out[i:i + step, k] = d[:, direction == k].min(axis=1)
+    return out
+
+
+def ring_edges(rings: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end points of every edge of every ring."""
+    return np.concatenate(rings), np.concatenate([np.roll(r, -1, axis=0) for r in rings])
+
+
+def contains(rings: Sequence[np.ndarray], points) -> np.ndarray:
+    """Even-odd point in polygon test of points (N, 2) against the footprint rings."""
+    points = np.asarray(points, dtype=float)
+    a, b = ring_edges(rings)
+    px, py = points[:, :1], points[:, 1:]
+    crosses = (a[:, 1] > py) != (b[:, 1] > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = a[:, 0] + (py - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    return (crosses & (px < x_at)).sum(axis=1) % 2 == 1
+
+
+def _thin(lines: np.ndarray, spacing: float) -> np.ndarray:
+    """Sorted lines with each kept line at least `spacing` past the last kept one; both ends are kept."""
+    kept = [lines[0]]
+    for v in lines[1:-1]:
+        if v - kept[-1] >= spacing:
+            kept.append(v)
+    if lines[-1] - kept[-1] < spacing and len(kept) > 1:
+        kept.pop()
+    kept.append(lines[-1])
+    return np.array(kept)
+
+
+def roof_zone_cells(rings: Sequence[np.ndarray], widths: RoofZoneWidths) -> List[Tuple[int, float, float, float, float]]:
+    """
+    The roof of a footprint as rectangles (zone, x0, x1, y0, y1).
+
+    The roof is cut on a grid through every vertex coordinate and every zone
+    boundary offset from it, so each cell of a rectilinear footprint lies in a
+    single zone; cells are zoned at their center, and runs of cells of the
+    same zone along x are merged into one rectangle. Edges that are not
+    parallel to x or y are followed to the grid resolution. Where that grid
+    would have more than `GRID_LINES` lines per axis, lines closer than
+    1/GRID_LINES of the extent are dropped, so zone boundaries of very
+    detailed footprints are followed to that spacing.
+    """
+    pts = np.concatenate(rings)
+    offsets = np.array([0.0, *widths, *(-w for w in widths)])
+
+    def lines(c):
+        lo, hi = c.min(), c.max()
+        v = np.unique(np.round(np.clip((c[:, None] + offsets[None, :]).ravel(), lo, hi), 9))
+        return v if len(v) <= GRID_LINES else _thin(v, (hi - lo) / GRID_LINES)
+
+    xs, ys = lines(pts[:, 0]), lines(pts[:, 1])
+    cx, cy = (xs[:-1] + xs[1:]) / 2, (ys[:-1] + ys[1:]) / 2
+    gx, gy = np.meshgrid(cx, cy)
+    centers = np.column_stack([gx.ravel(), gy.ravel()])
+
+    inside = contains(rings, centers)
+    zone = np.zeros(len(centers), dtype=int)
+    a, b = ring_edges(rings)
+    zone[inside] = roof_zone(edge_distances(centers[inside], a, b), widths)
+    zone = zone.reshape(len(cy), len(cx))
+
+    cells = []
+    for j in range(len(cy)):
+        row = zone[j]
+        starts = np.flatnonzero(np.diff(np.concatenate(([0], row))) != 0)
+        ends = np.append(starts[1:], len(row))
+        for s, e in zip(starts, ends):
+            if row[s]:
+                cells.append((int(row[s]), float(xs[s]), float(xs[e]), float(ys[j]), float(ys[j + 1])))
+    return cells
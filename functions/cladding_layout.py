@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from functions.editions import DEFAULT_EDITION
+from functions.pressure_calculation import calculate_pressure
+from functions.wall_gcp_chart import wall_gcp_array
+
+
+def zone_width_a(least_width, height):
+    """
+    Edge zone width a (ASCE 7-16 Figure 30.3-1, note 5): 10% of the least
+    horizontal dimension or 0.4h, whichever is smaller, but not less than
+    4% of the least horizontal dimension or 3 ft.
+    """
+    least_width = float(least_width)
+    return max(min(0.1 * least_width, 0.4 * float(height)), 0.04 * least_width, 3.0)
+
+
+def rectangular_elevations(least_width, longest_width, height):
+    """The four wall elevations (name, length, height) of a rectangular building."""
+    return [
+        ("Long wall 1", float(longest_width), float(height)),
+        ("Short wall 1", float(least_width), float(height)),
+        ("Long wall 2", float(longest_width), float(height)),
+        ("Short wall 2", float(least_width), float(height)),
+    ]
+
+
+def footprint_elevations(walls, height):
+    """
+    Wall elevations of a polygonal footprint (see functions.footprint) and the
+    Zone 5 width at the start and end of each wall, which is 0 at an end
+    without a corner zone.
+    """
+    elevations = [(w, float(L), float(height)) for w, L in zip(walls["Wall"], walls["Length (ft)"])]
+    return elevations, walls[["Zone 5 at start (ft)", "Zone 5 at end (ft)"]].to_numpy()
+
+
+def _wall_grid(length, wall_height, panel_width, panel_height):
+    """Panel edges along one wall; the last column/row is cut to the wall."""
+    x0 = np.arange(0.0, length, panel_width)
+    z0 = np.arange(0.0, wall_height, panel_height)
+    x1 = np.minimum(x0 + panel_width, length)
+    z1 = np.minimum(z0 + panel_height, wall_height)
+    return x0, x1, z0, z1
+
+
+def layout_panels(elevations, panel_width, panel_height, a, span="vertical"):
+    """
+    Lays a panel grid over each wall elevation and classifies every panel.
+
+    Parameters
+    ----------
+    elevations : list of (name, length, height)
+        Wall elevations (ft).
+    panel_width, panel_height : float
+        Panel grid module (ft).
+    a : float or array_like of shape (n_walls, 2)
+        Zone 5 width from each wall end (ft), see `zone_width_a`; per wall
+        (start, end) for polygonal footprints, where an end without a
+        corner zone has width 0.
+    span : {"vertical", "horizontal"}
+        Direction in which the panel spans between supports.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-panel wall index, row, col, x0, x1, z0, z1, effective area (sf)
+        and zone5 flag.
+    """
+    walls, rows, cols, xs0, xs1, zs0, zs1 = [], [], [], [], [], [], []
+    for w, (_, length, wall_height) in enumerate(elevations):
+        x0, x1, z0, z1 = _wall_grid(length, wall_height, panel_width, panel_height)
+        r, c = np.meshgrid(np.arange(len(z0)), np.arange(len(x0)), indexing="ij")
+        r, c = r.ravel(), c.ravel()
+        walls.append(np.full(r.size, w))
+        rows.append(r)
+        cols.append(c)
+        xs0.append(x0[c])
+        xs1.append(x1[c])
+        zs0.append(z0[r])
+        zs1.append(z1[r])
+
+    wall = np.concatenate(walls)
+    x0, x1 = np.concatenate(xs0), np.concatenate(xs1)
+    z0, z1 = np.concatenate(zs0), np.concatenate(zs1)
+    lengths = np.array([e[1] for e in elevations])[wall]
+
+    width = x1 - x0
+    height = z1 - z0
+    span_length, other = (height, width) if span == "vertical" else (width, height)
+
+    # Effective wind area: span x width, where the width need not be taken
+    # less than one-third of the span (ASCE 7-16 Section 26.2).
+    effective_area = span_length * np.maximum(other, span_length / 3.0)
+
+    # Zone 5 where any part of the panel lies within a of either wall end
+    a = np.asarray(a, dtype=float)
+    a_start, a_end = (a, a) if a.ndim == 0 else (a[wall, 0], a[wall, 1])
+    zone5 = (x0 < a_start) | (x1 > lengths - a_end)
+
+    return {
+        "wall": wall,
+        "row": np.concatenate(rows),
+        "col": np.concatenate(cols),
+        "x0": x0, "x1": x1, "z0": z0, "z1": z1,
+        "effective_area": effective_area,
+        "zone5": zone5,
+    }
+
+
+def panel_pressures(panels, q, gcpi_positive, gcpi_negative, edition=DEFAULT_EDITION):
+    """Vectorized wall GCp of the edition and ASD pressures for every panel."""
+    positive, z4, z5 = wall_gcp_array(panels["effective_area"], edition)
+    negative = np.where(panels["zone5"], z5, z4)
+    return {
+        "gcp_positive": positive,
+        "gcp_negative": negative,
+        "p_positive": calculate_pressure(q, positive, gcpi_positive, gcpi_negative, "positive"),
+        "p_negative": calculate_pressure(q, negative, gcpi_positive, gcpi_negative, "negative"),
+    }
+
+
+def cladding_layout(elevations, panel_width, panel_height, a, q, gcpi_positive, gcpi_negative,
+                    span="vertical", edition=DEFAULT_EDITION) -> pd.DataFrame:
+    panels = layout_panels(elevations, panel_width, panel_height, a, span=span)
+    pressures = panel_pressures(panels, q, gcpi_positive, gcpi_negative, edition)
+
+    names = np.array([e[0] for e in elevations])
+    return pd.DataFrame({
+        "Wall": names[panels["wall"]],
+        "Row": panels["row"],
+        "Col": panels["col"],
+        "x0 (ft)": panels["x0"],
+        "x1 (ft)": panels["x1"],
+        "z0 (ft)": panels["z0"],
+        "z1 (ft)": panels["z1"],
+        "Effective Area (sf)": panels["effective_area"],
+        "Zone": np.where(panels["zone5"], 5, 4),
+        "GCp Positive": pressures["gcp_positive"],
+        "GCp Negative": pressures["gcp_negative"],
+        "Positive (psf)": pressures["p_positive"],
+        "Negative (psf)": pressures["p_negative"],
+    })
+
+
+def show_cladding_layout(least_width, longest_width, height, q, gcpi_positive, gcpi_negative, footprint=None,
+                         edition=DEFAULT_EDITION):
+    st.header("Cladding Panel Layout")
+
+    a = zone_width_a(least_width, height)
+    st.caption(
+        f"a = min(0.1·{least_width:.1f}, 0.4·{height:.1f}) ≥ max(0.04·{least_width:.1f}, 3) "
+        f"= **{a:.2f} ft** (Zone 5 width at each wall end)"
+    )
+
+    c1, c2, c3 = st.columns(3)
+    panel_width = c1.number_input("Panel width (ft)", min_value=0.25, value=4.0, step=0.25, key="clad_w")
+    panel_height = c2.number_input("Panel height (ft)", min_value=0.25, value=8.0, step=0.25, key="clad_h")
+    span = c3.selectbox("Panel spans", ["vertical", "horizontal"], key="clad_span")
+
+    if footprint is None:
+        elevations = rectangular_elevations(least_width, longest_width, height)
+        zone5_widths = a
+    else:
+        elevations, zone5_widths = footprint_elevations(footprint["walls"], height)
+    df = cladding_layout(elevations, panel_width, panel_height, zone5_widths, q, gcpi_positive, gcpi_negative,
+                         span=span, edition=edition)
+
+    summary = (
+        df.groupby(["Wall", "Zone"])
+        .agg(**{
+            "Panels": ("Zone", "size"),
+            "Max Positive (psf)": ("Positive (psf)", "max"),
+            "Min Negative (psf)": ("Negative (psf)", "min"),
+        })
+        .reset_index()
+    )
+    st.dataframe(summary, width="stretch", hide_index=True)
+
+    wall_name = st.selectbox("Elevation", [e[0] for e in elevations], key="clad_wall")
+    wall_df = df[df["Wall"] == wall_name]
+    grid = np.full((wall_df["Row"].max() + 1, wall_df["Col"].max() + 1), np.nan)
+    grid[wall_df["Row"].to_numpy(), wall_df["Col"].to_numpy()] = wall_df["Negative (psf)"].to_numpy()
+
+    fig = go.Figure(go.Heatmap(
+        z=grid,
+        colorscale="Blues_r",
+        colorbar=dict(title="psf"),
+        hovertemplate="row %{y}, col %{x}<br>%{z:.2f} psf<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"{wall_name}: negative design pressure per panel",
+        xaxis_title="Panel column", yaxis_title="Panel row",
+        height=360, margin=dict(l=0, r=0, t=40, b=0),
+    )
+    st.plotly_chart(fig, width="stretch")
+
+    st.download_button(
+        "Download panel schedule (CSV)",
+        data=df.to_csv(index=False),
+        file_name="cladding_panels.csv",
+        mime="text/csv",
+    )
+    st.markdown("---")
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import logging
+import os
 import re
+import time
 from dataclasses import dataclass
 from typing import Optional, Dict, Tuple, List
 
@@ -8,6 +11,12 @@ import requests
 from bs4 import BeautifulSoup
 import streamlit as st
 
+from functions.editions import select_edition
+from functions.metrics import ADOPTION_LOOKUP_DURATION, ADOPTION_LOOKUP_FAILURES
+from functions.profiler import span, record_cache
+
+logger = logging.getLogger(__name__)
+
 
 # --- State options (same as you already have) ---
 STATE_OPTIONS: List[Tuple[str, str]] = [
@@ -28,9 +37,17 @@ STATE_OPTIONS: List[Tuple[str, str]] = [
     ("UT", "Utah"), ("VT", "Vermont"), ("VA", "Virginia"),
     ("WA", "Washington"), ("WV", "West Virginia"),
     ("WI", "Wisconsin"), ("WY", "Wyoming"),
+    # Territories (hurricane-prone by definition, ASCE 7 Section 26.2)
+    ("AS", "American Samoa"), ("GU", "Guam"), ("PR", "Puerto Rico"),
+    ("VI", "U.S. Virgin Islands"),
 ]
 STATE_ABBR_TO_NAME: Dict[str, str] = dict(STATE_OPTIONS)
 
+# Adoption pages live under this URL; point it at a local stub for load tests.
+ICC_ADOPTIONS_BASE_URL = os.environ.get(
+    "ICC_ADOPTIONS_BASE_URL", "https://www.iccsafe.org/advocacy/adoptions-map"
+).rstrip("/")
+
 
 @dataclass
 class AdoptionYears:
@@ -82,7 +99,7 @@ def lookup_state_ibc_iecc_from_iccsafe_adoptions(state_abbr: str, debug: bool =
     slug = _state_slug_for_adoptions(state_name)
 
     # ✅ Server-rendered adoption page (example exists for Illinois).  :contentReference[oaicite:1]{index=1}
-    url = f"https://www.iccsafe.org/advocacy/adoptions-map/{slug}/"
+    url = f"{ICC_ADOPTIONS_BASE_URL}/{slug}/"
 
     html = _http_get(url)
     soup = BeautifulSoup(html, "html.parser")
@@ -108,24 +125,73 @@ def lookup_state_ibc_iecc_from_iccsafe_adoptions(state_abbr: str, debug: bool =
     )
 
 
+# Successful adoption lookups are reused across reruns and sessions; failures are not cached.
+ADOPTION_CACHE_TTL_S = 12 * 60 * 60
+_adoption_cache: Dict[str, Tuple[float, AdoptionYears]] = {}
+
+
+def cached_adoption_lookup(state_abbr: str) -> Tuple[AdoptionYears, bool]:
+    """
+    Returns (adoption years, cache_hit) for a state, fetching the ICC page only
+    when there is no entry younger than ADOPTION_CACHE_TTL_S.
+    """
+    key = (state_abbr or "").strip().upper()
+    now = time.monotonic()
+
+    entry = _adoption_cache.get(key)
+    if entry is not None and now - entry[0] < ADOPTION_CACHE_TTL_S:
+        return entry[1], True
+
+    try:
+        with ADOPTION_LOOKUP_DURATION.time():
+            res = lookup_state_ibc_iecc_from_iccsafe_adoptions(key, debug=True)
+    except Exception as e:
+        ADOPTION_LOOKUP_FAILURES.labels(type(e).__name__).inc()
+        logger.warning("ICC adoption lookup failed for %s: %s", key, e)
+        raise
+
+    _adoption_cache[key] = (now, res)
+    return res, False
+
+
+def _reset_code_years():
+    # A new state means a new lookup; the year inputs start again from its result
+    for key in ("cj_ibc", "cj_iecc"):
+        st.session_state.pop(key, None)
+
+
 def code_jurisdiction_1() -> Dict[str, object]:
     st.header("Code Jurisdiction / Project Location")
 
-    city = st.text_input("City", value="Milwaukee")
+    city = st.text_input("City", value="Milwaukee", key="cj_city")
 
     # --- State dropdown ---
     state_labels = [f"{abbr} – {name}" for abbr, name in STATE_OPTIONS]
     default_index = [abbr for abbr, _ in STATE_OPTIONS].index("WI")
-    state_choice = st.selectbox("State", options=state_labels, index=default_index)
+    state_choice = st.selectbox("State", options=state_labels, index=default_index, key="cj_state",
+                                on_change=_reset_code_years)
     state_abbr = state_choice.split("–")[0].strip()
 
+    # Site location, used for the wind region lookups (functions.wind_regions);
+    # the lookups are skipped until both are entered
+    g1, g2 = st.columns(2)
+    lat = g1.number_input("Latitude (°)", min_value=-90.0, max_value=90.0, value=None,
+                          format="%.4f", placeholder="e.g. 43.0389", key="cj_lat")
+    lon = g2.number_input("Longitude (°)", min_value=-180.0, max_value=180.0, value=None,
+                          format="%.4f", placeholder="e.g. -87.9065", key="cj_lon")
+    if lat is None or lon is None:
+        st.caption("Enter the site coordinates to check the hurricane-prone, wind-borne debris "
+                   "and special wind region boundaries.")
+
     ibc_year: Optional[int] = None
     iecc_year: Optional[int] = None
     source_url: Optional[str] = None
     err: Optional[str] = None
 
     try:
-        res = lookup_state_ibc_iecc_from_iccsafe_adoptions(state_abbr, debug=True)
+        with span("icc_fetch"):
+            res, hit = cached_adoption_lookup(state_abbr)
+            record_cache("adoption_lookup", hit)
         ibc_year = res.ibc_year
         iecc_year = res.iecc_year
         source_url = res.source_url
@@ -142,18 +208,29 @@ def code_jurisdiction_1() -> Dict[str, object]:
     with c2:
         st.metric("IECC (State)", str(iecc_year) if iecc_year else "Not found")
 
+    # Keyed so projects can restore them; an empty input takes the lookup result
+    for key, year in (("cj_ibc", ibc_year), ("cj_iecc", iecc_year)):
+        if year and not st.session_state.get(key):
+            st.session_state[key] = str(year)
+
     col1, col2 = st.columns(2)
     with col1:
-        ibc_in = st.text_input("IBC Year", value=str(ibc_year) if ibc_year else "", placeholder="e.g. 2021")
+        ibc_in = st.text_input("IBC Year", placeholder="e.g. 2021", key="cj_ibc")
     with col2:
-        iecc_in = st.text_input("IECC Year", value=str(iecc_year) if iecc_year else "", placeholder="e.g. 2018")
+        iecc_in = st.text_input("IECC Year", placeholder="e.g. 2018", key="cj_iecc")
+
+    # ASCE 7 edition referenced by the adopted IBC (coefficients load lazily)
+    edition = select_edition(int(ibc_in) if ibc_in.isdigit() else ibc_year)
 
     st.markdown("---")
     return {
         "city": city,
         "state": state_abbr,
+        "lat": None if lat is None else float(lat),
+        "lon": None if lon is None else float(lon),
         "ibc_year": int(ibc_in) if ibc_in.isdigit() else ibc_year,
         "iecc_year": int(iecc_in) if iecc_in.isdigit() else iecc_year,
         "source_url": source_url,
         "error": err,
+        "asce_edition": edition,
     }
@@ -1,5 +1,10 @@
+import numpy as np
 import plotly.graph_objects as go
 
+from functions.cc_zones import roof_zone_cells
+from functions.footprint import extrude_footprint
+from functions.plot_encoding import typed
+
 def create_building_visualisation(NS_dimension, EW_dimension, z):
     TT_LightBlue = "rgb(136,219,223)"
     TT_LightGrey = "rgb(223,224,225)"
@@ -26,13 +31,13 @@ def create_building_visualisation(NS_dimension, EW_dimension, z):
     ))
 
     # Building as one closed mesh (8 vertices, 12 triangles)
-    x = [0, L, L, 0, 0, L, L, 0]
-    y = [0, 0, W, W, 0, 0, W, W]
-    zc = [0, 0, 0, 0, H, H, H, H]
+    x = typed([0, L, L, 0, 0, L, L, 0])
+    y = typed([0, 0, W, W, 0, 0, W, W])
+    zc = typed([0, 0, 0, 0, H, H, H, H])
 
-    i = [0, 0, 4, 4, 0, 0, 1, 1, 2, 2, 3, 3]
-    j = [1, 2, 5, 6, 1, 5, 2, 6, 3, 7, 0, 4]
-    k = [2, 3, 6, 7, 5, 4, 6, 5, 7, 6, 4, 7]
+    i = typed([0, 0, 4, 4, 0, 0, 1, 1, 2, 2, 3, 3], np.uint8)
+    j = typed([1, 2, 5, 6, 1, 5, 2, 6, 3, 7, 0, 4], np.uint8)
+    k = typed([2, 3, 6, 7, 5, 4, 6, 5, 7, 6, 4, 7], np.uint8)
 
     fig.add_trace(go.Mesh3d(
         x=x, y=y, z=zc,
@@ -45,17 +50,190 @@ def create_building_visualisation(NS_dimension, EW_dimension, z):
     ))
 
     # Edges
-    edges = [
+    edges = np.array([
         (0,1),(1,2),(2,3),(3,0),
         (4,5),(5,6),(6,7),(7,4),
         (0,4),(1,5),(2,6),(3,7)
-    ]
-    xe, ye, ze = [], [], []
-    for a, b in edges:
-        xe += [x[a], x[b], None]
-        ye += [y[a], y[b], None]
-        ze += [zc[a], zc[b], None]
+    ])
+    # Segments a-b-gap; NaN breaks the line like None but keeps a typed array
+    xe, ye, ze = (
+        typed(np.column_stack([c[edges], np.full(len(edges), np.nan)]).ravel())
+        for c in (x, y, zc)
+    )
+
+    fig.add_trace(go.Scatter3d(
+        x=xe, y=ye, z=ze,
+        mode="lines",
+        line=dict(width=4),
+        hoverinfo="none",
+        showlegend=False
+    ))
+
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(visible=False, showgrid=False, showticklabels=False, showbackground=False, zeroline=False),
+            yaxis=dict(visible=False, showgrid=False, showticklabels=False, showbackground=False, zeroline=False),
+            zaxis=dict(visible=False, showgrid=False, showticklabels=False, showbackground=False, zeroline=False),
+            aspectmode="data",
+        ),
+        margin=dict(l=0, r=0, b=0, t=40),
+        showlegend=False,
+        scene_camera=dict(eye=dict(x=1.5, y=-1.5, z=1.2)),
+        height=420,
+    )
+
+    return fig
+
+
+# --- Pressure-colored view -------------------------------------------------
+
+PRESSURE_COLORSCALE = "RdBu"
+
+
+def _zone_quads(rings, H, walls, widths):
+    """
+    One quad per zone piece as (zone, origin, u, v): wall Zones 5/4/5 along
+    each wall segment (functions.footprint.wall_segments) and the roof Zone
+    1/2/3 rectangles of `roof_zone_cells`.
+    """
+    quads = []
+    up = np.array([0.0, 0.0, H])
+    p0 = walls[["x0 (ft)", "y0 (ft)"]].to_numpy(float)
+    p1 = walls[["x1 (ft)", "y1 (ft)"]].to_numpy(float)
+    length = walls["Length (ft)"].to_numpy(float)
+    z5_start = walls["Zone 5 at start (ft)"].to_numpy(float)
+    z5_end = walls["Zone 5 at end (ft)"].to_numpy(float)
+    for a, b, n, s5, e5 in zip(p0, p1, length, z5_start, z5_end):
+        d = np.append((b - a) / n, 0.0)
+        for s0, s1, zone in ((0.0, s5, "Zone 5"), (s5, n - e5, "Zone 4"), (n - e5, n, "Zone 5")):
+            if s1 - s0 > 1e-9:
+                quads.append((zone, np.append(a, 0.0) + d * s0, d * (s1 - s0), up))
+
+    for zone, x0, x1, y0, y1 in roof_zone_cells(rings, widths):
+        quads.append((f"Zone {zone}", np.array([x0, y0, H]), np.array([x1 - x0, 0.0, 0.0]), np.array([0.0, y1 - y0, 0.0])))
+    return quads
+
+
+def create_pressure_visualisation(rings, z, walls, widths, zone_pressures):
+    """
+    Building with each wall and the roof split into C&C zones and colored by
+    governing pressure (psf).
+
+    rings is the footprint (functions.footprint; a rectangle from
+    preset_footprint for plain dimensions), walls its wall_segments table,
+    widths the roof zone widths of the edition (functions.cc_zones) and
+    zone_pressures maps "Zone 1" … "Zone 5" to the governing pressure of that
+    zone. Every zone piece is a single quad, so the figure stays small
+    whatever the building size.
+    """
+    H = float(z)
+    quads = _zone_quads(rings, H, walls, widths)
+    zones = np.array([q[0] for q in quads])
+    origin = np.array([q[1] for q in quads], dtype=float)
+    u = np.array([q[2] for q in quads], dtype=float)
+    v = np.array([q[3] for q in quads], dtype=float)
+
+    limit = max(abs(p) for p in zone_pressures.values()) or 1.0
+    fig = go.Figure()
+
+    for zone in sorted(set(zones)):
+        mask = zones == zone
+        o, du, dv = origin[mask], u[mask], v[mask]
+        vertices = np.stack([o, o + du, o + du + dv, o + dv], axis=1).reshape(-1, 3)
+        first = 4 * np.arange(mask.sum())
+        triangles = np.concatenate([
+            np.column_stack([first, first + 1, first + 2]),
+            np.column_stack([first, first + 2, first + 3]),
+        ])
+        p = zone_pressures[zone]
+        surface = "roof" if zone in ("Zone 1", "Zone 2", "Zone 3") else "wall"
 
+        fig.add_trace(go.Mesh3d(
+            x=typed(vertices[:, 0]), y=typed(vertices[:, 1]), z=typed(vertices[:, 2]),
+            i=typed(triangles[:, 0], np.int32), j=typed(triangles[:, 1], np.int32),
+            k=typed(triangles[:, 2], np.int32),
+            intensity=typed(np.full(len(vertices), p)),
+            intensitymode="vertex",
+            colorscale=PRESSURE_COLORSCALE,
+            cmin=-limit, cmax=limit,
+            showscale=zone == "Zone 1",
+            colorbar=dict(title="psf"),
+            flatshading=True,
+            name=f"{zone} ({surface})",
+            hovertemplate=(
+                f"<b>{zone}</b> ({surface})<br>p = {p:+.1f} psf"
+                "<br>x=%{x:.0f} ft, y=%{y:.0f} ft, z=%{z:.0f} ft<extra></extra>"
+            ),
+            lighting=dict(ambient=0.8, diffuse=0.5, specular=0.05, roughness=0.9),
+        ))
+
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            zaxis=dict(visible=False),
+            aspectmode="data",
+        ),
+        margin=dict(l=0, r=0, b=0, t=40),
+        showlegend=False,
+        scene_camera=dict(eye=dict(x=1.5, y=-1.5, z=1.2)),
+        height=480,
+    )
+    return fig
+
+
+# --- Polygonal footprint -----------------------------------------------------
+
+def create_footprint_visualisation(rings, z):
+    """Extruded polygonal footprint (outer ring plus courtyards), see functions.footprint."""
+    TT_LightBlue = "rgb(136,219,223)"
+    TT_LightGrey = "rgb(223,224,225)"
+
+    H = float(z)
+    vertices, triangles = extrude_footprint(rings, H)
+    xy = np.concatenate(rings)
+    n = len(xy)
+
+    fig = go.Figure()
+
+    (x0, y0), (x1, y1) = xy.min(axis=0), xy.max(axis=0)
+    ext = max(x1 - x0, y1 - y0) * 0.3
+    fig.add_trace(go.Surface(
+        x=[[x0 - ext, x1 + ext], [x0 - ext, x1 + ext]],
+        y=[[y0 - ext, y0 - ext], [y1 + ext, y1 + ext]],
+        z=[[0, 0], [0, 0]],
+        showscale=False,
+        opacity=0.6,
+        hoverinfo="none",
+        colorscale=[[0, TT_LightGrey], [1, TT_LightGrey]],
+    ))
+
+    index_dtype = np.uint16 if len(vertices) < 2 ** 16 else np.uint32
+    fig.add_trace(go.Mesh3d(
+        x=typed(vertices[:, 0]), y=typed(vertices[:, 1]), z=typed(vertices[:, 2]),
+        i=typed(triangles[:, 0], index_dtype),
+        j=typed(triangles[:, 1], index_dtype),
+        k=typed(triangles[:, 2], index_dtype),
+        color=TT_LightBlue,
+        opacity=0.95,
+        flatshading=True,
+        hoverinfo="none",
+        lighting=dict(ambient=0.7, diffuse=0.6, specular=0.1, roughness=0.9),
+    ))
+
+    # Base and roof outlines of every ring, plus a vertical edge at each vertex
+    offsets = np.concatenate(([0], np.cumsum([len(r) for r in rings])[:-1]))
+    start = np.concatenate([o + np.arange(len(r)) for o, r in zip(offsets, rings)])
+    end = np.concatenate([o + np.roll(np.arange(len(r)), -1) for o, r in zip(offsets, rings)])
+    edges = np.concatenate([
+        np.column_stack([start, end]),
+        np.column_stack([start + n, end + n]),
+        np.column_stack([start, start + n]),
+    ])
+    xe, ye, ze = (
+        typed(np.column_stack([vertices[edges, c], np.full(len(edges), np.nan)]).ravel())
+        for c in range(3)
+    )
     fig.add_trace(go.Scatter3d(
         x=xe, y=ye, z=ze,
         mode="lines",
@@ -0,0 +1,238 @@
+"""
+ASCE 7 edition coefficient sets (7-10, 7-16, 7-22).
+
+Each edition's Kz table, wall and roof GCp (h <= 60 ft), roof zoning and GCpi
+values live in data/editions/<name>.json and are only read when that edition
+is first used (`load_edition` is lru_cached), so a session that stays on one
+edition never loads the others. These files are the only copy of the
+coefficients: Kz.py, wall_gcp_chart.py and GCP_h_Less_than_60.py read them
+through `load_edition`. The edition follows from the IBC year adopted in the
+project's jurisdiction and can be overridden in the UI.
+"""
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from functions.pressure_calculation import calculate_pressure, velocity_pressure
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "editions"
+
+EDITION_FILES = {
+    "ASCE 7-10": "asce7-10.json",
+    "ASCE 7-16": "asce7-16.json",
+    "ASCE 7-22": "asce7-22.json",
+}
+EDITIONS = tuple(EDITION_FILES)
+DEFAULT_EDITION = "ASCE 7-16"
+
+# IBC edition -> referenced ASCE 7 edition (IBC Chapter 35)
+IBC_TO_ASCE = {
+    2012: "ASCE 7-10",
+    2015: "ASCE 7-10",
+    2018: "ASCE 7-16",
+    2021: "ASCE 7-16",
+    2024: "ASCE 7-22",
+}
+
+
+class Edition:
+    """Coefficient set of one ASCE 7 edition; also usable as a `gcp_source`."""
+
+    def __init__(self, data: Dict[str, object]):
+        self.name = data["edition"]
+        self.kz_source = data["kz_source"]
+        self.wall_gcp_source = data["wall_gcp_source"]
+        self.kz_table = self._read_kz(data["kz"])
+        # Kz for MWFRS and other structures where the edition tabulates it
+        # separately (ASCE 7-10 Table 27.3-1); otherwise the same table
+        self.kz_mwfrs_source = data.get("kz_mwfrs_source", self.kz_source)
+        self.kz_mwfrs_table = self._read_kz(data["kz_mwfrs"]) if "kz_mwfrs" in data else self.kz_table
+        # (heights, values) per exposure, for np.interp
+        self._kz_arrays = {
+            mwfrs: {e: (np.array(sorted(rows)), np.array([rows[h] for h in sorted(rows)])) for e, rows in table.items()}
+            for mwfrs, table in ((False, self.kz_table), (True, self.kz_mwfrs_table))
+        }
+        self.roof_gcp_source = data["roof_gcp_source"]
+        # "a": ASCE 7-10 edge/corner zones of width a; "0.6h": ASCE 7-16 and later
+        self.roof_zoning = data["roof_zoning"]
+        self._wall = data["wall_gcp"]
+        self._roof = data["roof_gcp"]
+        self.gcpi = {k: tuple(v) for k, v in data["gcpi"].items()}
+
+    @staticmethod
+    def _read_kz(rows_by_exposure):
+        return {e: {float(h): kz for h, kz in rows.items()} for e, rows in rows_by_exposure.items()}
+
+    def kz(self, height_ft, exposure, mwfrs=False):
+        """
+        Kz for heights clamped to 15-500 ft, linearly interpolated in the C&C
+        table (or the MWFRS table with `mwfrs`). `exposure` is one category
+        or one per height.
+        """
+        arrays = self._kz_arrays[bool(mwfrs)]
+        h = np.clip(np.asarray(height_ft, dtype=float), 15.0, 500.0)
+        if isinstance(exposure, str):
+            if exposure not in arrays:
+                raise KeyError(f"Unknown exposure category: {exposure}")
+            return np.interp(h, *arrays[exposure])
+
+        exposure = np.broadcast_to(np.asarray(exposure), h.shape)
+        unknown = ~np.isin(exposure, list(arrays))
+        if unknown.any():
+            raise KeyError(f"Unknown exposure category: {exposure[unknown][0]}")
+
+        out = np.empty_like(h)
+        for e, (heights, values) in arrays.items():
+            mask = exposure == e
+            if mask.any():
+                out[mask] = np.interp(h[mask], heights, values)
+        return out
+
+    def wall_gcp(self, area) -> Tuple[float, float, float]:
+        """(positive, zone4, zone5) wall GCp at an effective area, like wall_gcp."""
+        w = self._wall
+        if area <= w["area_min"]:
+            s = w["small"]
+            return s["positive"], s["zone4"], s["zone5"]
+        if area > w["area_max"]:
+            s = w["large"]
+            return s["positive"], s["zone4"], s["zone5"]
+        logA = math.log10(area)
+        c = w["log_linear"]
+        return tuple(c[k][0] + c[k][1] * logA for k in ("positive", "zone4", "zone5"))
+
+    __call__ = wall_gcp
+
+    def wall_gcp_array(self, area) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized `wall_gcp`: (positive, zone4, zone5) arrays shaped like `area`."""
+        w = self._wall
+        area = np.asarray(area, dtype=float)
+        logA = np.log10(np.clip(area, w["area_min"], w["area_max"]))
+        small, large = area <= w["area_min"], area > w["area_max"]
+        out = []
+        for k in ("positive", "zone4", "zone5"):
+            c = w["log_linear"][k]
+            values = np.where(large, w["large"][k], c[0] + c[1] * logA)
+            out.append(np.where(small, w["small"][k], values))
+        return tuple(out)
+
+    def gcp_table(self, areas=(1, 10, 20, 50, 100, 200, 500, 1000)) -> pd.DataFrame:
+        """Wall GCp at the standard effective areas (get_wall_gcp_data layout)."""
+        rows = [self.wall_gcp(a) for a in areas]
+        return pd.DataFrame({
+            "Area (sf)": list(areas),
+            "Zone 4 Negative": [r[1] for r in rows],
+            "Zone 5 Negative": [r[2] for r in rows],
+            "Zones 4&5 Positive": [r[0] for r in rows],
+        })
+
+    def roof_gcp_table(self) -> pd.DataFrame:
+        """Roof GCp (θ ≤ 7°) at the tabulated effective areas (get_roof_gcp_data layout)."""
+        roof = dict(self._roof)
+        return pd.DataFrame({"Area (sf)": roof.pop("areas"), **roof})
+
+
+@lru_cache(maxsize=None)
+def load_edition(name: str = DEFAULT_EDITION) -> Edition:
+    try:
+        filename = EDITION_FILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown ASCE 7 edition: {name}")
+    with open(DATA_DIR / filename, encoding="utf-8") as f:
+        return Edition(json.load(f))
+
+
+def loaded_editions() -> int:
+    """Number of edition files read so far in this process."""
+    return load_edition.cache_info().currsize
+
+
+def edition_for_ibc(ibc_year: Optional[int]) -> Tuple[str, Optional[str]]:
+    """
+    ASCE 7 edition referenced by an IBC year, and a note when the year is
+    unknown or outside the supported range.
+    """
+    if ibc_year is None:
+        return DEFAULT_EDITION, f"IBC year unknown; using {DEFAULT_EDITION}."
+    known = sorted(IBC_TO_ASCE)
+    if ibc_year < known[0]:
+        return IBC_TO_ASCE[known[0]], f"IBC {ibc_year} predates ASCE 7-10; using ASCE 7-10."
+    year = max(y for y in known if y <= ibc_year)
+    note = None if year == ibc_year else f"IBC {ibc_year} treated as IBC {year}."
+    return IBC_TO_ASCE[year], note
+
+
+# --- comparison ------------------------------------------------------------------
+
+def edition_pressures(edition: str, height, V, exposure, Kd, enclosure, area) -> Dict[str, object]:
+    """Kz, q and governing wall C&C pressures of one building under one edition."""
+    ed = load_edition(edition)
+    if enclosure not in ed.gcpi:
+        return {"Edition": edition, "Note": f"“{enclosure}” is not a classification in {edition}."}
+    gcpi_positive, gcpi_negative = ed.gcpi[enclosure]
+    Kz = float(ed.kz(height, exposure))
+    q = velocity_pressure(Kz, Kd, V)
+    positive, z4, z5 = ed.wall_gcp(area)
+    return {
+        "Edition": edition,
+        "Kz": Kz,
+        "q (psf)": q,
+        "GCpi": f"±{gcpi_positive:.2f}",
+        "Zone 4&5 Positive (psf)": calculate_pressure(q, positive, gcpi_positive, gcpi_negative, "positive"),
+        "Zone 4 Negative (psf)": calculate_pressure(q, z4, gcpi_positive, gcpi_negative, "negative"),
+        "Zone 5 Negative (psf)": calculate_pressure(q, z5, gcpi_positive, gcpi_negative, "negative"),
+        "Note": "",
+    }
+
+
+def compare_editions(height, V, exposure, Kd, enclosure, area, base: str = DEFAULT_EDITION,
+                     editions: Sequence[str] = EDITIONS) -> pd.DataFrame:
+    """
+    The same building under every edition, evaluated concurrently (each
+    worker loads its edition file on first use), with the change of each
+    governing pressure relative to `base`.
+    """
+    with ThreadPoolExecutor(max_workers=len(editions)) as pool:
+        rows = list(pool.map(lambda e: edition_pressures(e, height, V, exposure, Kd, enclosure, area), editions))
+
+    df = pd.DataFrame(rows).set_index("Edition")
+    pressure_cols = [c for c in df.columns if c.endswith("(psf)") and c != "q (psf)"]
+    if base in df.index and df.loc[base, pressure_cols].notna().all():
+        for c in pressure_cols:
+            df[f"Δ {c.replace(' (psf)', '')} (%)"] = (df[c] / df.loc[base, c] - 1.0) * 100.0
+    return df.reset_index()
+
+
+# --- UI -----------------------------------------------------------------------------
+
+def select_edition(ibc_year: Optional[int]) -> str:
+    """Edition chosen from the jurisdiction's IBC year, with a manual override."""
+    resolved, note = edition_for_ibc(ibc_year)
+    override = st.selectbox(
+        "ASCE 7 edition",
+        ["From IBC year"] + list(EDITIONS),
+        key="asce_edition",
+        help="By default the edition referenced by the adopted IBC is used.",
+    )
+    edition = resolved if override == "From IBC year" else override
+    if override == "From IBC year":
+        st.caption(f"IBC {ibc_year or '?'} → **{edition}**" + (f" · {note}" if note else ""))
+    return edition
+
+
+def show_edition_comparison(height, V, exposure, Kd, enclosure, edition):
+    st.header("Edition Comparison")
+    area = st.number_input("Effective wind area (ft²)", min_value=1.0, max_value=1000.0, value=10.0,
+                           key="edition_compare_area")
+    if st.toggle("Compare ASCE 7-10 / 7-16 / 7-22", key="edition_compare"):
+        df = compare_editions(height, V, exposure, Kd, enclosure, area, base=edition)
+        st.dataframe(df.round(3), width="stretch", hide_index=True)
+        st.caption(f"Δ columns are relative to {edition}, the edition used above.")
+    st.markdown("---")
@@ -0,0 +1,282 @@
+"""
+Enclosure classification from an inventory of openings (ASCE 7-16 Section 26.2).
+
+Every wall is tried as the wall receiving positive external pressure, with
+
+    Ao  = openings in that wall            Ag  = gross area of that wall
+    Aoi = openings in the rest of the      Agi = gross area of the rest of
+          envelope, roof included                the envelope
+
+    Open                each wall is at least 80% open (Ao >= 0.8 Ag)
+    Partially enclosed  Ao > 1.1 Aoi, Ao > min(4 sf, 0.01 Ag), Aoi/Agi <= 0.20
+    Enclosed            Ao <= min(4 sf, 0.01 Ag) for every wall
+    Partially open      none of the above
+
+Opening-failure scenarios (the as-is state, each closed breakable opening
+failing on its own, and all breakable openings of one surface failing) are
+evaluated together: the scenarios are an (n_scenarios, n_surfaces) array of
+open areas, so thousands of openings never need an openings x scenarios
+matrix. Partially enclosed buildings use the internal volume reduction
+factor Ri (Section 26.13.1.1).
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+SURFACES = ("North", "East", "South", "West", "Roof")
+WALLS = SURFACES[:4]
+
+CLASSES = ("Enclosed Building", "Partially Open Building", "Partially Enclosed Building", "Open Building")
+
+# Spellings accepted in the open / can_fail columns of an uploaded inventory
+TRUE_VALUES = ("true", "yes", "y", "1")
+FALSE_VALUES = ("false", "no", "n", "0")
+
+def gross_areas(ns, ew, height) -> np.ndarray:
+    """Gross areas of the North, East, South, West walls and the roof (sf)."""
+    ns, ew, height = float(ns), float(ew), float(height)
+    return np.array([ew * height, ns * height, ew * height, ns * height, ns * ew])
+
+
+def footprint_gross_areas(footprint, height) -> np.ndarray:
+    """
+    Gross areas of the North, East, South, West walls and the roof (sf) of a
+    polygonal footprint (functions.footprint_properties, x pointing North and
+    y East): each wall segment counts toward the side its outward normal is
+    closest to, and the roof is the plan area.
+    """
+    walls = footprint["walls"]
+    dx = (walls["x1 (ft)"] - walls["x0 (ft)"]).to_numpy(float)
+    dy = (walls["y1 (ft)"] - walls["y0 (ft)"]).to_numpy(float)
+    side = np.round(np.arctan2(-dx, dy) / (np.pi / 2)).astype(int) % 4
+    wall_area = walls["Length (ft)"].to_numpy(float) * float(height)
+    return np.append(np.bincount(side, weights=wall_area, minlength=4), float(footprint["area"]))
+
+
+def parse_flags(values: pd.Series, default: bool, column: str) -> pd.Series:
+    """
+    True/false, yes/no or 1/0 (any case) as booleans; blanks take `default`.
+    Raises ValueError on anything else rather than guessing.
+    """
+    def parse(v):
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            return default
+        if isinstance(v, (bool, np.bool_)):
+            return bool(v)
+        text = str(v).strip().lower()
+        if text.endswith(".0"):  # 1.0 / 0.0 from a numeric CSV column
+            text = text[:-2]
+        if text == "":
+            return default
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(v)
+
+    parsed, bad = [], []
+    for v in values:
+        try:
+            parsed.append(parse(v))
+        except ValueError:
+            bad.append(str(v))
+    if bad:
+        raise ValueError(f"Column {column!r} has {', '.join(sorted(set(bad)))}; use true/false, yes/no or 1/0.")
+    return pd.Series(parsed, index=values.index, dtype=bool)
+
+
+def normalize_inventory(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.dropna(subset=["surface", "area"]).copy()
+    df["surface"] = df["surface"].astype(str).str.strip().str.title()
+    unknown = sorted(set(df["surface"]) - set(SURFACES))
+    if unknown:
+        raise ValueError(f"Unknown surface(s): {', '.join(unknown)}. Use {', '.join(SURFACES)}.")
+    df["count"] = pd.to_numeric(df["count"], errors="coerce").fillna(1) if "count" in df else 1
+    df["area"] = pd.to_numeric(df["area"], errors="raise")
+    for col, default in (("open", False), ("can_fail", True)):
+        df[col] = parse_flags(df[col], default, col) if col in df else default
+    if "name" not in df:
+        df["name"] = [f"Opening {i + 1}" for i in range(len(df))]
+    return df.reset_index(drop=True)
+
+
+def opening_scenarios(inventory: pd.DataFrame) -> Tuple[list, np.ndarray]:
+    """
+    Labels and open area per surface (n_scenarios, 5) for: the as-is state,
+    each closed breakable opening failing alone, and all closed breakable
+    openings of each surface failing together.
+    """
+    surface = inventory["surface"].map({s: i for i, s in enumerate(SURFACES)}).to_numpy()
+    area = (inventory["area"] * inventory["count"]).to_numpy(float)
+    is_open = inventory["open"].to_numpy(bool)
+    can_fail = inventory["can_fail"].to_numpy(bool) & ~is_open
+
+    base = np.bincount(surface[is_open], weights=area[is_open], minlength=len(SURFACES)).astype(float)
+
+    fail = np.flatnonzero(can_fail)
+    singles = np.tile(base, (len(fail), 1))
+    singles[np.arange(len(fail)), surface[fail]] += area[fail]
+
+    breach_area = np.bincount(surface[can_fail], weights=area[can_fail], minlength=len(SURFACES))
+    breached = np.flatnonzero(breach_area > 0)
+    breaches = np.tile(base, (len(breached), 1))
+    breaches[np.arange(len(breached)), breached] += breach_area[breached]
+
+    names = inventory["name"].astype(str).to_numpy()
+    labels = (
+        ["As-is"]
+        + [f"{names[i]} fails" for i in fail]
+        + [f"All breakable openings on {SURFACES[s]} fail" for s in breached]
+    )
+    return labels, np.vstack([base[None, :], singles, breaches])
+
+
+def internal_volume_factor(open_total, volume):
+    """Ri = 0.5 (1 + 1 / sqrt(1 + Vi / (22,800 Aog))), at most 1.0."""
+    open_total = np.asarray(open_total, dtype=float)
+    with np.errstate(divide="ignore"):
+        ri = 0.5 * (1.0 + 1.0 / np.sqrt(1.0 + float(volume) / (22_800.0 * open_total)))
+    return np.where(open_total > 0, np.minimum(ri, 1.0), 1.0)
+
+
+def classify(open_areas: np.ndarray, gross: np.ndarray, volume: float) -> Dict[str, np.ndarray]:
+    """
+    Vectorized classification of every scenario (rows of open_areas).
+
+    Returns per-scenario class index (into CLASSES), the governing windward
+    wall, its Ao, Ag, Aoi, Agi and Ri.
+    """
+    A = np.asarray(open_areas, dtype=float)
+    walls = A[:, :4]
+    Ag = gross[:4][None, :]
+    total_open = A.sum(axis=1, keepdims=True)
+
+    Ao = walls
+    Aoi = total_open - Ao
+    Agi = gross.sum() - Ag
+    small = np.minimum(4.0, 0.01 * Ag)
+
+    is_open = (walls >= 0.8 * Ag).all(axis=1)
+    pe = (Ao > 1.1 * Aoi) & (Ao > small) & (Aoi / Agi <= 0.20)
+    enclosed = (Ao <= small).all(axis=1)
+
+    cls = np.where(is_open, 3, np.where(pe.any(axis=1), 2, np.where(enclosed, 0, 1)))
+
+    # Governing wall: a partially enclosing wall if any, else the most open one
+    ratio = np.where(pe, np.inf, Ao / Ag)
+    wall = ratio.argmax(axis=1)
+    rows = np.arange(len(A))
+    return {
+        "class": cls,
+        "wall": wall,
+        "Ao": Ao[rows, wall],
+        "Ag": Ag[0, wall],
+        "Aoi": Aoi[rows, wall],
+        "Agi": Agi[0, wall],
+        "Ri": internal_volume_factor(total_open[:, 0], volume),
+    }
+
+
+def classify_inventory(inventory: pd.DataFrame, ns, ew, height, gcpi_table: Dict[str, Tuple[float, float]],
+                       volume=None, footprint=None) -> pd.DataFrame:
+    """
+    One row per scenario with its classification and GCpi. gcpi_table maps
+    classification -> (GCpi+, GCpi-), e.g. an edition's `gcpi`; classes the
+    edition does not define fall back to Enclosed Building. With a polygonal
+    footprint the gross areas and default volume come from the polygon
+    rather than the ns x ew bounding box.
+    """
+    inventory = normalize_inventory(inventory)
+    if footprint is not None:
+        gross = footprint_gross_areas(footprint, height)
+    else:
+        gross = gross_areas(ns, ew, height)
+    volume = gross[4] * float(height) if volume is None else float(volume)
+
+    labels, open_areas = opening_scenarios(inventory)
+    res = classify(open_areas, gross, volume)
+
+    names = np.array([c if c in gcpi_table else "Enclosed Building" for c in CLASSES])
+    cls = names[res["class"]]
+    gcpi_pos = np.array([gcpi_table[c][0] for c in cls])
+    gcpi_neg = np.array([gcpi_table[c][1] for c in cls])
+    ri = np.where(cls == "Partially Enclosed Building", res["Ri"], 1.0)
+
+    return pd.DataFrame({
+        "Scenario": labels,
+        "Classification": cls,
+        "Windward wall": np.array(WALLS)[res["wall"]],
+        "Ao (sf)": res["Ao"],
+        "Ao/Ag": res["Ao"] / res["Ag"],
+        "Ao/Aoi": np.divide(res["Ao"], res["Aoi"], out=np.full(len(labels), np.inf), where=res["Aoi"] > 0),
+        "Aoi/Agi": res["Aoi"] / res["Agi"],
+        "Ri": ri,
+        "GCpi +": gcpi_pos * ri,
+        "GCpi −": gcpi_neg * ri,
+    })
+
+
+def governing_scenario(scenarios: pd.DataFrame) -> pd.Series:
+    """The scenario with the largest GCpi magnitude (first one on ties)."""
+    return scenarios.loc[scenarios["GCpi +"].abs().idxmax()]
+
+
+# --- UI ---------------------------------------------------------------------
+
+DEFAULT_INVENTORY = pd.DataFrame({
+    "name": ["Overhead door", "Windows", "Entry doors", "Skylights"],
+    "surface": ["South", "North", "East", "Roof"],
+    "area": [140.0, 15.0, 21.0, 16.0],
+    "count": [1, 8, 2, 4],
+    "open": [False, False, False, False],
+    "can_fail": [True, True, True, True],
+})
+
+
+def show_enclosure_classifier(ns, ew, height, gcpi_table, footprint=None) -> Tuple[str, float, float]:
+    """
+    Opening inventory editor; returns (classification, GCpi+, GCpi-). The
+    wall and roof areas are those of `footprint` in polygon mode.
+    """
+    st.caption(
+        "One row per opening type: surface (North/East/South/West/Roof), area of one opening (sf), "
+        "count, whether it is open, and whether it can fail (e.g. unprotected glazing). "
+        "Upload a CSV with the same columns for large inventories."
+    )
+    uploaded = st.file_uploader("Opening inventory (CSV)", type=["csv"], key="enc_upload")
+    if uploaded is not None:
+        inventory = pd.read_csv(uploaded)
+    else:
+        # A loaded project puts its inventory in "enc_inventory_rows"; the editor's edits apply on top
+        rows = st.session_state.get("enc_inventory_rows")
+        inventory = pd.DataFrame(rows, columns=DEFAULT_INVENTORY.columns) if rows is not None else DEFAULT_INVENTORY
+        inventory = st.data_editor(inventory, num_rows="dynamic", key="enc_inventory", width="stretch")
+    # The inventory as shown, saved with the project (functions.projects)
+    st.session_state["enc_inventory_current"] = inventory.to_dict(orient="records")
+
+    c1, c2 = st.columns(2)
+    consider_failures = c1.checkbox("Design for opening failures", value=False, key="enc_failures")
+    plan_area = float(footprint["area"]) if footprint is not None else float(ns) * float(ew)
+    volume = c2.number_input("Unpartitioned internal volume Vi (ft³)", min_value=1.0,
+                             value=plan_area * float(height), key="enc_volume")
+
+    try:
+        scenarios = classify_inventory(inventory, ns, ew, height, gcpi_table, volume=volume, footprint=footprint)
+    except (KeyError, ValueError) as e:
+        st.error(f"Could not read the opening inventory: {e}")
+        fallback = "Enclosed Building"
+        return fallback, *gcpi_table[fallback]
+
+    chosen = governing_scenario(scenarios) if consider_failures else scenarios.iloc[0]
+    st.success(f"**{chosen['Classification']}** ({chosen['Scenario']}, windward wall {chosen['Windward wall']})")
+    if chosen["Ri"] < 1.0:
+        st.caption(f"Ri = {chosen['Ri']:.3f} applied to GCpi (internal volume reduction)")
+
+    with st.expander(f"{len(scenarios):,} scenarios"):
+        counts = scenarios["Classification"].value_counts().rename_axis("Classification").reset_index(name="Scenarios")
+        st.dataframe(counts, width="stretch", hide_index=True)
+        st.dataframe(scenarios.round(3), width="stretch", hide_index=True, height=280)
+
+    return chosen["Classification"], float(chosen["GCpi +"]), float(chosen["GCpi −"])
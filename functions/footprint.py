@@ -0,0 +1,354 @@
+"""
+Polygonal building footprints (L-, U- and courtyard-shaped buildings).
+
+A footprint is a list of rings of (x, y) vertices in ft: the outer boundary
+first, then any courtyards. Rings are normalized so that the building lies to
+the left of every edge (outer ring counter-clockwise, courtyards clockwise);
+with that convention the outward wall normal of edge d = (dx, dy) is
+(dy, -dx) and a vertex is an outside corner when the cross product of its
+incoming and outgoing edges is positive, a reentrant corner when negative.
+
+All per-edge and per-vertex quantities are computed on whole arrays, and the
+least horizontal dimension uses rotating calipers over the convex hull, so
+footprints with hundreds of vertices stay interactive.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from functions.cladding_layout import zone_width_a
+
+EPS = 1e-9
+
+# Vertices over all rings; the edge-crossing check and the zoned 3D map grow
+# with the vertex count, so larger footprints are rejected
+MAX_VERTICES = 1000
+
+
+# --- input ---------------------------------------------------------------------
+
+def parse_footprint(text: str) -> List[np.ndarray]:
+    """
+    Rings from text: one "x, y" (or "x y") pair per line or separated by ";",
+    rings separated by a blank line or "|". The first ring is the outer
+    boundary, any further rings are courtyards.
+    """
+    rings = []
+    for block in text.replace("|", "\n\n").split("\n\n"):
+        points = [p.strip() for p in block.replace(";", "\n").splitlines() if p.strip()]
+        if not points:
+            continue
+        try:
+            xy = np.array([[float(v) for v in p.replace(",", " ").split()] for p in points])
+        except ValueError:
+            raise ValueError(f"Could not read footprint coordinates: {block.strip()[:40]}")
+        if xy.ndim != 2 or xy.shape[1] != 2:
+            raise ValueError("Each footprint vertex needs exactly two coordinates (x, y).")
+        rings.append(xy)
+    if not rings:
+        raise ValueError("The footprint has no vertices.")
+    return normalize_rings(rings)
+
+
+def format_footprint(rings: Sequence[np.ndarray]) -> str:
+    return "\n\n".join("\n".join(f"{x:g}, {y:g}" for x, y in ring) for ring in rings)
+
+
+def signed_area(ring: np.ndarray) -> float:
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _clean_ring(ring: np.ndarray) -> np.ndarray:
+    """Drops a repeated closing vertex, duplicate vertices and collinear vertices."""
+    ring = np.asarray(ring, dtype=float)
+    if len(ring) > 1 and np.allclose(ring[0], ring[-1]):
+        ring = ring[:-1]
+    ring = ring[np.linalg.norm(ring - np.roll(ring, 1, axis=0), axis=1) > EPS]
+    while len(ring) >= 3:
+        e_in = ring - np.roll(ring, 1, axis=0)
+        e_out = np.roll(ring, -1, axis=0) - ring
+        cross = e_in[:, 0] * e_out[:, 1] - e_in[:, 1] * e_out[:, 0]
+        scale = np.linalg.norm(e_in, axis=1) * np.linalg.norm(e_out, axis=1)
+        keep = np.abs(cross) > 1e-9 * scale
+        if keep.all():
+            break
+        ring = ring[keep]
+    return ring
+
+
+def _check_simple(rings: Sequence[np.ndarray]) -> None:
+    """Raises ValueError when any two edges of the rings cross (e.g. a bowtie)."""
+    a = np.concatenate(rings)
+    b = np.concatenate([np.roll(r, -1, axis=0) for r in rings])
+    cross = _segments_cross(a[:, None], b[:, None], a[None, :], b[None, :])
+    i, j = np.nonzero(np.triu(cross))
+    if len(i):
+        ring_of = np.concatenate([np.full(len(r), k) for k, r in enumerate(rings)])
+        offsets = np.concatenate(([0], np.cumsum([len(r) for r in rings])[:-1]))
+        edge = lambda e: f"ring {ring_of[e] + 1} edge {e - offsets[ring_of[e]] + 1}"
+        raise ValueError(f"The footprint edges cross ({edge(i[0])} and {edge(j[0])}); "
+                         "list the vertices in order around the boundary.")
+
+
+def normalize_rings(rings: Sequence[np.ndarray]) -> List[np.ndarray]:
+    """
+    Cleaned rings, outer counter-clockwise and courtyards clockwise.
+    Self-intersecting footprints and footprints of more than MAX_VERTICES
+    vertices raise ValueError.
+    """
+    n = sum(len(ring) for ring in rings)
+    if n > MAX_VERTICES:
+        raise ValueError(f"The footprint has {n:,} vertices; at most {MAX_VERTICES:,} are supported. "
+                         "Simplify the outline (merge short edges) first.")
+    out = []
+    for k, ring in enumerate(rings):
+        ring = _clean_ring(ring)
+        if len(ring) < 3:
+            raise ValueError(f"Footprint ring {k + 1} needs at least three distinct, non-collinear vertices.")
+        out.append(ring)
+    _check_simple(out)
+    return [ring if (signed_area(ring) > 0) == (k == 0) else ring[::-1] for k, ring in enumerate(out)]
+
+
+# --- geometry ------------------------------------------------------------------
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Andrew's monotone chain; counter-clockwise hull vertices."""
+    pts = np.unique(np.asarray(points, dtype=float), axis=0)
+    if len(pts) < 3:
+        return pts
+
+    def half(seq):
+        h = []
+        for p in seq:
+            while len(h) >= 2 and ((h[-1][0] - h[-2][0]) * (p[1] - h[-2][1])
+                                   - (h[-1][1] - h[-2][1]) * (p[0] - h[-2][0])) <= 0:
+                h.pop()
+            h.append(p)
+        return h[:-1]
+
+    return np.array(half(pts) + half(pts[::-1]))
+
+
+def least_dimension(outer: np.ndarray) -> Dict[str, float]:
+    """
+    Least horizontal dimension by rotating calipers: the width of the
+    narrowest strip containing the footprint (its minimum-width bounding
+    rectangle), with that rectangle's length and orientation.
+    """
+    hull = convex_hull(outer)
+    edges = np.roll(hull, -1, axis=0) - hull
+    u = edges / np.linalg.norm(edges, axis=1, keepdims=True)          # (E, 2)
+    n = np.column_stack([-u[:, 1], u[:, 0]])
+    along = hull @ u.T                                                # (P, E)
+    across = hull @ n.T
+    width = across.max(axis=0) - across.min(axis=0)
+    length = along.max(axis=0) - along.min(axis=0)
+    k = int(width.argmin())
+    return {
+        "least": float(width[k]),
+        "longest": float(max(length[k], width[k])),
+        "angle_deg": float(np.degrees(np.arctan2(u[k, 1], u[k, 0])) % 180.0),
+    }
+
+
+def wall_segments(rings: Sequence[np.ndarray], a: float, reentrant_zone5: bool = True) -> pd.DataFrame:
+    """
+    One row per wall segment with its length, outward normal and the Zone 5 /
+    Zone 4 lengths. Zone 5 extends a from every outside corner (and from
+    reentrant corners when reentrant_zone5), but no further than half the
+    segment from each end.
+    """
+    starts, ends, ring_ids = [], [], []
+    for r, ring in enumerate(rings):
+        starts.append(ring)
+        ends.append(np.roll(ring, -1, axis=0))
+        ring_ids.append(np.full(len(ring), r))
+    p0, p1, ring_id = np.concatenate(starts), np.concatenate(ends), np.concatenate(ring_ids)
+
+    d = p1 - p0
+    length = np.linalg.norm(d, axis=1)
+    normal = np.column_stack([d[:, 1], -d[:, 0]]) / length[:, None]
+
+    corner = corner_types(rings)
+    # Segment i starts at vertex i and ends at vertex i+1 of the same ring
+    offsets = np.concatenate(([0], np.cumsum([len(r) for r in rings])[:-1]))
+    sizes = np.array([len(r) for r in rings])
+    local = np.arange(len(p0)) - offsets[ring_id]
+    end_vertex = offsets[ring_id] + (local + 1) % sizes[ring_id]
+
+    zoned = (corner == "outside") | ((corner == "reentrant") & reentrant_zone5)
+    edge = np.minimum(float(a), length / 2)
+    z5_start = np.where(zoned, edge, 0.0)
+    z5_end = np.where(zoned[end_vertex], edge, 0.0)
+
+    facing = (np.degrees(np.arctan2(normal[:, 0], normal[:, 1])) % 360.0).round(1)
+    return pd.DataFrame({
+        "Wall": [f"Wall {i + 1}" for i in range(len(p0))],
+        "Ring": np.where(ring_id == 0, "Outer", [f"Courtyard {r}" for r in ring_id]),
+        "x0 (ft)": p0[:, 0], "y0 (ft)": p0[:, 1],
+        "x1 (ft)": p1[:, 0], "y1 (ft)": p1[:, 1],
+        "Length (ft)": length,
+        "Faces (° from +y)": facing,
+        "Start corner": corner,
+        "End corner": corner[end_vertex],
+        "Zone 5 at start (ft)": z5_start,
+        "Zone 5 at end (ft)": z5_end,
+        "Zone 4 length (ft)": length - z5_start - z5_end,
+    })
+
+
+def corner_types(rings: Sequence[np.ndarray]) -> np.ndarray:
+    """"outside" or "reentrant" for every vertex of every ring, in ring order."""
+    out = []
+    for ring in rings:
+        e_in = ring - np.roll(ring, 1, axis=0)
+        e_out = np.roll(ring, -1, axis=0) - ring
+        cross = e_in[:, 0] * e_out[:, 1] - e_in[:, 1] * e_out[:, 0]
+        out.append(np.where(cross > 0, "outside", "reentrant"))
+    return np.concatenate(out)
+
+
+def footprint_properties(rings: Sequence[np.ndarray], height: float, reentrant_zone5: bool = True) -> Dict[str, object]:
+    """
+    Plan area, perimeter, least/longest dimension, zone width a, corner
+    counts and the wall segment table of a footprint.
+    """
+    dims = least_dimension(rings[0])
+    a = zone_width_a(dims["least"], height)
+    walls = wall_segments(rings, a, reentrant_zone5=reentrant_zone5)
+    corners = corner_types(rings)
+    return {
+        "area": float(sum(signed_area(r) for r in rings)),
+        "perimeter": float(walls["Length (ft)"].sum()),
+        "least": dims["least"],
+        "longest": dims["longest"],
+        "angle_deg": dims["angle_deg"],
+        "a": a,
+        "outside_corners": int((corners == "outside").sum()),
+        "reentrant_corners": int((corners == "reentrant").sum()),
+        "bbox": np.ptp(rings[0], axis=0),
+        "walls": walls,
+    }
+
+
+# --- triangulation and extrusion ------------------------------------------------
+
+def _segments_cross(p, q, a, b):
+    """Proper intersection of segment p-q with each segment a[i]-b[i]."""
+    def orient(o, s, t):
+        return (s[..., 0] - o[..., 0]) * (t[..., 1] - o[..., 1]) - (s[..., 1] - o[..., 1]) * (t[..., 0] - o[..., 0])
+    d1, d2 = orient(a, b, p), orient(a, b, q)
+    d3, d4 = orient(p, q, a), orient(p, q, b)
+    return (d1 * d2 < -EPS) & (d3 * d4 < -EPS)
+
+
+def _bridge_holes(rings: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Vertex indices (into the concatenated rings) of one simple polygon: each
+    courtyard is joined to the outer ring by a two-way bridge edge.
+    """
+    offsets = np.concatenate(([0], np.cumsum([len(r) for r in rings])[:-1]))
+    pts = np.concatenate(rings)
+    poly = list(range(len(rings[0])))
+    holes = sorted(range(1, len(rings)), key=lambda k: -rings[k][:, 0].max())
+    for k in holes:
+        ring_idx = offsets[k] + np.arange(len(rings[k]))
+        m = int(ring_idx[rings[k][:, 0].argmax()])
+        # All current edges plus the edges of courtyards not yet bridged
+        edge_a = [np.array(poly), *(offsets[j] + np.arange(len(rings[j])) for j in holes if j != k)]
+        a_idx = np.concatenate(edge_a)
+        b_idx = np.concatenate([np.roll(e, -1) for e in edge_a])
+        cand = np.array(poly)
+        order = np.argsort(np.linalg.norm(pts[cand] - pts[m], axis=1))
+        for c in cand[order]:
+            if not _segments_cross(pts[m], pts[c], pts[a_idx], pts[b_idx]).any():
+                break
+        at = poly.index(int(c))
+        start = int(np.flatnonzero(ring_idx == m)[0])
+        loop = list(np.roll(ring_idx, -start)) + [m]
+        poly = poly[:at + 1] + [int(i) for i in loop] + [int(c)] + poly[at + 1:]
+    return np.array(poly)
+
+
+def triangulate(rings: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Ear clipping of a footprint (with courtyards). Returns (n - 2 + 2h, 3)
+    triangles indexing the concatenated ring vertices. Each ear test checks
+    all reflex vertices at once.
+    """
+    pts = np.concatenate(rings)
+    idx = _bridge_holes(rings)
+    tris = []
+    while len(idx) > 3:
+        P = pts[idx]
+        prev, nxt = np.roll(P, 1, axis=0), np.roll(P, -1, axis=0)
+        cross = (P[:, 0] - prev[:, 0]) * (nxt[:, 1] - P[:, 1]) - (P[:, 1] - prev[:, 1]) * (nxt[:, 0] - P[:, 0])
+        reflex = np.flatnonzero(cross <= EPS)
+        ear = None
+        for i in np.flatnonzero(cross > EPS):
+            a, b, c = prev[i], P[i], nxt[i]
+            r = P[reflex]
+            # Reflex vertices coinciding with a triangle corner (bridge duplicates) do not block the ear
+            distinct = ~(np.isclose(r, a).all(1) | np.isclose(r, b).all(1) | np.isclose(r, c).all(1))
+            r = r[distinct]
+            d1 = (b[0] - a[0]) * (r[:, 1] - a[1]) - (b[1] - a[1]) * (r[:, 0] - a[0])
+            d2 = (c[0] - b[0]) * (r[:, 1] - b[1]) - (c[1] - b[1]) * (r[:, 0] - b[0])
+            d3 = (a[0] - c[0]) * (r[:, 1] - c[1]) - (a[1] - c[1]) * (r[:, 0] - c[0])
+            if not ((d1 >= -EPS) & (d2 >= -EPS) & (d3 >= -EPS)).any():
+                ear = i
+                break
+        if ear is None:
+            raise ValueError("The footprint could not be triangulated; check that its edges do not cross.")
+        n = len(idx)
+        tris.append((idx[(ear - 1) % n], idx[ear], idx[(ear + 1) % n]))
+        idx = np.delete(idx, ear)
+    tris.append(tuple(idx))
+    return np.array(tris, dtype=np.int64)
+
+
+def extrude_footprint(rings: Sequence[np.ndarray], height: float):
+    """
+    Closed prism mesh of a footprint: vertices (2n, 3) with the base ring
+    first, and triangles (walls, roof and floor) indexing them.
+    """
+    pts = np.concatenate(rings)
+    n = len(pts)
+    vertices = np.concatenate([
+        np.column_stack([pts, np.zeros(n)]),
+        np.column_stack([pts, np.full(n, float(height))]),
+    ])
+
+    offsets = np.concatenate(([0], np.cumsum([len(r) for r in rings])[:-1]))
+    i0 = np.concatenate([o + np.arange(len(r)) for o, r in zip(offsets, rings)])
+    j0 = np.concatenate([o + np.roll(np.arange(len(r)), -1) for o, r in zip(offsets, rings)])
+    walls = np.concatenate([
+        np.column_stack([i0, j0, j0 + n]),
+        np.column_stack([i0, j0 + n, i0 + n]),
+    ])
+
+    roof = triangulate(rings)
+    return vertices, np.concatenate([walls, roof + n, roof[:, ::-1]])
+
+
+# --- presets -------------------------------------------------------------------
+
+def preset_footprint(shape: str, length: float = 120.0, width: float = 80.0) -> List[np.ndarray]:
+    """Rectangle, L-, U- or courtyard footprint in a length x width box."""
+    L, W = float(length), float(width)
+    if shape == "L-shape":
+        rings = [np.array([[0, 0], [L, 0], [L, W / 2], [L / 2, W / 2], [L / 2, W], [0, W]])]
+    elif shape == "U-shape":
+        rings = [np.array([[0, 0], [L, 0], [L, W], [2 * L / 3, W], [2 * L / 3, W / 2],
+                           [L / 3, W / 2], [L / 3, W], [0, W]])]
+    elif shape == "Courtyard":
+        rings = [np.array([[0, 0], [L, 0], [L, W], [0, W]]),
+                 np.array([[L / 4, W / 4], [L / 4, 3 * W / 4], [3 * L / 4, 3 * W / 4], [3 * L / 4, W / 4]])]
+    else:
+        rings = [np.array([[0, 0], [L, 0], [L, W], [0, W]])]
+    return normalize_rings(rings)
+
+
+PRESETS = ("L-shape", "U-shape", "Courtyard", "Rectangle")
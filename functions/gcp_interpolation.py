@@ -7,7 +7,7 @@ def interpolate_gcp(area, df, column):
     return float(
         np.interp(
             math.log10(area),
-            math.log10(df["Area (sf)"]),
+            np.log10(df["Area (sf)"]),
             df[column]
         )
     )
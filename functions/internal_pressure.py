@@ -1,10 +1,51 @@
 import streamlit as st
 
-
-def internal_pressure():
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.enclosure_classifier import show_enclosure_classifier
+
+
+# Classification descriptions; the GCpi values are per edition (functions.editions)
+ENCLOSURE_DATA = {
+    "Enclosed Building": {
+        "internal_pressure": "Moderate",
+        "criteria": (
+            "The total area of openings in each wall and roof, excluding "
+            "the dominant wall, does not meet the requirements for a "
+            "partially enclosed or open building."
+        ),
+    },
+    "Partially Enclosed Building": {
+        "internal_pressure": "High",
+        "criteria": (
+            "The building has a dominant opening and satisfies the "
+            "ASCE 7 requirements for a partially enclosed building."
+        ),
+    },
+    "Partially Open Building": {
+        "internal_pressure": "Moderate",
+        "criteria": (
+            "The building does not comply with the enclosed, partially "
+            "enclosed, or open building classifications."
+        ),
+    },
+    "Open Building": {
+        "internal_pressure": "Negligible",
+        "criteria": "Each wall is at least 80% open.",
+    },
+}
+
+
+def internal_pressure(edition=DEFAULT_EDITION, building=None, footprint=None):
     """
-    Allows the user to select the ASCE 7-16 enclosure classification
-    and returns the corresponding internal pressure coefficients, GCpi.
+    Allows the user to select the enclosure classification of the given
+    ASCE 7 edition and returns its internal pressure coefficients, GCpi.
+
+    Only the edition's classifications are offered (7-10 has no partially
+    open buildings). With `building` = (ns, ew, height), the
+    classification can instead be derived from an inventory of openings,
+    in which case GCpi includes the Ri reduction for large volumes. A
+    polygon-mode `footprint` (functions.footprint.footprint_properties)
+    supplies the wall and roof areas in place of the ns x ew box.
 
     Returns
     -------
@@ -20,60 +61,32 @@ def internal_pressure():
 
     st.markdown("### Internal Pressure Coefficient, GCpi")
 
-    enclosure_options = [
-        "Enclosed Building",
-        "Partially Enclosed Building",
-        "Partially Open Building",
-        "Open Building",
-    ]
-
-    enclosure_classification = st.selectbox(
-        "Select Enclosure Classification",
-        enclosure_options,
-        key="enclosure_classification",
-    )
+    gcpi_values = load_edition(edition).gcpi
+
+    enclosure_options = [k for k in ENCLOSURE_DATA if k in gcpi_values]
+
+    method = "Select"
+    if building is not None:
+        method = st.radio(
+            "Classification method",
+            ["Select", "From opening inventory"],
+            horizontal=True,
+            key="enclosure_method",
+        )
+
+    if method == "Select":
+        enclosure_classification = st.selectbox(
+            "Select Enclosure Classification",
+            enclosure_options,
+            key="enclosure_classification",
+        )
+        gcpi_positive, gcpi_negative = gcpi_values[enclosure_classification]
+    else:
+        enclosure_classification, gcpi_positive, gcpi_negative = show_enclosure_classifier(
+            *building, {k: gcpi_values[k] for k in enclosure_options}, footprint=footprint
+        )
 
-    enclosure_data = {
-        "Enclosed Building": {
-            "internal_pressure": "Moderate",
-            "gcpi_positive": 0.18,
-            "gcpi_negative": -0.18,
-            "criteria": (
-                "The total area of openings in each wall and roof, excluding "
-                "the dominant wall, does not meet the requirements for a "
-                "partially enclosed or open building."
-            ),
-        },
-        "Partially Enclosed Building": {
-            "internal_pressure": "High",
-            "gcpi_positive": 0.55,
-            "gcpi_negative": -0.55,
-            "criteria": (
-                "The building has a dominant opening and satisfies the "
-                "ASCE 7 requirements for a partially enclosed building."
-            ),
-        },
-        "Partially Open Building": {
-            "internal_pressure": "Moderate",
-            "gcpi_positive": 0.18,
-            "gcpi_negative": -0.18,
-            "criteria": (
-                "The building does not comply with the enclosed, partially "
-                "enclosed, or open building classifications."
-            ),
-        },
-        "Open Building": {
-            "internal_pressure": "Negligible",
-            "gcpi_positive": 0.00,
-            "gcpi_negative": 0.00,
-            "criteria": "Each wall is at least 80% open.",
-        },
-    }
-
-    selected_data = enclosure_data[enclosure_classification]
-
-    gcpi_positive = selected_data["gcpi_positive"]
-    gcpi_negative = selected_data["gcpi_negative"]
+    selected_data = ENCLOSURE_DATA[enclosure_classification]
 
     st.info(
         f"**Classification criteria:** {selected_data['criteria']}"
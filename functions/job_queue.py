@@ -0,0 +1,147 @@
+"""
+Background job queue backed by a process pool.
+
+A job is a list of chunks submitted to a pool shared by every session in the
+server process, so long portfolio runs never execute on the Streamlit script
+thread. Sessions keep only the job id and poll `Job.progress()`.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Finished jobs are dropped from the registry after this long.
+JOB_TTL_S = 60 * 60
+
+
+class Job:
+    def __init__(self, job_id: str, fn: Callable, chunks: Sequence[list], executor: ProcessPoolExecutor):
+        self.id = job_id
+        self.created = time.time()
+        self.total = sum(len(c) for c in chunks)
+        self._lock = threading.Lock()
+        self._done_items = 0
+        self._settled_chunks = 0
+        self._n_chunks = len(chunks)
+        self._results: List[Optional[list]] = [None] * len(chunks)
+        self._errors: List[str] = []
+        self.cancelled = False
+        self.finished_at: Optional[float] = None
+
+        self._futures: List[Future] = []
+        for index, chunk in enumerate(chunks):
+            future = executor.submit(fn, chunk)
+            future.add_done_callback(lambda f, i=index, n=len(chunk): self._on_done(f, i, n))
+            self._futures.append(future)
+        if not chunks:
+            self.finished_at = time.time()
+
+    def _on_done(self, future: Future, index: int, n_items: int) -> None:
+        with self._lock:
+            if not future.cancelled():
+                error = future.exception()
+                if error is not None:
+                    self._errors.append(f"chunk {index}: {error!r}")
+                else:
+                    self._results[index] = future.result()
+                self._done_items += n_items
+            self._settled_chunks += 1
+            if self._settled_chunks == self._n_chunks:
+                self.finished_at = time.time()
+
+    def cancel(self) -> None:
+        """Cancels chunks that have not started; running chunks finish but are kept."""
+        self.cancelled = True
+        for f in self._futures:
+            f.cancel()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def progress(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "done": self._done_items,
+                "total": self.total,
+                "fraction": self._done_items / self.total if self.total else 1.0,
+                "finished": self.finished_at is not None,
+                "cancelled": self.cancelled,
+                "errors": list(self._errors),
+            }
+
+    def results(self) -> list:
+        """Results of completed chunks, in submission order."""
+        with self._lock:
+            return [row for chunk in self._results if chunk is not None for row in chunk]
+
+
+@contextmanager
+def _bare_main():
+    """
+    Streamlit runs the page script as the __main__ module, and a spawned
+    worker re-imports __main__ from its file, which would run the page (and
+    stop in authenticate_user). Workers spawned while submitting see an
+    empty __main__ instead; running scripts keep their own module object.
+    """
+    main = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class JobQueue:
+    def __init__(self, max_workers: Optional[int] = None):
+        # spawn: forking the multi-threaded Streamlit server is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, items: Sequence, chunk_size: int = 250) -> Job:
+        chunks = [list(items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+        # Worker processes are spawned on demand inside executor.submit
+        with self._lock, _bare_main():
+            job = Job(uuid.uuid4().hex, fn, chunks, self._executor)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > JOB_TTL_S:
+                del self._jobs[job_id]
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                workers = os.environ.get("WIND_JOB_WORKERS")
+                _queue = JobQueue(max_workers=int(workers) if workers else None)
+    return _queue
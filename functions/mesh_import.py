@@ -0,0 +1,530 @@
+"""
+Triangulated building models (STL, OBJ) as an alternative to typing the
+three building dimensions.
+
+Files are parsed straight into NumPy arrays: binary STL through
+np.frombuffer on a structured dtype, ASCII STL and OBJ through the pandas C
+tokenizer after the irrelevant lines are dropped with one regex pass, so no
+Python object is created per triangle. Every face is then classified by its
+normal (wall, roof, floor, soffit), and the mean roof height, least
+horizontal dimension and C&C zone of every face are computed on whole arrays:
+
+- vertical corners are creases between wall faces, eaves are creases
+  between roof and wall faces (vertices are welded first, STL has none shared)
+- wall faces within a of a corner are Zone 5, otherwise Zone 4
+- roof faces are zoned from their distances to the eaves with the edition's
+  Zone 2/3 widths (functions.cc_zones: a for ASCE 7-10, 0.6h and 0.2h for
+  7-16 and later)
+
+Zones are assigned per face, so the zoning is only as fine as the mesh:
+models are subdivided by default until no edge is longer than
+`zone_resolution`, half the narrowest zone.
+"""
+import io
+import re
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from functions.cc_zones import edge_distances, roof_zone, roof_zone_widths
+from functions.cladding_layout import zone_width_a
+from functions.editions import DEFAULT_EDITION
+from functions.footprint import least_dimension
+from functions.gcp_interpolation import interpolate_gcp
+from functions.GCP_h_Less_than_60 import get_roof_gcp_data
+from functions.plot_encoding import typed
+from functions.pressure_calculation import calculate_pressure
+from functions.wall_gcp_chart import wall_gcp
+
+UNITS_TO_FT = {"ft": 1.0, "in": 1.0 / 12.0, "m": 3.280839895, "mm": 0.003280839895}
+
+# Faces within this angle of vertical are walls
+WALL_TILT_DEG = 10.0
+# Dihedral angle above which a shared edge is a corner / eave
+CREASE_DEG = 30.0
+# Vertices closer than this (ft) are welded
+WELD_TOL = 1e-4
+
+SURFACE_NAMES = np.array(["Wall", "Roof", "Floor", "Soffit"])
+ZONE_NAMES = np.array(["", "Zone 1", "Zone 2", "Zone 3", "Zone 4", "Zone 5"])
+
+STL_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("v", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+# Faces drawn in the 3D view; larger meshes are shown with a stride
+MAX_PLOT_FACES = 150_000
+
+# Rows x columns of a distance block in the zoning step
+BLOCK = 4_000_000
+
+# Faces are refined to this fraction of the narrowest zone width
+ZONE_RESOLUTION = 0.5
+
+
+# --- parsing ---------------------------------------------------------------------
+
+def read_stl(data: bytes) -> np.ndarray:
+    """Triangles (T, 3, 3) of a binary or ASCII STL file."""
+    if len(data) >= 84:
+        n = int(np.frombuffer(data, dtype="<u4", count=1, offset=80)[0])
+        if len(data) == 84 + n * STL_DTYPE.itemsize:
+            return np.frombuffer(data, dtype=STL_DTYPE, count=n, offset=84)["v"].astype(np.float64)
+    if not data.lstrip()[:5].lower() == b"solid":
+        raise ValueError("Not a binary or ASCII STL file.")
+
+    vertex_lines = b"\n".join(re.findall(rb"^\s*vertex\s+(.+?)\s*$", data, flags=re.M))
+    xyz = pd.read_csv(io.BytesIO(vertex_lines), sep=r"\s+", header=None, names=["x", "y", "z"],
+                      dtype=np.float64, engine="c").to_numpy()
+    if len(xyz) % 3:
+        raise ValueError("ASCII STL facets must have three vertices each.")
+    return xyz.reshape(-1, 3, 3)
+
+
+def read_obj(data: bytes, max_polygon: int = 32):
+    """
+    Vertices (V, 3) and triangles (T, 3) of an OBJ file. Polygons are fan
+    triangulated; texture/normal indices and negative (relative) indices are
+    handled.
+    """
+    # Keep only "v" and "f" lines and drop the /vt/vn parts of face indices
+    body = re.sub(rb"^(?![vf][ \t]).*(\r?\n|$)", b"", data, flags=re.M)
+    body = re.sub(rb"/\S*", b"", body)
+    if not body.strip():
+        raise ValueError("The OBJ file has no vertices or faces.")
+
+    table = pd.read_csv(io.BytesIO(body), sep=r"\s+", header=None, names=range(max_polygon + 1),
+                        engine="c", dtype={0: "category"})
+    kind = table[0].to_numpy().astype(str)
+    values = table.iloc[:, 1:].to_numpy(dtype=np.float64)
+
+    is_v = kind == "v"
+    vertices = values[is_v, :3]
+
+    faces = values[~is_v]
+    n_before = np.cumsum(is_v)[~is_v]                    # vertices defined before each face
+    valid = ~np.isnan(faces)
+    sizes = valid.sum(axis=1)
+    if (sizes < 3).any():
+        raise ValueError("OBJ faces need at least three vertices.")
+    idx = np.where(faces < 0, n_before[:, None] + faces, faces - 1)
+
+    tris = []
+    for k in range(2, max_polygon):
+        has = sizes > k
+        if not has.any():
+            break
+        tris.append(np.column_stack([idx[has, 0], idx[has, k - 1], idx[has, k]]))
+    triangles = np.concatenate(tris).astype(np.int64)
+    if triangles.min() < 0 or triangles.max() >= len(vertices):
+        raise ValueError("OBJ face index out of range.")
+    return vertices, triangles
+
+
+def weld(triangles: np.ndarray, tol: float = WELD_TOL):
+    """
+    Shared vertices (V, 3) and indices (T, 3) of a triangle soup (T, 3, 3).
+    Vertices are matched on a 64-bit hash of their quantized coordinates,
+    which sorts far faster than comparing rows; a hash collision is detected
+    and falls back to an exact row comparison.
+    """
+    flat = triangles.reshape(-1, 3)
+    key = np.round(flat / tol).astype(np.int64)
+    h = (key * np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+         .astype(np.int64)).sum(axis=1)
+    _, first, inverse = np.unique(h, return_index=True, return_inverse=True)
+    if not (key[first][inverse] == key).all():
+        rows = np.ascontiguousarray(key).view(np.dtype((np.void, 24))).ravel()
+        _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    return flat[first], inverse.reshape(-1, 3)
+
+
+def load_mesh(data: bytes, filename: str, units: str = "ft", up: str = "Z"):
+    """
+    Welded vertices (ft, z up, ground at z = 0) and triangles of an STL or
+    OBJ file.
+    """
+    if filename.lower().endswith(".obj"):
+        vertices, triangles = read_obj(data)
+        vertices, remap = weld(vertices[triangles])
+        triangles = remap
+    else:
+        vertices, triangles = weld(read_stl(data))
+
+    vertices = vertices * UNITS_TO_FT[units]
+    if up == "Y":
+        vertices = vertices[:, [0, 2, 1]] * np.array([1.0, -1.0, 1.0])   # (x, y, z) -> (x, -z, y)
+    vertices[:, 2] -= vertices[:, 2].min()
+
+    # Orient outward: a closed mesh with outward faces has positive volume
+    v0, v1, v2 = (vertices[triangles[:, i]] for i in range(3))
+    if np.einsum("ij,ij->i", v0, np.cross(v1, v2)).sum() < 0:
+        triangles = triangles[:, ::-1]
+    return vertices, np.ascontiguousarray(triangles)
+
+
+def subdivide(vertices, triangles, max_edge, max_faces=2_000_000):
+    """
+    Splits every face into four (at shared, welded edge midpoints, so the
+    mesh stays conforming) while any edge is longer than max_edge and the
+    face budget allows.
+    """
+    while len(triangles) * 4 <= max_faces:
+        v = vertices[triangles]
+        if np.linalg.norm(v - np.roll(v, -1, axis=1), axis=2).max() <= max_edge:
+            break
+        pairs = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        uniq, inv = np.unique(pairs, axis=0, return_inverse=True)
+        mid = len(vertices) + inv.reshape(-1, 3)
+        vertices = np.concatenate([vertices, vertices[uniq].mean(axis=1)])
+        t = triangles
+        m01, m12, m20 = mid[:, 0], mid[:, 1], mid[:, 2]
+        triangles = np.concatenate([
+            np.column_stack([t[:, 0], m01, m20]),
+            np.column_stack([m01, t[:, 1], m12]),
+            np.column_stack([m20, m12, t[:, 2]]),
+            np.column_stack([m01, m12, m20]),
+        ])
+    return vertices, triangles
+
+
+# --- geometry ----------------------------------------------------------------------
+
+def face_geometry(vertices, triangles):
+    """Unit normals (T, 3), areas (T,) and centroids (T, 3)."""
+    v0, v1, v2 = (vertices[triangles[:, i]] for i in range(3))
+    n = np.cross(v1 - v0, v2 - v0)
+    norm = np.linalg.norm(n, axis=1)
+    area = norm / 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normal = np.where(norm[:, None] > 0, n / norm[:, None], 0.0)
+    return normal, area, (v0 + v1 + v2) / 3
+
+
+def classify_faces(normal, centroid, ground_tol=0.01):
+    """Surface index into SURFACE_NAMES: wall, roof, floor (at grade) or soffit."""
+    s = np.sin(np.radians(WALL_TILT_DEG))
+    nz = normal[:, 2]
+    surface = np.where(np.abs(nz) <= s, 0, np.where(nz > 0, 1, 3))
+    surface[(nz < -s) & (centroid[:, 2] <= ground_tol)] = 2
+    return surface
+
+
+def _hull_candidates(xy):
+    """Drops points strictly inside the octagon of extreme points (Akl-Toussaint)."""
+    dirs = np.array([[1, 0], [1, 1], [0, 1], [-1, 1], [-1, 0], [-1, -1], [0, -1], [1, -1]], dtype=float)
+    ext = xy[np.argmax(xy @ dirs.T, axis=0)]
+    edges = np.roll(ext, -1, axis=0) - ext
+    keep = np.zeros(len(xy), dtype=bool)
+    for e, p in zip(edges, ext):
+        if not e.any():
+            continue
+        keep |= (e[0] * (xy[:, 1] - p[1]) - e[1] * (xy[:, 0] - p[0])) <= 0
+    return np.unique(np.concatenate([xy[keep], ext]), axis=0)
+
+
+def creases(triangles, normal, surface):
+    """
+    Edges shared by two faces whose normals differ by more than CREASE_DEG:
+    returns vertex pairs (E, 2) and the surfaces of the two faces (E, 2).
+    """
+    e0 = triangles.ravel()
+    e1 = triangles[:, [1, 2, 0]].ravel()
+    lo, hi = np.minimum(e0, e1), np.maximum(e0, e1)
+    key = lo * (int(triangles.max()) + 1) + hi
+    order = np.argsort(key)
+    k = key[order]
+    shared = np.flatnonzero(k[1:] == k[:-1])
+    ia, ib = order[shared], order[shared + 1]
+    fa, fb = ia // 3, ib // 3
+    cos = np.einsum("ij,ij->i", normal[fa], normal[fb])
+    sharp = cos < np.cos(np.radians(CREASE_DEG))
+    edges = np.column_stack([lo[ia], hi[ia]])
+    return edges[sharp], np.column_stack([surface[fa], surface[fb]])[sharp]
+
+
+def _min_point_distance(p, q):
+    """Horizontal distance from each p (N, 2) to the nearest q (M, 2), in blocks."""
+    out = np.full(len(p), np.inf)
+    if len(q) == 0:
+        return out
+    step = max(1, BLOCK // len(q))
+    for i in range(0, len(p), step):
+        d = p[i:i + step, None, :] - q[None, :, :]
+        out[i:i + step] = np.sqrt((d ** 2).sum(axis=2)).min(axis=1)
+    return out
+
+
+def merge_segments(a, b, tol=1e-3):
+    """
+    Joins collinear, touching or overlapping 2D segments a-b into maximal
+    runs, so a finely meshed eave becomes one segment per straight edge.
+    """
+    d = b - a
+    theta = np.arctan2(d[:, 1], d[:, 0]) % np.pi
+    theta = np.where(np.isclose(theta, np.pi), 0.0, theta)
+    u = np.column_stack([np.cos(theta), np.sin(theta)])
+    n = np.column_stack([-u[:, 1], u[:, 0]])
+    s0, s1 = (a * u).sum(axis=1), (b * u).sum(axis=1)
+    df = pd.DataFrame({
+        "theta": np.round(theta, 4),
+        "offset": np.round((a * n).sum(axis=1) / tol).astype(np.int64),
+        "lo": np.minimum(s0, s1),
+        "hi": np.maximum(s0, s1),
+    }).sort_values(["theta", "offset", "lo"])
+    line = df.groupby(["theta", "offset"], sort=False)
+    reach = line["hi"].cummax().groupby([df["theta"], df["offset"]]).shift()
+    df["run"] = (reach.isna() | (df["lo"] > reach + tol)).cumsum()
+    runs = df.groupby("run").agg(theta=("theta", "first"), offset=("offset", "first"),
+                                 lo=("lo", "min"), hi=("hi", "max"))
+    t, c = runs["theta"].to_numpy(), runs["offset"].to_numpy() * tol
+    u = np.column_stack([np.cos(t), np.sin(t)])
+    n = np.column_stack([-u[:, 1], u[:, 0]])
+    return c[:, None] * n + runs["lo"].to_numpy()[:, None] * u, c[:, None] * n + runs["hi"].to_numpy()[:, None] * u
+
+
+def analyze_mesh(vertices, triangles) -> Dict[str, object]:
+    """
+    Surface and wall zone of every face, the distances of roof faces to the
+    eaves (see `mesh_zones`), and the building's mean roof height, least and
+    longest horizontal dimension and zone width a.
+    """
+    normal, area, centroid = face_geometry(vertices, triangles)
+    surface = classify_faces(normal, centroid)
+    if not (surface == 1).any() or not (surface == 0).any():
+        raise ValueError("The model needs both wall and roof faces; check the up axis.")
+
+    roof_z = vertices[triangles[surface == 1]][..., 2]
+    eave, ridge = float(roof_z.min()), float(roof_z.max())
+    height = (eave + ridge) / 2
+
+    dims = least_dimension(_hull_candidates(vertices[:, :2]))
+    a = zone_width_a(dims["least"], height)
+
+    edges, sides = creases(triangles, normal, surface)
+    p0, p1 = vertices[edges[:, 0]], vertices[edges[:, 1]]
+    d = p1 - p0
+    vertical = np.abs(d[:, 2]) > np.cos(np.radians(WALL_TILT_DEG)) * np.linalg.norm(d, axis=1)
+
+    corner_edge = vertical & (sides == 0).all(axis=1)
+    corners = np.unique(np.round((p0[corner_edge, :2] + p1[corner_edge, :2]) / 2, 3), axis=0)
+
+    eave_edge = ~vertical & (np.sort(sides, axis=1) == [0, 1]).all(axis=1)
+    ea, eb = merge_segments(p0[eave_edge, :2], p1[eave_edge, :2])
+
+    wall_zone = np.zeros(len(triangles), dtype=np.int8)
+    wall = surface == 0
+    wall_zone[wall] = np.where(_min_point_distance(centroid[wall, :2], corners) < a, 5, 4)
+    roof = surface == 1
+    eave_distance = edge_distances(centroid[roof, :2], ea, eb).astype(np.float32)
+
+    v = vertices[triangles]
+    max_edge = float(np.linalg.norm(v - np.roll(v, -1, axis=1), axis=2).max())
+
+    slope = np.degrees(np.arccos(np.clip(normal[:, 2], -1.0, 1.0)))
+    return {
+        "vertices": vertices,
+        "triangles": triangles,
+        "area": area,
+        "surface": surface,
+        "wall_zone": wall_zone,
+        "eave_distance": eave_distance,
+        "height": height,
+        "eave": eave,
+        "ridge": ridge,
+        "least": dims["least"],
+        "longest": dims["longest"],
+        "bbox": np.ptp(vertices[:, :2], axis=0),
+        "a": a,
+        "n_corners": len(corners),
+        "n_eaves": len(ea),
+        "max_edge": max_edge,
+        "max_roof_slope": float(slope[roof].max()),
+    }
+
+
+def zone_resolution(mesh) -> float:
+    """Longest face edge (ft) that still resolves the narrowest C&C zone of any edition."""
+    return ZONE_RESOLUTION * min(mesh["a"], 0.2 * mesh["height"])
+
+
+def mesh_zones(mesh, edition=DEFAULT_EDITION) -> np.ndarray:
+    """C&C zone index (into ZONE_NAMES) of every face for the edition."""
+    zone = mesh["wall_zone"].copy()
+    widths = roof_zone_widths(mesh["least"], mesh["height"], edition)
+    zone[mesh["surface"] == 1] = roof_zone(mesh["eave_distance"], widths)
+    return zone
+
+
+def face_pressures(mesh, q, gcpi_positive, gcpi_negative, area=10.0,
+                   edition=DEFAULT_EDITION) -> Dict[str, np.ndarray]:
+    """
+    Zone, GCp and ASD pressures of every face: the zone's positive/negative
+    GCp at the effective wind area is looked up by zone index, so the whole
+    mesh is one gather.
+    """
+    positive, z4, z5 = wall_gcp(area, edition)
+    roof = get_roof_gcp_data(edition)
+    roof_positive = interpolate_gcp(area, roof, "Zone 1 Positive")
+    gcp_pos = np.array([0.0, roof_positive, roof_positive, roof_positive, positive, positive])
+    gcp_neg = np.array([0.0] + [interpolate_gcp(area, roof, f"Zone {z} Negative") for z in (1, 2, 3)] + [z4, z5])
+
+    zone = mesh_zones(mesh, edition)
+    p_pos = calculate_pressure(q, gcp_pos, gcpi_positive, gcpi_negative, "positive")[zone]
+    p_neg = calculate_pressure(q, gcp_neg, gcpi_positive, gcpi_negative, "negative")[zone]
+    loaded = zone > 0
+    return {
+        "zone": zone,
+        "gcp_positive": np.where(loaded, gcp_pos[zone], np.nan),
+        "gcp_negative": np.where(loaded, gcp_neg[zone], np.nan),
+        "p_positive": np.where(loaded, p_pos, np.nan),
+        "p_negative": np.where(loaded, p_neg, np.nan),
+        "p_governing": np.where(loaded, np.where(np.abs(p_pos) > np.abs(p_neg), p_pos, p_neg), np.nan),
+    }
+
+
+def zone_summary(mesh, pressures) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Surface": SURFACE_NAMES[mesh["surface"]],
+        "Zone": ZONE_NAMES[pressures["zone"]],
+        "Area (sf)": mesh["area"],
+        "GCp Positive": pressures["gcp_positive"],
+        "GCp Negative": pressures["gcp_negative"],
+        "Positive (psf)": pressures["p_positive"],
+        "Negative (psf)": pressures["p_negative"],
+    })
+    return (
+        df.groupby(["Surface", "Zone"], sort=True)
+        .agg(**{
+            "Faces": ("Area (sf)", "size"),
+            "Area (sf)": ("Area (sf)", "sum"),
+            "GCp Positive": ("GCp Positive", "first"),
+            "GCp Negative": ("GCp Negative", "first"),
+            "Positive (psf)": ("Positive (psf)", "first"),
+            "Negative (psf)": ("Negative (psf)", "first"),
+        })
+        .reset_index()
+    )
+
+
+# --- plotting ------------------------------------------------------------------------
+
+def create_mesh_visualisation(mesh, values=None, title=None):
+    """
+    The imported model; faces colored by `values` (e.g. governing pressure)
+    when given. Meshes above MAX_PLOT_FACES are drawn with a face stride.
+    """
+    vertices, triangles = mesh["vertices"], mesh["triangles"]
+    stride = max(1, int(np.ceil(len(triangles) / MAX_PLOT_FACES)))
+    tri = triangles[::stride]
+    index_dtype = np.uint32 if len(vertices) >= 2 ** 16 else np.uint16
+
+    kwargs = dict(color="rgb(136,219,223)")
+    if values is not None:
+        v = np.asarray(values, dtype=float)[::stride]
+        limit = float(np.nanmax(np.abs(v))) or 1.0
+        kwargs = dict(
+            intensity=typed(np.nan_to_num(v)),
+            intensitymode="cell",
+            colorscale="RdBu",
+            cmin=-limit, cmax=limit,
+            colorbar=dict(title="psf"),
+        )
+
+    fig = go.Figure(go.Mesh3d(
+        x=typed(vertices[:, 0]), y=typed(vertices[:, 1]), z=typed(vertices[:, 2]),
+        i=typed(tri[:, 0], index_dtype), j=typed(tri[:, 1], index_dtype), k=typed(tri[:, 2], index_dtype),
+        flatshading=True,
+        hoverinfo="none",
+        lighting=dict(ambient=0.7, diffuse=0.6, specular=0.1, roughness=0.9),
+        **kwargs,
+    ))
+    fig.update_layout(
+        title=title,
+        scene=dict(
+            xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False),
+            aspectmode="data",
+        ),
+        margin=dict(l=0, r=0, b=0, t=40),
+        scene_camera=dict(eye=dict(x=1.5, y=-1.5, z=1.2)),
+        height=420,
+    )
+    return fig
+
+
+# --- UI ------------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=2, show_spinner="Reading model…")
+def _cached_mesh(data: bytes, filename: str, units: str, up: str, refine: Optional[float]):
+    """The analyzed model, refined to `refine` ft or, when None, to `zone_resolution`."""
+    vertices, triangles = load_mesh(data, filename, units=units, up=up)
+    mesh = analyze_mesh(vertices, triangles)
+    target = refine or zone_resolution(mesh)
+    if mesh["max_edge"] > target:
+        mesh = analyze_mesh(*subdivide(vertices, triangles, target))
+    return mesh
+
+
+def mesh_footprint():
+    """
+    building_dimension's mesh mode: upload, units and up axis; returns the
+    analyzed mesh (also kept in st.session_state["building_mesh"]) or None.
+    """
+    uploaded = st.file_uploader("Building model (STL or OBJ)", type=["stl", "obj"], key="bd_mesh_file")
+    c1, c2, c3 = st.columns(3)
+    units = c1.selectbox("Model units", list(UNITS_TO_FT), key="bd_mesh_units")
+    up = c2.selectbox("Up axis", ["Z", "Y"], key="bd_mesh_up")
+    refine = c3.number_input("Refine faces longer than (ft, 0 = auto)", min_value=0.0, value=0.0,
+                             key="bd_mesh_refine",
+                             help="Auto refines to half the narrowest C&C zone width, so each face lies in one zone.")
+    if uploaded is None:
+        st.info("Upload a closed, triangulated model of the building.")
+        return None
+
+    try:
+        mesh = _cached_mesh(uploaded.getvalue(), uploaded.name, units, up, refine or None)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    st.session_state["building_mesh"] = mesh
+    return mesh
+
+
+def show_mesh_pressures(q, gcpi_positive, gcpi_negative, edition=DEFAULT_EDITION):
+    """Per-face C&C zones and pressures of the imported model."""
+    mesh = st.session_state.get("building_mesh")
+    if mesh is None:
+        return
+    st.header("Model Face Pressures")
+
+    if mesh["max_roof_slope"] > 7.0:
+        st.warning(
+            f"Roof faces up to {mesh['max_roof_slope']:.0f}° slope: roof GCp is taken for θ ≤ 7°, "
+            "check sloped roof areas separately."
+        )
+    resolution = zone_resolution(mesh)
+    if mesh["max_edge"] > resolution:
+        st.warning(
+            f"Faces up to {mesh['max_edge']:.1f} ft long are coarser than the C&C zones "
+            f"({resolution:.1f} ft): zones are assigned per face, so corner and edge zones are "
+            "under-represented. Lower the refinement length or split the model."
+        )
+    area = st.number_input("Effective wind area (ft²)", min_value=1.0, max_value=1000.0, value=10.0,
+                           key="mesh_area")
+    pressures = face_pressures(mesh, q, gcpi_positive, gcpi_negative, area=area, edition=edition)
+
+    st.caption(
+        f"{len(mesh['triangles']):,} faces · {edition} · a = {mesh['a']:.2f} ft · "
+        f"{mesh['n_corners']} vertical corners detected · zones assigned per face"
+    )
+    st.dataframe(zone_summary(mesh, pressures).round(2), width="stretch", hide_index=True)
+    st.plotly_chart(
+        create_mesh_visualisation(mesh, pressures["p_governing"], "Governing C&C pressure per face (psf)"),
+        width="stretch",
+    )
+    st.markdown("---")
@@ -0,0 +1,305 @@
+"""
+Process-wide metrics registry (counters and histograms) in Prometheus text format.
+
+Streamlit imports this module once per server process, so every session
+records into the same registry. Recording is a dict lookup plus a short
+locked update; nothing is formatted until the metrics are scraped.
+
+Exporters (both opt-in, started once per process by `start_exporters`):
+    WIND_METRICS_PORT   serve GET /metrics on 127.0.0.1:<port>
+    WIND_METRICS_FILE   rewrite this file every WIND_METRICS_INTERVAL seconds (default 15)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v))
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self._upper = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self._upper, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_t0")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._t0)
+        return False
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _samples(self) -> List[str]:
+        out: List[str] = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            cumulative = 0
+            for upper, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(upper)}"'
+                out.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            out.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+RERUNS = REGISTRY.counter(
+    "wind_app_reruns_total", "Completed Streamlit script reruns.")
+RERUN_DURATION = REGISTRY.histogram(
+    "wind_app_rerun_duration_seconds", "Wall time of a full App_R00.py rerun.")
+ADOPTION_LOOKUP_DURATION = REGISTRY.histogram(
+    "wind_adoption_lookup_duration_seconds", "Latency of ICC adoption page fetch and parse.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0))
+ADOPTION_LOOKUP_FAILURES = REGISTRY.counter(
+    "wind_adoption_lookup_failures_total", "Failed ICC adoption lookups by exception type.",
+    labelnames=("reason",))
+CACHE_REQUESTS = REGISTRY.counter(
+    "wind_cache_requests_total", "Cache lookups by cache name and result (hit/miss).",
+    labelnames=("cache", "result"))
+
+
+def record_cache_request(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def start_rerun_timer() -> float:
+    return time.perf_counter()
+
+
+def observe_rerun(t0: float) -> None:
+    RERUNS.inc()
+    RERUN_DURATION.observe(time.perf_counter() - t0)
+
+
+# --- Exporters ---
+
+_exporters_lock = threading.Lock()
+_exporters_started = False
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_exporter(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_metrics_file(path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+
+def start_file_exporter(path: str, interval_s: float) -> threading.Thread:
+    def loop():
+        while True:
+            time.sleep(interval_s)
+            try:
+                write_metrics_file(path)
+            except OSError:
+                pass
+
+    t = threading.Thread(target=loop, name="metrics-file", daemon=True)
+    t.start()
+    return t
+
+
+def start_exporters() -> None:
+    """Starts the exporters configured through the environment, once per process."""
+    global _exporters_started
+    if _exporters_started:
+        return
+
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+        port: Optional[str] = os.environ.get("WIND_METRICS_PORT")
+        if port:
+            try:
+                start_http_exporter(int(port))
+            except OSError:
+                # Another server process on this host already owns the port.
+                pass
+
+        path = os.environ.get("WIND_METRICS_FILE")
+        if path:
+            start_file_exporter(path, float(os.environ.get("WIND_METRICS_INTERVAL", "15")))
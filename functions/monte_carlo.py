@@ -0,0 +1,319 @@
+"""
+Monte Carlo wind load uncertainty.
+
+Samples V, the exposure category, Kd and a GCp model error from user-specified
+distributions and pushes them through compute_kz -> q -> wall_gcp ->
+calculate_pressure in vectorized chunks. Each chunk is reduced to a fixed-bin
+histogram per zone before the next one is drawn, so memory stays flat however
+many samples are requested. Chunks are seeded from one SeedSequence, so the
+result does not depend on chunk scheduling or the number of worker processes.
+
+In the app a run is a job on the shared job queue (functions.job_queue): the
+chunks are grouped into at most MAX_JOB_CHUNKS tasks, each merged to one set
+of histograms in the worker, and the session polls the job instead of
+sampling on the script thread.
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from functions.Kz import compute_kz_array
+from functions.editions import DEFAULT_EDITION
+from functions.job_queue import Job, get_job_queue
+from functions.plot_encoding import typed
+from functions.pressure_calculation import calculate_pressure, velocity_pressure
+from functions.wall_gcp_chart import wall_gcp_array
+
+EXPOSURES = ("B", "C", "D")
+
+ZONES = ("Zone 4&5 Positive", "Zone 4 Negative", "Zone 5 Negative")
+
+# Histogram of |p|: HIST_BIN_PSF resolution up to HIST_MAX_PSF, plus one
+# overflow bin. Percentiles are read from it to within one bin.
+HIST_BIN_PSF = 0.05
+HIST_MAX_PSF = 500.0
+N_BINS = int(round(HIST_MAX_PSF / HIST_BIN_PSF))
+
+CHUNK_SIZE = 250_000
+
+# Queue tasks per run; bounds the per-zone histograms a finished job holds
+MAX_JOB_CHUNKS = 64
+
+PERCENTILES = (5, 50, 90, 95, 99, 99.9)
+
+
+def draw(rng: np.random.Generator, dist: Dict[str, float], n: int) -> np.ndarray:
+    """
+    n samples of a distribution given as a dict:
+
+    {"kind": "fixed", "value": x}
+    {"kind": "normal", "mean": m, "sd": s}
+    {"kind": "lognormal", "mean": m, "cov": c}
+    {"kind": "uniform", "low": a, "high": b}
+    """
+    kind = dist["kind"]
+    if kind == "fixed":
+        return np.full(n, float(dist["value"]))
+    if kind == "normal":
+        return rng.normal(dist["mean"], dist["sd"], n)
+    if kind == "lognormal":
+        sigma = np.sqrt(np.log1p(dist["cov"] ** 2))
+        return rng.lognormal(np.log(dist["mean"]) - sigma ** 2 / 2, sigma, n)
+    if kind == "uniform":
+        return rng.uniform(dist["low"], dist["high"], n)
+    raise ValueError(f"Unknown distribution kind: {kind}")
+
+
+def simulate_chunk(inputs: Dict[str, object], n: int, seed: np.random.SeedSequence) -> Dict[str, dict]:
+    """
+    Draws n samples and returns, per zone, the |p| histogram counts together
+    with the sample sum, sum of squares, min and max (psf, signed).
+
+    inputs holds height, area, gcpi_positive, gcpi_negative, the ASCE 7
+    edition and the distributions V, Kd, gcp_error and exposure_probs (B, C, D).
+    """
+    rng = np.random.default_rng(seed)
+
+    V = np.clip(draw(rng, inputs["V"], n), 0.0, None)
+    Kd = np.clip(draw(rng, inputs["Kd"], n), 0.0, None)
+    error = np.clip(draw(rng, inputs["gcp_error"], n), 0.0, None)
+
+    probs = np.asarray(inputs["exposure_probs"], dtype=float)
+    exposure = rng.choice(len(EXPOSURES), size=n, p=probs / probs.sum())
+    edition = inputs.get("edition", DEFAULT_EDITION)
+    kz_by_exposure = compute_kz_array(np.full(len(EXPOSURES), float(inputs["height"])), EXPOSURES, edition)
+
+    q = velocity_pressure(kz_by_exposure[exposure], Kd, V)
+    positive, z4, z5 = (float(g) for g in wall_gcp_array(float(inputs["area"]), edition))
+    gp, gn = inputs["gcpi_positive"], inputs["gcpi_negative"]
+
+    pressures = {
+        "Zone 4&5 Positive": calculate_pressure(q, positive * error, gp, gn, "positive"),
+        "Zone 4 Negative": calculate_pressure(q, z4 * error, gp, gn, "negative"),
+        "Zone 5 Negative": calculate_pressure(q, z5 * error, gp, gn, "negative"),
+    }
+
+    out = {}
+    for zone, p in pressures.items():
+        bins = np.minimum((np.abs(p) / HIST_BIN_PSF).astype(np.int64), N_BINS)
+        out[zone] = {
+            "counts": np.bincount(bins, minlength=N_BINS + 1),
+            "sum": float(p.sum()),
+            "sumsq": float(np.dot(p, p)),
+            "min": float(p.min()),
+            "max": float(p.max()),
+        }
+    return out
+
+
+class ZoneAccumulator:
+    """Running histogram and moments of one zone's pressure samples."""
+
+    def __init__(self, zone: str):
+        self.zone = zone
+        self.sign = 1.0 if "Positive" in zone else -1.0
+        self.counts = np.zeros(N_BINS + 1, dtype=np.int64)
+        self.n = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def merge(self, part: dict) -> None:
+        self.counts += part["counts"]
+        self.n += int(part["counts"].sum())
+        self.sum += part["sum"]
+        self.sumsq += part["sumsq"]
+        self.min = min(self.min, part["min"])
+        self.max = max(self.max, part["max"])
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.n
+
+    @property
+    def sd(self) -> float:
+        return float(np.sqrt(max(self.sumsq / self.n - self.mean ** 2, 0.0)))
+
+    def magnitude_quantile(self, fraction: float) -> float:
+        """|p| below which `fraction` of the samples fall (bin upper edge)."""
+        cdf = np.cumsum(self.counts)
+        index = int(np.searchsorted(cdf, fraction * self.n, side="left"))
+        return min((index + 1) * HIST_BIN_PSF, max(abs(self.min), abs(self.max)))
+
+    def percentiles(self, levels=PERCENTILES) -> Dict[str, float]:
+        """Percentiles of the load effect |p|, reported with the zone's sign."""
+        return {f"P{lvl:g}": self.sign * self.magnitude_quantile(lvl / 100) for lvl in levels}
+
+    def exceedance(self):
+        """(|p| bin upper edges, probability that |p| exceeds them), overflow bin excluded."""
+        edges = np.arange(1, N_BINS + 1) * HIST_BIN_PSF
+        exceed = 1.0 - np.cumsum(self.counts[:-1]) / self.n
+        return edges, exceed
+
+
+def chunk_specs(inputs: Dict[str, object], n_samples: int, chunk_size: int = CHUNK_SIZE,
+                seed: Optional[int] = None) -> List[Tuple[dict, int, np.random.SeedSequence]]:
+    """(inputs, n, seed) of every chunk; all chunk seeds come from one SeedSequence."""
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [(inputs, n, s) for n, s in zip(sizes, seeds)]
+
+
+def merge_part(acc: Dict[str, ZoneAccumulator], part: Dict[str, dict]) -> int:
+    """Merges one chunk result into the accumulators; returns its sample count."""
+    for zone, values in part.items():
+        acc[zone].merge(values)
+    return int(part[ZONES[0]]["counts"].sum())
+
+
+def simulate_chunks(specs: List[tuple]) -> List[Dict[str, dict]]:
+    """Job-queue task: simulates several chunks and returns them merged as one part."""
+    acc = {zone: ZoneAccumulator(zone) for zone in ZONES}
+    for spec in specs:
+        merge_part(acc, simulate_chunk(*spec))
+    return [{
+        zone: {"counts": a.counts, "sum": a.sum, "sumsq": a.sumsq, "min": a.min, "max": a.max}
+        for zone, a in acc.items()
+    }]
+
+
+def run_monte_carlo(inputs: Dict[str, object], n_samples: int, chunk_size: int = CHUNK_SIZE,
+                    seed: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, ZoneAccumulator]:
+    """Runs n_samples in-process in chunks of chunk_size, merged into one accumulator per zone."""
+    acc = {zone: ZoneAccumulator(zone) for zone in ZONES}
+    done = 0
+    for spec in chunk_specs(inputs, n_samples, chunk_size, seed):
+        done += merge_part(acc, simulate_chunk(*spec))
+        if progress is not None:
+            progress(done, n_samples)
+    return acc
+
+
+def submit_monte_carlo(inputs: Dict[str, object], n_samples: int, chunk_size: int = CHUNK_SIZE,
+                       seed: Optional[int] = None, queue=None) -> Job:
+    """
+    Submits a run to the shared job queue; `job_accumulators` merges the
+    result. Same chunks and seeds as run_monte_carlo, so the same result.
+    """
+    specs = chunk_specs(inputs, n_samples, chunk_size, seed)
+    per_task = max(1, math.ceil(len(specs) / MAX_JOB_CHUNKS))
+    return (queue or get_job_queue()).submit(simulate_chunks, specs, chunk_size=per_task)
+
+
+def job_accumulators(job: Job) -> Dict[str, ZoneAccumulator]:
+    acc = {zone: ZoneAccumulator(zone) for zone in ZONES}
+    for part in job.results():
+        merge_part(acc, part)
+    return acc
+
+
+def summary_table(acc: Dict[str, ZoneAccumulator]) -> pd.DataFrame:
+    rows = []
+    for zone, a in acc.items():
+        rows.append({"Zone": zone, "Mean (psf)": a.mean, "SD (psf)": a.sd, **a.percentiles()})
+    return pd.DataFrame(rows)
+
+
+def exceedance_chart(acc: Dict[str, ZoneAccumulator]):
+    fig = go.Figure()
+    for zone, a in acc.items():
+        edges, exceed = a.exceedance()
+        keep = exceed > 0
+        fig.add_trace(go.Scatter(x=typed(edges[keep]), y=typed(exceed[keep]), name=zone, mode="lines"))
+    fig.update_yaxes(type="log", title="P(|p| > x)")
+    fig.update_xaxes(title="|p| (psf)")
+    fig.update_layout(title="Exceedance probability by zone", height=420)
+    return fig
+
+
+def show_monte_carlo(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition=DEFAULT_EDITION):
+    st.header("Monte Carlo Uncertainty")
+    st.caption(
+        "Samples V, exposure, Kd and a multiplicative GCp model error and reports "
+        f"the distribution of wall C&C pressures ({edition}). Runs in the background worker processes."
+    )
+
+    c1, c2 = st.columns(2)
+    area = c1.number_input("Effective wind area (ft²)", min_value=1.0, max_value=1000.0, value=10.0, key="mc_area")
+    n_samples = int(c2.number_input("Samples", min_value=10_000, max_value=100_000_000, value=1_000_000,
+                                    step=100_000, key="mc_samples"))
+
+    c1, c2, c3 = st.columns(3)
+    v_cov = c1.number_input("V coefficient of variation", min_value=0.0, max_value=1.0, value=0.10, key="mc_v_cov")
+    kd_sd = c2.number_input("Kd standard deviation", min_value=0.0, max_value=0.5, value=0.05, key="mc_kd_sd")
+    gcp_cov = c3.number_input("GCp model error COV", min_value=0.0, max_value=1.0, value=0.12, key="mc_gcp_cov")
+
+    st.markdown("Exposure category probabilities")
+    c1, c2, c3 = st.columns(3)
+    weights = [
+        col.number_input(e, min_value=0.0, max_value=1.0, value=1.0 if e == exposure else 0.0, key=f"mc_p_{e}")
+        for col, e in zip((c1, c2, c3), EXPOSURES)
+    ]
+
+    seed = st.number_input("Seed", min_value=0, value=0, step=1, key="mc_seed")
+
+    queue = get_job_queue()
+    if st.button("Run Monte Carlo", key="mc_run"):
+        if sum(weights) <= 0:
+            st.error("At least one exposure category needs a probability above zero.")
+        else:
+            inputs = {
+                "height": float(height),
+                "area": float(area),
+                "gcpi_positive": float(gcpi_positive),
+                "gcpi_negative": float(gcpi_negative),
+                "edition": edition,
+                "V": {"kind": "lognormal", "mean": float(V), "cov": float(v_cov)},
+                "Kd": {"kind": "normal", "mean": float(Kd), "sd": float(kd_sd)},
+                "gcp_error": {"kind": "lognormal", "mean": 1.0, "cov": float(gcp_cov)},
+                "exposure_probs": weights,
+            }
+            job = submit_monte_carlo(inputs, n_samples, seed=int(seed), queue=queue)
+            st.session_state["mc_job"] = {"id": job.id, "inputs": inputs, "n": n_samples}
+
+    pending = st.session_state.get("mc_job")
+    job = queue.get(pending["id"]) if pending else None
+
+    @st.fragment(run_every="1s")
+    def mc_progress():
+        progress = job.progress()
+        st.progress(progress["fraction"], text=f"{progress['fraction'] * pending['n']:,.0f} / {pending['n']:,} samples")
+        if st.button("Cancel", key="mc_cancel"):
+            job.cancel()
+        if progress["finished"]:
+            st.rerun(scope="app")
+
+    if job is not None:
+        if not job.done:
+            mc_progress()
+        else:
+            del st.session_state["mc_job"]
+            progress = job.progress()
+            for error in progress["errors"]:
+                st.error(error)
+            acc = job_accumulators(job)
+            n = acc[ZONES[0]].n
+            if n:
+                if n < pending["n"]:
+                    st.warning(f"Cancelled after {n:,} of {pending['n']:,} samples.")
+                st.session_state["monte_carlo"] = {"inputs": pending["inputs"], "n": n, "acc": acc}
+
+    run = st.session_state.get("monte_carlo")
+    if run is not None:
+        acc = run["acc"]
+        st.dataframe(summary_table(acc).round(2), width="stretch", hide_index=True)
+        st.plotly_chart(exceedance_chart(acc), width="stretch")
+        st.caption(
+            f"{run['n']:,} samples at {run['inputs']['area']:.0f} ft², "
+            f"percentiles resolved to {HIST_BIN_PSF} psf."
+        )
+
+    st.markdown("---")
@@ -0,0 +1,239 @@
+"""
+Main wind force resisting system, directional procedure (ASCE 7 Chapter 27).
+
+    p = q G Cp - qh (GCpi),  q = qz on the windward wall, qh elsewhere
+
+Walls use Cp = 0.8 (windward), -0.7 (side) and the L/B-dependent leeward value;
+the roof uses the Figure 27.3-1 values for roofs with θ < 10° (and for wind
+parallel to the ridge), by distance from the windward edge and h/L. G = 0.85
+(rigid building).
+
+Two wind directions are evaluated, normal to the longest face (X) and normal
+to the least face (Y), each with both GCpi signs. qz is integrated over fine
+slices of the windward wall and summed into floor tributary strips with
+np.add.reduceat; every direction and GCpi case is one axis of the same array
+computation. Forces are reported at ASD level (0.6 x strength), like the C&C
+tables, with the Figure 27.3-8 load cases built from the story forces.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from functions.Kz import compute_kz, compute_kz_array
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.other_structures import slice_segments
+from functions.pressure_calculation import velocity_pressure
+
+G_RIGID = 0.85
+
+ASD = 0.6
+
+DZ = 0.5
+
+CP_WINDWARD = 0.8
+CP_SIDE = -0.7
+
+# Leeward wall Cp by L/B
+LEEWARD_L_OVER_B = (1.0, 2.0, 4.0)
+LEEWARD_CP = (-0.5, -0.3, -0.2)
+
+# Roof Cp (θ < 10°) by distance from the windward edge, for h/L <= 0.5 and
+# h/L >= 1.0; zone edges are at h/2, h and 2h. The second value of each pair
+# in Figure 27.3-1 is -0.18 for every zone.
+ROOF_ZONE_EDGES = (0.5, 1.0, 2.0)   # multiples of h
+ROOF_CP_LOW = (-0.9, -0.9, -0.5, -0.3)
+ROOF_CP_HIGH = (-1.3, -0.7, -0.7, -0.7)
+ROOF_CP_MIN_UPLIFT = -0.18
+
+DIRECTIONS = ("X (normal to longest face)", "Y (normal to least face)")
+
+
+def leeward_cp(l_over_b):
+    return np.interp(l_over_b, LEEWARD_L_OVER_B, LEEWARD_CP)
+
+
+def roof_cp(h_over_l):
+    """Roof zone Cp (4 zones) for each h/L, interpolated between 0.5 and 1.0."""
+    t = np.clip((np.asarray(h_over_l, dtype=float) - 0.5) / 0.5, 0.0, 1.0)[..., None]
+    return (1 - t) * np.asarray(ROOF_CP_LOW) + t * np.asarray(ROOF_CP_HIGH)
+
+
+def floor_elevations(height, n_stories):
+    """Floor levels above grade (ft) for equal story heights; the last is the roof."""
+    return np.linspace(0.0, float(height), int(n_stories) + 1)[1:]
+
+
+def mwfrs_loads(height, least_width, longest_width, exposure, Kd, V, gcpi_positive, gcpi_negative,
+                levels, Kzt=1.0, dz=DZ, edition=DEFAULT_EDITION) -> Dict[str, object]:
+    """
+    Directional-procedure MWFRS loads for a rectangular building.
+
+    Parameters
+    ----------
+    height : float
+        Mean roof height h (ft).
+    least_width, longest_width : float
+        Plan dimensions (ft), as returned by building_dimension.
+    levels : array_like
+        Floor elevations above grade (ft), ending at the roof.
+    edition : str, optional
+        ASCE 7 edition whose MWFRS Kz table gives qz and qh.
+
+    Returns
+    -------
+    dict
+        pressures : DataFrame of design pressures by direction, GCpi case and surface
+        stories   : DataFrame of story forces and shears by direction
+        summary   : DataFrame of base shear, overturning and roof uplift
+        cases     : DataFrame of the Figure 27.3-8 load cases
+    """
+    h = float(height)
+    levels = np.asarray(levels, dtype=float)
+    B = np.array([longest_width, least_width], dtype=float)   # normal to wind
+    L = np.array([least_width, longest_width], dtype=float)   # parallel to wind
+    gcpi = np.array([gcpi_positive, gcpi_negative], dtype=float)
+
+    qh = velocity_pressure(compute_kz(h, exposure, edition, mwfrs=True), Kd, V, Kzt=Kzt)
+
+    # Windward wall, sliced; each floor takes the strip from mid-story below
+    # to mid-story above (the roof level takes the top half story)
+    strip_top = np.append((levels[:-1] + levels[1:]) / 2, h)
+    strip_bottom = np.concatenate(([0.0], strip_top[:-1]))
+    mid, thickness, _, start = slice_segments(strip_bottom, strip_top, dz)
+    qz = velocity_pressure(compute_kz_array(mid, exposure, edition, mwfrs=True), Kd, V, Kzt=Kzt)
+
+    cp_lw = leeward_cp(L / B)                                           # (D,)
+    # Net lateral pressure windward minus leeward; GCpi cancels
+    net = ASD * G_RIGID * (CP_WINDWARD * qz[None, :] - cp_lw[:, None] * qh)  # (D, S)
+    slice_force = net * B[:, None] * thickness[None, :]
+    story_force = np.add.reduceat(slice_force, start, axis=1)           # (D, F)
+    windward_force = np.add.reduceat(ASD * G_RIGID * CP_WINDWARD * qz[None, :] * B[:, None] * thickness,
+                                     start, axis=1)
+    leeward_force = story_force - windward_force
+
+    base_shear = story_force.sum(axis=1)
+    overturning = (story_force * levels[None, :]).sum(axis=1)
+
+    # Roof: zone lengths along the wind, clipped to L
+    edges = np.minimum(np.asarray(ROOF_ZONE_EDGES)[None, :] * h, L[:, None])   # (D, 3)
+    bounds = np.concatenate([np.zeros((2, 1)), edges, L[:, None]], axis=1)    # (D, 5)
+    zone_len = np.diff(bounds, axis=1)                                         # (D, 4)
+    cp_roof = roof_cp(h / L)                                                   # (D, 4)
+
+    # Pressures with both GCpi signs: (D, GCpi, ...)
+    def roof_pressure(cp):
+        return ASD * (qh * G_RIGID * cp - qh * gcpi[None, :, None])
+
+    p_roof = roof_pressure(cp_roof[:, None, :])                          # (D, 2, 4)
+    p_roof_min = roof_pressure(np.full((2, 1, 4), ROOF_CP_MIN_UPLIFT))   # (D, 2, 4)
+    roof_uplift = -(p_roof * zone_len[:, None, :] * B[:, None, None]).sum(axis=2)       # (D, 2)
+    roof_uplift_min = -(p_roof_min * zone_len[:, None, :] * B[:, None, None]).sum(axis=2)
+
+    q_levels = velocity_pressure(compute_kz_array(levels, exposure, edition, mwfrs=True), Kd, V, Kzt=Kzt)
+    rows = []
+    for d, direction in enumerate(DIRECTIONS):
+        for g, case in enumerate(("+GCpi", "−GCpi")):
+            gi = gcpi[g]
+            for z, q in zip(levels, q_levels):
+                rows.append((direction, case, "Windward wall", f"z = {z:.1f} ft",
+                             ASD * (q * G_RIGID * CP_WINDWARD - qh * gi)))
+            rows.append((direction, case, "Leeward wall", f"Cp = {cp_lw[d]:.2f}",
+                         ASD * (qh * G_RIGID * cp_lw[d] - qh * gi)))
+            rows.append((direction, case, "Side walls", f"Cp = {CP_SIDE:.2f}",
+                         ASD * (qh * G_RIGID * CP_SIDE - qh * gi)))
+            for k in range(4):
+                if zone_len[d, k] <= 0:
+                    continue
+                where = f"{bounds[d, k]:.0f}–{bounds[d, k + 1]:.0f} ft from windward edge"
+                rows.append((direction, case, "Roof", where, p_roof[d, g, k]))
+                rows.append((direction, case, "Roof (Cp = −0.18)", where, p_roof_min[d, g, k]))
+    pressures = pd.DataFrame(rows, columns=["Direction", "GCpi", "Surface", "Location", "p (psf)"])
+
+    stories = pd.concat([
+        pd.DataFrame({
+            "Direction": direction,
+            "Level": np.arange(1, len(levels) + 1),
+            "z (ft)": levels,
+            "Windward (lb)": windward_force[d],
+            "Leeward (lb)": leeward_force[d],
+            "Story force (lb)": story_force[d],
+            "Story shear (lb)": np.cumsum(story_force[d][::-1])[::-1],
+        })
+        for d, direction in enumerate(DIRECTIONS)
+    ], ignore_index=True)
+
+    summary = pd.DataFrame({
+        "Direction": DIRECTIONS,
+        "B (ft)": B,
+        "L (ft)": L,
+        "Leeward Cp": cp_lw,
+        "Base shear (lb)": base_shear,
+        "Overturning (lb-ft)": overturning,
+        "Roof uplift +GCpi (lb)": roof_uplift[:, 0],
+        "Roof uplift −GCpi (lb)": roof_uplift[:, 1],
+        "Roof uplift, Cp −0.18, +GCpi (lb)": roof_uplift_min[:, 0],
+    })
+
+    return {
+        "qh": qh,
+        "pressures": pressures,
+        "stories": stories,
+        "summary": summary,
+        "cases": load_cases(base_shear, B),
+    }
+
+
+def load_cases(base_shear, B) -> pd.DataFrame:
+    """
+    Figure 27.3-8 design wind load cases from the X and Y base shears
+    (windward plus leeward), with eccentricity 0.15 B for the torsional cases.
+    """
+    Vx, Vy = base_shear
+    Bx, By = B
+    rows = [
+        ("Case 1", "X only", Vx, 0.0, 0.0),
+        ("Case 1", "Y only", 0.0, Vy, 0.0),
+        ("Case 2", "X, ± eccentricity", 0.75 * Vx, 0.0, 0.75 * Vx * 0.15 * Bx),
+        ("Case 2", "Y, ± eccentricity", 0.0, 0.75 * Vy, 0.75 * Vy * 0.15 * By),
+        ("Case 3", "X and Y", 0.75 * Vx, 0.75 * Vy, 0.0),
+        ("Case 4", "X and Y, ± eccentricity", 0.563 * Vx, 0.563 * Vy,
+         0.563 * Vx * 0.15 * Bx + 0.563 * Vy * 0.15 * By),
+    ]
+    return pd.DataFrame(rows, columns=["Case", "Loading", "Vx (lb)", "Vy (lb)", "Torsion MT (lb-ft)"])
+
+
+def show_mwfrs(least_width, longest_width, height, exposure, V, Kd, gcpi_positive, gcpi_negative,
+               roof_info=None, edition=DEFAULT_EDITION):
+    """roof_info: the roof_type_picker result; edition: ASCE 7 edition of the project."""
+    st.header("Main Wind Force Resisting System (Chapter 27)")
+
+    roof = (roof_info or {}).get("roof_type", "Flat roof")
+    if roof != "Flat roof":
+        st.info(f"Roof Cp uses the Figure 27.3-1 values for θ < 10°; check them for a {roof.lower()}.")
+
+    n_stories = int(st.number_input("Number of stories", min_value=1, max_value=200,
+                                    value=max(1, int(round(height / 12.0))), key="mwfrs_stories"))
+    res = mwfrs_loads(height, least_width, longest_width, exposure, Kd, V, gcpi_positive, gcpi_negative,
+                      floor_elevations(height, n_stories), edition=edition)
+
+    st.caption(f"qh = {res['qh']:.2f} psf (Kz from {edition} {load_edition(edition).kz_mwfrs_source}) · "
+               f"G = {G_RIGID} (rigid) · ASD forces (0.6 × strength level)")
+    st.dataframe(res["summary"].round(2), width="stretch", hide_index=True)
+
+    tab_p, tab_s, tab_c = st.tabs(["Pressures", "Story Forces", "Load Cases"])
+    with tab_p:
+        direction = st.selectbox("Wind direction", DIRECTIONS, key="mwfrs_direction")
+        table = res["pressures"][res["pressures"]["Direction"] == direction]
+        st.dataframe(
+            table.pivot_table(index=["Surface", "Location"], columns="GCpi", values="p (psf)", sort=False)
+            .round(2).reset_index(),
+            width="stretch", hide_index=True,
+        )
+    with tab_s:
+        st.dataframe(res["stories"].round(1), width="stretch", hide_index=True)
+    with tab_c:
+        st.dataframe(res["cases"].round(0), width="stretch", hide_index=True)
+
+    st.markdown("---")
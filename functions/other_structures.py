@@ -0,0 +1,337 @@
+"""
+Other structures (ASCE 7 Chapter 29, figure numbers of ASCE 7-16): chimneys
+and tanks, open signs and single-plane open frames, and trussed towers.
+
+    F = qz G Cf Af,  G = 0.85 (rigid structures)
+
+qz is evaluated along the height with compute_kz_array (the selected
+edition's MWFRS / other-structures Kz table). Structures are cut
+into horizontal slices of at most `dz`; every slice gets its own qz (and, for
+round sections, its own Cf), and slice forces are summed per segment with
+np.add.reduceat. All segments and load directions are evaluated in one array
+operation, so towers with hundreds of panels at 0.5 ft resolution are
+instantaneous. Forces are reported at ASD level (0.6 x strength), like the
+C&C tables. Kd is that of the structure's row of Table 26.6-1 unless the
+user overrides it.
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from functions.Kz import compute_kz_array
+from functions.editions import DEFAULT_EDITION, EDITIONS
+from functions.pressure_calculation import velocity_pressure
+from functions.wind_pressure_calc import STRUCTURE_TYPES
+
+G_RIGID = 0.85
+
+ASD = 0.6
+
+DZ = 0.5
+
+# Chimneys, tanks and similar structures (Figure 29.4-1): Cf at h/D = 1, 7, 25
+CHIMNEY_H_OVER_D = (1.0, 7.0, 25.0)
+CHIMNEY_CF = {
+    "Square (wind normal to face)": (1.3, 1.4, 2.0),
+    "Square (wind along diagonal)": (1.0, 1.1, 1.5),
+    "Hexagonal or octagonal": (1.0, 1.2, 1.4),
+    "Round, moderately smooth": (0.5, 0.6, 0.7),
+    "Round, rough (D'/D = 0.02)": (0.7, 0.8, 0.9),
+    "Round, very rough (D'/D = 0.08)": (0.8, 1.0, 1.2),
+}
+# Round sections use these Cf where D sqrt(qz) <= 2.5 (all surface roughness)
+CHIMNEY_CF_ROUND_LOW = (0.7, 0.8, 1.2)
+
+# Open signs and single-plane open frames (Figure 29.4-2): solidity bands
+# (upper limits) and Cf for flat-sided members, round members with
+# D sqrt(qz) <= 2.5 and round members with D sqrt(qz) > 2.5. Above the last
+# band (ε > 0.7) a sign is a solid sign (Section 29.3, Figure 29.3-1).
+OPEN_SIGN_SOLIDITY = (0.1, 0.3, 0.7)
+OPEN_SIGN_MAX_SOLIDITY = OPEN_SIGN_SOLIDITY[-1]
+OPEN_SIGN_CF = {
+    "flat": (2.0, 1.8, 1.6),
+    "round_low": (1.2, 1.3, 1.5),
+    "round_high": (0.8, 0.9, 1.1),
+}
+
+TOWER_SHAPES = ("Square", "Triangular")
+
+# Table 26.6-1 structure type (functions.wind_pressure_calc.STRUCTURE_TYPES)
+# of each cross-section, for Kd; hexagonal and octagonal sections share a
+# row in Figure 29.4-1, so they take the larger (octagonal) Kd
+CHIMNEY_STRUCTURE = {
+    "Square (wind normal to face)": "Chimneys / Tanks – Square",
+    "Square (wind along diagonal)": "Chimneys / Tanks – Square",
+    "Hexagonal or octagonal": "Chimneys / Tanks – Octagonal",
+    "Round, moderately smooth": "Chimneys / Tanks – Round",
+    "Round, rough (D'/D = 0.02)": "Chimneys / Tanks – Round",
+    "Round, very rough (D'/D = 0.08)": "Chimneys / Tanks – Round",
+}
+OPEN_SIGN_STRUCTURE = "Open Signs"
+TOWER_STRUCTURE = {shape: "Trussed Towers – Triangular / Square / Rectangular" for shape in TOWER_SHAPES}
+
+
+def structure_kd(structure: str, override=None) -> float:
+    """Kd of a Table 26.6-1 structure type, unless an explicit override is given."""
+    return float(override) if override is not None else float(STRUCTURE_TYPES[structure])
+
+
+def qz_profile(z, exposure, Kd, V, Kzt=1.0, edition=DEFAULT_EDITION):
+    """Velocity pressure qz (psf, strength level) at heights z (ft)."""
+    return velocity_pressure(compute_kz_array(z, exposure, edition, mwfrs=True), Kd, V, Kzt=Kzt)
+
+
+def slice_segments(z0, z1, dz=DZ):
+    """
+    Cuts segments [z0, z1) into slices of at most dz.
+
+    Returns slice mid-heights, slice thicknesses, the segment index of each
+    slice and the index of each segment's first slice (for reduceat).
+    """
+    z0 = np.asarray(z0, dtype=float)
+    z1 = np.asarray(z1, dtype=float)
+    n = np.maximum(1, np.ceil((z1 - z0) / dz)).astype(int)
+    seg = np.repeat(np.arange(len(z0)), n)
+    start = np.concatenate(([0], np.cumsum(n)[:-1]))
+    k = np.arange(n.sum()) - start[seg]
+    thickness = ((z1 - z0) / n)[seg]
+    mid = z0[seg] + (k + 0.5) * thickness
+    return mid, thickness, seg, start
+
+
+# --- chimneys and tanks ----------------------------------------------------------
+
+def chimney_cf(section, h_over_d, d_sqrt_qz=None):
+    """Cf for a chimney/tank cross-section, interpolated on h/D."""
+    values = CHIMNEY_CF[section]
+    cf = np.interp(h_over_d, CHIMNEY_H_OVER_D, values)
+    if section.startswith("Round") and d_sqrt_qz is not None:
+        low = np.interp(h_over_d, CHIMNEY_H_OVER_D, CHIMNEY_CF_ROUND_LOW)
+        cf = np.where(np.asarray(d_sqrt_qz) <= 2.5, low, cf)
+    return cf
+
+
+def chimney_loads(height, diameter, section, exposure, Kd, V, Kzt=1.0, dz=DZ,
+                  edition=DEFAULT_EDITION) -> Dict[str, object]:
+    """
+    Wind force on a chimney or tank of constant width along its height.
+
+    Returns base shear (lb), overturning moment (lb-ft) and the slice profile.
+    """
+    mid, thickness, _, _ = slice_segments([0.0], [float(height)], dz)
+    qz = qz_profile(mid, exposure, Kd, V, Kzt, edition)
+    cf = chimney_cf(section, height / diameter, diameter * np.sqrt(qz))
+    force = ASD * qz * G_RIGID * cf * diameter * thickness
+    return {
+        "base_shear": float(force.sum()),
+        "overturning": float((force * mid).sum()),
+        "profile": pd.DataFrame({"z (ft)": mid, "qz (psf)": qz, "Cf": cf, "Force (lb/ft)": force / thickness}),
+    }
+
+
+# --- open signs and frames ----------------------------------------------------------
+
+def open_sign_cf(solidity, members="flat", d_sqrt_qz=None):
+    """
+    Cf for open signs and single-plane open frames by solidity ratio.
+    Raises ValueError for ε > 0.7, which Figure 29.4-2 does not cover.
+    """
+    if np.any(np.asarray(solidity) > OPEN_SIGN_MAX_SOLIDITY):
+        raise ValueError(f"Solidity ratio above {OPEN_SIGN_MAX_SOLIDITY}: this is a solid sign (Section 29.3), "
+                         "not an open sign (Figure 29.4-2).")
+    band = np.minimum(np.searchsorted(OPEN_SIGN_SOLIDITY, solidity, side="right"), len(OPEN_SIGN_SOLIDITY) - 1)
+    if members == "flat":
+        return np.asarray(OPEN_SIGN_CF["flat"])[band]
+    low = np.asarray(OPEN_SIGN_CF["round_low"])[band]
+    high = np.asarray(OPEN_SIGN_CF["round_high"])[band]
+    return np.where(np.asarray(d_sqrt_qz) <= 2.5, low, high)
+
+
+def open_sign_loads(bottom, top, width, solidity, members, exposure, Kd, V,
+                    member_diameter=0.0, Kzt=1.0, dz=DZ, edition=DEFAULT_EDITION) -> Dict[str, float]:
+    """Force on an open sign or frame between heights bottom and top (ft)."""
+    mid, thickness, _, _ = slice_segments([float(bottom)], [float(top)], dz)
+    qz = qz_profile(mid, exposure, Kd, V, Kzt, edition)
+    cf = open_sign_cf(solidity, members, member_diameter * np.sqrt(qz))
+    force = ASD * qz * G_RIGID * cf * solidity * width * thickness
+    return {
+        "force": float(force.sum()),
+        "centroid": float((force * mid).sum() / force.sum()),
+        "overturning": float((force * mid).sum()),
+        "Af": float(solidity * width * (top - bottom)),
+    }
+
+
+# --- trussed towers ---------------------------------------------------------------------
+
+def tower_cf(solidity, shape):
+    """Cf of a square or triangular trussed tower with flat members (Figure 29.4-3)."""
+    e = np.asarray(solidity, dtype=float)
+    if shape == "Square":
+        return 4.0 * e ** 2 - 5.9 * e + 4.0
+    return 3.4 * e ** 2 - 4.7 * e + 3.4
+
+
+def tower_directions(shape) -> Sequence[str]:
+    return ("Normal to face", "Along diagonal") if shape == "Square" else ("Any direction",)
+
+
+def tower_direction_factor(solidity, shape, direction):
+    """Wind along a square tower's diagonal: 1 + 0.75 e, at most 1.2."""
+    e = np.asarray(solidity, dtype=float)
+    if shape == "Square" and direction == "Along diagonal":
+        return np.minimum(1.0 + 0.75 * e, 1.2)
+    return np.ones_like(e)
+
+
+def round_member_factor(solidity):
+    """Reduction for round members: 0.51 e^2 + 0.57, at most 1.0."""
+    e = np.asarray(solidity, dtype=float)
+    return np.minimum(0.51 * e ** 2 + 0.57, 1.0)
+
+
+def tower_loads(segments: pd.DataFrame, shape, exposure, Kd, V, Kzt=1.0, dz=DZ, edition=DEFAULT_EDITION):
+    """
+    Segment forces of a trussed tower for every load direction.
+
+    segments has columns z0, z1 (ft), face_width (ft), solidity and members
+    ("flat" or "round"). Af of a segment is solidity x face width x height.
+
+    Returns (per-segment DataFrame with one force column per direction,
+    dict direction -> (base shear, overturning moment)).
+    """
+    z0 = segments["z0"].to_numpy(float)
+    z1 = segments["z1"].to_numpy(float)
+    width = segments["face_width"].to_numpy(float)
+    e = segments["solidity"].to_numpy(float)
+    round_members = segments["members"].astype(str).str.lower().eq("round").to_numpy()
+
+    mid, thickness, seg, start = slice_segments(z0, z1, dz)
+    qz = qz_profile(mid, exposure, Kd, V, Kzt, edition)
+
+    cf = tower_cf(e, shape) * np.where(round_members, round_member_factor(e), 1.0)
+    directions = tower_directions(shape)
+    factors = np.stack([tower_direction_factor(e, shape, d) for d in directions])  # (dirs, segs)
+
+    # (dirs, slices): slice force, then summed back to segments
+    slice_force = ASD * G_RIGID * (qz * e[seg] * width[seg] * thickness) * (cf * factors)[:, seg]
+    seg_force = np.add.reduceat(slice_force, start, axis=1)
+    seg_moment = np.add.reduceat(slice_force * mid, start, axis=1)
+
+    out = segments[["z0", "z1", "face_width", "solidity", "members"]].copy()
+    out["Cf"] = cf
+    totals = {}
+    for i, d in enumerate(directions):
+        out[f"F {d} (lb)"] = seg_force[i]
+        totals[d] = (float(seg_force[i].sum()), float(seg_moment[i].sum()))
+    return out, totals
+
+
+def uniform_tower(height, n_panels, base_width, top_width, solidity, members="flat") -> pd.DataFrame:
+    """Tower of n equal-height panels with a linear taper, for quick studies."""
+    z = np.linspace(0.0, float(height), int(n_panels) + 1)
+    mid = (z[:-1] + z[1:]) / 2
+    return pd.DataFrame({
+        "z0": z[:-1],
+        "z1": z[1:],
+        "face_width": base_width + (top_width - base_width) * mid / height,
+        "solidity": np.full(len(mid), float(solidity)),
+        "members": members,
+    })
+
+
+# --- UI ---------------------------------------------------------------------------
+
+def _wind_inputs():
+    # The main page's edition override, when one is chosen there
+    main_edition = st.session_state.get("asce_edition")
+    edition = st.selectbox("ASCE 7 edition", EDITIONS,
+                           index=EDITIONS.index(main_edition if main_edition in EDITIONS else DEFAULT_EDITION),
+                           key="os_edition")
+    c1, c2, c3, c4 = st.columns(4)
+    V = c1.number_input("V (mph)", min_value=1.0, value=float(st.session_state.get("ws_V", 115.0)), key="os_V")
+    exposure = c2.selectbox("Exposure", ["B", "C", "D"],
+                            index=["B", "C", "D"].index(st.session_state.get("exposure_category", "C")),
+                            key="os_exposure")
+    Kzt = c3.number_input("Kzt", min_value=1.0, value=1.0, key="os_Kzt")
+    # Kd follows each structure's Table 26.6-1 row unless overridden here
+    kd_override = None
+    if c4.checkbox("Override Kd", key="os_Kd_override"):
+        kd_override = c4.number_input("Kd", min_value=0.5, max_value=1.0, value=0.85, key="os_Kd")
+    return V, exposure, kd_override, Kzt, edition
+
+
+def _kd_caption(structure, Kd, kd_override):
+    source = "override" if kd_override is not None else f"Table 26.6-1, {structure}"
+    st.caption(f"Kd = {Kd:.2f} ({source})")
+
+
+def show_other_structures():
+    st.header("Other Structures (Chapter 29)")
+    st.caption("F = qz G Cf Af with G = 0.85 and qz along the height · ASD forces (0.6 × strength level)")
+
+    V, exposure, kd_override, Kzt, edition = _wind_inputs()
+    tab_ch, tab_sign, tab_tower = st.tabs(["Chimneys & Tanks", "Open Signs & Frames", "Trussed Towers"])
+
+    with tab_ch:
+        c1, c2, c3 = st.columns(3)
+        height = c1.number_input("Height (ft)", min_value=1.0, value=80.0, key="os_ch_h")
+        diameter = c2.number_input("Width / diameter D (ft)", min_value=0.1, value=6.0, key="os_ch_d")
+        section = c3.selectbox("Cross-section", list(CHIMNEY_CF), key="os_ch_section")
+        Kd = structure_kd(CHIMNEY_STRUCTURE[section], kd_override)
+        _kd_caption(CHIMNEY_STRUCTURE[section], Kd, kd_override)
+        res = chimney_loads(height, diameter, section, exposure, Kd, V, Kzt, edition=edition)
+        c1, c2 = st.columns(2)
+        c1.metric("Base shear", f"{res['base_shear']:,.0f} lb")
+        c2.metric("Overturning moment", f"{res['overturning']:,.0f} lb-ft")
+        st.line_chart(res["profile"], x="Force (lb/ft)", y="z (ft)")
+
+    with tab_sign:
+        c1, c2, c3 = st.columns(3)
+        bottom = c1.number_input("Bottom of sign (ft)", min_value=0.0, value=10.0, key="os_sg_bottom")
+        top = c2.number_input("Top of sign (ft)", min_value=0.1, value=20.0, key="os_sg_top")
+        width = c3.number_input("Width (ft)", min_value=0.1, value=20.0, key="os_sg_width")
+        c1, c2, c3 = st.columns(3)
+        solidity = c1.number_input("Solidity ratio ε", min_value=0.01, max_value=OPEN_SIGN_MAX_SOLIDITY, value=0.3,
+                                   key="os_sg_e", help="Signs with ε > 0.7 are solid signs (Section 29.3).")
+        members = c2.selectbox("Members", ["flat", "round"], key="os_sg_members")
+        member_d = c3.number_input("Round member diameter (ft)", min_value=0.0, value=0.25, key="os_sg_d")
+        Kd = structure_kd(OPEN_SIGN_STRUCTURE, kd_override)
+        _kd_caption(OPEN_SIGN_STRUCTURE, Kd, kd_override)
+        if top <= bottom:
+            st.error("The top of the sign must be above its bottom.")
+        else:
+            res = open_sign_loads(bottom, top, width, solidity, members, exposure, Kd, V, member_d, Kzt,
+                                  edition=edition)
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Force", f"{res['force']:,.0f} lb")
+            c2.metric("Resultant height", f"{res['centroid']:.1f} ft")
+            c3.metric("Overturning at grade", f"{res['overturning']:,.0f} lb-ft")
+
+    with tab_tower:
+        c1, c2, c3 = st.columns(3)
+        shape = c1.selectbox("Cross-section", TOWER_SHAPES, key="os_tw_shape")
+        height = c2.number_input("Tower height (ft)", min_value=1.0, value=300.0, key="os_tw_h")
+        n_panels = int(c3.number_input("Panels", min_value=1, max_value=5000, value=150, key="os_tw_n"))
+        c1, c2, c3, c4 = st.columns(4)
+        base_w = c1.number_input("Face width at base (ft)", min_value=0.1, value=20.0, key="os_tw_wb")
+        top_w = c2.number_input("Face width at top (ft)", min_value=0.1, value=6.0, key="os_tw_wt")
+        solidity = c3.number_input("Solidity ratio ε", min_value=0.01, max_value=0.99, value=0.2, key="os_tw_e")
+        members = c4.selectbox("Members", ["flat", "round"], key="os_tw_members")
+        Kd = structure_kd(TOWER_STRUCTURE[shape], kd_override)
+        _kd_caption(TOWER_STRUCTURE[shape], Kd, kd_override)
+
+        segments = uniform_tower(height, n_panels, base_w, top_w, solidity, members)
+        table, totals = tower_loads(segments, shape, exposure, Kd, V, Kzt, edition=edition)
+
+        cols = st.columns(len(totals))
+        for col, (d, (shear, moment)) in zip(cols, totals.items()):
+            col.metric(f"Base shear · {d}", f"{shear:,.0f} lb")
+            col.metric(f"Overturning · {d}", f"{moment:,.0f} lb-ft")
+        st.dataframe(table.round(3), width="stretch", hide_index=True, height=300)
+        st.download_button("Download segment forces (CSV)", data=table.to_csv(index=False),
+                           file_name="tower_segments.csv", mime="text/csv", key="os_tw_download")
+
+    st.markdown("---")
@@ -0,0 +1,51 @@
+"""
+Helpers that keep Plotly figure payloads small.
+
+Plotly (>= 6) serializes NumPy arrays as base64 typed arrays instead of JSON
+number lists, so figure data should be handed over as contiguous arrays of the
+narrowest dtype that holds it. Curves are also reduced to the points that
+change the drawn line.
+"""
+import numpy as np
+
+
+def typed(values, dtype=np.float32):
+    """Contiguous NumPy array for a Plotly data field (float32 unless given)."""
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def decimate_curves(x, ys, log_x=False, rtol=1e-6):
+    """
+    Drops interior samples at which every curve in `ys` is collinear with its
+    neighbours (in log10 x when `log_x`), so the drawn polylines are unchanged.
+
+    Parameters
+    ----------
+    x : array_like
+        Shared, increasing abscissa of the curves.
+    ys : sequence of array_like
+        Curve ordinates, each the same length as `x`.
+    log_x : bool
+        Test collinearity on a log x axis.
+    rtol : float
+        Slope change, relative to the largest slope, treated as a corner.
+
+    Returns
+    -------
+    x, list of y
+        The kept samples, as float32 arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    ys = [np.asarray(y, dtype=float) for y in ys]
+    if x.size <= 2:
+        return typed(x), [typed(y) for y in ys]
+
+    u = np.log10(x) if log_x else x
+    keep = np.zeros(x.size, dtype=bool)
+    keep[[0, -1]] = True
+    for y in ys:
+        slope = np.diff(y) / np.diff(u)
+        scale = max(np.abs(slope).max(), 1e-12)
+        keep[1:-1] |= np.abs(np.diff(slope)) > rtol * scale
+
+    return typed(x[keep]), [typed(y[keep]) for y in ys]
@@ -0,0 +1,151 @@
+from typing import Dict, List
+
+import pandas as pd
+
+from functions.Kz import compute_kz
+from functions.footprint import footprint_properties, parse_footprint
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.pressure_calculation import velocity_pressure, calculate_pressure
+from functions.wall_gcp_chart import wall_gcp
+from functions.wind_regions import classify_sites
+
+REQUIRED_COLUMNS = ["name", "height", "V", "exposure"]
+
+# Optional columns and the value used when a building list leaves them out
+OPTIONAL_DEFAULTS = {
+    "Kd": 0.85,
+    "enclosure": "Enclosed Building",
+    "area": 10.0,
+    # Polygon as "x y; x y; ..." with courtyards after "|"; empty for none
+    "footprint": "",
+}
+
+# Optional site columns; when any is given each building is checked
+# against the wind region index (functions.wind_regions)
+LOCATION_COLUMNS = ["lat", "lon", "state"]
+REGION_FLAGS = ["hurricane_prone", "wind_borne_debris", "special_wind_region", "debris_if_coastal"]
+
+
+def read_portfolio(uploaded_file) -> pd.DataFrame:
+    name = getattr(uploaded_file, "name", str(uploaded_file)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        return pd.read_excel(uploaded_file)
+    return pd.read_csv(uploaded_file)
+
+
+def normalize_portfolio(df: pd.DataFrame, edition: str = DEFAULT_EDITION) -> pd.DataFrame:
+    """
+    Validates a building list, fills optional columns with their defaults and
+    resolves the enclosure classification to the edition's gcpi_positive /
+    gcpi_negative.
+    """
+    gcpi = load_edition(edition).gcpi
+    df = df.rename(columns={c: str(c).strip() for c in df.columns})
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Building list is missing column(s): {', '.join(missing)}")
+
+    for col, default in OPTIONAL_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default
+        df[col] = df[col].fillna(default)
+
+    df["exposure"] = df["exposure"].astype(str).str.strip().str.upper()
+    bad = sorted(set(df["exposure"]) - {"B", "C", "D"})
+    if bad:
+        raise ValueError(f"Unknown exposure categories: {', '.join(bad)}")
+
+    unknown = sorted(set(df["enclosure"]) - set(gcpi), key=str)
+    if unknown:
+        raise ValueError(f"Unknown enclosure classifications in {edition}: {', '.join(map(str, unknown))}")
+
+    df["footprint"] = df["footprint"].astype(str).str.strip()
+    for name, text in zip(df["name"], df["footprint"]):
+        if text:
+            try:
+                parse_footprint(text)
+            except ValueError as e:
+                raise ValueError(f"Footprint of {name}: {e}")
+
+    has_location = any(c in df.columns for c in LOCATION_COLUMNS)
+    for col in ("lat", "lon"):
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else float("nan")
+    df["state"] = df["state"].fillna("").astype(str).str.strip().str.upper() if "state" in df.columns else ""
+    if has_location:
+        regions = classify_sites(df["lat"].to_numpy(), df["lon"].to_numpy(), df["V"].to_numpy(dtype=float),
+                                 df["state"].to_numpy())
+        for flag in REGION_FLAGS:
+            df[flag] = regions[flag].to_numpy()
+    else:
+        for flag in REGION_FLAGS:
+            df[flag] = None
+
+    df["gcpi_positive"] = df["enclosure"].map({k: v[0] for k, v in gcpi.items()})
+    df["gcpi_negative"] = df["enclosure"].map({k: v[1] for k, v in gcpi.items()})
+    return df
+
+
+def prepare_portfolio(df: pd.DataFrame, edition: str = DEFAULT_EDITION) -> List[Dict[str, object]]:
+    """
+    Validates a building list and resolves it to plain records
+    (name, height, V, exposure, Kd, gcpi_positive, gcpi_negative, area, footprint,
+    the wind region flags and the ASCE 7 edition) that can be pickled to
+    worker processes.
+    """
+    df = normalize_portfolio(df, edition)
+    return [
+        {
+            "name": str(row.name),
+            "height": float(row.height),
+            "V": float(row.V),
+            "exposure": row.exposure,
+            "Kd": float(row.Kd),
+            "gcpi_positive": float(row.gcpi_positive),
+            "gcpi_negative": float(row.gcpi_negative),
+            "area": float(row.area),
+            "footprint": row.footprint,
+            **{flag: getattr(row, flag) for flag in REGION_FLAGS},
+            "edition": edition,
+        }
+        for row in df.itertuples(index=False)
+    ]
+
+
+def compute_portfolio_chunk(records: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """
+    Kz, q and wall C&C pressures for a chunk of buildings (runs in a worker
+    process), with each record's ASCE 7 edition.
+    """
+    out = []
+    for r in records:
+        edition = r.get("edition", DEFAULT_EDITION)
+        Kz = compute_kz(r["height"], r["exposure"], edition)
+        q = velocity_pressure(Kz, r["Kd"], r["V"])
+        positive, z4, z5 = wall_gcp(r["area"], edition)
+        gp, gn = r["gcpi_positive"], r["gcpi_negative"]
+
+        row = {
+            "name": r["name"],
+            "edition": edition,
+            "height (ft)": r["height"],
+            "V (mph)": r["V"],
+            "exposure": r["exposure"],
+            "Kz": Kz,
+            "q (psf)": q,
+            "area (sf)": r["area"],
+            "Zone 4&5 Positive (psf)": calculate_pressure(q, positive, gp, gn, "positive"),
+            "Zone 4 Negative (psf)": calculate_pressure(q, z4, gp, gn, "negative"),
+            "Zone 5 Negative (psf)": calculate_pressure(q, z5, gp, gn, "negative"),
+        }
+        if r.get("hurricane_prone") is not None:
+            row.update({flag: bool(r[flag]) for flag in REGION_FLAGS})
+        if r.get("footprint"):
+            fp = footprint_properties(parse_footprint(r["footprint"]), r["height"])
+            row.update({
+                "plan area (sf)": fp["area"],
+                "least width (ft)": fp["least"],
+                "a (ft)": fp["a"],
+                "reentrant corners": fp["reentrant_corners"],
+            })
+        out.append(row)
+    return out
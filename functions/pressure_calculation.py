@@ -1,3 +1,8 @@
+def velocity_pressure(Kz, Kd, V, Kzt=1.0, Ke=1.0):
+    """ASCE 7-16 Eq. 26.10-1: qz = 0.00256 Kz Kzt Kd Ke V² (psf). Works on scalars or arrays."""
+    return 0.00256 * Kz * Kzt * Kd * Ke * (V ** 2)
+
+
 def calculate_pressure(q, gcp, gcpi_positive, gcpi_negative, sign):
 
     if sign=="positive":
@@ -1,34 +1,35 @@
 import pandas as pd
 
+from functions.gcp_interpolation import interpolate_gcp
 from functions.pressure_calculation import calculate_pressure
 
+# Effective wind areas (sf) the pressure tables list
+TABLE_AREAS = [10, 20, 50, 100, 200, 500, 1000]
+
 
 def create_wall_pressure_table(
         q,
         gcpi_positive,
-        gcpi_negative
+        gcpi_negative,
+        gcp_source=None
 ):
+    """
+    ASD wall C&C pressures at the standard effective areas.
 
-    areas = [
-        10,
-        20,
-        50,
-        100,
-        200,
-        500,
-        1000
-    ]
-
+    gcp_source maps an area to (positive, zone4, zone5) GCp, e.g. an Edition
+    or WindTunnelGCp for test data; defaults to wall_gcp (ASCE 7-16).
+    """
 
-    rows=[]
+    if gcp_source is None:
 
+        from functions.wall_gcp_chart import wall_gcp as gcp_source
 
-    for area in areas:
+    rows=[]
 
-        from functions.wall_gcp_chart import wall_gcp
 
+    for area in TABLE_AREAS:
 
-        positive,z4,z5 = wall_gcp(area)
+        positive,z4,z5 = gcp_source(area)
 
 
         rows.append({
@@ -69,3 +70,38 @@ def create_wall_pressure_table(
 
 
     return pd.DataFrame(rows)
+
+
+def create_roof_pressure_table(q, gcpi_positive, gcpi_negative, roof_gcp):
+    """
+    ASD roof C&C pressures at the standard effective areas, from a roof GCp
+    table (Edition.roof_gcp_table); the positive GCp applies to all zones.
+    """
+
+    rows = []
+
+    for area in TABLE_AREAS:
+
+        row = {
+            "Effective Area (sf)": area,
+            "Zones 1-3 Positive (psf)": calculate_pressure(
+                q,
+                interpolate_gcp(area, roof_gcp, "Zone 1 Positive"),
+                gcpi_positive,
+                gcpi_negative,
+                "positive"
+            ),
+        }
+
+        for zone in ("Zone 1", "Zone 2", "Zone 3"):
+            row[f"{zone} Negative (psf)"] = calculate_pressure(
+                q,
+                interpolate_gcp(area, roof_gcp, f"{zone} Negative"),
+                gcpi_positive,
+                gcpi_negative,
+                "negative"
+            )
+
+        rows.append(row)
+
+    return pd.DataFrame(rows)
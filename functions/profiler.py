@@ -0,0 +1,281 @@
+"""
+Opt-in rerun profiler.
+
+Each step App_R00.py calls is wrapped in a `span`, which records wall time,
+traced allocations and cache hits/misses reported from inside the step. The
+last N reruns are kept per session, shown in a collapsible sidebar panel and
+exportable as Chrome trace JSON (chrome://tracing, Perfetto).
+
+Profiling is off unless WIND_PROFILER=1 is set or the page is opened with
+?profile=1. When off, `span` returns a shared no-op object.
+
+tracemalloc is process-wide: it is started by the first profiled rerun and
+stopped again when no profiled rerun is open, so unprofiled sessions do not
+pay for allocation tracing. Its peak counter is shared as well, so a rerun
+that overlapped another profiled rerun (any session) records no memory
+figures rather than figures that include the other session's allocations.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from functions.metrics import record_cache_request
+
+PROFILER_ENV = "WIND_PROFILER"
+PROFILER_HISTORY = int(os.environ.get("WIND_PROFILER_HISTORY", "20"))
+
+_HISTORY_KEY = "_profiler_history"
+
+_current_rerun: ContextVar[Optional[dict]] = ContextVar("profiler_rerun", default=None)
+_current_span: ContextVar[Optional["_Span"]] = ContextVar("profiler_span", default=None)
+
+# Open profiled reruns: session id -> (script thread, rerun)
+_active: Dict[str, tuple] = {}
+_active_lock = threading.Lock()
+# Whether tracemalloc was started here (and so may be stopped here)
+_started_tracing = False
+
+
+def profiling_enabled() -> bool:
+    if os.environ.get(PROFILER_ENV, "") == "1":
+        return True
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, rerun: dict, name: str):
+        self.rerun = rerun
+        self.name = name
+        self.parent: Optional[_Span] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.max_traced = 0
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+
+        current, peak = tracemalloc.get_traced_memory()
+        if self.parent is not None:
+            self.parent.max_traced = max(self.parent.max_traced, peak)
+        tracemalloc.reset_peak()
+        self.start_traced = current
+        self.max_traced = current
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        self.max_traced = max(self.max_traced, peak)
+        if self.parent is not None:
+            self.parent.max_traced = max(self.parent.max_traced, self.max_traced)
+        _current_span.reset(self._token)
+
+        self.rerun["spans"].append({
+            "name": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "start_s": self.start - self.rerun["start"],
+            "duration_s": end - self.start,
+            "alloc_bytes": current - self.start_traced,
+            "peak_bytes": self.max_traced - self.start_traced,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        })
+        return False
+
+
+def span(name: str):
+    """Context manager timing one step of the current rerun."""
+    rerun = _current_rerun.get()
+    if rerun is None:
+        return _NULL_SPAN
+    return _Span(rerun, name)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Counts a cache hit or miss in the metrics and against the innermost open span."""
+    record_cache_request(cache, hit)
+
+    s = _current_span.get()
+    if s is None:
+        return
+    if hit:
+        s.cache_hits += 1
+    else:
+        s.cache_misses += 1
+
+
+def _session_key() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else f"thread-{threading.get_ident()}"
+
+
+def _drop_finished_locked() -> None:
+    """Forgets reruns whose script thread ended without finish_rerun (st.stop, errors)."""
+    for key, (thread, _) in list(_active.items()):
+        if not thread.is_alive():
+            del _active[key]
+
+
+def _stop_tracing_locked() -> None:
+    global _started_tracing
+    if not _active and _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+
+def start_rerun() -> None:
+    global _started_tracing
+    if not profiling_enabled():
+        _current_rerun.set(None)
+        return
+
+    rerun = {
+        "start": time.perf_counter(),
+        "wall_clock": time.time(),
+        "spans": [],
+        "memory": True,
+    }
+    with _active_lock:
+        _drop_finished_locked()
+        key = _session_key()
+        if key in _active:
+            _active[key][1]["memory"] = False
+        _active[key] = (threading.current_thread(), rerun)
+        if len(_active) > 1:
+            for _, other in _active.values():
+                other["memory"] = False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+    _current_rerun.set(rerun)
+
+
+def finish_rerun() -> None:
+    """Closes the current rerun, stores it in the session and shows the panel."""
+    rerun = _current_rerun.get()
+    if rerun is None:
+        return
+    _current_rerun.set(None)
+
+    rerun["duration_s"] = time.perf_counter() - rerun["start"]
+    with _active_lock:
+        key = _session_key()
+        if key in _active and _active[key][1] is rerun:
+            del _active[key]
+        _drop_finished_locked()
+        _stop_tracing_locked()
+    if not rerun["memory"]:
+        for s in rerun["spans"]:
+            s["alloc_bytes"] = s["peak_bytes"] = None
+
+    if _HISTORY_KEY not in st.session_state:
+        st.session_state[_HISTORY_KEY] = deque(maxlen=PROFILER_HISTORY)
+    history = st.session_state[_HISTORY_KEY]
+    history.append(rerun)
+
+    show_profiler_panel(list(history))
+
+
+def chrome_trace(history: List[dict]) -> Dict[str, object]:
+    """Converts stored reruns to the Chrome trace event format (one thread per rerun)."""
+    events: List[dict] = []
+    for tid, rerun in enumerate(history, start=1):
+        base_us = rerun["wall_clock"] * 1e6
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+            "args": {"name": f"rerun {tid}"},
+        })
+        events.append({
+            "name": "rerun", "cat": "rerun", "ph": "X", "pid": 1, "tid": tid,
+            "ts": base_us, "dur": rerun["duration_s"] * 1e6,
+        })
+        for s in rerun["spans"]:
+            events.append({
+                "name": s["name"], "cat": "step", "ph": "X", "pid": 1, "tid": tid,
+                "ts": base_us + s["start_s"] * 1e6,
+                "dur": s["duration_s"] * 1e6,
+                "args": {
+                    "alloc_bytes": s["alloc_bytes"],
+                    "peak_bytes": s["peak_bytes"],
+                    "cache_hits": s["cache_hits"],
+                    "cache_misses": s["cache_misses"],
+                },
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def show_profiler_panel(history: List[dict]) -> None:
+    with st.sidebar.expander(f"Profiler (last {len(history)} reruns)", expanded=False):
+        last = history[-1]
+        st.metric("Last rerun", f"{last['duration_s'] * 1e3:.1f} ms")
+
+        df = pd.DataFrame(last["spans"])
+        if not df.empty:
+            df = df.sort_values("start_s")
+            df["duration (ms)"] = df["duration_s"] * 1e3
+            df["peak (KiB)"] = pd.to_numeric(df["peak_bytes"]) / 1024
+            st.dataframe(
+                df[["name", "parent", "duration (ms)", "peak (KiB)", "cache_hits", "cache_misses"]],
+                width="stretch",
+                hide_index=True,
+            )
+            if not last.get("memory", True):
+                st.caption("No memory peaks: another profiled rerun ran at the same time, and tracemalloc "
+                           "counts allocations for the whole process.")
+
+        totals = pd.DataFrame(
+            [{"rerun": n, "duration (ms)": r["duration_s"] * 1e3} for n, r in enumerate(history, start=1)]
+        )
+        st.line_chart(totals, x="rerun", y="duration (ms)", height=160)
+
+        # Imported here: result_cache records its hits through this module
+        from functions.result_cache import get_result_cache
+
+        stats = get_result_cache().stats()
+        st.caption("Result cache (this process)")
+        st.dataframe(
+            pd.DataFrame([
+                {"tier": "memory", "hits": stats["memory_hits"], "evictions": stats["memory_evictions"],
+                 "entries": stats["memory_entries"], "size (MiB)": None},
+                {"tier": "disk", "hits": stats["disk_hits"], "evictions": stats["disk_evictions"],
+                 "entries": stats["disk_entries"], "size (MiB)": stats["disk_bytes"] / 2 ** 20},
+            ]),
+            width="stretch",
+            hide_index=True,
+        )
+        st.caption(f"{stats['misses']} misses")
+
+        st.download_button(
+            "Export Chrome trace",
+            data=json.dumps(chrome_trace(history)),
+            file_name="wind_load_profile.json",
+            mime="application/json",
+        )
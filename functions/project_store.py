@@ -0,0 +1,177 @@
+"""
+SQLite persistence for projects: the step inputs plus the computed results.
+
+Each project is one row. The searchable fields (state, exposure, V, height)
+are real indexed columns; the full inputs are JSON and the results are the
+compute_wind_loads output in the result cache's JSON format, zlib-compressed,
+so a project loads with a single primary-key lookup and nothing is recomputed.
+
+Listings use keyset pagination (WHERE id < last_id ORDER BY id DESC), which
+stays fast no matter how deep into thousands of projects the user pages.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from functions.result_cache import decode_results, encode_results
+
+DEFAULT_DB_PATH = Path(os.environ.get(
+    "WIND_PROJECT_DB",
+    Path.home() / ".local" / "share" / "wind_load_calculator" / "projects.sqlite3",
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    name        TEXT    NOT NULL,
+    created_at  REAL    NOT NULL,
+    city        TEXT,
+    state       TEXT,
+    exposure    TEXT,
+    V           REAL,
+    height      REAL,
+    result_key  TEXT,
+    inputs      TEXT    NOT NULL,
+    results     BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_projects_state    ON projects(state, id);
+CREATE INDEX IF NOT EXISTS idx_projects_exposure ON projects(exposure, id);
+CREATE INDEX IF NOT EXISTS idx_projects_v        ON projects(V, id);
+"""
+
+_LIST_COLUMNS = "id, name, created_at, city, state, exposure, V, height"
+
+
+@dataclass
+class ProjectRecord:
+    id: int
+    name: str
+    inputs: Dict[str, object]
+    results: Optional[Dict[str, object]]
+    result_key: Optional[str]
+
+
+def _encode(results: Dict[str, object]) -> bytes:
+    return zlib.compress(encode_results(results))
+
+
+def _decode(blob: bytes) -> Dict[str, object]:
+    data = zlib.decompress(blob)
+    try:
+        return decode_results(data)
+    except TypeError:
+        # Rows saved before the result cache's format stored each frame as a to_json string
+        return {
+            k: pd.read_json(StringIO(v["frame"]), orient="split", dtype=False) if "frame" in v else v["value"]
+            for k, v in json.loads(data).items()
+        }
+
+
+class ProjectStore:
+    def __init__(self, path: Path = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def save_project(self, name: str, inputs: Dict[str, object],
+                     results: Optional[Dict[str, object]] = None,
+                     result_key: Optional[str] = None) -> int:
+        row = (
+            name.strip() or "Untitled project",
+            time.time(),
+            inputs.get("city"),
+            inputs.get("state"),
+            inputs.get("exposure"),
+            inputs.get("V"),
+            inputs.get("height"),
+            result_key,
+            json.dumps(inputs),
+            _encode(results) if results is not None else None,
+        )
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO projects (name, created_at, city, state, exposure, V, height, "
+                "result_key, inputs, results) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            return int(cur.lastrowid)
+
+    def load_project(self, project_id: int) -> Optional[ProjectRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, inputs, results, result_key FROM projects WHERE id = ?",
+                (int(project_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        return ProjectRecord(
+            id=row[0],
+            name=row[1],
+            inputs=json.loads(row[2]),
+            results=_decode(row[3]) if row[3] is not None else None,
+            result_key=row[4],
+        )
+
+    def list_projects(self, state: Optional[str] = None, exposure: Optional[str] = None,
+                      v_min: Optional[float] = None, v_max: Optional[float] = None,
+                      before_id: Optional[int] = None, limit: int = 20) -> pd.DataFrame:
+        """One page of projects, newest first. Pass the last id of a page as `before_id` for the next."""
+        where: List[str] = []
+        params: List[object] = []
+        if state:
+            where.append("state = ?")
+            params.append(state)
+        if exposure:
+            where.append("exposure = ?")
+            params.append(exposure)
+        if v_min is not None:
+            where.append("V >= ?")
+            params.append(float(v_min))
+        if v_max is not None:
+            where.append("V <= ?")
+            params.append(float(v_max))
+        if before_id is not None:
+            where.append("id < ?")
+            params.append(int(before_id))
+
+        sql = f"SELECT {_LIST_COLUMNS} FROM projects"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=[c.strip() for c in _LIST_COLUMNS.split(",")])
+
+    def delete_project(self, project_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects WHERE id = ?", (int(project_id),))
+
+
+_store: Optional[ProjectStore] = None
+_store_lock = threading.Lock()
+
+
+def get_project_store() -> ProjectStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProjectStore()
+    return _store
@@ -0,0 +1,155 @@
+import streamlit as st
+
+from functions.code_jurisdiction_1 import STATE_OPTIONS
+from functions.editions import DEFAULT_EDITION
+from functions.project_store import get_project_store
+from functions.result_cache import get_result_cache, wind_loads_key
+
+# Widget / session_state keys written back when a project is loaded
+PROJECT_STATE_KEYS = [
+    "bd_ns", "bd_ew", "bd_h",
+    "cj_city", "cj_state",
+    "risk_category",
+    "ws_V",
+    "structure_type", "exposure_category",
+    "enclosure_classification",
+    "asce_edition",
+    "bd_mode", "bd_polygon", "bd_reentrant",
+    "cj_lat", "cj_lon", "cj_ibc", "cj_iecc",
+    "enclosure_method",
+]
+
+# Session state that is not a widget value: saved from the first key, restored into the second
+PROJECT_DATA_KEYS = {
+    "enc_inventory_current": "enc_inventory_rows",
+}
+
+PAGE_SIZE = 15
+
+
+def collect_project_inputs(jurisdiction, height, V, exposure, Kd, enclosure, gcpi_positive, gcpi_negative,
+                           edition=DEFAULT_EDITION):
+    """
+    Inputs from building_dimension, code_jurisdiction_1, wind_speed,
+    wind_pressure_calc and internal_pressure, in the form ProjectStore saves.
+    """
+    return {
+        "city": jurisdiction["city"],
+        "state": jurisdiction["state"],
+        "lat": jurisdiction.get("lat"),
+        "lon": jurisdiction.get("lon"),
+        "ibc_year": jurisdiction["ibc_year"],
+        "iecc_year": jurisdiction["iecc_year"],
+        "height": float(height),
+        "V": float(V),
+        "exposure": exposure,
+        "Kd": float(Kd),
+        "enclosure": enclosure,
+        "gcpi_positive": float(gcpi_positive),
+        "gcpi_negative": float(gcpi_negative),
+        "edition": edition,
+        "widgets": {
+            **{k: st.session_state[k] for k in PROJECT_STATE_KEYS if k in st.session_state},
+            **{restore: st.session_state[saved] for saved, restore in PROJECT_DATA_KEYS.items()
+               if saved in st.session_state},
+        },
+    }
+
+
+def _load_project(project_id):
+    # Runs as a button callback, i.e. before the widgets of the next rerun exist.
+    record = get_project_store().load_project(project_id)
+    if record is None:
+        st.session_state["project_message"] = f"Project {project_id} no longer exists."
+        return
+
+    widgets = record.inputs.get("widgets", {})
+    for key, value in widgets.items():
+        st.session_state[key] = value
+    if "enc_inventory_rows" in widgets:
+        # Edits held by the inventory editor were made to the previous rows
+        st.session_state.pop("enc_inventory", None)
+
+    # Stored results go straight into the result cache, so the rerun does not recompute.
+    if record.results is not None and record.result_key:
+        get_result_cache().put(record.result_key, record.results)
+
+    st.session_state["project_message"] = f"Loaded “{record.name}”."
+
+
+def _change_page(direction, last_id=None):
+    stack = st.session_state.setdefault("project_page_cursors", [])
+    if direction == "next":
+        stack.append(last_id)
+    elif stack:
+        stack.pop()
+
+
+def _reset_pages():
+    st.session_state["project_page_cursors"] = []
+
+
+def project_panel(inputs, results):
+    """Sidebar panel to save the current project and browse/load saved ones."""
+    store = get_project_store()
+
+    with st.sidebar.expander("Projects", expanded=False):
+        message = st.session_state.pop("project_message", None)
+        if message:
+            st.success(message)
+
+        name = st.text_input("Project name", key="project_name", placeholder="e.g. Warehouse – Milwaukee")
+        if st.button("Save project", key="project_save"):
+            key = wind_loads_key(
+                inputs["height"], inputs["V"], inputs["exposure"], inputs["Kd"],
+                inputs["gcpi_positive"], inputs["gcpi_negative"],
+                inputs.get("edition", DEFAULT_EDITION),
+            )
+            project_id = store.save_project(name, inputs, results=results, result_key=key)
+            _reset_pages()
+            st.success(f"Saved as project #{project_id}.")
+
+        st.markdown("**Saved projects**")
+
+        c1, c2 = st.columns(2)
+        state = c1.selectbox(
+            "State", ["All"] + [abbr for abbr, _ in STATE_OPTIONS],
+            key="project_filter_state", on_change=_reset_pages,
+        )
+        exposure = c2.selectbox(
+            "Exposure", ["All", "B", "C", "D"],
+            key="project_filter_exposure", on_change=_reset_pages,
+        )
+        v_min, v_max = st.slider(
+            "V (mph)", 0, 300, (0, 300),
+            key="project_filter_v", on_change=_reset_pages,
+        )
+
+        cursors = st.session_state.setdefault("project_page_cursors", [])
+        page = store.list_projects(
+            state=None if state == "All" else state,
+            exposure=None if exposure == "All" else exposure,
+            v_min=v_min if v_min > 0 else None,
+            v_max=v_max if v_max < 300 else None,
+            before_id=cursors[-1] if cursors else None,
+            limit=PAGE_SIZE + 1,
+        )
+        has_next = len(page) > PAGE_SIZE
+        page = page.head(PAGE_SIZE)
+
+        if page.empty:
+            st.caption("No saved projects match.")
+
+        for row in page.itertuples(index=False):
+            c1, c2 = st.columns([3, 1])
+            c1.markdown(
+                f"**{row.name}**  \n"
+                f"{row.city or ''}, {row.state or ''} · V={row.V:.0f} · Exp {row.exposure}"
+            )
+            c2.button("Load", key=f"project_load_{row.id}", on_click=_load_project, args=(row.id,))
+
+        p1, p2 = st.columns(2)
+        p1.button("‹ Newer", key="project_prev", disabled=not cursors,
+                  on_click=_change_page, args=("prev",))
+        p2.button("Older ›", key="project_next", disabled=not has_next,
+                  on_click=_change_page, args=("next", int(page["id"].iloc[-1]) if has_next else None))
@@ -0,0 +1,399 @@
+"""
+Calculation package export (PDF and Excel) for one project or a whole
+portfolio.
+
+A report holds the inputs, the Kz / q derivation shown under Step 6, the
+GCp charts and the wall and roof C&C pressure tables. Batches run through
+the job queue's worker processes; each worker writes its PDFs and CSV parts
+of pressure rows straight to the batch directory and returns only one
+summary row per building, so memory stays flat however many buildings there
+are. The Excel workbook and the zip parts are then streamed from those files
+(openpyxl write-only mode). Batch directories live under BATCH_DIR and are
+removed after BATCH_MAX_AGE_H hours.
+
+GCp charts depend only on the curve set (an edition's wall GCp curve and the
+roof GCp table), not on the building, so each unique set is rendered once to
+a PNG in CHART_DIR (shared by all worker processes) and reused by every
+report that needs it.
+"""
+import csv
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+import streamlit as st
+from openpyxl import Workbook
+
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.pressure_table import create_roof_pressure_table
+from functions.wind_load_results import compute_wind_loads
+
+CHART_DIR = Path(os.environ.get("WIND_REPORT_CHART_DIR", Path(tempfile.gettempdir()) / "wind_report_charts"))
+BATCH_DIR = Path(os.environ.get("WIND_REPORT_BATCH_DIR", Path(tempfile.gettempdir()) / "wind_reports"))
+BATCH_MAX_AGE_H = float(os.environ.get("WIND_REPORT_BATCH_HOURS", "24"))
+
+# A calc package is split into zip files of about this size, each downloaded on its own
+PACKAGE_PART_BYTES = int(float(os.environ.get("WIND_REPORT_PART_MB", "200")) * 1024 * 1024)
+
+PRESSURE_TABLES = (("Wall Pressures", "wall_pressure", "parts"), ("Roof Pressures", "roof_pressure", "roof_parts"))
+
+PAGE_SIZE = (8.5, 11.0)
+
+KZT = 1.0
+KE = 1.0
+
+
+# --- data --------------------------------------------------------------------------
+
+def report_data(record: Dict[str, object]) -> Dict[str, object]:
+    """
+    Everything one report shows, from a record with name, height, V,
+    exposure, Kd, enclosure, gcpi_positive, gcpi_negative and (optionally)
+    edition, city and state.
+    """
+    edition = record.get("edition") or DEFAULT_EDITION
+    res = compute_wind_loads(record["height"], record["V"], record["exposure"], record["Kd"],
+                             record["gcpi_positive"], record["gcpi_negative"], edition)
+    ed = load_edition(edition)
+    Kz, q = res["Kz"], res["q"]
+
+    location = ", ".join(str(record[k]) for k in ("city", "state") if record.get(k))
+    inputs = [
+        ("Project", record["name"]),
+        ("Location", location or "—"),
+        ("Standard", edition),
+        ("Mean roof height h (ft)", f"{float(record['height']):.1f}"),
+        ("Basic wind speed V (mph)", f"{float(record['V']):.1f}"),
+        ("Exposure category", record["exposure"]),
+        ("Directionality factor Kd", f"{float(record['Kd']):.2f}"),
+        ("Enclosure classification", record.get("enclosure", "—")),
+        ("GCpi", f"{float(record['gcpi_positive']):+.2f} / {float(record['gcpi_negative']):+.2f}"),
+    ]
+    derivation = [
+        f"Kz = {Kz:.3f}  ({ed.kz_source}, Exposure {record['exposure']}, h = {float(record['height']):.1f} ft)",
+        f"Kzt = {KZT:.2f}, Ke = {KE:.2f}",
+        "q = 0.00256 Kz Kzt Kd Ke V²",
+        f"  = 0.00256 × {Kz:.3f} × {KZT:.2f} × {float(record['Kd']):.2f} × {KE:.2f} × {float(record['V']):.1f}²",
+        f"  = {q:.2f} psf",
+        f"p = 0.6 q (GCp − GCpi)  (ASD; wall GCp from {ed.wall_gcp_source})",
+    ]
+    return {
+        "name": str(record["name"]),
+        "edition": edition,
+        "inputs": inputs,
+        "derivation": derivation,
+        "Kz": Kz,
+        "q": q,
+        "wall_gcp": res["wall_gcp"],
+        "roof_gcp": res["roof_gcp"],
+        "wall_pressure": res["wall_pressure"],
+        "roof_pressure": create_roof_pressure_table(q, float(record["gcpi_positive"]),
+                                                    float(record["gcpi_negative"]), res["roof_gcp"]),
+    }
+
+
+# --- charts ---------------------------------------------------------------------------
+
+def curve_set_key(wall_gcp: pd.DataFrame, roof_gcp: pd.DataFrame) -> str:
+    """Content hash of the curves a chart draws; equal curves share one PNG."""
+    h = hashlib.sha256()
+    for df in (wall_gcp, roof_gcp):
+        h.update(",".join(df.columns).encode())
+        h.update(np.ascontiguousarray(df.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()[:20]
+
+
+def _render_gcp_chart(wall_gcp: pd.DataFrame, roof_gcp: pd.DataFrame) -> bytes:
+    fig = Figure(figsize=(7.0, 3.2), dpi=150)
+    for ax, df, title in zip(fig.subplots(1, 2), (wall_gcp, roof_gcp), ("Walls", "Roof")):
+        area = df["Area (sf)"].to_numpy()
+        for col in df.columns[1:]:
+            ax.plot(area, df[col].to_numpy(), label=col)
+        ax.set_xscale("log")
+        ax.set_title(title, fontsize=9)
+        ax.set_xlabel("Effective wind area (sf)", fontsize=8)
+        ax.set_ylabel("GCp", fontsize=8)
+        ax.grid(True, which="both", alpha=0.3)
+        ax.tick_params(labelsize=7)
+        ax.legend(fontsize=6)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=32)
+def _chart_image(path: str) -> np.ndarray:
+    return imread(path)
+
+
+def gcp_chart(wall_gcp: pd.DataFrame, roof_gcp: pd.DataFrame) -> np.ndarray:
+    """
+    The GCp chart of a curve set as an image array: read from CHART_DIR if
+    any process has rendered it already, otherwise rendered and written
+    there atomically.
+    """
+    path = CHART_DIR / f"gcp_{curve_set_key(wall_gcp, roof_gcp)}.png"
+    if not path.exists():
+        CHART_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(_render_gcp_chart(wall_gcp, roof_gcp))
+        os.replace(tmp, path)
+    return _chart_image(str(path))
+
+
+# --- PDF ------------------------------------------------------------------------------
+
+def _table(ax, df: pd.DataFrame, fmt="{:.2f}"):
+    cells = [[fmt.format(v) if isinstance(v, (float, np.floating)) else str(v) for v in row]
+             for row in df.itertuples(index=False)]
+    table = ax.table(cellText=cells, colLabels=list(df.columns), loc="upper center", cellLoc="center")
+    table.auto_set_font_size(False)
+    table.set_fontsize(7)
+    table.scale(1.0, 1.3)
+    ax.axis("off")
+
+
+def write_pdf(data: Dict[str, object], target) -> None:
+    """Three-page calc package: inputs and derivation, charts and wall pressures, roof pressures."""
+    ed = load_edition(data["edition"])
+    with PdfPages(target) as pdf:
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.08, 0.94, f"Wind Load Calculation – {data['name']}", fontsize=14, weight="bold")
+        fig.text(0.08, 0.915, f"Components and cladding, {data['edition']}", fontsize=9, color="0.3")
+
+        y = 0.87
+        fig.text(0.08, y, "Inputs", fontsize=11, weight="bold")
+        for label, value in data["inputs"]:
+            y -= 0.024
+            fig.text(0.10, y, label, fontsize=9)
+            fig.text(0.55, y, str(value), fontsize=9)
+
+        y -= 0.05
+        fig.text(0.08, y, "Velocity pressure", fontsize=11, weight="bold")
+        for line in data["derivation"]:
+            y -= 0.024
+            fig.text(0.10, y, line, fontsize=9, family="monospace")
+        pdf.savefig(fig)
+
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.08, 0.95, f"GCp ({ed.wall_gcp_source} / {ed.roof_gcp_source})", fontsize=11, weight="bold")
+        ax = fig.add_axes((0.06, 0.58, 0.88, 0.35))
+        ax.imshow(gcp_chart(data["wall_gcp"], data["roof_gcp"]))
+        ax.axis("off")
+        fig.text(0.08, 0.53, "Wall C&C design pressures (ASD, psf)", fontsize=11, weight="bold")
+        _table(fig.add_axes((0.08, 0.05, 0.84, 0.46)), data["wall_pressure"].round(2))
+        pdf.savefig(fig)
+
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.08, 0.94, "Roof C&C design pressures (ASD, psf)", fontsize=11, weight="bold")
+        fig.text(0.08, 0.915, f"Roof GCp from {ed.roof_gcp_source}",
+                 fontsize=9, color="0.3")
+        _table(fig.add_axes((0.08, 0.50, 0.84, 0.40)), data["roof_pressure"].round(2))
+        pdf.savefig(fig)
+
+
+def pdf_bytes(data: Dict[str, object]) -> bytes:
+    buf = io.BytesIO()
+    write_pdf(data, buf)
+    return buf.getvalue()
+
+
+# --- Excel ----------------------------------------------------------------------------
+
+def _append_frame(ws, df: pd.DataFrame) -> None:
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        ws.append([v.item() if isinstance(v, np.generic) else v for v in row])
+
+
+def excel_bytes(data: Dict[str, object]) -> bytes:
+    """Workbook of one project: inputs and derivation, GCp tables, pressures."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Inputs")
+    for row in data["inputs"]:
+        ws.append(list(row))
+    ws.append([])
+    ws.append(["Kz", data["Kz"]])
+    ws.append(["q (psf)", data["q"]])
+    for line in data["derivation"]:
+        ws.append([line])
+    for title, key in (("Wall GCp", "wall_gcp"), ("Roof GCp", "roof_gcp"),
+                       ("Wall Pressures", "wall_pressure"), ("Roof Pressures", "roof_pressure")):
+        _append_frame(wb.create_sheet(title), data[key])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+# --- batches --------------------------------------------------------------------------
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")[:60] or "building"
+
+
+def report_records(records: List[Dict[str, object]], out_dir, edition=DEFAULT_EDITION) -> List[Dict[str, object]]:
+    """Portfolio records (see prepare_portfolio) tagged for render_report_chunk."""
+    return [{**r, "edition": r.get("edition") or edition, "index": i, "out_dir": str(out_dir)}
+            for i, r in enumerate(records)]
+
+
+def render_report_chunk(records: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """
+    Writes one PDF per building and, per pressure table, one CSV part of
+    rows for the chunk (runs in a worker process); returns one summary row
+    per building.
+    """
+    if not records:
+        return []
+    out_dir = Path(records[0]["out_dir"])
+    files, writers = [], {}
+    try:
+        for _, key, folder in PRESSURE_TABLES:
+            (out_dir / folder).mkdir(parents=True, exist_ok=True)
+            f = open(out_dir / folder / f"{records[0]['index']:07d}.csv", "w", newline="", encoding="utf-8")
+            files.append(f)
+            writers[key] = csv.writer(f)
+
+        summary = []
+        for n, r in enumerate(records):
+            data = report_data(r)
+            filename = f"{r['index']:05d}_{_slug(data['name'])}.pdf"
+            write_pdf(data, out_dir / filename)
+            for key, writer in writers.items():
+                if n == 0:
+                    writer.writerow(["name", *data[key].columns])
+                for row in data[key].itertuples(index=False):
+                    writer.writerow([data["name"], *row])
+            summary.append({
+                "name": data["name"],
+                "edition": data["edition"],
+                "Kz": data["Kz"],
+                "q (psf)": data["q"],
+                "report": filename,
+            })
+    finally:
+        for f in files:
+            f.close()
+    return summary
+
+
+def write_batch_workbook(summary: Iterable[Dict[str, object]], out_dir, path) -> None:
+    """Summary sheet plus all pressure rows, streamed from the CSV parts."""
+    out_dir = Path(out_dir)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Summary")
+    summary = list(summary)
+    if summary:
+        ws.append(list(summary[0]))
+        for row in summary:
+            ws.append(list(row.values()))
+
+    for title, _, folder in PRESSURE_TABLES:
+        ws = wb.create_sheet(title)
+        for i, part in enumerate(sorted((out_dir / folder).glob("*.csv"))):
+            with open(part, newline="", encoding="utf-8") as f:
+                rows = csv.reader(f)
+                header = next(rows, None)
+                if i == 0 and header:
+                    ws.append(header)
+                for name, *values in rows:
+                    ws.append([name, *(float(v) for v in values)])
+    wb.save(path)
+
+
+def zip_batch(summary: List[Dict[str, object]], out_dir, part_bytes: int = PACKAGE_PART_BYTES) -> List[Path]:
+    """
+    Workbook plus every PDF, written file by file into zip parts of about
+    `part_bytes` each (calc_package_1.zip, ...; the workbook is in the first).
+    Returns the part paths.
+    """
+    out_dir = Path(out_dir)
+    workbook = out_dir / "wind_loads.xlsx"
+    write_batch_workbook(summary, out_dir, workbook)
+
+    members = [(workbook, workbook.name)] + [(out_dir / row["report"], f"reports/{row['report']}")
+                                             for row in summary]
+    paths, zf = [], None
+    try:
+        for source, arcname in members:
+            if zf is not None and zf.fp.tell() + source.stat().st_size > part_bytes:
+                zf.close()
+                zf = None
+            if zf is None:
+                paths.append(out_dir / f"calc_package_{len(paths) + 1}.zip")
+                zf = zipfile.ZipFile(paths[-1], "w", compression=zipfile.ZIP_DEFLATED)
+            zf.write(source, arcname)
+    finally:
+        if zf is not None:
+            zf.close()
+    return paths
+
+
+def new_batch_dir() -> Path:
+    """A fresh directory under BATCH_DIR; batches older than BATCH_MAX_AGE_H are removed first."""
+    BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    remove_old_batches()
+    return Path(tempfile.mkdtemp(prefix="batch_", dir=BATCH_DIR))
+
+
+def remove_old_batches(max_age_h: float = BATCH_MAX_AGE_H) -> int:
+    """Deletes batch directories not modified for `max_age_h` hours; returns how many."""
+    cutoff = time.time() - max_age_h * 3600
+    removed = 0
+    for path in BATCH_DIR.glob("batch_*"):
+        try:
+            if path.is_dir() and path.stat().st_mtime < cutoff:
+                shutil.rmtree(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def remove_batch(out_dir) -> None:
+    """Deletes one batch directory (e.g. when the session builds a new package)."""
+    out_dir = Path(out_dir)
+    if out_dir.parent == BATCH_DIR:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+# --- UI -------------------------------------------------------------------------------
+
+def show_report_export(inputs: Dict[str, object]):
+    """Step 15: PDF / Excel calc package of the current project."""
+    st.header("Calculation Report")
+    name = st.text_input("Project name", value=inputs.get("city") or "Project", key="report_name")
+    record = {**inputs, "name": name}
+    key = hashlib.sha256(repr(sorted((k, v) for k, v in record.items() if k != "widgets")).encode()).hexdigest()
+
+    if st.button("Generate calc package", key="report_generate"):
+        data = report_data(record)
+        st.session_state["report_files"] = {"key": key, "pdf": pdf_bytes(data), "xlsx": excel_bytes(data)}
+
+    files = st.session_state.get("report_files")
+    if files and files["key"] == key:
+        c1, c2 = st.columns(2)
+        c1.download_button("Download PDF", data=files["pdf"], file_name=f"{_slug(name)}_wind.pdf",
+                           mime="application/pdf", key="report_pdf")
+        c2.download_button("Download Excel", data=files["xlsx"], file_name=f"{_slug(name)}_wind.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                           key="report_xlsx")
+    elif files:
+        st.caption("Inputs changed since the last report; generate it again.")
+    st.markdown("---")
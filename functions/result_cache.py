@@ -0,0 +1,317 @@
+"""
+Content-addressed cache for complete wind load calculations.
+
+Results are stored under a SHA-256 of the exact inputs, so every session in
+the server process (and every process sharing the cache directory) reuses
+the same Kz, q, GCp and pressure tables for the same building parameters.
+
+Two tiers:
+    memory  LRU of the most recent results (WIND_RESULT_CACHE_ENTRIES, default 256)
+    disk    JSON results in WIND_RESULT_CACHE_DIR (created 0700), trimmed
+            least-recently-used first once the directory holds more than
+            WIND_RESULT_CACHE_MB (default 64)
+
+The disk tier holds plain JSON (floats and DataFrames in "split" layout), so
+reading an entry never executes code. The size cap applies to the directory
+as a whole: its total size is kept in a ".size" file that every write
+updates under an exclusive file lock, and only a write that takes it over
+the cap rescans and trims the directory, so processes sharing the directory
+trim it together. Disk reads, writes and (de)serialization run outside the
+in-memory LRU's lock, so sessions never wait on each other's disk I/O.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from functions.editions import DEFAULT_EDITION
+from functions.metrics import REGISTRY
+from functions.profiler import record_cache
+from functions.wind_load_results import compute_wind_loads
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cap is then enforced per process only
+    fcntl = None
+
+# Bump when the calculation changes so stale disk entries are never served.
+CALC_VERSION = 3
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "WIND_RESULT_CACHE_DIR",
+    Path.home() / ".cache" / "wind_load_calculator" / "results",
+))
+
+CACHE_EVICTIONS = REGISTRY.counter(
+    "wind_result_cache_evictions_total", "Result cache evictions by tier.", labelnames=("tier",))
+
+
+def normalize_inputs(height, V, exposure, Kd, gcpi_positive, gcpi_negative,
+                     edition=DEFAULT_EDITION) -> Dict[str, object]:
+    """
+    Inputs as plain floats and an upper-case exposure. Numbers are not
+    rounded: GCpi in particular may carry an Ri reduction, and the key (JSON,
+    i.e. the float repr) and the calculation both use the exact value.
+    """
+    return {
+        "edition": edition,
+        "height": float(height),
+        "V": float(V),
+        "exposure": str(exposure).strip().upper(),
+        "Kd": float(Kd),
+        "gcpi_positive": float(gcpi_positive),
+        "gcpi_negative": float(gcpi_negative),
+    }
+
+
+def cache_key(inputs: Dict[str, object]) -> str:
+    payload = json.dumps({"v": CALC_VERSION, **inputs}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def encode_results(value: Dict[str, object]) -> bytes:
+    """JSON for a results dict of numbers and DataFrames."""
+    out = {}
+    for k, v in value.items():
+        if isinstance(v, pd.DataFrame):
+            out[k] = {"frame": v.to_dict(orient="split", index=False)}
+        else:
+            out[k] = {"value": v}
+    return json.dumps(out, allow_nan=False).encode("utf-8")
+
+
+def decode_results(data: bytes) -> Dict[str, object]:
+    out = {}
+    for k, v in json.loads(data).items():
+        if "frame" in v:
+            out[k] = pd.DataFrame(v["frame"]["data"], columns=v["frame"]["columns"])
+        else:
+            out[k] = v["value"]
+    return out
+
+
+class ResultCache:
+    def __init__(self, directory: Optional[Path] = DEFAULT_CACHE_DIR, max_entries: int = 256,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        # Guards the memory LRU and the counters only, never disk I/O
+        self._memory: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "memory_evictions": 0, "disk_evictions": 0,
+        }
+        # Serializes this process's updates of the directory size (the file
+        # lock alone does not on platforms without fcntl)
+        self._disk_lock = threading.Lock()
+        self._disk_entries = 0
+        self._disk_bytes = 0
+        if self.directory is not None:
+            try:
+                self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+                with self._dir_lock():
+                    self._disk_bytes = self._trim_locked()
+                    self._write_size(self._disk_bytes)
+            except OSError:
+                self.directory = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    @contextmanager
+    def _dir_lock(self):
+        """Exclusive lock on the cache directory, shared by all processes using it."""
+        with self._disk_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.directory / ".lock", "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_size(self) -> Optional[int]:
+        try:
+            return int((self.directory / ".size").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, size: int) -> None:
+        (self.directory / ".size").write_text(str(int(size)))
+
+    def _trim_locked(self) -> int:
+        """
+        Deletes least-recently-used entries until the directory is within the
+        cap; returns its size. Scans the whole directory.
+        """
+        entries = []
+        for e in os.scandir(self.directory):
+            if e.name.endswith(".json"):
+                try:
+                    st_ = e.stat()
+                except OSError:
+                    continue
+                entries.append((st_.st_mtime, st_.st_size, e.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        n = len(entries)
+        evicted = 0
+        for _, size, path in entries[:-1]:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            n -= 1
+            evicted += 1
+        with self._lock:
+            self._stats["disk_evictions"] += evicted
+            self._disk_entries = n
+        if evicted:
+            CACHE_EVICTIONS.labels("disk").inc(evicted)
+        return total
+
+    def _remember_locked(self, key: str, value: Dict[str, object]) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+            CACHE_EVICTIONS.labels("memory").inc()
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, object]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            value = decode_results(path.read_bytes())
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return value
+
+    def _write_disk(self, key: str, value: Dict[str, object]) -> None:
+        if self.directory is None:
+            return
+        try:
+            data = encode_results(value)
+        except (TypeError, ValueError):
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.chmod(tmp, 0o600)
+            with self._dir_lock():
+                try:
+                    replaced = path.stat().st_size
+                except OSError:
+                    replaced = None
+                os.replace(tmp, path)
+                size = self._read_size()
+                if size is None:
+                    size = self._trim_locked()
+                else:
+                    size += len(data) - (replaced or 0)
+                    if replaced is None:
+                        with self._lock:
+                            self._disk_entries += 1
+                    if size > self.max_disk_bytes:
+                        size = self._trim_locked()
+                self._write_size(size)
+            with self._lock:
+                self._disk_bytes = size
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is not None:
+                self._remember_locked(key, value)
+                self._stats["disk_hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, object]) -> None:
+        with self._lock:
+            self._remember_locked(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, object]]) -> Dict[str, object]:
+        value = self.get(key)
+        record_cache("wind_results", value is not None)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses and evictions of both tiers; disk figures as of this process's last write."""
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide cache shared by all Streamlit sessions."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(
+                    max_entries=int(os.environ.get("WIND_RESULT_CACHE_ENTRIES", "256")),
+                    max_disk_bytes=int(float(os.environ.get("WIND_RESULT_CACHE_MB", "64")) * 1024 * 1024),
+                )
+    return _cache
+
+
+def wind_loads_key(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition=DEFAULT_EDITION) -> str:
+    return cache_key(normalize_inputs(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition))
+
+
+def cached_wind_loads(height, V, exposure, Kd, gcpi_positive, gcpi_negative,
+                      edition=DEFAULT_EDITION) -> Dict[str, object]:
+    """
+    `compute_wind_loads` behind the shared result cache. The returned DataFrames
+    are shared between sessions and must not be modified in place.
+    """
+    inputs = normalize_inputs(height, V, exposure, Kd, gcpi_positive, gcpi_negative, edition)
+    return get_result_cache().get_or_compute(
+        cache_key(inputs),
+        lambda: compute_wind_loads(**inputs),
+    )
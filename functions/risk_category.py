@@ -1,6 +1,8 @@
 import streamlit as st
 
-def risk_category():
+from functions.wind_regions import show_site_flags, site_flags
+
+def risk_category(site=None):
     st.header("Risk Category")
     risk_map = {
         "I": "Low risk to human life (e.g., storage, barns)",
@@ -9,7 +11,10 @@ def risk_category():
         "IV": "Essential facilities (hospitals, emergency services)"
     }
     category = st.selectbox("Select Risk Category", list(risk_map.keys()),
-                            format_func=lambda x: f"Category {x} – {risk_map[x].split('(')[0]}")
+                            format_func=lambda x: f"Category {x} – {risk_map[x].split('(')[0]}",
+                            key="risk_category")
     st.info(risk_map[category])
+    if site:
+        show_site_flags(site_flags(site["lat"], site["lon"], state=site["state"], risk_category=category))
     st.markdown("---")
     return category
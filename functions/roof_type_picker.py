@@ -21,7 +21,7 @@ def roof_type_picker(height_ft: float) -> dict:
     roof_high = roof_low_rise + ["Other / Not listed"]
 
     if h <= 60.0:
-        st.info("h ≤ 60 ft → Low-rise C&C path (ASCE 7-16 Chapter 30.3).")
+        st.info("h ≤ 60 ft → Low-rise C&C path (ASCE 7 Chapter 30).")
         roof = st.selectbox("Roof type:", roof_low_rise, key="roof_type_lowrise")
         ref = "Use Chapter 30.3 roof figures for (GCp) for the selected roof type."
         result = {"height_band": "<=60", "roof_type": roof, "ref": ref}
@@ -0,0 +1,335 @@
+"""
+Rooftop structures, equipment and solar panels (ASCE 7-16 Section 29.4).
+
+All calculations are vectorized over units / panels and use the velocity
+pressure at mean roof height, qh, from the Wind Pressure step. Forces and
+pressures are reported at ASD level (0.6 x strength), like the C&C tables.
+
+Equipment (29.4.1)
+    Fh = qh (GCr) Af,  (GCr) 1.9 for Af <= 0.1Bh, down to 1.0 at Af = Bh
+    Fv = qh (GCr) Ar,  (GCr) 1.5 for Ar <= 0.1BL, down to 1.0 at Ar = BL
+
+Solar panels parallel to the roof (29.4.4)
+    p = qh (GCp) gamma_E gamma_a, with (GCp) the roof C&C coefficient of the
+    panel's roof zone at the panel area.
+
+Tilted solar panels (29.4.3)
+    p = qh (GCrn), (GCrn) = gamma_p gamma_c gamma_E (GCrn)nom. The nominal
+    coefficients are read by the user from Figure 29.4-7 at the normalized
+    area An computed here; they are not tabulated in this module.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from functions.GCP_h_Less_than_60 import get_roof_gcp_data
+from functions.cc_zones import rect_roof_zones, roof_zone_widths
+from functions.editions import DEFAULT_EDITION
+
+ASD = 0.6
+
+GAMMA_E_EXPOSED = 1.5
+
+
+# --- equipment (29.4.1) ------------------------------------------------------
+
+def equipment_gcr_lateral(Af, B, h):
+    """(GCr) for the horizontal force, by Af / (B h)."""
+    return np.interp(np.asarray(Af, dtype=float) / (B * h), [0.1, 1.0], [1.9, 1.0])
+
+
+def equipment_gcr_uplift(Ar, B, L):
+    """(GCr) for the vertical uplift force, by Ar / (B L)."""
+    return np.interp(np.asarray(Ar, dtype=float) / (B * L), [0.1, 1.0], [1.5, 1.0])
+
+
+def equipment_forces(units: pd.DataFrame, qh, h, least_width, longest_width) -> pd.DataFrame:
+    """
+    ASD lateral and uplift force per unit.
+
+    units has columns name, width, depth, height (ft); width runs parallel to
+    the longest building side. Both wind directions are checked, with B the
+    building dimension normal to the wind, and the larger lateral force is
+    reported as governing.
+    """
+    width = units["width"].to_numpy(float)
+    depth = units["depth"].to_numpy(float)
+    height = units["height"].to_numpy(float)
+
+    # Wind normal to the longest side: face width x height, B = longest width
+    af_long = width * height
+    gcr_long = equipment_gcr_lateral(af_long, longest_width, h)
+    # Wind normal to the least side: face depth x height, B = least width
+    af_short = depth * height
+    gcr_short = equipment_gcr_lateral(af_short, least_width, h)
+
+    ar = width * depth
+    gcr_v = equipment_gcr_uplift(ar, least_width, longest_width)
+
+    fh_long = ASD * qh * gcr_long * af_long
+    fh_short = ASD * qh * gcr_short * af_short
+
+    return pd.DataFrame({
+        "Unit": units["name"].astype(str).to_numpy(),
+        "Af ⊥ long side (sf)": af_long,
+        "GCr ⊥ long side": gcr_long,
+        "Fh ⊥ long side (lb)": fh_long,
+        "Af ⊥ short side (sf)": af_short,
+        "GCr ⊥ short side": gcr_short,
+        "Fh ⊥ short side (lb)": fh_short,
+        "Fh governing (lb)": np.maximum(fh_long, fh_short),
+        "Ar (sf)": ar,
+        "GCr uplift": gcr_v,
+        "Fv uplift (lb)": ASD * qh * gcr_v * ar,
+    })
+
+
+# --- solar arrays ----------------------------------------------------------------
+
+# Default array: panel size (ft), gap (ft), setback from the roof edges (ft,
+# at most 10% of the roof dimension) and the most columns / rows filled in
+PV_PANEL_LENGTH = 5.5
+PV_PANEL_WIDTH = 3.4
+PV_GAP = 0.1
+PV_SETBACK = 10.0
+PV_MAX_COLS, PV_MAX_ROWS = 20, 10
+
+
+def default_solar_array(roof_length, roof_width, panel_length=PV_PANEL_LENGTH, panel_width=PV_PANEL_WIDTH,
+                        gap=PV_GAP) -> Tuple[int, int, float, float]:
+    """(n_cols, n_rows, x0, y0) of a default array that fits on the roof."""
+    def fit(extent, size, most):
+        setback = min(PV_SETBACK, 0.1 * extent)
+        n = int(np.floor((extent - 2 * setback + gap) / (size + gap)))
+        return max(1, min(most, n)), setback
+
+    n_cols, x0 = fit(float(roof_length), panel_length, PV_MAX_COLS)
+    n_rows, y0 = fit(float(roof_width), panel_width, PV_MAX_ROWS)
+    return n_cols, n_rows, x0, y0
+
+
+def layout_solar_array(roof_length, roof_width, x0, y0, n_cols, n_rows, panel_length, panel_width,
+                       gap=0.0) -> Dict[str, np.ndarray]:
+    """
+    Rectangular array of identical panels on a rectangular roof.
+
+    Columns run along the roof length (x), rows along the width (y); panel
+    length is along x. Returns per-panel row, col and x0/x1/y0/y1 (ft).
+    Panels that would overhang the roof raise ValueError.
+    """
+    r, c = np.meshgrid(np.arange(n_rows), np.arange(n_cols), indexing="ij")
+    r, c = r.ravel(), c.ravel()
+    px0 = x0 + c * (panel_length + gap)
+    py0 = y0 + r * (panel_width + gap)
+    panels = {
+        "row": r, "col": c,
+        "x0": px0, "x1": px0 + panel_length,
+        "y0": py0, "y1": py0 + panel_width,
+    }
+    if (x0 < 0 or y0 < 0 or panels["x1"].max() > roof_length + 1e-9
+            or panels["y1"].max() > roof_width + 1e-9):
+        raise ValueError("The array does not fit on the roof at this position.")
+    return panels
+
+
+def roof_zones(panels, roof_length, roof_width, widths) -> np.ndarray:
+    """
+    Roof C&C zone (1, 2 or 3) of each panel: the highest zone the panel
+    reaches, with the edition's zone widths (functions.cc_zones).
+    """
+    return rect_roof_zones(panels["x0"], panels["y0"], panels["x1"], panels["y1"],
+                           roof_length, roof_width, widths)
+
+
+def exposed_panels(panels, roof_length, roof_width, h, panel_length):
+    """
+    gamma_E position factor per panel (simplified for one array).
+
+    A panel is exposed when it lies within 1.5 Lp of an edge of the array
+    and that array edge is more than 0.5h from the parallel roof edge.
+    """
+    ax0, ax1 = panels["x0"].min(), panels["x1"].max()
+    ay0, ay1 = panels["y0"].min(), panels["y1"].max()
+    reach = 1.5 * panel_length
+    exposed_edge = {
+        "x0": ax0 > 0.5 * h, "x1": roof_length - ax1 > 0.5 * h,
+        "y0": ay0 > 0.5 * h, "y1": roof_width - ay1 > 0.5 * h,
+    }
+    exposed = (
+        (exposed_edge["x0"] & (panels["x0"] - ax0 < reach))
+        | (exposed_edge["x1"] & (ax1 - panels["x1"] < reach))
+        | (exposed_edge["y0"] & (panels["y0"] - ay0 < reach))
+        | (exposed_edge["y1"] & (ay1 - panels["y1"] < reach))
+    )
+    return np.where(exposed, GAMMA_E_EXPOSED, 1.0)
+
+
+def gamma_a(area):
+    """Solar panel pressure equalization factor (Figure 29.4-8), by panel area (sf)."""
+    return np.interp(np.log10(np.asarray(area, dtype=float)), [1.0, 2.0], [0.8, 0.4])
+
+
+def roof_gcp_array(area, zone, edition=DEFAULT_EDITION):
+    """
+    Roof C&C GCp (negative for zone 1/2/3, and the Zone 1 positive value) at
+    effective areas `area`, interpolated on log(area) like interpolate_gcp.
+    """
+    df = get_roof_gcp_data(edition)
+    log_a = np.log10(df["Area (sf)"].to_numpy(float))
+    x = np.log10(np.asarray(area, dtype=float))
+    zone = np.asarray(zone)
+    negative = np.select(
+        [zone == 1, zone == 2, zone == 3],
+        [np.interp(x, log_a, df[f"Zone {z} Negative"].to_numpy()) for z in (1, 2, 3)],
+    )
+    positive = np.interp(x, log_a, df["Zone 1 Positive"].to_numpy())
+    return np.broadcast_to(positive, negative.shape), negative
+
+
+def normalized_area(area, h, longest_width, least_width):
+    """
+    An = 1000 A / max(Lb, 15)^2 with Lb = min(0.4 sqrt(h WL), h, Ws)
+    (Section 29.4.3), WL and Ws the longest and least building widths.
+    """
+    Lb = min(0.4 * np.sqrt(h * longest_width), h, least_width)
+    return 1000.0 * np.asarray(area, dtype=float) / max(Lb, 15.0) ** 2
+
+
+def tilted_gammas(h, panel_height_above_roof, panel_chord):
+    """Array edge factor gamma_p and panel chord factor gamma_c (Section 29.4.3)."""
+    gamma_p = min(1.2, 0.9 + panel_height_above_roof / h)
+    gamma_c = max(0.6 + 0.06 * panel_chord, 0.8)
+    return gamma_p, gamma_c
+
+
+def solar_panel_loads(panels, qh, h, roof_length, roof_width, panel_length, panel_width,
+                      tilted_nominal=None, panel_height_above_roof=0.0,
+                      edition=DEFAULT_EDITION) -> pd.DataFrame:
+    """
+    ASD pressure and force on every panel.
+
+    With tilted_nominal=None the panels are treated as parallel to the roof
+    (29.4.4). Otherwise tilted_nominal maps roof zone 1/2/3 to the uplift
+    (GCrn)nom from Figure 29.4-7 at the array's normalized area (29.4.3).
+    Roof zones and GCp follow the edition.
+    """
+    widths = roof_zone_widths(min(roof_length, roof_width), h, edition)
+    zone = roof_zones(panels, roof_length, roof_width, widths)
+    gamma_e = exposed_panels(panels, roof_length, roof_width, h, panel_length)
+    area = float(panel_length * panel_width)
+
+    if tilted_nominal is None:
+        positive, negative = roof_gcp_array(np.full(zone.shape, area), zone, edition)
+        ga = float(gamma_a(area))
+        uplift_coeff = negative * gamma_e * ga
+        down_coeff = positive * ga
+    else:
+        gamma_p, gamma_c = tilted_gammas(h, panel_height_above_roof, panel_length)
+        nominal = np.select([zone == 1, zone == 2, zone == 3],
+                            [-abs(float(tilted_nominal[z])) for z in (1, 2, 3)])
+        uplift_coeff = gamma_p * gamma_c * gamma_e * nominal
+        down_coeff = np.zeros(zone.shape)
+
+    uplift = ASD * qh * uplift_coeff
+    down = ASD * qh * down_coeff
+    return pd.DataFrame({
+        "Row": panels["row"],
+        "Col": panels["col"],
+        "Roof Zone": zone,
+        "γE": gamma_e,
+        "Uplift Coefficient": uplift_coeff,
+        "Uplift (psf)": uplift,
+        "Uplift Force (lb)": uplift * area,
+        "Downward (psf)": down,
+        "Downward Force (lb)": down * area,
+    })
+
+
+# --- UI ---------------------------------------------------------------------------
+
+DEFAULT_UNITS = pd.DataFrame({
+    "name": ["RTU-1"],
+    "width": [8.0],
+    "depth": [5.0],
+    "height": [4.0],
+})
+
+
+def show_rooftop_loads(least_width, longest_width, height, edition=DEFAULT_EDITION):
+    st.header("Rooftop Equipment & Solar Panels (Section 29.4)")
+
+    wp = st.session_state.get("wind_pressure")
+    if wp is None:
+        st.info("Complete the Wind Pressure step first (qh is needed).")
+        st.markdown("---")
+        return
+    qh = wp["q"]
+    st.caption(f"qh = {qh:.2f} psf from the Wind Pressure step · ASD forces (0.6 × strength level)")
+
+    tab_eq, tab_pv = st.tabs(["Equipment", "Solar Array"])
+
+    with tab_eq:
+        units = st.data_editor(DEFAULT_UNITS, num_rows="dynamic", key="rt_units", width="stretch")
+        units = units.dropna()
+        if len(units):
+            st.dataframe(
+                equipment_forces(units, qh, height, least_width, longest_width).round(2),
+                width="stretch", hide_index=True,
+            )
+
+    with tab_pv:
+        roof_length = float(st.session_state.get("bd_ns", longest_width))
+        roof_width = float(st.session_state.get("bd_ew", least_width))
+
+        # Defaults sized to the roof, so the first render is a valid array
+        d_cols, d_rows, d_x0, d_y0 = default_solar_array(roof_length, roof_width)
+        c1, c2, c3, c4 = st.columns(4)
+        n_cols = int(c1.number_input("Columns (along N–S)", min_value=1, value=d_cols, key="pv_cols"))
+        n_rows = int(c2.number_input("Rows (along E–W)", min_value=1, value=d_rows, key="pv_rows"))
+        panel_length = c3.number_input("Panel length (ft)", min_value=0.5, value=PV_PANEL_LENGTH, key="pv_len")
+        panel_width = c4.number_input("Panel width (ft)", min_value=0.5, value=PV_PANEL_WIDTH, key="pv_wid")
+
+        c1, c2, c3 = st.columns(3)
+        x0 = c1.number_input("Offset from N–S origin edge (ft)", min_value=0.0, value=d_x0, key="pv_x0")
+        y0 = c2.number_input("Offset from E–W origin edge (ft)", min_value=0.0, value=d_y0, key="pv_y0")
+        gap = c3.number_input("Gap between panels (ft)", min_value=0.0, value=PV_GAP, key="pv_gap")
+
+        tilted = st.toggle("Tilted panels (Section 29.4.3)", key="pv_tilted")
+        nominal, lift = None, 0.0
+        if tilted:
+            area = panel_length * panel_width
+            An = float(normalized_area(area, height, longest_width, least_width))
+            st.caption(f"Normalized wind area An = {An:.0f} sf; read (GCrn)nom for each zone from Figure 29.4-7.")
+            c1, c2, c3, c4 = st.columns(4)
+            nominal = {
+                z: col.number_input(f"(GCrn)nom Zone {z}", min_value=0.0, value=0.0, key=f"pv_gcrn_{z}")
+                for col, z in zip((c1, c2, c3), (1, 2, 3))
+            }
+            lift = c4.number_input("Panel height above roof h2 (ft)", min_value=0.0, value=1.0, key="pv_h2")
+
+        try:
+            panels = layout_solar_array(roof_length, roof_width, x0, y0, n_cols, n_rows,
+                                        panel_length, panel_width, gap)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            df = solar_panel_loads(panels, qh, height, roof_length, roof_width, panel_length, panel_width,
+                                   tilted_nominal=nominal, panel_height_above_roof=lift, edition=edition)
+            summary = df.groupby(["Roof Zone", "γE"]).agg(**{
+                "Panels": ("Row", "size"),
+                "Uplift (psf)": ("Uplift (psf)", "min"),
+                "Uplift Force (lb)": ("Uplift Force (lb)", "min"),
+                "Downward (psf)": ("Downward (psf)", "max"),
+            }).reset_index()
+            st.dataframe(summary.round(2), width="stretch", hide_index=True)
+            st.download_button(
+                "Download panel loads (CSV)",
+                data=df.to_csv(index=False),
+                file_name="solar_panel_loads.csv",
+                mime="text/csv",
+                key="pv_download",
+            )
+
+    st.markdown("---")
@@ -0,0 +1,194 @@
+"""
+What-if scenarios branched from the current project.
+
+A scenario stores only the inputs it overrides (e.g. {"exposure": "D"});
+everything else is read through a ChainMap from the base project, so a
+session keeps a few small dicts however many scenarios are open.
+
+Results are read from the shared result cache under the scenario's own input
+key, so a scenario matching a computed project reuses its results. On a miss
+they are derived from the base project's results, reusing its Kz, q, GCp
+tables and pressure table wherever the inputs they depend on are unchanged,
+so e.g. an enclosure scenario only builds a new pressure table and the
+DataFrames it shares are the base's own objects. Derived results are cached
+under a separate "scenario-" key and never stand in for a full calculation.
+"""
+from collections import ChainMap
+from typing import Dict, List, Mapping
+
+import pandas as pd
+import streamlit as st
+
+from functions.Kz import compute_kz
+from functions.editions import EDITIONS, load_edition
+from functions.internal_pressure import ENCLOSURE_DATA
+from functions.pressure_calculation import velocity_pressure
+from functions.pressure_table import create_wall_pressure_table
+from functions.result_cache import get_result_cache, wind_loads_key
+
+# Inputs a scenario can override, with their labels
+SCENARIO_FIELDS = {
+    "height": "Mean roof height (ft)",
+    "V": "V (mph)",
+    "exposure": "Exposure",
+    "Kd": "Kd",
+    "enclosure": "Enclosure",
+    "edition": "Edition",
+}
+
+# Inputs each shared intermediate result depends on
+KZ_FIELDS = ("height", "exposure", "edition")
+Q_FIELDS = KZ_FIELDS + ("V", "Kd")
+PRESSURE_FIELDS = Q_FIELDS + ("gcpi_positive", "gcpi_negative")
+
+
+def scenario_inputs(base: Mapping[str, object], overrides: Mapping[str, object]) -> ChainMap:
+    """
+    The scenario's full inputs as a ChainMap over the base. GCpi follows the
+    enclosure (or edition) override from that edition's table; without either
+    the base's GCpi, which may come from the opening inventory, is kept.
+    """
+    derived = {}
+    if "enclosure" in overrides or "edition" in overrides:
+        edition = overrides.get("edition", base["edition"])
+        enclosure = overrides.get("enclosure", base["enclosure"])
+        gcpi = load_edition(edition).gcpi
+        if enclosure not in gcpi:
+            raise ValueError(f"“{enclosure}” is not a classification in {edition}.")
+        derived["gcpi_positive"], derived["gcpi_negative"] = gcpi[enclosure]
+    return ChainMap(dict(overrides), derived, base)
+
+
+def _derive_results(s: Mapping[str, object], base: Mapping[str, object],
+                    base_results: Dict[str, object]) -> Dict[str, object]:
+    same = lambda fields: all(s[f] == base[f] for f in fields)
+    ed = load_edition(s["edition"])
+
+    Kz = base_results["Kz"] if same(KZ_FIELDS) else float(compute_kz(s["height"], s["exposure"], edition=s["edition"]))
+    q = base_results["q"] if same(Q_FIELDS) else velocity_pressure(Kz, s["Kd"], float(s["V"]))
+    return {
+        "Kz": Kz,
+        "q": q,
+        "wall_gcp": base_results["wall_gcp"] if same(("edition",)) else ed.gcp_table(),
+        "roof_gcp": base_results["roof_gcp"] if same(("edition",)) else ed.roof_gcp_table(),
+        "wall_pressure": base_results["wall_pressure"] if same(PRESSURE_FIELDS) else create_wall_pressure_table(
+            q, s["gcpi_positive"], s["gcpi_negative"], gcp_source=ed
+        ),
+    }
+
+
+def scenario_results(base: Mapping[str, object], base_results: Dict[str, object],
+                     overrides: Mapping[str, object]) -> Dict[str, object]:
+    """
+    Results of one scenario: the full calculation's if the cache holds it,
+    otherwise derived from the base and cached under the scenario namespace.
+    """
+    s = scenario_inputs(base, overrides)
+    key = wind_loads_key(s["height"], s["V"], s["exposure"], s["Kd"],
+                         s["gcpi_positive"], s["gcpi_negative"], s["edition"])
+    cache = get_result_cache()
+    return cache.get(key) or cache.get_or_compute(f"scenario-{key}", lambda: _derive_results(s, base, base_results))
+
+
+def _format(value) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def compare_scenarios(base: Mapping[str, object], base_results: Dict[str, object],
+                      scenarios: Mapping[str, Mapping[str, object]], area: float) -> pd.DataFrame:
+    """
+    One row per scenario (base first): what it changes, Kz, q and the wall
+    pressures at `area`, with the change of each pressure relative to the base.
+    """
+    rows: List[Dict[str, object]] = []
+    for name, overrides in [("Base", {}), *scenarios.items()]:
+        try:
+            results = base_results if not overrides else scenario_results(base, base_results, overrides)
+        except ValueError as e:
+            rows.append({"Scenario": name, "Changes": str(e)})
+            continue
+        table = results["wall_pressure"].set_index("Effective Area (sf)")
+        changes = "; ".join(
+            f"{SCENARIO_FIELDS[f]}: {_format(base[f])} → {_format(v)}" for f, v in overrides.items()
+        )
+        rows.append({
+            "Scenario": name,
+            "Changes": changes or "—",
+            "Kz": results["Kz"],
+            "q (psf)": results["q"],
+            **table.loc[area].to_dict(),
+        })
+
+    df = pd.DataFrame(rows)
+    pressure_cols = [c for c in df.columns if c.endswith("(psf)") and c != "q (psf)"]
+    for c in pressure_cols:
+        df[f"Δ {c.replace(' (psf)', '')} (%)"] = (df[c] / df.loc[0, c] - 1.0) * 100.0
+    return df
+
+
+def _add_scenario(base):
+    name = st.session_state["scn_name"].strip() or f"Scenario {len(st.session_state['scenarios']) + 1}"
+    overrides = {}
+    for field in SCENARIO_FIELDS:
+        value = st.session_state[f"scn_{field}"]
+        if isinstance(base[field], float):
+            value = float(value)
+        if value != base[field]:
+            overrides[field] = value
+    if not overrides:
+        st.session_state["scn_message"] = "The scenario doesn't change any input."
+        return
+    st.session_state["scenarios"][name] = overrides
+
+
+def _delete_scenario(name):
+    st.session_state["scenarios"].pop(name, None)
+
+
+def show_scenarios(base: Mapping[str, object], base_results: Dict[str, object]) -> None:
+    """
+    Streamlit step: named what-if scenarios over the current project
+    (collect_project_inputs) and a side-by-side comparison. The scenario form
+    only reruns the app when a scenario is added.
+    """
+    st.header("Scenarios")
+    scenarios = st.session_state.setdefault("scenarios", {})
+
+    with st.form("scn_form", clear_on_submit=True):
+        st.text_input("Scenario name", key="scn_name", placeholder="e.g. Exposure D, partially enclosed")
+        c1, c2, c3 = st.columns(3)
+        c1.number_input(SCENARIO_FIELDS["height"], min_value=0.01, value=float(base["height"]),
+                        format="%.2f", key="scn_height")
+        c2.number_input(SCENARIO_FIELDS["V"], min_value=0.0, value=float(base["V"]), key="scn_V")
+        c3.number_input(SCENARIO_FIELDS["Kd"], min_value=0.0, max_value=1.0, value=float(base["Kd"]),
+                        key="scn_Kd")
+        c1, c2, c3 = st.columns(3)
+        exposures = ["B", "C", "D"]
+        c1.selectbox(SCENARIO_FIELDS["exposure"], exposures, index=exposures.index(base["exposure"]),
+                     key="scn_exposure")
+        enclosures = list(ENCLOSURE_DATA)
+        c2.selectbox(SCENARIO_FIELDS["enclosure"], enclosures,
+                     index=enclosures.index(base["enclosure"]),
+                     key="scn_enclosure")
+        c3.selectbox(SCENARIO_FIELDS["edition"], EDITIONS, index=list(EDITIONS).index(base["edition"]),
+                     key="scn_edition")
+        st.form_submit_button("Add scenario", on_click=_add_scenario, args=(base,))
+
+    message = st.session_state.pop("scn_message", None)
+    if message:
+        st.warning(message)
+
+    if scenarios:
+        for name in list(scenarios):
+            c1, c2 = st.columns([4, 1])
+            c1.markdown(f"**{name}** · " + ", ".join(f"{f} = {_format(v)}" for f, v in scenarios[name].items()))
+            c2.button("Remove", key=f"scn_delete_{name}", on_click=_delete_scenario, args=(name,))
+
+        areas = base_results["wall_pressure"]["Effective Area (sf)"].tolist()
+        area = st.select_slider("Effective wind area (ft²)", options=areas, key="scn_area")
+        df = compare_scenarios(base, base_results, scenarios, area)
+        st.dataframe(df.round(3), width="stretch", hide_index=True)
+        st.caption("Δ columns are relative to the base project. Scenarios store only the inputs they change.")
+    else:
+        st.caption("Add a scenario to compare it with the current inputs.")
+    st.markdown("---")
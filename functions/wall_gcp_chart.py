@@ -1,53 +1,30 @@
-import math
 import numpy as np
 import plotly.graph_objects as go
 
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.plot_encoding import decimate_curves
 
-def wall_gcp(area):
 
+def wall_gcp(area, edition=DEFAULT_EDITION):
+    """
+    Wall GCp (positive, zone4, zone5) at an effective wind area (sf), from
+    the edition's Figure 30.3-1 (7-10: Figure 30.4-1) curve.
+    """
+    return load_edition(edition).wall_gcp(area)
 
-    if area <=10:
 
-        return (
-            1.0,
-            -1.1,
-            -1.4
-        )
-
-
-    elif area <=500:
-
-        logA = math.log10(area)
-
-        positive = (
-            1.1766 -
-            0.1766*logA
-        )
-
-        zone4 = (
-            -1.2766 +
-            0.1766*logA
-        )
-
-        zone5 = (
-            -1.7532 +
-            0.3532*logA
-        )
-
-        return positive, zone4, zone5
 
+def wall_gcp_array(area, edition=DEFAULT_EDITION):
+    """
+    Vectorized `wall_gcp` for an array of effective wind areas (sf).
 
-    else:
+    Returns (positive, zone4, zone5) arrays with the same shape as `area`.
+    """
+    return load_edition(edition).wall_gcp_array(area)
 
-        return (
-            0.7,
-            -0.8,
-            -0.8
-        )
 
 
-
-def create_wall_chart(selected_area):
+def create_wall_chart(selected_area, edition=DEFAULT_EDITION):
 
 
     x = np.logspace(
@@ -57,22 +34,17 @@ def create_wall_chart(selected_area):
     )
 
 
-    pos=[]
-    z4=[]
-    z5=[]
-
-
-    for a in x:
-
-        p,z4n,z5n = wall_gcp(a)
-
-        pos.append(p)
-        z4.append(z4n)
-        z5.append(z5n)
+    # The curves are linear in log(area) between the plateaus, so only the
+    # corner samples are needed to draw them exactly.
+    x, (pos, z4, z5) = decimate_curves(
+        x,
+        wall_gcp_array(x, edition),
+        log_x=True
+    )
 
 
 
-    selected = wall_gcp(selected_area)
+    selected = wall_gcp(selected_area, edition)
 
 
     fig=go.Figure()
@@ -127,7 +99,7 @@ def create_wall_chart(selected_area):
 
     fig.update_layout(
         title=
-        "Components and Cladding [h ≤ 60 ft] (Figure 30.3-1)",
+        f"Components and Cladding [h ≤ 60 ft] ({edition} {load_edition(edition).wall_gcp_source})",
         height=600
     )
 
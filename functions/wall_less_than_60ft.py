@@ -1,45 +1,60 @@
 import streamlit as st
 
+from functions.profiler import span
+
 from functions.pressure_table import create_wall_pressure_table
 
-from functions.GCP_h_Less_than_60 import (
-    get_wall_gcp_data,
-    get_roof_gcp_data
-)
+from functions.wall_gcp_chart import create_wall_chart
 
-from functions.wall_gcp_chart import (
-    create_wall_chart,
-    wall_gcp
-)
+from functions.cc_zones import roof_zone_widths
+from functions.cladding_layout import zone_width_a
+from functions.create_building_visualisation import create_pressure_visualisation
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.footprint import preset_footprint, wall_segments
+from functions.wind_load_results import governing_zone_pressures
 
 
 def show_wall_less_than_60ft(
     height,
     q,
     gcpi_positive,
-    gcpi_negative
+    gcpi_negative,
+    results=None,
+    dims=None,
+    gcp_source=None,
+    edition=DEFAULT_EDITION,
+    footprint=None
 ):
 
     if height >= 60:
         return
 
 
+    ed = load_edition(edition)
     st.header(
-        "ASCE 7-16 Components & Cladding"
+        f"{edition} Components & Cladding"
     )
 
 
-    pressure_df = create_wall_pressure_table(
-        q,
-        gcpi_positive,
-        gcpi_negative
-    )
+    # results: output of compute_wind_loads (usually from the shared result cache)
+    # gcp_source: custom GCp (e.g. wind-tunnel data) in place of the edition's curve
+    if results is not None and gcp_source is None:
+        pressure_df = results["wall_pressure"]
+    else:
+        with span("table_build"):
+            pressure_df = create_wall_pressure_table(
+                q,
+                gcpi_positive,
+                gcpi_negative,
+                gcp_source=gcp_source or ed
+            )
 
 
-    tab1, tab2 = st.tabs(
+    tab1, tab2, tab3 = st.tabs(
         [
             "Wall GCp",
-            "Pressure Table"
+            "Pressure Table",
+            "3D Pressure Map"
         ]
     )
 
@@ -53,7 +68,7 @@ def show_wall_less_than_60ft(
         st.markdown(
             "### Components and Cladding "
             "[h ≤ 60 ft (h ≤ 18.3 m)] "
-            "(Figure 30.3-1)"
+            f"({ed.wall_gcp_source})"
         )
 
 
@@ -61,11 +76,13 @@ def show_wall_less_than_60ft(
             "Effective Wind Area (ft²)",
             min_value=1,
             max_value=1000,
-            value=10
+            value=10,
+            key="wall_cc_area"
         )
 
 
-        positive, z4, z5 = wall_gcp(area)
+        gcp = gcp_source or ed
+        positive, z4, z5 = gcp(area)
         pressure1 = 0.6*q*(positive-gcpi_negative)
         pressure2 = 0.6*q*(z4-gcpi_negative)
         pressure3 = 0.6*q*(z5 - gcpi_positive)
@@ -82,11 +99,12 @@ def show_wall_less_than_60ft(
         with col5:st.metric("ASD Pressure Z4 Negative", f"{pressure2:+.2f} psf")
         with col6:st.metric("ASD Pressure Z5 Negative", f"{pressure3:+.2f} psf")
 
-        fig = create_wall_chart(area)
+        with span("plotly_figure"):
+            fig = create_wall_chart(area, edition)
 
         st.plotly_chart(
             fig,
-            use_container_width=True
+            width="stretch"
         )
 
 
@@ -95,7 +113,11 @@ def show_wall_less_than_60ft(
         )
 
 
-        wall_df = get_wall_gcp_data()
+        if gcp_source is not None:
+            st.caption(f"GCp values from wind-tunnel data; the chart shows {ed.wall_gcp_source} for reference.")
+            wall_df = gcp_source.gcp_table()
+        else:
+            wall_df = results["wall_gcp"] if results is not None else ed.gcp_table()
 
 
         st.dataframe(
@@ -111,7 +133,7 @@ def show_wall_less_than_60ft(
 
     with tab2:
 
-        st.markdown("### ASD Components and Cladding Design Load [h ≤ 60 ft (h ≤ 18.3 m)] (Figure 30.3-1)")
+        st.markdown(f"### ASD Components and Cladding Design Load [h ≤ 60 ft (h ≤ 18.3 m)] ({ed.wall_gcp_source})")
 
         st.caption(
             f"q = {q:.2f} psf | "
@@ -125,3 +147,42 @@ def show_wall_less_than_60ft(
             width="stretch",
             hide_index=True
         )
+
+
+    # -------------------------
+    # 3D PRESSURE MAP TAB
+    # -------------------------
+
+    with tab3:
+
+        if dims is None and footprint is None:
+            st.info("Building plan dimensions are needed for the 3D pressure map.")
+            return
+
+        # footprint: polygon-mode footprint (building_dimension); else the dims rectangle
+        if footprint is not None:
+            rings, walls, a, least = footprint["rings"], footprint["walls"], footprint["a"], footprint["least"]
+        else:
+            ns, ew = dims
+            least = min(ns, ew)
+            a = zone_width_a(least, height)
+            rings = preset_footprint("Rectangle", ns, ew)
+            walls = wall_segments(rings, a)
+        widths = roof_zone_widths(least, height, edition)
+        zone_pressures = governing_zone_pressures(q, gcpi_positive, gcpi_negative, area, edition,
+                                                  gcp_source=gcp_source)
+
+        st.caption(
+            f"Governing ASD pressures at {area} ft² effective area · "
+            f"wall zone width a = {a:.2f} ft · roof Zone 2 width {widths.edge:.2f} ft "
+            f"({ed.roof_gcp_source})"
+            + (" · wall GCp from wind-tunnel data" if gcp_source is not None else "")
+        )
+
+        with span("plotly_figure"):
+            fig3d = create_pressure_visualisation(rings, height, walls, widths, zone_pressures)
+
+        st.plotly_chart(
+            fig3d,
+            width="stretch"
+        )
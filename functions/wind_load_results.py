@@ -0,0 +1,91 @@
+from typing import Dict
+
+import numpy as np
+
+from functions.Kz import compute_kz, compute_kz_array
+from functions.GCP_h_Less_than_60 import get_roof_gcp_data
+from functions.editions import DEFAULT_EDITION, load_edition
+from functions.gcp_interpolation import interpolate_gcp
+from functions.pressure_calculation import velocity_pressure, calculate_pressure
+from functions.pressure_table import create_wall_pressure_table
+from functions.wall_gcp_chart import wall_gcp, wall_gcp_array
+
+
+def compute_wind_loads(height, V, exposure, Kd, gcpi_positive, gcpi_negative,
+                       edition=DEFAULT_EDITION) -> Dict[str, object]:
+    """
+    Full C&C calculation for one set of inputs, without any Streamlit output.
+    Kz, wall and roof GCp come from the given ASCE 7 edition's coefficient set.
+
+    Returns
+    -------
+    dict
+        Kz, q, and the wall GCp, roof GCp and wall pressure DataFrames.
+    """
+    ed = load_edition(edition)
+    Kz = float(compute_kz(height, exposure, edition=edition))
+    q = velocity_pressure(Kz, Kd, float(V))
+
+    return {
+        "Kz": Kz,
+        "q": q,
+        "wall_gcp": ed.gcp_table(),
+        "roof_gcp": ed.roof_gcp_table(),
+        "wall_pressure": create_wall_pressure_table(q, gcpi_positive, gcpi_negative, gcp_source=ed),
+    }
+
+
+
+def compute_wind_loads_batch(height, V, exposure, Kd, gcpi_positive, gcpi_negative, area,
+                             edition=DEFAULT_EDITION) -> Dict[str, np.ndarray]:
+    """
+    Vectorized Kz, q, wall GCp and wall C&C pressures for many buildings.
+
+    All arguments but `edition` are arrays of equal length (or scalars that
+    broadcast); `exposure` may be a single category or one per building.
+    """
+    height = np.asarray(height, dtype=float)
+    V = np.asarray(V, dtype=float)
+    gcpi_positive = np.asarray(gcpi_positive, dtype=float)
+    gcpi_negative = np.asarray(gcpi_negative, dtype=float)
+
+    Kz = compute_kz_array(height, exposure, edition)
+    q = velocity_pressure(Kz, np.asarray(Kd, dtype=float), V)
+    positive, z4, z5 = wall_gcp_array(area, edition)
+
+    return {
+        "Kz": Kz,
+        "q": q,
+        "gcp_positive": positive,
+        "gcp_zone4": z4,
+        "gcp_zone5": z5,
+        "zone45_positive": calculate_pressure(q, positive, gcpi_positive, gcpi_negative, "positive"),
+        "zone4_negative": calculate_pressure(q, z4, gcpi_positive, gcpi_negative, "negative"),
+        "zone5_negative": calculate_pressure(q, z5, gcpi_positive, gcpi_negative, "negative"),
+    }
+
+
+def governing_zone_pressures(q, gcpi_positive, gcpi_negative, area, edition=DEFAULT_EDITION,
+                             gcp_source=None) -> Dict[str, float]:
+    """
+    Governing (largest magnitude, signed) ASD pressure for wall Zones 4/5 and
+    roof Zones 1/2/3 at one effective wind area, with the edition's GCp.
+    A gcp_source (e.g. wind-tunnel data) replaces the edition's wall GCp;
+    roof GCp always come from the edition.
+    """
+    def governing(positive, negative):
+        p = calculate_pressure(q, positive, gcpi_positive, gcpi_negative, "positive")
+        n = calculate_pressure(q, negative, gcpi_positive, gcpi_negative, "negative")
+        return p if abs(p) > abs(n) else n
+
+    positive, z4, z5 = gcp_source(area) if gcp_source is not None else wall_gcp(area, edition)
+    roof = get_roof_gcp_data(edition)
+    roof_positive = interpolate_gcp(area, roof, "Zone 1 Positive")
+
+    pressures = {
+        "Zone 4": governing(positive, z4),
+        "Zone 5": governing(positive, z5),
+    }
+    for zone in ("Zone 1", "Zone 2", "Zone 3"):
+        pressures[zone] = governing(roof_positive, interpolate_gcp(area, roof, f"{zone} Negative"))
+    return pressures
@@ -1,15 +1,46 @@
 import base64
+from functools import lru_cache
+
 import streamlit as st
 from functions.Kz import compute_kz
-
-
+from functions.editions import DEFAULT_EDITION
+from functions.pressure_calculation import velocity_pressure
+from functions.profiler import span, record_cache
+
+
+# Directionality factor Kd, ASCE 7-16 Table 26.6-1
+STRUCTURE_TYPES = {
+    "Buildings – Components & Cladding": 0.85,
+    "Arched Roofs": 0.85,
+    "Circular Domes (Axisymmetric)": 1.00,
+    "Circular Domes (Non-axisymmetric system)": 0.95,
+    "Chimneys / Tanks – Square": 0.90,
+    "Chimneys / Tanks – Hexagonal": 0.95,
+    "Chimneys / Tanks – Octagonal": 1.00,
+    "Chimneys / Tanks – Round": 1.00,
+    "Chimneys / Tanks – Octagonal (Non-axisymmetric system)": 0.95,
+    "Chimneys / Tanks – Round (Non-axisymmetric system)": 0.95,
+    "Solid Freestanding Walls": 0.85,
+    "Rooftop Equipment (Solid)": 0.85,
+    "Attached Signs (Solid)": 0.85,
+    "Open Signs": 0.85,
+    "Single-Plane Open Frames": 0.85,
+    "Trussed Towers – Triangular / Square / Rectangular": 0.85,
+    "Trussed Towers – All Other Cross-Sections": 0.95,
+}
+
+
+@lru_cache(maxsize=16)
 def _img_to_base64(path: str) -> str:
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode("utf-8")
 
 
 def _fixed_image(path: str, height_px: int = 140, border_radius_px: int = 12) -> None:
-    b64 = _img_to_base64(path)
+    with span("image_encoding"):
+        hits = _img_to_base64.cache_info().hits
+        b64 = _img_to_base64(path)
+        record_cache("image_base64", _img_to_base64.cache_info().hits > hits)
     st.markdown(
         f"""
         <div style="width: 100%; height: {height_px}px; overflow: hidden; border-radius: {border_radius_px}px;">
@@ -21,32 +52,12 @@ def _fixed_image(path: str, height_px: int = 140, border_radius_px: int = 12) ->
     )
 
 
-def wind_pressure_calc(height, V):
-    st.header("Basic Wind Pressure Calculation (ASCE 7-16)")
+def wind_pressure_calc(height, V, edition=DEFAULT_EDITION):
+    st.header(f"Basic Wind Pressure Calculation ({edition})")
 
     # --- Directionality Factor (Kd) ---
-    structure_types = {
-        "Buildings – Components & Cladding": 0.85,
-        "Arched Roofs": 0.85,
-        "Circular Domes (Axisymmetric)": 1.00,
-        "Circular Domes (Non-axisymmetric system)": 0.95,
-        "Chimneys / Tanks – Square": 0.90,
-        "Chimneys / Tanks – Hexagonal": 0.95,
-        "Chimneys / Tanks – Octagonal": 1.00,
-        "Chimneys / Tanks – Round": 1.00,
-        "Chimneys / Tanks – Octagonal (Non-axisymmetric system)": 0.95,
-        "Chimneys / Tanks – Round (Non-axisymmetric system)": 0.95,
-        "Solid Freestanding Walls": 0.85,
-        "Rooftop Equipment (Solid)": 0.85,
-        "Attached Signs (Solid)": 0.85,
-        "Open Signs": 0.85,
-        "Single-Plane Open Frames": 0.85,
-        "Trussed Towers – Triangular / Square / Rectangular": 0.85,
-        "Trussed Towers – All Other Cross-Sections": 0.95,
-    }
-
-    structure = st.selectbox("Structure Type:", list(structure_types.keys()), key="structure_type")
-    Kd = float(structure_types[structure])
+    structure = st.selectbox("Structure Type:", list(STRUCTURE_TYPES.keys()), key="structure_type")
+    Kd = float(STRUCTURE_TYPES[structure])
 
     # --- Exposure Category (cards) ---
     st.subheader("Exposure Category")
@@ -83,14 +94,14 @@ def wind_pressure_calc(height, V):
     st.markdown("---")
 
     # --- Compute Kz (from separate function) ---
-    Kz = float(compute_kz(height, exposure))
+    Kz = float(compute_kz(height, exposure, edition=edition))
     st.metric(label=f"Kz (Exposure {exposure}, h = {float(height):.0f} ft)", value=f"{Kz:.3f}")
 
     # --- Velocity pressure qh ---
     Kzt = 1.0
     Ke = 1.0
 
-    q = 0.00256 * Kz * Kzt * Kd * Ke * (float(V) ** 2)
+    q = velocity_pressure(Kz, Kd, V, Kzt=Kzt, Ke=Ke)
 
     st.metric("Velocity Pressure (q)", f"{q:.2f} psf")
     st.caption(
@@ -99,4 +110,8 @@ def wind_pressure_calc(height, V):
     )
     st.markdown("---")
 
+    # Persist for later steps (the result cache keys on Kd)
+    st.session_state["wind_pressure"] = {
+        "structure": structure, "Kd": Kd, "exposure": exposure, "Kz": Kz, "q": q, "V": float(V),
+    }
     return exposure, Kz, q
@@ -0,0 +1,326 @@
+"""
+Hurricane-prone, wind-borne debris and special wind region lookup.
+
+Boundary polygons are read from GeoJSON files in data/wind_regions/ (or
+WIND_REGIONS_DIR); see the README there for the expected format. No
+boundaries ship with the app, since they must come from the ASCE Hazard Tool
+or the authority having jurisdiction.
+
+Polygons are bucketed into a uniform lon/lat grid by their bounding box.
+A batch of sites is sorted by grid cell once; each polygon then only tests
+the sites in the cells its bounding box covers, with a crossing-number test
+vectorized over sites and edges. Where polygons are missing, the ASCE 7
+definitions give a fallback from V and the state:
+
+- hurricane-prone: Atlantic / Gulf coast states with V > 115 mph, and Hawaii,
+  Puerto Rico, Guam, the Virgin Islands and American Samoa (Section 26.2)
+- wind-borne debris: hurricane-prone and V >= 140 mph (Section 26.12.3.1);
+  the 130 mph band within 1 mi of the coast needs a debris polygon or a check
+  of the site's distance to the coast
+"""
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+REGIONS_DIR = Path(os.environ.get(
+    "WIND_REGIONS_DIR", Path(__file__).resolve().parent.parent / "data" / "wind_regions"
+))
+
+REGION_KINDS = ("hurricane_prone", "wind_borne_debris", "special_wind_region")
+REGION_LABELS = {
+    "hurricane_prone": "Hurricane-prone region",
+    "wind_borne_debris": "Wind-borne debris region",
+    "special_wind_region": "Special wind region",
+}
+
+# Grid cell size of the spatial index (degrees)
+CELL_DEG = 1.0
+
+# Section 26.2 / 26.12.3.1 thresholds (V for Risk Category II, mph)
+HURRICANE_PRONE_V = 115.0
+DEBRIS_V = 140.0
+DEBRIS_COASTAL_V = 130.0
+HURRICANE_COAST_STATES = frozenset({
+    "ME", "NH", "MA", "RI", "CT", "NY", "NJ", "DE", "MD", "VA",
+    "NC", "SC", "GA", "FL", "AL", "MS", "LA", "TX",
+})
+HURRICANE_PRONE_STATES = frozenset({"HI", "PR", "GU", "VI", "AS"})
+
+# Site x edge elements per block of the crossing-number test (bounds memory)
+_EDGE_BLOCK = 2_000_000
+
+
+class RegionIndex:
+    """
+    Grid-bucketed polygons of named regions.
+
+    Parameters
+    ----------
+    features : list of (kind, name, polygons)
+        `polygons` is a list of polygons, each a list of (n, 2) lon/lat ring
+        arrays; holes are handled by the even-odd rule.
+    cell_deg : float
+        Grid cell size in degrees.
+    """
+
+    def __init__(self, features: Sequence[Tuple[str, str, List[List[np.ndarray]]]], cell_deg: float = CELL_DEG):
+        self.kinds = np.array([f[0] for f in features], dtype=object)
+        self.names = np.array([f[1] for f in features], dtype=object)
+        self.cell = float(cell_deg)
+
+        owner, edges, bbox = [], [], []
+        for i, (_, _, polygons) in enumerate(features):
+            for rings in polygons:
+                e = np.concatenate([
+                    np.hstack([r, np.roll(r, -1, axis=0)]) for r in rings if len(r) >= 3
+                ])
+                owner.append(i)
+                edges.append(e)
+                pts = np.vstack(rings)
+                bbox.append((*pts.min(axis=0), *pts.max(axis=0)))
+        self.owner = np.array(owner, dtype=np.int64)
+        self.edges = edges
+        self.bbox = np.array(bbox, dtype=float).reshape(-1, 4)
+
+        if len(self.bbox):
+            self.origin = self.bbox[:, :2].min(axis=0)
+            span = self.bbox[:, 2:].max(axis=0) - self.origin
+            self.shape = (np.floor(span / self.cell).astype(np.int64) + 1)
+            lo = self._cells(self.bbox[:, :2])
+            hi = self._cells(self.bbox[:, 2:])
+            self.cell_ranges = np.hstack([lo, hi])
+        else:
+            self.origin = np.zeros(2)
+            self.shape = np.zeros(2, dtype=np.int64)
+            self.cell_ranges = np.zeros((0, 4), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cells(self, xy: np.ndarray) -> np.ndarray:
+        ij = np.floor((xy - self.origin) / self.cell).astype(np.int64)
+        return np.clip(ij, 0, self.shape - 1)
+
+    def query(self, lon, lat) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All (site, feature) containment pairs for arrays of sites.
+
+        Returns
+        -------
+        site, feature : np.ndarray
+            Parallel index arrays; a site inside several features (or several
+            polygons of one feature) may appear more than once.
+        """
+        x = np.atleast_1d(np.asarray(lon, dtype=float))
+        y = np.atleast_1d(np.asarray(lat, dtype=float))
+        valid = np.isfinite(x) & np.isfinite(y)
+        if not len(self.bbox) or not valid.any():
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Bucket sites by cell; sites outside the grid can't be in any polygon.
+        xy = np.column_stack([x, y])
+        inside_grid = valid & np.all(xy >= self.origin, axis=1) & np.all(
+            xy < self.origin + self.shape * self.cell, axis=1
+        )
+        ids = np.flatnonzero(inside_grid)
+        if not len(ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        ij = self._cells(xy[ids])
+        keys = ij[:, 1] * self.shape[0] + ij[:, 0]
+        order = np.argsort(keys, kind="stable")
+        keys, ids = keys[order], ids[order]
+
+        # Only polygons whose bbox meets the sites' extent
+        lo, hi = xy[ids].min(axis=0), xy[ids].max(axis=0)
+        near = np.flatnonzero(
+            (self.bbox[:, 0] <= hi[0]) & (self.bbox[:, 2] >= lo[0])
+            & (self.bbox[:, 1] <= hi[1]) & (self.bbox[:, 3] >= lo[1])
+        )
+
+        hit_site, hit_feature = [], []
+        for p in near:
+            i0, j0, i1, j1 = self.cell_ranges[p]
+            rows = np.arange(j0, j1 + 1) * self.shape[0]
+            start = np.searchsorted(keys, rows + i0, side="left")
+            stop = np.searchsorted(keys, rows + i1, side="right")
+            cand = np.concatenate([ids[a:b] for a, b in zip(start, stop) if b > a] or [ids[:0]])
+            if not len(cand):
+                continue
+            x0, y0, x1, y1 = self.bbox[p]
+            px, py = x[cand], y[cand]
+            keep = (px >= x0) & (px <= x1) & (py >= y0) & (py <= y1)
+            cand, px, py = cand[keep], px[keep], py[keep]
+            if not len(cand):
+                continue
+            inside = _crossing_parity(self.edges[p], px, py)
+            hit_site.append(cand[inside])
+            hit_feature.append(np.full(int(inside.sum()), self.owner[p]))
+
+        if not hit_site:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(hit_site), np.concatenate(hit_feature)
+
+    def classify(self, lon, lat) -> pd.DataFrame:
+        """
+        One row per site: a bool column per REGION_KINDS and a "<kind> name"
+        column with the (first) matching region's name.
+        """
+        n = len(np.atleast_1d(lon))
+        site, feature = self.query(lon, lat)
+        out = {}
+        for kind in REGION_KINDS:
+            m = self.kinds[feature] == kind if len(feature) else np.zeros(0, dtype=bool)
+            names = np.full(n, "", dtype=object)
+            # Reverse so the first listed feature wins on overlaps
+            names[site[m][::-1]] = self.names[feature[m]][::-1]
+            out[kind] = names != ""
+            out[f"{kind} name"] = names
+        return pd.DataFrame(out)
+
+
+def _crossing_parity(edges: np.ndarray, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """
+    Even-odd point-in-polygon over all edges (rings stacked). Sites are sorted
+    by latitude so each edge only meets the contiguous run of sites its y-span
+    straddles; the work is proportional to the actual crossings.
+    """
+    order = np.argsort(py, kind="stable")
+    ys = py[order]
+    ex0, ey0, ex1, ey1 = (edges[:, k] for k in range(4))
+    start = np.searchsorted(ys, np.minimum(ey0, ey1), side="left")
+    counts = np.searchsorted(ys, np.maximum(ey0, ey1), side="left") - start
+    slope = (ex1 - ex0) / np.where(ey1 == ey0, np.inf, ey1 - ey0)
+
+    crossings = np.zeros(len(px), dtype=np.int64)
+    ends = np.cumsum(counts)
+    for lo, hi in _blocks(ends):
+        c = counts[lo:hi]
+        edge = np.repeat(np.arange(lo, hi), c)
+        offset = np.arange(int(c.sum())) - np.repeat(ends[lo:hi] - c - (ends[lo - 1] if lo else 0), c)
+        site = order[start[edge] + offset]
+        x_cross = ex0[edge] + (py[site] - ey0[edge]) * slope[edge]
+        crossings += np.bincount(site[px[site] < x_cross], minlength=len(px))
+    return crossings % 2 == 1
+
+
+def _blocks(ends: np.ndarray):
+    """(lo, hi) edge ranges holding about _EDGE_BLOCK site-edge pairs each."""
+    if not len(ends):
+        return
+    cuts = np.searchsorted(ends, np.arange(_EDGE_BLOCK, int(ends[-1]), _EDGE_BLOCK), side="right")
+    bounds = np.unique(np.concatenate([[0], cuts, [len(ends)]]))
+    yield from zip(bounds[:-1], bounds[1:])
+
+
+def _geometry_polygons(geometry: Dict[str, object]) -> List[List[np.ndarray]]:
+    kind = geometry.get("type")
+    coords = geometry.get("coordinates") or []
+    if kind == "Polygon":
+        coords = [coords]
+    elif kind != "MultiPolygon":
+        return []
+    return [[np.asarray(r, dtype=float)[:, :2] for r in poly] for poly in coords if poly]
+
+
+def read_region_files(directory: Path) -> List[Tuple[str, str, List[List[np.ndarray]]]]:
+    """
+    Features of every *.geojson / *.json file in `directory`. A feature's
+    kind comes from its "kind" property, else from the file name (e.g.
+    special_wind_region.geojson).
+    """
+    features = []
+    for path in sorted(Path(directory).glob("*.*json")):
+        data = json.loads(path.read_text())
+        default_kind = path.stem if path.stem in REGION_KINDS else None
+        for n, feat in enumerate(data.get("features", [])):
+            props = feat.get("properties") or {}
+            kind = props.get("kind", default_kind)
+            if kind not in REGION_KINDS:
+                raise ValueError(f"{path.name} feature {n}: kind must be one of {', '.join(REGION_KINDS)}")
+            polygons = _geometry_polygons(feat.get("geometry") or {})
+            if polygons:
+                features.append((kind, str(props.get("name", f"{path.stem} {n + 1}")), polygons))
+    return features
+
+
+@lru_cache(maxsize=4)
+def load_region_index(directory: str = str(REGIONS_DIR)) -> RegionIndex:
+    return RegionIndex(read_region_files(Path(directory)))
+
+
+def classify_sites(lat, lon, V, state=None, index: Optional[RegionIndex] = None) -> pd.DataFrame:
+    """
+    Region flags for arrays of sites: polygons where installed, otherwise
+    (or additionally) the Section 26.2 / 26.12.3.1 definitions from V and state.
+
+    Returns
+    -------
+    pd.DataFrame
+        hurricane_prone, wind_borne_debris, special_wind_region (bool),
+        their "<kind> name" columns, and debris_if_coastal (hurricane-prone
+        with 130 <= V < 140 mph: a debris region within 1 mi of the coast).
+    """
+    index = index or load_region_index()
+    df = index.classify(lon, lat)
+    V = np.broadcast_to(np.asarray(V, dtype=float), len(df))
+
+    if state is not None:
+        st_ = pd.Series(np.broadcast_to(np.asarray(state, dtype=object), len(df))).astype(str).str.upper().to_numpy()
+        by_rule = (np.isin(st_, list(HURRICANE_COAST_STATES)) & (V > HURRICANE_PRONE_V)) | np.isin(
+            st_, list(HURRICANE_PRONE_STATES)
+        )
+        df["hurricane_prone"] |= by_rule
+
+    hp = df["hurricane_prone"].to_numpy()
+    df["wind_borne_debris"] |= hp & (V >= DEBRIS_V)
+    df["debris_if_coastal"] = hp & (V >= DEBRIS_COASTAL_V) & ~df["wind_borne_debris"].to_numpy()
+    return df
+
+
+def site_flags(lat, lon, V=None, state=None, risk_category=None) -> List[Tuple[str, str]]:
+    """
+    (level, message) notes for one site, level being "warning" or "info".
+
+    With V: the special wind region, hurricane-prone and debris region flags.
+    With risk_category: only the note on which wind speed map sets the debris
+    region, shown when the site is or may be hurricane-prone (V not known yet).
+    """
+    if lat is None or lon is None:
+        return []
+    row = classify_sites(lat, lon, np.nan if V is None else V, state).iloc[0]
+
+    if V is None:
+        maybe = row["hurricane_prone"] or str(state).upper() in HURRICANE_COAST_STATES | HURRICANE_PRONE_STATES
+        if risk_category in ("III", "IV") and maybe:
+            return [("info", "In a hurricane-prone region, the wind-borne debris region of Risk Category IV "
+                             "and Risk Category III health care facilities follows the Risk Category IV "
+                             "wind speed map (Section 26.12.3.1).")]
+        return []
+
+    flags = []
+    if row["special_wind_region"]:
+        flags.append(("warning", f"{REGION_LABELS['special_wind_region']} ({row['special_wind_region name']}): "
+                                 "the mapped V may not apply; use local data or the authority having "
+                                 "jurisdiction (Section 26.5.2)."))
+    if row["hurricane_prone"]:
+        where = f" ({row['hurricane_prone name']})" if row["hurricane_prone name"] else ""
+        flags.append(("info", f"{REGION_LABELS['hurricane_prone']}{where}."))
+    if row["wind_borne_debris"]:
+        where = f" ({row['wind_borne_debris name']})" if row["wind_borne_debris name"] else ""
+        flags.append(("warning", f"{REGION_LABELS['wind_borne_debris']}{where}: glazed openings need impact "
+                                 "protection or must be treated as openings (Section 26.12.3)."))
+    elif row["debris_if_coastal"]:
+        flags.append(("info", f"V >= {DEBRIS_COASTAL_V:.0f} mph in a hurricane-prone region: within 1 mi of the "
+                              "coastal mean high water line this is a wind-borne debris region."))
+    return flags
+
+
+def show_site_flags(flags: List[Tuple[str, str]]) -> None:
+    for level, message in flags:
+        (st.warning if level == "warning" else st.info)(message)
@@ -1,9 +1,13 @@
 import streamlit as st
 
-def wind_speed():
+from functions.wind_regions import show_site_flags, site_flags
+
+def wind_speed(site=None):
     st.header("Wind Speed")
     st.markdown("Get your wind speed (V) from [ASCE Hazard Tool](https://ascehazardtool.org/)")
-    V = st.number_input("Enter Basic Wind Speed (mph)", min_value=0.0, value=115.0)
+    V = st.number_input("Enter Basic Wind Speed (mph)", min_value=0.0, value=115.0, key="ws_V")
     st.success(f"Using V = {V:.1f} mph")
+    if site:
+        show_site_flags(site_flags(site["lat"], site["lon"], V=V, state=site["state"]))
     st.markdown("---")
     return V
@@ -0,0 +1,384 @@
+"""
+Wind-tunnel pressure-tap time series -> peak GCp.
+
+Tap records are read in chunks (binary files through a memory map, CSV files
+with a chunked reader), so processing never holds a whole record in memory.
+Records uploaded in the browser are buffered in memory by Streamlit (up to
+server.maxUploadSize) before they are spooled to disk; multi-GB records are
+placed in the server directory WIND_TUNNEL_DATA_DIR and picked from a list,
+and no other server path can be opened from the UI.
+For every tap, and for every area-averaged tap group, the processor keeps
+running moments plus the maximum and minimum of each of `n_segments` equal
+record segments. Design peaks are estimated from those segment extremes with
+a Gumbel (Type I) fit.
+
+Input values are pressure coefficients referenced to the mean roof height
+velocity pressure, or pressures that are divided by `reference_pressure`.
+The record length should correspond to the full-scale duration the peaks
+are meant for (typically one hour).
+
+Tap groups are given as a table with columns group, zone, tap and area
+(tributary area of the tap, sf). A group's coefficient series is the
+area-weighted average of its taps; its effective area is the sum of the
+tap areas. Groups in "Zone 4" / "Zone 5" feed `WindTunnelGCp`, a drop-in
+replacement for `wall_gcp` in the pressure and GCp tables.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from functions.pressure_table import create_wall_pressure_table
+
+# Rows per block are chosen so a float32 block is about this size
+CHUNK_BYTES = 16 * 1024 * 1024
+N_SEGMENTS = 16
+
+EULER_GAMMA = 0.5772156649
+
+# Server directory of tap records offered in the UI (unset: uploads only)
+TAP_RECORD_DIR = os.environ.get("WIND_TUNNEL_DATA_DIR")
+TAP_RECORD_SUFFIXES = (".csv", ".txt", ".bin", ".dat", ".f32")
+
+TIME_COLUMNS = ("t", "time", "time (s)")
+
+
+# --- readers ---------------------------------------------------------------
+
+def _count_csv_rows(path: str) -> int:
+    """Data rows of a CSV file with one header line, counted in 16 MB blocks."""
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(16 * 1024 * 1024)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return lines - 1
+
+
+def open_tap_record(path: str, n_taps: Optional[int] = None, dtype: str = "<f4",
+                    tap_names: Optional[Sequence[str]] = None,
+                    chunk_rows: Optional[int] = None) -> Tuple[List[str], int, Iterator[np.ndarray]]:
+    """
+    Opens a tap record and returns (tap names, number of samples, block iterator).
+
+    CSV files have one column per tap (an optional time column is dropped).
+    Any other file is read as headerless row-major binary of `dtype` with
+    `n_taps` values per sample.
+    """
+    if str(path).lower().endswith((".csv", ".txt")):
+        header = pd.read_csv(path, nrows=0).columns
+        taps = [c for c in header if str(c).strip().lower() not in TIME_COLUMNS]
+        n_samples = _count_csv_rows(path)
+        chunk_rows = chunk_rows or max(1024, CHUNK_BYTES // (4 * max(len(taps), 1)))
+
+        def blocks():
+            for chunk in pd.read_csv(path, usecols=taps, chunksize=chunk_rows, dtype=np.float32, engine="c"):
+                yield chunk[taps].to_numpy()
+
+        return [str(t) for t in taps], n_samples, blocks()
+
+    if not n_taps:
+        raise ValueError("Binary tap records need the number of taps.")
+    data = np.memmap(path, dtype=dtype, mode="r")
+    if data.size % n_taps:
+        raise ValueError(f"File holds {data.size} values, not a multiple of {n_taps} taps.")
+    data = data.reshape(-1, n_taps)
+    taps = list(tap_names) if tap_names is not None else [f"T{i + 1}" for i in range(n_taps)]
+    chunk_rows = chunk_rows or max(1024, CHUNK_BYTES // (4 * n_taps))
+
+    def blocks():
+        for start in range(0, len(data), chunk_rows):
+            yield np.asarray(data[start:start + chunk_rows], dtype=np.float32)
+
+    return taps, len(data), blocks()
+
+
+# --- streaming statistics ----------------------------------------------------
+
+class RunningExtremes:
+    """Mean, RMS and per-segment max/min of many series, updated block by block."""
+
+    def __init__(self, n_series: int, n_samples: int, n_segments: int = N_SEGMENTS):
+        self.n_segments = max(1, min(n_segments, n_samples))
+        self.segment_len = -(-n_samples // self.n_segments)
+        self.n = 0
+        self.sum = np.zeros(n_series)
+        self.sumsq = np.zeros(n_series)
+        self.seg_max = np.full((self.n_segments, n_series), -np.inf)
+        self.seg_min = np.full((self.n_segments, n_series), np.inf)
+
+    def update(self, block: np.ndarray) -> None:
+        # Moments accumulate in float64; the block itself stays float32
+        self.sum += block.sum(axis=0, dtype=np.float64)
+        self.sumsq += np.einsum("ij,ij->j", block, block, dtype=np.float64)
+
+        # Split the block where it crosses segment boundaries
+        start = self.n
+        while start < self.n + len(block):
+            seg = min(start // self.segment_len, self.n_segments - 1)
+            stop = self.n + len(block) if seg == self.n_segments - 1 else min(
+                (seg + 1) * self.segment_len, self.n + len(block))
+            part = block[start - self.n:stop - self.n]
+            np.maximum(self.seg_max[seg], part.max(axis=0), out=self.seg_max[seg])
+            np.minimum(self.seg_min[seg], part.min(axis=0), out=self.seg_min[seg])
+            start = stop
+        self.n += len(block)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / self.n
+
+    @property
+    def rms(self) -> np.ndarray:
+        """RMS of the fluctuating part (standard deviation)."""
+        return np.sqrt(np.maximum(self.sumsq / self.n - self.mean ** 2, 0.0))
+
+
+def gumbel_peak(segment_peaks: np.ndarray, probability: Optional[float] = None) -> np.ndarray:
+    """
+    Peak over the whole record from the maxima of its N segments.
+
+    The segment maxima are fitted with a Gumbel distribution by the method of
+    moments; the maximum of N such segments is Gumbel with the mode shifted by
+    beta ln N. Returns its expected value, or its `probability` quantile
+    (non-exceedance) when given. Works column-wise on (N, series) arrays.
+    """
+    peaks = np.asarray(segment_peaks, dtype=float)
+    n = peaks.shape[0]
+    if n < 2:
+        return peaks.max(axis=0)
+    beta = peaks.std(axis=0, ddof=1) * np.sqrt(6.0) / np.pi
+    mode = peaks.mean(axis=0) - EULER_GAMMA * beta + beta * np.log(n)
+    if probability is None:
+        return mode + EULER_GAMMA * beta
+    return mode - beta * np.log(-np.log(probability))
+
+
+# --- processing --------------------------------------------------------------
+
+def _group_weights(taps: Sequence[str], groups: pd.DataFrame):
+    """Area-weight matrix (taps x groups), group table and any unknown taps."""
+    index = {t: i for i, t in enumerate(taps)}
+    groups = groups.assign(tap=groups["tap"].astype(str), area=groups["area"].astype(float))
+    if (groups["area"] <= 0).any():
+        raise ValueError("Tap tributary areas must be positive.")
+    unknown = sorted(set(groups["tap"]) - set(index))
+
+    known = groups[groups["tap"].isin(index)]
+    names = list(dict.fromkeys(known["group"]))
+    W = np.zeros((len(taps), len(names)))
+    for name, part in known.groupby("group", sort=False):
+        W[part["tap"].map(index).to_numpy(), names.index(name)] = part["area"].to_numpy()
+
+    info = known.groupby("group", sort=False).agg(zone=("zone", "first"), area=("area", "sum"), taps=("tap", "size"))
+    info = info.loc[names].reset_index()
+    return W / W.sum(axis=0), info, unknown
+
+
+def process_tap_record(path: str, groups: Optional[pd.DataFrame] = None, n_taps: Optional[int] = None,
+                       dtype: str = "<f4", reference_pressure: float = 1.0,
+                       n_segments: int = N_SEGMENTS, probability: Optional[float] = None,
+                       chunk_rows: Optional[int] = None, progress=None):
+    """
+    Streams a tap record once and returns (tap statistics, group statistics).
+
+    Both DataFrames hold mean, RMS, min/max and Gumbel peak coefficients; the
+    group table also has zone and effective area (sf).
+    """
+    taps, n_samples, blocks = open_tap_record(path, n_taps=n_taps, dtype=dtype, chunk_rows=chunk_rows)
+    if n_samples <= 0:
+        raise ValueError("Tap record has no samples.")
+
+    tap_stats = RunningExtremes(len(taps), n_samples, n_segments)
+    group_stats, W, info = None, None, None
+    if groups is not None and len(groups):
+        W, info, unknown = _group_weights(taps, groups)
+        W = W.astype(np.float32)
+        if unknown:
+            raise ValueError(f"Tap groups reference unknown taps: {', '.join(unknown[:10])}")
+        group_stats = RunningExtremes(W.shape[1], n_samples, n_segments)
+
+    scale = np.float32(1.0 / float(reference_pressure))
+    for block in blocks:
+        if scale != 1:
+            block = block * scale
+        tap_stats.update(block)
+        if group_stats is not None:
+            group_stats.update(block @ W)
+        if progress is not None:
+            progress(tap_stats.n, n_samples)
+
+    def table(stats: RunningExtremes) -> pd.DataFrame:
+        return pd.DataFrame({
+            "Mean Cp": stats.mean,
+            "RMS Cp": stats.rms,
+            "Min Cp": stats.seg_min.min(axis=0),
+            "Max Cp": stats.seg_max.max(axis=0),
+            "Peak Positive GCp": gumbel_peak(stats.seg_max, probability),
+            "Peak Negative GCp": -gumbel_peak(-stats.seg_min, probability),
+        })
+
+    taps_df = pd.concat([pd.DataFrame({"Tap": taps}), table(tap_stats)], axis=1)
+    groups_df = None
+    if group_stats is not None:
+        groups_df = pd.concat([info.rename(columns={"group": "Group", "zone": "Zone", "area": "Area (sf)",
+                                                    "taps": "Taps"}), table(group_stats)], axis=1)
+    return taps_df, groups_df
+
+
+# --- custom GCp source ---------------------------------------------------------
+
+class WindTunnelGCp:
+    """
+    GCp source built from area-averaged tap groups, callable like `wall_gcp`:
+    area -> (Zones 4&5 positive, Zone 4 negative, Zone 5 negative).
+
+    For each zone the most severe group peak at each effective area is
+    interpolated on log(area) and held constant beyond the tested range.
+    """
+
+    def __init__(self, group_stats: pd.DataFrame):
+        self.curves = {}
+        for zone in ("Zone 4", "Zone 5"):
+            part = group_stats[group_stats["Zone"].astype(str).str.strip() == zone]
+            if part.empty:
+                raise ValueError(f"No tap groups for {zone}.")
+            env = part.groupby("Area (sf)").agg(pos=("Peak Positive GCp", "max"), neg=("Peak Negative GCp", "min"))
+            self.curves[zone] = (np.log10(env.index.to_numpy(float)), env["pos"].to_numpy(), env["neg"].to_numpy())
+
+    def _interp(self, area, zone, which):
+        log_area, pos, neg = self.curves[zone]
+        return float(np.interp(np.log10(area), log_area, pos if which == "pos" else neg))
+
+    def __call__(self, area):
+        positive = max(self._interp(area, "Zone 4", "pos"), self._interp(area, "Zone 5", "pos"))
+        return positive, self._interp(area, "Zone 4", "neg"), self._interp(area, "Zone 5", "neg")
+
+    def gcp_table(self, areas=(1, 10, 20, 50, 100, 200, 500, 1000)) -> pd.DataFrame:
+        """Same layout as get_wall_gcp_data, from the wind-tunnel curves."""
+        rows = [self(a) for a in areas]
+        return pd.DataFrame({
+            "Area (sf)": list(areas),
+            "Zone 4 Negative": [r[1] for r in rows],
+            "Zone 5 Negative": [r[2] for r in rows],
+            "Zones 4&5 Positive": [r[0] for r in rows],
+        })
+
+
+# --- UI -----------------------------------------------------------------------
+
+def server_records(directory: Optional[str] = TAP_RECORD_DIR) -> List[str]:
+    """File names of the tap records in the allow-listed server directory."""
+    if not directory or not os.path.isdir(directory):
+        return []
+    return sorted(
+        e.name for e in os.scandir(directory)
+        if e.is_file(follow_symlinks=False) and e.name.lower().endswith(TAP_RECORD_SUFFIXES)
+    )
+
+
+def server_record_path(name: str, directory: Optional[str] = TAP_RECORD_DIR) -> str:
+    """Path of a record listed by `server_records`; any other name raises ValueError."""
+    if name not in server_records(directory):
+        raise ValueError(f"“{name}” is not a tap record in the server data directory.")
+    return os.path.join(directory, name)
+
+
+def _spool_upload(uploaded) -> str:
+    """Copies an uploaded file to a temporary file so it can be streamed from disk."""
+    suffix = os.path.splitext(uploaded.name)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
+        for block in iter(lambda: uploaded.read(16 * 1024 * 1024), b""):
+            f.write(block)
+        return f.name
+
+
+def show_wind_tunnel(q, gcpi_positive, gcpi_negative):
+    """
+    Optional step: derives wall GCp from wind-tunnel tap data. Returns the
+    WindTunnelGCp source when the user chooses to use it, else None.
+    """
+    st.header("Wind-Tunnel GCp (optional)")
+    st.caption(
+        "Tap records: CSV with one column per tap, or headerless binary float32 "
+        "(give the number of taps). Tap groups: CSV with group, zone, tap, area."
+    )
+
+    c1, c2 = st.columns(2)
+    record = c1.file_uploader("Tap record (CSV)", type=["csv"], key="wt_record")
+    on_server = server_records()
+    server_record = c1.selectbox(
+        "…or a record in the server data directory", [""] + on_server, key="wt_server_record",
+        format_func=lambda name: name or "—", disabled=not on_server,
+        help="Large records (CSV or binary) are copied to WIND_TUNNEL_DATA_DIR on the server; "
+             "uploads are held in memory while they are received.",
+    )
+    group_file = c2.file_uploader("Tap groups (CSV)", type=["csv"], key="wt_groups")
+    n_taps = c2.number_input("Taps per sample (binary files)", min_value=0, value=0, step=1, key="wt_ntaps")
+
+    c1, c2, c3 = st.columns(3)
+    reference = c1.number_input("Reference pressure (1 if already Cp)", min_value=1e-6, value=1.0, key="wt_ref")
+    n_segments = int(c2.number_input("Record segments", min_value=2, max_value=200, value=N_SEGMENTS, key="wt_segments"))
+    use_p = c3.checkbox("Peak at non-exceedance probability", value=False, key="wt_use_p")
+    probability = c3.number_input("Probability", min_value=0.5, max_value=0.999, value=0.78,
+                                  key="wt_prob", disabled=not use_p) if use_p else None
+
+    if st.button("Process tap record", key="wt_run"):
+        path = None
+        if server_record:
+            try:
+                path = server_record_path(server_record)
+            except ValueError as e:
+                st.error(str(e))
+        elif record is not None:
+            path = _spool_upload(record)
+        else:
+            st.error("Choose a tap record first.")
+        if path:
+            try:
+                groups = pd.read_csv(group_file) if group_file is not None else None
+                bar = st.progress(0.0, text="Reading taps…")
+                taps_df, groups_df = process_tap_record(
+                    path, groups=groups, n_taps=int(n_taps) or None, reference_pressure=reference,
+                    n_segments=n_segments, probability=probability,
+                    progress=lambda done, total: bar.progress(min(done / total, 1.0), text=f"{done:,} / {total:,} samples"),
+                )
+                bar.empty()
+                st.session_state["wind_tunnel"] = {"taps": taps_df, "groups": groups_df}
+            except (OSError, ValueError, KeyError) as e:
+                st.error(f"Could not process tap record: {e}")
+            finally:
+                if record is not None and not server_record:
+                    os.unlink(path)
+
+    source = None
+    run = st.session_state.get("wind_tunnel")
+    if run is not None:
+        st.markdown("#### Tap coefficients")
+        st.dataframe(run["taps"].round(3), width="stretch", hide_index=True)
+
+        if run["groups"] is not None:
+            st.markdown("#### Area-averaged tap groups")
+            st.dataframe(run["groups"].round(3), width="stretch", hide_index=True)
+            try:
+                wt = WindTunnelGCp(run["groups"])
+            except ValueError as e:
+                st.warning(f"Wind-tunnel GCp is not available as a GCp source: {e}")
+            else:
+                if st.toggle("Use wind-tunnel GCp instead of Figure 30.3-1", key="wt_use"):
+                    source = wt
+                    st.dataframe(create_wall_pressure_table(q, gcpi_positive, gcpi_negative, gcp_source=wt),
+                                 width="stretch", hide_index=True)
+
+    st.markdown("---")
+    return source
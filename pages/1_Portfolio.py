@@ -0,0 +1,144 @@
+import math
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from auth import authenticate_user
+from functions.editions import DEFAULT_EDITION, EDITIONS
+from functions.job_queue import get_job_queue
+from functions.portfolio import (
+    LOCATION_COLUMNS,
+    OPTIONAL_DEFAULTS,
+    REQUIRED_COLUMNS,
+    compute_portfolio_chunk,
+    prepare_portfolio,
+    read_portfolio,
+)
+from functions.report import new_batch_dir, remove_batch, render_report_chunk, report_records, zip_batch
+
+authenticate_user()
+
+st.set_page_config(page_title="Portfolio – Wind Load Calculator", layout="centered")
+st.title("Portfolio Run")
+st.markdown(
+    "Upload a building list to compute Kz, q and wall C&C pressures for every building. "
+    "The work runs in background worker processes, so the page stays responsive."
+)
+optional = ", ".join(f"{k} (default {v})" if v != "" else f"{k} (polygon, e.g. 0 0; 120 0; 120 80; 0 80)"
+                     for k, v in OPTIONAL_DEFAULTS.items())
+st.caption(
+    f"Required columns: {', '.join(REQUIRED_COLUMNS)}. Optional: {optional}. "
+    f"Site columns ({', '.join(LOCATION_COLUMNS)}) add hurricane-prone, wind-borne debris "
+    "and special wind region flags, and debris_if_coastal (a debris region within 1 mi of the coast)."
+)
+st.markdown("---")
+
+ROWS_PER_PAGE = 50
+
+queue = get_job_queue()
+
+uploaded = st.file_uploader("Building list (CSV or Excel)", type=["csv", "xlsx", "xls"])
+edition = st.selectbox("ASCE 7 edition", EDITIONS, index=EDITIONS.index(DEFAULT_EDITION), key="portfolio_edition")
+
+if uploaded is not None and st.button("Run portfolio", type="primary"):
+    try:
+        records = prepare_portfolio(read_portfolio(uploaded), edition)
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        job = queue.submit(compute_portfolio_chunk, records)
+        st.session_state["portfolio_job"] = job.id
+        st.session_state["portfolio_records"] = records
+        st.session_state["portfolio_page"] = 1
+        st.session_state.pop("report_job", None)
+
+job = queue.get(st.session_state.get("portfolio_job"))
+
+
+@st.fragment(run_every="1s")
+def job_progress():
+    progress = job.progress()
+    st.progress(progress["fraction"], text=f"{progress['done']:,} / {progress['total']:,} buildings")
+
+    if st.button("Cancel", key="portfolio_cancel"):
+        job.cancel()
+
+    if progress["finished"]:
+        st.rerun(scope="app")
+
+
+if job is not None:
+    if not job.done:
+        job_progress()
+    else:
+        progress = job.progress()
+        if progress["cancelled"]:
+            st.warning(f"Cancelled after {progress['done']:,} of {progress['total']:,} buildings.")
+        else:
+            st.success(f"Finished {progress['total']:,} buildings.")
+        for error in progress["errors"]:
+            st.error(error)
+
+        results = pd.DataFrame(job.results())
+        if not results.empty:
+            n_pages = max(1, math.ceil(len(results) / ROWS_PER_PAGE))
+            page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key="portfolio_page")
+            start = (int(page) - 1) * ROWS_PER_PAGE
+
+            # Only the visible rows are sent to the browser.
+            st.dataframe(results.iloc[start:start + ROWS_PER_PAGE], width="stretch", hide_index=True)
+            st.caption(f"Page {int(page)} of {n_pages} · {len(results):,} rows")
+
+            st.download_button(
+                "Download all results (CSV)",
+                data=results.to_csv(index=False),
+                file_name="portfolio_results.csv",
+                mime="text/csv",
+            )
+
+
+# Calc package: one PDF per building plus a workbook, rendered by the workers
+# straight to disk and zipped from there into parts that are read only when
+# their download button is clicked
+records = st.session_state.get("portfolio_records")
+if job is not None and job.done and records:
+    st.markdown("---")
+    st.subheader("Calculation Package")
+    if st.button("Build PDF / Excel calc package", key="report_build"):
+        previous = st.session_state.get("report_job")
+        previous_job = queue.get(previous["id"]) if previous else None
+        if previous and (previous_job is None or previous_job.done):
+            remove_batch(previous["dir"])
+        out_dir = new_batch_dir()
+        report_job = queue.submit(render_report_chunk, report_records(records, out_dir), chunk_size=25)
+        st.session_state["report_job"] = {"id": report_job.id, "dir": str(out_dir)}
+
+    report = st.session_state.get("report_job")
+    report_job = queue.get(report["id"]) if report else None
+
+    @st.fragment(run_every="1s")
+    def report_progress():
+        progress = report_job.progress()
+        st.progress(progress["fraction"], text=f"{progress['done']:,} / {progress['total']:,} reports")
+        if progress["finished"]:
+            st.rerun(scope="app")
+
+    if report_job is not None:
+        if not report_job.done:
+            report_progress()
+        else:
+            for error in report_job.progress()["errors"]:
+                st.error(error)
+            if not Path(report["dir"]).is_dir():
+                st.caption("This calc package has expired; build it again.")
+            else:
+                if "zip" not in report:
+                    report["zip"] = [str(p) for p in zip_batch(report_job.results(), report["dir"])]
+                parts = report["zip"]
+                for i, part in enumerate(parts, start=1):
+                    label = "Download calc package (zip)" if len(parts) == 1 else \
+                        f"Download calc package, part {i} of {len(parts)} (zip)"
+                    st.download_button(label, data=lambda part=part: Path(part).read_bytes(),
+                                       file_name=Path(part).name if len(parts) > 1 else "calc_package.zip",
+                                       mime="application/zip", key=f"report_download_{i}")
@@ -0,0 +1,16 @@
+import streamlit as st
+
+from auth import authenticate_user
+from functions.other_structures import show_other_structures
+
+authenticate_user()
+
+st.set_page_config(page_title="Other Structures – Wind Load Calculator", layout="centered")
+st.title("Other Structures")
+st.markdown(
+    "Wind forces on chimneys and tanks, open signs and frames, and trussed towers "
+    "(ASCE 7 Chapter 29). Edition, V and exposure default to the values entered on the main page."
+)
+st.markdown("---")
+
+show_other_structures()
@@ -0,0 +1,51 @@
+from datetime import date, datetime, time, timedelta
+
+import streamlit as st
+
+from auth import authenticate_user
+from functions.audit_log import get_audit_log
+from functions.code_jurisdiction_1 import STATE_OPTIONS
+
+authenticate_user()
+
+st.set_page_config(page_title="Audit Log – Wind Load Calculator", layout="centered")
+st.title("Calculation Audit Log")
+st.markdown(
+    "Every calculation run in the app: who ran it (the engineer named in the sidebar, and the "
+    "session), the inputs, the code editions resolved for the jurisdiction and the resulting pressures."
+)
+st.markdown("---")
+
+ROW_LIMIT = 5000
+
+log = get_audit_log()
+log.flush(timeout=5.0)
+
+c1, c2 = st.columns(2)
+state = c1.selectbox("State", ["All"] + [abbr for abbr, _ in STATE_OPTIONS], key="audit_state")
+today = date.today()
+period = c2.date_input("Date range (UTC)", (today - timedelta(days=30), today), key="audit_dates")
+v_min, v_max = st.slider("V (mph)", 0, 300, (0, 300), key="audit_v")
+
+start, end = (period[0], period[-1]) if isinstance(period, (tuple, list)) and period else (None, None)
+df = log.query(
+    state=None if state == "All" else state,
+    v_min=v_min if v_min > 0 else None,
+    v_max=v_max if v_max < 300 else None,
+    since=datetime.combine(start, time.min) if start else None,
+    until=datetime.combine(end, time.max) if end else None,
+    limit=ROW_LIMIT,
+)
+
+stats = log.stats()
+st.caption(
+    f"{len(df):,} entries shown (newest first, up to {ROW_LIMIT:,}) · "
+    f"{df.attrs['segments_scanned']} of {df.attrs['segments_total']} segments read · "
+    f"{stats['entries']:,} entries in {stats['bytes'] / 2**20:.1f} MB"
+)
+
+if not df.empty:
+    df.insert(0, "time (UTC)", (df.pop("ts") * 1e9).astype("datetime64[ns]"))
+    st.dataframe(df, width="stretch", hide_index=True)
+    st.download_button("Download CSV", df.to_csv(index=False), file_name="audit_log.csv",
+                       mime="text/csv", key="audit_download")
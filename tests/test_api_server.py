@@ -0,0 +1,87 @@
+import http.client
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from functions.api_server import _block_rows, iter_batch, _buildings_frame, make_server
+
+
+@pytest.fixture(scope="module")
+def api():
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def _post(address, path, body, headers=None):
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    conn.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json", **(headers or {})})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, data
+
+
+BUILDING = {"height": 30, "V": 115, "exposure": "C"}
+
+
+def test_batch_returns_valid_json(api):
+    status, data = _post(api, "/v1/batch", {"buildings": [BUILDING, {**BUILDING, "height": 45}]})
+    assert status == 200
+    body = json.loads(data)
+    assert body["count"] == 2
+    assert body["results"][0]["Kz"] == pytest.approx(0.98)
+
+
+def test_batch_ndjson_has_one_line_per_building(api):
+    status, data = _post(api, "/v1/batch", {"buildings": [BUILDING] * 3},
+                         headers={"Accept": "application/x-ndjson"})
+    assert status == 200
+    lines = data.decode().strip().split("\n")
+    assert [json.loads(line)["name"] for line in lines] == ["0", "1", "2"]
+
+
+@pytest.mark.parametrize("bad", [
+    {"height": None},
+    {"height": 0},
+    {"height": -10},
+    {"V": None},
+    {"area": 0},
+    {"Kd": -0.85},
+])
+def test_bad_buildings_get_a_400_before_any_output(api, bad):
+    status, data = _post(api, "/v1/batch", {"buildings": [BUILDING, {**BUILDING, **bad}]})
+    assert status == 400
+    body = json.loads(data)
+    assert "must be a positive number" in body["error"]
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/v1/pressure", {**BUILDING, "height": -5}),
+    ("/v1/pressure", {**BUILDING, "area": 0}),
+    ("/v1/kz", {"height": 0, "exposure": "C"}),
+    ("/v1/wall-gcp", {"area": -1}),
+])
+def test_single_requests_reject_non_positive_inputs(api, path, body):
+    status, _ = _post(api, path, body)
+    assert status == 400
+
+
+def test_nan_in_json_body_is_rejected(api):
+    conn = http.client.HTTPConnection(*api, timeout=10)
+    conn.request("POST", "/v1/pressure", body='{"height": NaN, "V": 115, "exposure": "C"}')
+    response = conn.getresponse()
+    assert response.status == 400
+    json.loads(response.read())
+
+
+def test_block_rows_refuse_nan():
+    df = _buildings_frame({"buildings": [BUILDING]})
+    block = next(iter_batch(df))
+    block["q"] = np.array([np.nan])
+    with pytest.raises(ValueError):
+        _block_rows(block)
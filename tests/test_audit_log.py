@@ -0,0 +1,93 @@
+from unittest import mock
+
+import pyarrow.dataset as ds
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import functions.audit_log as audit_log
+from functions.audit_log import AuditLog, calculation_entry
+from functions.wind_load_results import compute_wind_loads
+
+INPUTS = {"city": "Milwaukee", "state": "WI", "ibc_year": 2021, "iecc_year": 2018, "edition": "ASCE 7-16",
+          "height": 30.0, "V": 115.0, "exposure": "C", "Kd": 0.85, "enclosure": "Enclosed Building",
+          "gcpi_positive": 0.18, "gcpi_negative": -0.18}
+
+
+def _entry(i, state="WI", who="J. Smith"):
+    results = compute_wind_loads(30.0, 100.0 + i, "C", 0.85, 0.18, -0.18)
+    return {**calculation_entry({**INPUTS, "state": state, "V": 100.0 + i}, results, who, session="s1"),
+            "ts": 1_700_000_000.0 + i}
+
+
+def test_query_filters_and_prunes_segments(tmp_path):
+    log = AuditLog(tmp_path, segment_rows=1000)
+    log.write_segment([_entry(i) for i in range(10)])
+    log.write_segment([_entry(i, state="FL") for i in range(10, 20)])
+    df = log.query(state="FL", v_min=115)
+    assert list(df["V"]) == [float(v) for v in range(119, 114, -1)]
+    assert df.attrs["segments_scanned"] == 1 and df.attrs["segments_total"] == 2
+    assert set(df["who"]) == {"J. Smith"} and set(df["session"]) == {"s1"}
+
+
+def test_compaction_keeps_every_entry(tmp_path):
+    log = AuditLog(tmp_path, segment_rows=100)
+    for i in range(5):
+        log.write_segment([_entry(i)])
+    assert log.compact() == 5
+    assert len(log.segments()) == 1
+    assert sorted(log.query()["V"]) == [100.0 + i for i in range(5)]
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+
+
+def test_query_survives_a_compaction_between_manifest_and_files(tmp_path):
+    log = AuditLog(tmp_path, segment_rows=100)
+    for i in range(4):
+        log.write_segment([_entry(i)])
+
+    real_dataset = ds.dataset
+    calls = []
+
+    def dataset_after_compaction(*args, **kwargs):
+        # The writer thread compacts right after the query read the manifest
+        calls.append(args)
+        if len(calls) == 1:
+            with mock.patch.object(audit_log.ds, "dataset", real_dataset):
+                log.compact()
+        return real_dataset(*args, **kwargs)
+
+    with mock.patch.object(audit_log.ds, "dataset", dataset_after_compaction):
+        df = log.query()
+    assert len(calls) == 2
+    assert sorted(df["V"]) == [100.0, 101.0, 102.0, 103.0]
+
+
+def test_segments_without_the_session_column_still_read(tmp_path):
+    log = AuditLog(tmp_path)
+    old = _entry(0)
+    del old["session"]
+    log.write_segment([old])
+    assert log.query()["session"].isna().all()
+
+
+def test_app_logs_the_engineer(tmp_path, monkeypatch):
+    log = AuditLog(tmp_path)
+    monkeypatch.setattr(audit_log, "_log", log)
+
+    def page():
+        from functions.audit_log import engineer_input, record_calculation
+        from functions.wind_load_results import compute_wind_loads
+        inputs = {"city": "Milwaukee", "state": "WI", "ibc_year": 2021, "iecc_year": 2018,
+                  "edition": "ASCE 7-16", "height": 30.0, "V": 115.0, "exposure": "C", "Kd": 0.85,
+                  "enclosure": "Enclosed Building", "gcpi_positive": 0.18, "gcpi_negative": -0.18}
+        record_calculation(inputs, compute_wind_loads(30.0, 115.0, "C", 0.85, 0.18, -0.18), who=engineer_input())
+
+    at = AppTest.from_function(page, default_timeout=30)
+    at.run()
+    at.sidebar.text_input(key="audit_engineer").set_value(" A. Engineer ").run()
+    at.run()
+    log.flush()
+    df = log.query()
+    # Once without a name, once with it; the plain rerun is not logged again
+    assert df["who"].iloc[0] == "A. Engineer" and df["who"].isna().iloc[1]
+    assert len(df) == 2
+    assert df["session"].notna().all()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from functions.cladding_layout import cladding_layout, layout_panels, rectangular_elevations, zone_width_a
+from functions.wall_gcp_chart import wall_gcp_array
+
+# One 22 ft x 10 ft wall in 4 ft x 8 ft panels: columns end at 4, 8, 12, 16, 20, 22 ft; rows at 8, 10 ft
+WALL = [("Wall", 22.0, 10.0)]
+
+
+@pytest.mark.parametrize("least, height, a", [
+    (50, 20, 5.0),    # 0.1 x 50 governs
+    (200, 10, 8.0),   # 0.4h = 4 is below 0.04 x 200
+    (20, 30, 3.0),    # the 3 ft minimum
+])
+def test_zone_width_a(least, height, a):
+    assert zone_width_a(least, height) == pytest.approx(a)
+
+
+def _grid(panels, key):
+    grid = np.zeros((panels["row"].max() + 1, panels["col"].max() + 1))
+    grid[panels["row"], panels["col"]] = panels[key]
+    return grid
+
+
+def test_effective_area_is_span_times_a_third_of_the_span_at_least():
+    vertical = _grid(layout_panels(WALL, 4.0, 8.0, 5.0, span="vertical"), "effective_area")
+    # Full panel: 8 x max(4, 8/3); cut end column: 8 x max(2, 8/3); cut top row: 2 x max(4, 2/3)
+    assert vertical[0, 0] == pytest.approx(32.0)
+    assert vertical[0, 5] == pytest.approx(8.0 * 8.0 / 3.0)
+    assert vertical[1, 0] == pytest.approx(8.0)
+    assert vertical[1, 5] == pytest.approx(2.0 * 2.0)
+
+    horizontal = _grid(layout_panels(WALL, 4.0, 8.0, 5.0, span="horizontal"), "effective_area")
+    # Spanning the 4 ft width: 4 x max(8, 4/3); cut end column: 2 x max(8, 2/3); cut top row: 4 x max(2, 4/3)
+    assert horizontal[0, 0] == pytest.approx(32.0)
+    assert horizontal[0, 5] == pytest.approx(16.0)
+    assert horizontal[1, 0] == pytest.approx(8.0)
+
+
+def test_zone5_holds_every_panel_reaching_into_a_corner_zone():
+    panels = layout_panels(WALL, 4.0, 8.0, 5.0)
+    # a = 5 ft: columns 0-4 and 4-8 start within 5 ft of the left end, 16-20 and 20-22 end past 17 ft
+    assert _grid(panels, "zone5").astype(bool).tolist() == [[True, True, False, False, True, True]] * 2
+
+    # Polygon walls: no corner zone at the end of this wall
+    one_sided = layout_panels(WALL, 4.0, 8.0, np.array([[5.0, 0.0]]))
+    assert _grid(one_sided, "zone5")[0].astype(bool).tolist() == [True, True, False, False, False, False]
+
+
+def test_layout_uses_zone_gcp_per_panel():
+    elevations = rectangular_elevations(50, 100, 20)
+    df = cladding_layout(elevations, 4.0, 8.0, zone_width_a(50, 20), 30.0, 0.18, -0.18)
+    assert df.groupby("Wall").size().to_dict() == {"Long wall 1": 75, "Long wall 2": 75,
+                                                   "Short wall 1": 39, "Short wall 2": 39}
+    positive, z4, z5 = wall_gcp_array(df["Effective Area (sf)"].to_numpy())
+    expected = np.where(df["Zone"] == 5, z5, z4)
+    np.testing.assert_allclose(df["GCp Negative"], expected)
+    np.testing.assert_allclose(df["Negative (psf)"], 0.6 * 30.0 * (expected - 0.18))
+    np.testing.assert_allclose(df["Positive (psf)"], 0.6 * 30.0 * (positive + 0.18))
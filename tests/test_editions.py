@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from functions.GCP_h_Less_than_60 import get_roof_gcp_data, get_wall_gcp_data
+from functions.Kz import compute_kz, compute_kz_array
+from functions.editions import EDITIONS, compare_editions, edition_for_ibc, load_edition
+from functions.portfolio import normalize_portfolio
+from functions.wall_gcp_chart import wall_gcp, wall_gcp_array
+from functions.wind_load_results import compute_wind_loads, compute_wind_loads_batch, governing_zone_pressures
+
+
+def test_asce7_10_exposure_b_is_070_up_to_30_ft():
+    # ASCE 7-10 Table 30.3-1 (C&C): Exposure B Kz = 0.70 for z <= 30 ft
+    for h in (10, 15, 20, 25, 30):
+        assert compute_kz(h, "B", "ASCE 7-10") == pytest.approx(0.70)
+    assert compute_kz(20, "B", "ASCE 7-16") == pytest.approx(0.62)
+
+
+def test_asce7_22_differs_from_7_16_at_30_ft():
+    assert compute_kz(30, "B", "ASCE 7-22") == pytest.approx(0.69)
+    assert compute_kz(30, "B", "ASCE 7-16") == pytest.approx(0.70)
+
+
+def test_kz_interpolates_and_clamps():
+    assert compute_kz(35, "C") == pytest.approx((0.98 + 1.04) / 2)
+    assert compute_kz(5, "D") == compute_kz(15, "D")
+    assert compute_kz(900, "D") == compute_kz(500, "D")
+
+
+@pytest.mark.parametrize("edition", EDITIONS)
+def test_kz_array_matches_scalar(edition):
+    heights = np.array([12.0, 18.0, 33.0, 75.0, 260.0, 700.0])
+    exposures = np.array(["B", "C", "D", "B", "C", "D"])
+    expected = [compute_kz(h, e, edition) for h, e in zip(heights, exposures)]
+    np.testing.assert_allclose(compute_kz_array(heights, exposures, edition), expected)
+
+
+def test_kz_array_rejects_unknown_exposure():
+    with pytest.raises(KeyError):
+        compute_kz_array([30.0], ["E"])
+
+
+def test_wall_gcp_plateaus_and_log_linear_segment():
+    assert wall_gcp(5) == (1.0, -1.1, -1.4)
+    assert wall_gcp(2000) == (0.7, -0.8, -0.8)
+    positive, z4, z5 = wall_gcp(100)
+    assert positive == pytest.approx(1.1766 - 0.1766 * 2)
+    assert z5 == pytest.approx(-1.7532 + 0.3532 * 2)
+
+
+@pytest.mark.parametrize("edition", EDITIONS)
+def test_wall_gcp_array_matches_scalar(edition):
+    areas = np.array([1, 10, 10.5, 37, 499, 500, 501, 5000], dtype=float)
+    arrays = wall_gcp_array(areas, edition)
+    for i, a in enumerate(areas):
+        np.testing.assert_allclose([arr[i] for arr in arrays], wall_gcp(a, edition))
+
+
+def test_roof_gcp_per_edition():
+    roof_10 = get_roof_gcp_data("ASCE 7-10").set_index("Area (sf)")
+    roof_16 = get_roof_gcp_data("ASCE 7-16").set_index("Area (sf)")
+    # ASCE 7-10 Figure 30.4-2A vs ASCE 7-16 Figure 30.3-2A, Zone 3 at 10 sf
+    assert roof_10.loc[10, "Zone 3 Negative"] == pytest.approx(-2.8)
+    assert roof_16.loc[10, "Zone 3 Negative"] == pytest.approx(-3.2)
+    assert roof_10.loc[100, "Zone 2 Negative"] == pytest.approx(-1.1)
+    assert load_edition("ASCE 7-10").roof_zoning == "a"
+    assert load_edition("ASCE 7-16").roof_zoning == "0.6h"
+
+
+def test_wall_table_comes_from_the_edition():
+    table = get_wall_gcp_data().set_index("Area (sf)")
+    assert table.loc[100, "Zone 5 Negative"] == pytest.approx(wall_gcp(100)[2])
+
+
+def test_compute_wind_loads_uses_edition_roof_table():
+    results = compute_wind_loads(30, 115, "B", 0.85, 0.18, -0.18, "ASCE 7-10")
+    assert results["Kz"] == pytest.approx(0.70)
+    assert results["roof_gcp"]["Zone 3 Negative"].iloc[0] == pytest.approx(-2.8)
+
+
+def test_batch_uses_edition():
+    out = compute_wind_loads_batch([30.0], [115.0], "B", 0.85, 0.18, -0.18, [10.0], edition="ASCE 7-22")
+    assert out["Kz"][0] == pytest.approx(0.69)
+
+
+def test_governing_zone_pressures_follow_edition():
+    p16 = governing_zone_pressures(30.0, 0.18, -0.18, 10, "ASCE 7-16")
+    p10 = governing_zone_pressures(30.0, 0.18, -0.18, 10, "ASCE 7-10")
+    assert p16["Zone 3"] == pytest.approx(0.6 * 30.0 * (-3.2 - 0.18))
+    assert p10["Zone 3"] == pytest.approx(0.6 * 30.0 * (-2.8 - 0.18))
+    assert p10["Zone 4"] == pytest.approx(p16["Zone 4"])
+
+
+def test_portfolio_gcpi_from_edition():
+    import pandas as pd
+    df = pd.DataFrame({"name": ["a"], "height": [30], "V": [115], "exposure": ["c"],
+                       "enclosure": ["Partially Open Building"]})
+    assert normalize_portfolio(df.copy())["gcpi_positive"].iloc[0] == pytest.approx(0.18)
+    # ASCE 7-10 has no partially open classification
+    with pytest.raises(ValueError, match="ASCE 7-10"):
+        normalize_portfolio(df.copy(), "ASCE 7-10")
+
+
+def test_edition_for_ibc():
+    assert edition_for_ibc(2015) == ("ASCE 7-10", None)
+    assert edition_for_ibc(2024) == ("ASCE 7-22", None)
+    assert edition_for_ibc(2019)[0] == "ASCE 7-16"
+
+
+def test_compare_editions_relative_to_base():
+    df = compare_editions(30, 115, "B", 0.85, "Enclosed Building", 10).set_index("Edition")
+    assert df.loc["ASCE 7-16", "Δ Zone 4 Negative (%)"] == pytest.approx(0.0)
+    assert df.loc["ASCE 7-22", "Kz"] == pytest.approx(0.69)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from functions.enclosure_classifier import classify_inventory, governing_scenario, normalize_inventory, parse_flags
+
+GCPI = {"Enclosed Building": (0.18, -0.18), "Partially Open Building": (0.18, -0.18),
+        "Partially Enclosed Building": (0.55, -0.55), "Open Building": (0.0, 0.0)}
+
+# 100 ft N-S x 50 ft E-W x 20 ft: North/South walls 1,000 sf, East/West 2,000 sf, roof 5,000 sf
+BUILDING = (100, 50, 20.0)
+
+
+def _inventory(*rows):
+    return pd.DataFrame(rows, columns=["name", "surface", "area", "count", "open", "can_fail"])
+
+
+def test_flags_are_parsed_explicitly():
+    values = pd.Series([True, "no", "False", "0", 0, 1.0, "YES", " y ", "1", None, ""])
+    assert parse_flags(values, True, "open").tolist() == [True, False, False, False, False, True,
+                                                          True, True, True, True, True]
+    with pytest.raises(ValueError, match="'open' has maybe"):
+        parse_flags(pd.Series(["yes", "maybe"]), False, "open")
+
+
+def test_csv_spellings_of_false_stay_closed():
+    inventory = pd.DataFrame({"surface": ["south"], "area": ["140"], "open": ["no"], "can_fail": ["false"]})
+    normalized = normalize_inventory(inventory)
+    assert normalized.loc[0, "surface"] == "South"
+    assert not normalized.loc[0, "open"] and not normalized.loc[0, "can_fail"]
+    assert normalized.loc[0, "count"] == 1
+    scenarios = classify_inventory(inventory, *BUILDING, GCPI)
+    assert scenarios["Classification"].tolist() == ["Enclosed Building"]
+
+
+def test_unknown_surface_is_rejected():
+    with pytest.raises(ValueError, match="Unknown surface"):
+        normalize_inventory(pd.DataFrame({"surface": ["Up"], "area": [1.0]}))
+
+
+@pytest.mark.parametrize("rows, expected", [
+    # Every wall at most min(4 sf, 1% of Ag)
+    ([("a", "North", 3.0, 1, True, False), ("b", "East", 4.0, 1, True, False)], "Enclosed Building"),
+    # 50 sf on both North and South: Ao is not 1.1 Aoi
+    ([("a", "North", 50.0, 1, True, False), ("b", "South", 50.0, 1, True, False)], "Partially Open Building"),
+    # Every wall at least 80% open
+    ([(s, s, 0.8 * ag, 1, True, False) for s, ag in zip(("North", "East", "South", "West"),
+                                                          (1000, 2000, 1000, 2000))], "Open Building"),
+])
+def test_classification(rows, expected):
+    scenarios = classify_inventory(_inventory(*rows), *BUILDING, GCPI)
+    assert scenarios.loc[0, "Classification"] == expected
+
+
+def test_partially_enclosed_with_ri():
+    # South door 100 sf open, 3 sf of North vents: Ao = 100 > 1.1 x 3, Aoi/Agi = 3 / 10,000
+    inventory = _inventory(("Door", "South", 100.0, 1, True, False), ("Vents", "North", 1.5, 2, True, False))
+    row = classify_inventory(inventory, *BUILDING, GCPI).iloc[0]
+    assert row["Classification"] == "Partially Enclosed Building"
+    assert row["Windward wall"] == "South"
+    assert row["Ao/Ag"] == pytest.approx(0.1)
+    assert row["Aoi/Agi"] == pytest.approx(3 / 10_000)
+    # Ri = 0.5 (1 + 1 / sqrt(1 + 100,000 / (22,800 x 103)))
+    ri = 0.5 * (1 + 1 / np.sqrt(1 + 100_000 / (22_800 * 103)))
+    assert row["Ri"] == pytest.approx(ri)
+    assert row["GCpi +"] == pytest.approx(0.55 * ri)
+
+
+def test_failure_scenarios():
+    inventory = _inventory(("Windows", "North", 10.0, 3, False, True), ("Door", "East", 3.0, 1, True, False),
+                           ("Skylight", "Roof", 20.0, 1, False, False))
+    scenarios = classify_inventory(inventory, *BUILDING, GCPI)
+    assert scenarios["Scenario"].tolist() == ["As-is", "Windows fails", "All breakable openings on North fail"]
+    assert scenarios["Classification"].tolist() == ["Enclosed Building"] + ["Partially Enclosed Building"] * 2
+    worst = governing_scenario(scenarios)
+    assert worst["Scenario"] == "Windows fails" and worst["Windward wall"] == "North"
@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from functions.enclosure_classifier import classify_inventory, footprint_gross_areas, gross_areas
+from functions.footprint import MAX_VERTICES, footprint_properties, parse_footprint, preset_footprint, triangulate
+
+
+def test_bowtie_is_rejected():
+    with pytest.raises(ValueError, match="cross"):
+        parse_footprint("0,0\n10,10\n10,0\n0,10")
+
+
+def test_courtyard_crossing_the_boundary_is_rejected():
+    with pytest.raises(ValueError, match="cross"):
+        parse_footprint("0,0; 10,0; 10,10; 0,10 | 2,2; 12,3; 3,4")
+
+
+def _round_ring(n):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack([200 * np.cos(t), 200 * np.sin(t)])
+
+
+def test_very_large_footprints_are_rejected():
+    with pytest.raises(ValueError, match="at most"):
+        parse_footprint("\n".join(f"{x}, {y}" for x, y in _round_ring(MAX_VERTICES + 1)))
+
+
+def test_largest_footprint_stays_interactive():
+    t0 = time.perf_counter()
+    rings = parse_footprint("\n".join(f"{x}, {y}" for x, y in _round_ring(MAX_VERTICES)))
+    footprint_properties(rings, 30.0)
+    assert time.perf_counter() - t0 < 3.0
+
+
+def test_simple_footprints_are_accepted():
+    rings = parse_footprint("0,0; 120,0; 120,40; 60,40; 60,80; 0,80")
+    props = footprint_properties(rings, 30.0)
+    assert props["area"] == pytest.approx(120 * 80 - 60 * 40)
+    assert props["outside_corners"] == 5 and props["reentrant_corners"] == 1
+    assert len(triangulate(rings)) == 4
+
+
+def test_rectangle_gross_areas_match_the_box():
+    rings = preset_footprint("Rectangle", 120, 80)
+    props = footprint_properties(rings, 30.0)
+    np.testing.assert_allclose(footprint_gross_areas(props, 30.0), gross_areas(120, 80, 30.0))
+
+
+def test_l_shape_gross_areas_use_the_polygon():
+    # x points North, y East; the notch is the North-East quarter
+    rings = preset_footprint("L-shape", 120, 80)
+    gross = footprint_gross_areas(footprint_properties(rings, 30.0), 30.0)
+    north, east, south, west, roof = gross
+    assert north == pytest.approx((40 + 40) * 30)
+    assert east == pytest.approx((60 + 60) * 30)
+    assert south == pytest.approx(80 * 30)
+    assert west == pytest.approx(120 * 30)
+    assert roof == pytest.approx(120 * 80 - 60 * 40)
+
+
+def test_classifier_uses_the_footprint():
+    rings = preset_footprint("L-shape", 120, 80)
+    props = footprint_properties(rings, 30.0)
+    # A dominant South opening either way; the L's smaller plan area gives a
+    # smaller default volume and so a larger Ri
+    inventory = pd.DataFrame({"name": ["Door"], "surface": ["South"], "area": [300.0], "count": [1],
+                              "open": [True], "can_fail": [False]})
+    gcpi = {"Enclosed Building": (0.18, -0.18), "Partially Enclosed Building": (0.55, -0.55)}
+    box = classify_inventory(inventory, 120, 80, 30.0, gcpi)
+    poly = classify_inventory(inventory, 120, 80, 30.0, gcpi, footprint=props)
+    assert box.loc[0, "Classification"] == poly.loc[0, "Classification"] == "Partially Enclosed Building"
+    assert poly.loc[0, "Aoi/Agi"] == box.loc[0, "Aoi/Agi"] == 0
+    assert poly.loc[0, "Ao/Ag"] == pytest.approx(300 / (80 * 30))
+    assert poly.loc[0, "Ri"] > box.loc[0, "Ri"]
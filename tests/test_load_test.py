@@ -0,0 +1,42 @@
+from unittest import mock
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import functions.code_jurisdiction_1 as cj
+from benchmarks.load_test import AREAS, REPO_ROOT, TEST_PASSWORD, _actions, _login, throughput_ceiling
+from benchmarks.run_benchmarks import AREA_SLIDER_KEY, STUB_ADOPTION_HTML
+
+
+def _levels(*rates):
+    return [{"sessions": n, "reruns_per_s": r} for n, r in rates]
+
+
+@pytest.mark.parametrize("levels, best, at, saturates", [
+    # 2 -> 4 sessions gains 5%, less than SATURATION_GAIN
+    (_levels((1, 10.0), (2, 19.0), (4, 19.95), (8, 21.0)), 21.0, 8, 2),
+    # Still scaling at the end of the sweep
+    (_levels((1, 10.0), (2, 20.0), (4, 40.0)), 40.0, 4, 4),
+    # Exactly SATURATION_GAIN still counts as scaling
+    (_levels((1, 10.0), (2, 11.0), (4, 11.5)), 11.5, 4, 2),
+    # Throughput falls with the second session
+    (_levels((1, 10.0), (2, 8.0)), 10.0, 1, 1),
+    (_levels((3, 7.0)), 7.0, 3, 3),
+])
+def test_throughput_ceiling(levels, best, at, saturates):
+    ceiling = throughput_ceiling(levels)
+    assert ceiling["max_reruns_per_s"] == best
+    assert ceiling["at_sessions"] == at
+    assert ceiling["saturates_at_sessions"] == saturates
+
+
+def test_actions_drive_the_area_slider_by_key():
+    at = AppTest.from_file(str(REPO_ROOT / "App_R00.py"), default_timeout=60)
+    at.secrets["password"] = TEST_PASSWORD
+    with mock.patch.object(cj, "_http_get", return_value=STUB_ADOPTION_HTML):
+        _login(at)
+        # Steps 2, 5, ... move the slider through AREAS
+        _actions(at, 5)
+        at.run()
+    assert not at.exception
+    assert at.slider(key=AREA_SLIDER_KEY).value == AREAS[1]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from functions.footprint import extrude_footprint, preset_footprint
+from functions.mesh_import import analyze_mesh, face_pressures, subdivide, zone_resolution, zone_summary
+
+
+def _box(refine=True):
+    # 120 x 80 x 30 ft box: 12 triangles plus the floor split
+    vertices, triangles = extrude_footprint(preset_footprint("Rectangle", 120, 80), 30)
+    mesh = analyze_mesh(vertices, triangles)
+    if refine:
+        mesh = analyze_mesh(*subdivide(vertices, triangles, zone_resolution(mesh)))
+    return mesh
+
+
+def _zone_areas(mesh, edition):
+    summary = zone_summary(mesh, face_pressures(mesh, 30.0, 0.18, -0.18, edition=edition))
+    return summary.set_index(["Surface", "Zone"])["Area (sf)"]
+
+
+def test_coarse_box_has_no_corner_zones():
+    # The bug: with one face per side, every centroid is far from the corners
+    mesh = _box(refine=False)
+    assert mesh["max_edge"] > zone_resolution(mesh)
+    areas = _zone_areas(mesh, "ASCE 7-16")
+    assert ("Roof", "Zone 3") not in areas.index
+
+
+def test_refined_box_matches_asce7_16_zone_areas():
+    mesh = _box()
+    assert mesh["max_edge"] <= zone_resolution(mesh)
+    areas = _zone_areas(mesh, "ASCE 7-16")
+    # h = 30 ft: four Zone 3 L's of 2 x 6 x 18 - 6 x 6 sf, Zone 1 is (120 - 36) x (80 - 36)
+    assert areas[("Roof", "Zone 3")] == pytest.approx(4 * 180, rel=0.05)
+    assert areas[("Roof", "Zone 1")] == pytest.approx(84 * 44, rel=0.05)
+    # Walls: Zone 5 within a = 8 ft of each of the four corners
+    assert areas[("Wall", "Zone 5")] == pytest.approx(8 * 8 * 30, rel=0.05)
+
+
+def test_refined_box_matches_asce7_10_zone_areas():
+    areas = _zone_areas(_box(), "ASCE 7-10")
+    assert areas[("Roof", "Zone 3")] == pytest.approx(4 * 64, rel=0.1)
+    assert areas[("Roof", "Zone 1")] == pytest.approx(104 * 64, rel=0.05)
+
+
+def test_face_pressures_follow_the_edition():
+    mesh = _box()
+    p16 = face_pressures(mesh, 30.0, 0.18, -0.18, edition="ASCE 7-16")
+    p10 = face_pressures(mesh, 30.0, 0.18, -0.18, edition="ASCE 7-10")
+    zone1 = (p16["zone"] == 1) & (p10["zone"] == 1)
+    assert zone1.any()
+    assert not np.allclose(p16["gcp_negative"][zone1], p10["gcp_negative"][zone1])
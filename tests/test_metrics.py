@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import requests
+
+import functions.code_jurisdiction_1 as cj
+import functions.metrics as metrics
+from functions.metrics import Registry
+
+PAGE = "<html>Illinois adopted the 2021 IBC.</html>"
+
+
+def test_counter_exposition_escapes_labels():
+    registry = Registry()
+    plain = registry.counter("jobs_total", "Jobs run.")
+    plain.inc()
+    plain.inc(2)
+    labelled = registry.counter("errors_total", "Errors by reason.", labelnames=("reason",))
+    labelled.labels('say "hi"\\now\n').inc()
+    assert registry.render() == (
+        "# HELP jobs_total Jobs run.\n"
+        "# TYPE jobs_total counter\n"
+        "jobs_total 3.0\n"
+        "# HELP errors_total Errors by reason.\n"
+        "# TYPE errors_total counter\n"
+        'errors_total{reason="say \\"hi\\"\\\\now\\n"} 1.0\n'
+    )
+    # The same name registers once
+    assert registry.counter("jobs_total", "Again.") is plain
+    with pytest.raises(ValueError):
+        labelled.labels("a", "b")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    h = registry.histogram("latency_seconds", "Latency.", labelnames=("page",), buckets=(1.0, 0.1, 0.5))
+    for v in (0.05, 0.1, 0.3, 0.7, 4.0):
+        h.labels("home").observe(v)
+    lines = registry.render().splitlines()[2:]
+    assert lines == [
+        'latency_seconds_bucket{page="home",le="0.1"} 2',
+        'latency_seconds_bucket{page="home",le="0.5"} 3',
+        'latency_seconds_bucket{page="home",le="1.0"} 4',
+        'latency_seconds_bucket{page="home",le="+Inf"} 5',
+        'latency_seconds_sum{page="home"} 5.15',
+        'latency_seconds_count{page="home"} 5',
+    ]
+
+
+def test_file_exporter_writes_the_registry(tmp_path, monkeypatch):
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs run.").inc()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    path = tmp_path / "metrics.prom"
+    metrics.write_metrics_file(str(path))
+    assert path.read_text() == registry.render()
+    assert not (tmp_path / "metrics.prom.tmp").exists()
+
+
+@pytest.fixture
+def adoption(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cj, "_adoption_cache", {})
+    monkeypatch.setattr(cj, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_adoption_lookup_is_cached_for_the_ttl(adoption):
+    with mock.patch.object(cj, "_http_get", return_value=PAGE) as get:
+        res, hit = cj.cached_adoption_lookup("il")
+        assert (res.ibc_year, hit) == (2021, False)
+        adoption.now += cj.ADOPTION_CACHE_TTL_S - 1
+        assert cj.cached_adoption_lookup("IL") == (res, True)
+        assert get.call_count == 1
+        adoption.now += 1
+        assert cj.cached_adoption_lookup("IL")[1] is False
+        assert get.call_count == 2
+
+
+def test_adoption_lookup_failures_are_counted_not_cached(adoption):
+    failures = cj.ADOPTION_LOOKUP_FAILURES.labels("Timeout")
+    before = failures.value
+    with mock.patch.object(cj, "_http_get", side_effect=requests.Timeout("slow")):
+        with pytest.raises(requests.Timeout):
+            cj.cached_adoption_lookup("IL")
+    assert failures.value == before + 1
+    assert cj._adoption_cache == {}
+    assert f'wind_adoption_lookup_failures_total{{reason="Timeout"}} {before + 1!r}' in metrics.REGISTRY.render()
+
+    with mock.patch.object(cj, "_http_get", return_value=PAGE):
+        assert cj.cached_adoption_lookup("IL")[1] is False
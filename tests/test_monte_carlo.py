@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+import pytest
+
+from functions.job_queue import JobQueue
+from functions.monte_carlo import (
+    ZONES,
+    job_accumulators,
+    run_monte_carlo,
+    simulate_chunks,
+    chunk_specs,
+    submit_monte_carlo,
+)
+from functions.pressure_calculation import velocity_pressure
+
+
+def _inputs(edition="ASCE 7-16", exposure_probs=(1.0, 0.0, 0.0)):
+    return {
+        "height": 30.0, "area": 10.0, "gcpi_positive": 0.18, "gcpi_negative": -0.18,
+        "edition": edition,
+        "V": {"kind": "fixed", "value": 115.0},
+        "Kd": {"kind": "fixed", "value": 0.85},
+        "gcp_error": {"kind": "fixed", "value": 1.0},
+        "exposure_probs": list(exposure_probs),
+    }
+
+
+def test_fixed_inputs_reproduce_the_deterministic_pressure():
+    acc = run_monte_carlo(_inputs(), 20_000, chunk_size=5_000, seed=1)
+    q = velocity_pressure(0.70, 0.85, 115.0)
+    assert acc["Zone 5 Negative"].mean == pytest.approx(0.6 * q * (-1.4 - 0.18))
+    assert acc["Zone 5 Negative"].n == 20_000
+
+
+def test_edition_is_used():
+    a16 = run_monte_carlo(_inputs("ASCE 7-16"), 10_000, seed=1)["Zone 4 Negative"].mean
+    a22 = run_monte_carlo(_inputs("ASCE 7-22"), 10_000, seed=1)["Zone 4 Negative"].mean
+    assert a22 / a16 == pytest.approx(0.69 / 0.70)
+
+
+def test_grouped_tasks_match_in_process_run():
+    inputs = _inputs(exposure_probs=(0.3, 0.5, 0.2))
+    inputs["V"] = {"kind": "lognormal", "mean": 115.0, "cov": 0.1}
+    direct = run_monte_carlo(inputs, 30_000, chunk_size=4_000, seed=7)
+    specs = chunk_specs(inputs, 30_000, 4_000, seed=7)
+    parts = simulate_chunks(specs[:3]) + simulate_chunks(specs[3:])
+    for zone in ZONES:
+        merged = sum(p[zone]["counts"] for p in parts)
+        np.testing.assert_array_equal(merged, direct[zone].counts)
+
+
+def test_runs_on_the_shared_job_queue():
+    queue = JobQueue(max_workers=1)
+    job = submit_monte_carlo(_inputs(), 20_000, chunk_size=1_000, seed=3, queue=queue)
+    # 20 chunks fit in one task each (below MAX_JOB_CHUNKS)
+    assert job.total == 20
+    deadline = time.time() + 120
+    while not job.done and time.time() < deadline:
+        time.sleep(0.1)
+    assert job.done and not job.progress()["errors"]
+    acc = job_accumulators(job)
+    direct = run_monte_carlo(_inputs(), 20_000, chunk_size=1_000, seed=3)
+    np.testing.assert_array_equal(acc["Zone 4 Negative"].counts, direct["Zone 4 Negative"].counts)
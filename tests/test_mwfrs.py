@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from functions.Kz import compute_kz
+from functions.mwfrs import floor_elevations, leeward_cp, mwfrs_loads
+from functions.pressure_calculation import velocity_pressure
+
+
+def _loads(edition, height=30.0, exposure="B"):
+    return mwfrs_loads(height, 60.0, 120.0, exposure, 0.85, 115.0, 0.18, -0.18,
+                       floor_elevations(height, 2), edition=edition)
+
+
+def test_qh_follows_edition():
+    # ASCE 7-22 Exposure B at 30 ft is 0.69, ASCE 7-16 0.70
+    assert _loads("ASCE 7-22")["qh"] == pytest.approx(velocity_pressure(0.69, 0.85, 115.0))
+    assert _loads("ASCE 7-16")["qh"] == pytest.approx(velocity_pressure(0.70, 0.85, 115.0))
+
+
+def test_asce7_10_mwfrs_uses_table_27_3_1():
+    # Exposure B at 15 ft: 0.57 for the MWFRS (Table 27.3-1), 0.70 for C&C (Table 30.3-1)
+    assert compute_kz(15, "B", "ASCE 7-10", mwfrs=True) == pytest.approx(0.57)
+    assert compute_kz(15, "B", "ASCE 7-10") == pytest.approx(0.70)
+    assert _loads("ASCE 7-10", height=15.0)["qh"] == pytest.approx(velocity_pressure(0.57, 0.85, 115.0))
+
+
+def test_base_shear_equals_sum_of_story_forces():
+    res = _loads("ASCE 7-16")
+    stories = res["stories"]
+    for direction, total in zip(res["summary"]["Direction"], res["summary"]["Base shear (lb)"]):
+        assert stories.loc[stories["Direction"] == direction, "Story force (lb)"].sum() == pytest.approx(total)
+
+
+def test_leeward_cp():
+    np.testing.assert_allclose(leeward_cp([0.5, 1.0, 3.0, 6.0]), [-0.5, -0.5, -0.25, -0.2])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from functions.other_structures import CHIMNEY_STRUCTURE, chimney_loads, open_sign_cf, open_sign_loads, structure_kd
+
+
+@pytest.mark.parametrize("solidity, cf", [(0.05, 2.0), (0.1, 1.8), (0.29, 1.8), (0.3, 1.6), (0.7, 1.6)])
+def test_open_sign_cf_bands(solidity, cf):
+    assert open_sign_cf(solidity) == pytest.approx(cf)
+
+
+@pytest.mark.parametrize("solidity", [0.71, 0.99, np.array([0.3, 0.8])])
+def test_solid_signs_are_not_open_signs(solidity):
+    with pytest.raises(ValueError, match="solid sign"):
+        open_sign_cf(solidity)
+
+
+def test_open_sign_loads_refuse_solid_signs():
+    assert open_sign_loads(10, 20, 20, 0.7, "flat", "C", 0.85, 115)["force"] > 0
+    with pytest.raises(ValueError, match="solid sign"):
+        open_sign_loads(10, 20, 20, 0.9, "flat", "C", 0.85, 115)
+
+
+def test_solidity_input_stops_at_0_7():
+    at = AppTest.from_function(_page, default_timeout=30)
+    at.run()
+    field = at.number_input(key="os_sg_e")
+    assert field.max == pytest.approx(0.7)
+    field.set_value(0.7).run()
+    assert not at.exception
+
+
+@pytest.mark.parametrize("section, kd", [
+    ("Square (wind normal to face)", 0.90),
+    ("Hexagonal or octagonal", 1.00),
+    ("Round, moderately smooth", 1.00),
+])
+def test_chimney_kd_follows_table_26_6_1(section, kd):
+    assert structure_kd(CHIMNEY_STRUCTURE[section]) == kd
+    assert structure_kd(CHIMNEY_STRUCTURE[section], override=0.85) == 0.85
+
+
+def _page():
+    from functions.other_structures import show_other_structures
+    show_other_structures()
+
+
+def test_round_chimney_uses_kd_1():
+    at = AppTest.from_function(_page, default_timeout=30)
+    at.run()
+    at.selectbox(key="os_ch_section").set_value("Round, moderately smooth").run()
+    assert any("Kd = 1.00" in c.value for c in at.caption)
+    expected = chimney_loads(80.0, 6.0, "Round, moderately smooth", "C", 1.0, 115.0)["base_shear"]
+    assert at.metric[0].value == f"{expected:,.0f} lb"
+
+    at.checkbox(key="os_Kd_override").check().run()
+    at.number_input(key="os_Kd").set_value(0.9).run()
+    assert any("Kd = 0.90 (override)" in c.value for c in at.caption)
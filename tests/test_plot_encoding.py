@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from functions.editions import EDITIONS
+from functions.plot_encoding import decimate_curves, typed
+from functions.wall_gcp_chart import wall_gcp_array
+
+
+def test_typed_is_contiguous_float32_unless_given():
+    strided = np.arange(20, dtype=float).reshape(4, 5)[:, 1]
+    out = typed(strided)
+    assert out.dtype == np.float32 and out.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(out, [1, 6, 11, 16])
+    assert typed([0, 1, 2], np.uint8).dtype == np.uint8
+
+
+@pytest.mark.parametrize("edition", EDITIONS)
+def test_wall_gcp_curves_are_drawn_unchanged(edition):
+    x = np.logspace(0, 3, 300)
+    curves = wall_gcp_array(x, edition)
+    kept_x, kept = decimate_curves(x, curves, log_x=True)
+
+    assert len(kept_x) < 20
+    assert kept_x[0] == pytest.approx(1.0) and kept_x[-1] == pytest.approx(1000.0)
+    assert all(y.dtype == np.float32 for y in kept) and kept_x.dtype == np.float32
+    # The polylines through the kept samples pass through every original sample
+    for y, y_kept in zip(curves, kept):
+        redrawn = np.interp(np.log10(x), np.log10(kept_x.astype(float)), y_kept.astype(float))
+        np.testing.assert_allclose(redrawn, y, atol=1e-5)
+
+
+def test_linear_corners_and_short_inputs_are_kept():
+    x = np.arange(7.0)
+    y = np.array([0, 1, 2, 3, 3, 3, 3.0])
+    kept_x, (kept_y,) = decimate_curves(x, [y])
+    np.testing.assert_array_equal(kept_x, [0, 3, 6])
+    np.testing.assert_array_equal(kept_y, [0, 3, 3])
+
+    kept_x, (kept_y,) = decimate_curves([1.0, 2.0], [[5.0, 4.0]])
+    np.testing.assert_array_equal(kept_x, [1, 2])
+    np.testing.assert_array_equal(kept_y, [5, 4])
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from functions.portfolio import compute_portfolio_chunk, prepare_portfolio
+
+
+def _buildings(**extra):
+    return pd.DataFrame({"name": ["low", "tall"], "height": [20.0, 30.0], "V": [115.0, 115.0],
+                         "exposure": ["B", "B"], **extra})
+
+
+def test_chunk_uses_the_edition_of_the_records():
+    rows_16 = compute_portfolio_chunk(prepare_portfolio(_buildings()))
+    rows_10 = compute_portfolio_chunk(prepare_portfolio(_buildings(), "ASCE 7-10"))
+    rows_22 = compute_portfolio_chunk(prepare_portfolio(_buildings(), "ASCE 7-22"))
+    assert rows_16[0]["Kz"] == pytest.approx(0.62)
+    assert rows_10[0]["Kz"] == pytest.approx(0.70)
+    assert rows_22[1]["Kz"] == pytest.approx(0.69)
+    assert rows_10[0]["edition"] == "ASCE 7-10"
+
+
+def test_optional_defaults_and_gcpi():
+    records = prepare_portfolio(_buildings(enclosure=["Partially Enclosed Building", None]))
+    assert records[0]["gcpi_positive"] == pytest.approx(0.55)
+    assert records[1]["gcpi_positive"] == pytest.approx(0.18)
+    assert records[1]["Kd"] == pytest.approx(0.85)
+
+
+def test_missing_and_bad_columns():
+    with pytest.raises(ValueError, match="missing column"):
+        prepare_portfolio(pd.DataFrame({"name": ["a"], "height": [30]}))
+    with pytest.raises(ValueError, match="exposure"):
+        prepare_portfolio(_buildings().assign(exposure=["B", "E"]))
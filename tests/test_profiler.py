@@ -0,0 +1,69 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from functions import profiler
+from functions.profiler import finish_rerun, span, start_rerun
+
+
+@pytest.fixture(autouse=True)
+def profiling(monkeypatch):
+    monkeypatch.setenv(profiler.PROFILER_ENV, "1")
+    monkeypatch.setattr(profiler, "show_profiler_panel", lambda history: None)
+    yield
+    assert not profiler._active
+
+
+def _profiled_rerun(before_finish=None):
+    start_rerun()
+    with span("step"):
+        data = [bytes(1024) for _ in range(100)]
+        if before_finish is not None:
+            before_finish()
+    rerun = profiler._current_rerun.get()
+    finish_rerun()
+    del data
+    return rerun
+
+
+def test_tracing_stops_when_no_profiled_rerun_is_open():
+    assert not tracemalloc.is_tracing()
+    rerun = _profiled_rerun()
+    assert not tracemalloc.is_tracing()
+    assert rerun["memory"]
+    assert rerun["spans"][0]["peak_bytes"] >= 100 * 1024
+
+
+def test_overlapping_reruns_drop_memory_peaks():
+    results = {}
+    inside, release = threading.Event(), threading.Event()
+
+    def other_session():
+        def wait():
+            inside.set()
+            release.wait(5)
+        results["other"] = _profiled_rerun(wait)
+
+    t = threading.Thread(target=other_session)
+    t.start()
+    inside.wait(5)
+    results["this"] = _profiled_rerun(release.set)
+    t.join()
+
+    for rerun in results.values():
+        assert rerun["memory"] is False
+        assert rerun["spans"][0]["peak_bytes"] is None
+    assert not tracemalloc.is_tracing()
+
+
+def test_rerun_ended_by_an_exception_does_not_keep_tracing():
+    def stopped_session():
+        start_rerun()          # e.g. st.stop(): finish_rerun is never reached
+
+    t = threading.Thread(target=stopped_session)
+    t.start()
+    t.join()
+    assert tracemalloc.is_tracing()
+    _profiled_rerun()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,100 @@
+from unittest import mock
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import functions.code_jurisdiction_1 as cj
+import functions.project_store as project_store
+import functions.result_cache as result_cache
+from functions.projects import PROJECT_STATE_KEYS
+
+APP = str(cj.__file__).replace("functions/code_jurisdiction_1.py", "App_R00.py")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_store, "_store", project_store.ProjectStore(tmp_path / "projects.sqlite3"))
+    monkeypatch.setattr(result_cache, "_cache", result_cache.ResultCache(tmp_path / "results"))
+
+    def new_session():
+        at = AppTest.from_file(APP, default_timeout=60)
+        at.secrets["password"] = "x"
+        at.session_state["authenticated"] = True
+        return at
+
+    with mock.patch.object(cj, "_http_get", return_value="<html>2021 IBC 2018 IECC</html>"):
+        yield new_session
+
+
+def test_year_inputs_follow_the_state_until_edited(app):
+    at = app()
+    at.run()
+    assert at.text_input(key="cj_ibc").value == "2021"
+    at.text_input(key="cj_ibc").set_value("2015").run()
+    assert at.text_input(key="cj_ibc").value == "2015"
+    at.selectbox(key="cj_state").select_index(0).run()
+    assert at.text_input(key="cj_ibc").value == "2021"
+
+
+def test_saved_project_restores_every_step(app):
+    at = app()
+    at.run()
+    at.radio(key="bd_mode").set_value("Polygon").run()
+    at.checkbox(key="bd_reentrant").uncheck()
+    at.number_input(key="bd_h").set_value(42.0)
+    at.text_input(key="cj_ibc").set_value("2015")
+    assert at.number_input(key="cj_lat").value is None
+    at.number_input(key="cj_lat").set_value(18.4655)
+    at.number_input(key="cj_lon").set_value(-66.1057)
+    at.session_state["enc_inventory_rows"] = [
+        {"name": "Roll-up door", "surface": "South", "area": 140.0, "count": 2, "open": True, "can_fail": False},
+    ]
+    at.radio(key="enclosure_method").set_value("From opening inventory").run()
+    missing = [k for k in PROJECT_STATE_KEYS if k not in at.session_state]
+    assert set(missing) <= {"bd_ns", "bd_ew", "enclosure_classification"}  # not shown in these modes
+    saved_inventory = at.session_state["enc_inventory_current"]
+    assert [row["name"] for row in saved_inventory] == ["Roll-up door"]
+
+    at.text_input(key="project_name").set_value("Polygon warehouse")
+    at.button(key="project_save").click().run()
+    assert not at.exception
+
+    fresh = app()
+    fresh.run()
+    load = [b for b in fresh.button if b.key and b.key.startswith("project_load_")]
+    assert len(load) == 1
+    load[0].click().run()
+    fresh.run()
+    assert not fresh.exception
+    assert fresh.radio(key="bd_mode").value == "Polygon"
+    assert fresh.checkbox(key="bd_reentrant").value is False
+    assert fresh.number_input(key="bd_h").value == 42.0
+    assert fresh.text_input(key="cj_ibc").value == "2015"
+    assert (fresh.number_input(key="cj_lat").value, fresh.number_input(key="cj_lon").value) == (18.4655, -66.1057)
+    assert fresh.radio(key="enclosure_method").value == "From opening inventory"
+    assert fresh.session_state["enc_inventory_current"] == saved_inventory
+
+
+def test_store_keeps_results_in_the_result_cache_format(tmp_path):
+    import json
+    import zlib
+
+    import pandas as pd
+
+    store = project_store.ProjectStore(tmp_path / "projects.sqlite3")
+    results = {"qh": 28.2, "table": pd.DataFrame({"Zone": ["4", "5"], "GCp": [-1.1, -1.4]})}
+    record = store.load_project(store.save_project("p", {"V": 115}, results=results))
+    pd.testing.assert_frame_equal(record.results["table"], results["table"])
+    assert record.results["qh"] == 28.2
+
+    blob = store._conn.execute("SELECT results FROM projects").fetchone()[0]
+    assert zlib.decompress(blob) == result_cache.encode_results(results)
+
+    # Rows written before the shared format still load
+    legacy = zlib.compress(json.dumps({
+        "qh": {"value": 28.2}, "table": {"frame": results["table"].to_json(orient="split")},
+    }).encode("utf-8"))
+    with store._conn:
+        store._conn.execute("UPDATE projects SET results = ?", (legacy,))
+    record = store.load_project(record.id)
+    pd.testing.assert_frame_equal(record.results["table"], results["table"])
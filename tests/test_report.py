@@ -0,0 +1,75 @@
+import io
+import os
+import time
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import functions.report as report
+from functions.editions import load_edition
+from functions.report import (excel_bytes, new_batch_dir, remove_batch, remove_old_batches, render_report_chunk,
+                              report_data, report_records, zip_batch)
+
+RECORD = {"name": "Warehouse", "height": 30.0, "V": 115.0, "exposure": "C", "Kd": 0.85,
+          "enclosure": "Enclosed Building", "gcpi_positive": 0.18, "gcpi_negative": -0.18}
+
+
+def test_report_has_roof_pressures():
+    data = report_data(RECORD)
+    roof = data["roof_pressure"].set_index("Effective Area (sf)")
+    gcp = load_edition().roof_gcp_table().set_index("Area (sf)")
+    assert roof.loc[10, "Zone 3 Negative (psf)"] == pytest.approx(0.6 * data["q"] * (gcp.loc[10, "Zone 3 Negative"] - 0.18))
+    assert roof.loc[10, "Zones 1-3 Positive (psf)"] == pytest.approx(0.6 * data["q"] * (gcp.loc[10, "Zone 1 Positive"] + 0.18))
+    sheets = load_workbook(io.BytesIO(excel_bytes(data)), read_only=True).sheetnames
+    assert "Roof Pressures" in sheets
+
+
+def test_batch_package_is_split_into_parts(tmp_path):
+    records = report_records([{**RECORD, "name": f"B{i}"} for i in range(3)], tmp_path)
+    summary = render_report_chunk(records[:2]) + render_report_chunk(records[2:])
+    parts = zip_batch(summary, tmp_path, part_bytes=1)
+    # Each member goes to a part of its own once a part is over the size
+    assert [p.name for p in parts] == [f"calc_package_{i}.zip" for i in range(1, 5)]
+    names = [n for p in parts for n in zipfile.ZipFile(p).namelist()]
+    assert names == ["wind_loads.xlsx"] + [f"reports/{row['report']}" for row in summary]
+
+    whole = zip_batch(summary, tmp_path)
+    assert len(whole) == 1
+    with zipfile.ZipFile(whole[0]) as zf:
+        wb = load_workbook(io.BytesIO(zf.read("wind_loads.xlsx")), read_only=True)
+    roof = pd.DataFrame(list(wb["Roof Pressures"].values))
+    assert len(roof) == 1 + 3 * 7
+    assert roof.iloc[0, 0] == "name" and set(roof.iloc[1:, 0]) == {"B0", "B1", "B2"}
+
+
+def test_old_batches_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(report, "BATCH_DIR", tmp_path)
+    old, fresh = new_batch_dir(), new_batch_dir()
+    past = time.time() - 48 * 3600
+    os.utime(old, (past, past))
+    assert remove_old_batches(24) == 1
+    assert not old.exists() and fresh.exists()
+
+    remove_batch(fresh)
+    assert not fresh.exists()
+    outside = tmp_path.parent / "keep_me"
+    outside.mkdir(exist_ok=True)
+    remove_batch(outside)
+    assert outside.exists()
+
+
+@pytest.mark.parametrize("edition, title", [("ASCE 7-10", "GCp (Figure 30.4-1 / Figure 30.4-2A)"),
+                                            ("ASCE 7-22", "GCp (Figure 30.3-1 / Figure 30.3-2A)")])
+def test_pdf_cites_the_edition_figures(edition, title, monkeypatch):
+    texts = []
+
+    class Figure(report.Figure):
+        def text(self, x, y, s, *args, **kwargs):
+            texts.append(s)
+            return super().text(x, y, s, *args, **kwargs)
+
+    monkeypatch.setattr(report, "Figure", Figure)
+    report.pdf_bytes(report_data({**RECORD, "edition": edition}))
+    assert title in texts
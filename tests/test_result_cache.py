@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+import pytest
+
+from functions.result_cache import (ResultCache, decode_results, encode_results, normalize_inputs,
+                                    wind_loads_key)
+from functions.wind_load_results import compute_wind_loads
+
+
+def test_gcpi_is_keyed_and_computed_exactly():
+    # An Ri-reduced GCpi must not collapse onto the rounded value
+    assert wind_loads_key(30, 115, "C", 0.85, 0.183, -0.183) != wind_loads_key(30, 115, "C", 0.85, 0.18, -0.18)
+    inputs = normalize_inputs(30, 115, "c", 0.85, 0.183, -0.183)
+    assert inputs["gcpi_positive"] == 0.183 and inputs["exposure"] == "C"
+
+
+def test_results_round_trip_through_json():
+    results = compute_wind_loads(**normalize_inputs(30, 115, "C", 0.85, 0.18, -0.18))
+    data = encode_results(results)
+    assert b"pandas" not in data
+    back = decode_results(data)
+    assert back.keys() == results.keys()
+    for k, v in results.items():
+        if isinstance(v, pd.DataFrame):
+            pd.testing.assert_frame_equal(back[k], v.reset_index(drop=True), check_dtype=False)
+        else:
+            assert back[k] == pytest.approx(v)
+
+
+def _entry(i):
+    return {"q": float(i), "table": pd.DataFrame({"a": [float(i)] * 50})}
+
+
+def test_disk_cap_is_shared_between_caches(tmp_path):
+    size = len(encode_results(_entry(0)))
+    first = ResultCache(tmp_path, max_entries=1, max_disk_bytes=5 * size)
+    second = ResultCache(tmp_path, max_entries=1, max_disk_bytes=5 * size)
+    for i in range(6):
+        first.put(f"a{i}", _entry(i))
+        second.put(f"b{i}", _entry(i))
+    files = list(tmp_path.glob("*.json"))
+    assert len(files) <= 5
+    assert sum(f.stat().st_size for f in files) <= 5 * size
+    assert not list(tmp_path.glob("*.pkl"))
+    # The newest entry survives and is readable from the other instance
+    assert first.get("b5")["q"] == 5.0
+
+
+def test_cache_directory_is_private(tmp_path):
+    directory = tmp_path / "results"
+    cache = ResultCache(directory)
+    cache.put("k", _entry(1))
+    assert directory.stat().st_mode & 0o777 == 0o700
+    assert (directory / "k.json").stat().st_mode & 0o777 == 0o600
+
+
+def test_disk_io_runs_outside_the_memory_lock(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_entries=1)
+    held = []
+    read, write = cache._read_disk, cache._write_disk
+    monkeypatch.setattr(cache, "_read_disk", lambda k: held.append(cache._lock.locked()) or read(k))
+    monkeypatch.setattr(cache, "_write_disk", lambda k, v: held.append(cache._lock.locked()) or write(k, v))
+    cache.put("a", _entry(1))
+    cache.put("b", _entry(2))
+    assert cache.get("a")["q"] == 1.0
+    assert held == [False, False, False]
+
+
+def test_disk_size_is_tracked_without_rescanning(tmp_path, monkeypatch):
+    size = len(encode_results(_entry(0)))
+    cache = ResultCache(tmp_path, max_entries=1, max_disk_bytes=3 * size)
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+    for i in range(3):
+        cache.put(f"k{i}", _entry(i))
+    cache.put("k0", _entry(0))  # Overwriting does not grow the directory
+    assert scans == []
+    assert cache.stats()["disk_bytes"] == 3 * size
+    assert cache.stats()["disk_entries"] == 3
+    cache.put("k3", _entry(3))  # Over the cap: one rescan trims the oldest entry
+    assert len(scans) == 1
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.stats()["disk_bytes"] == sum(f.stat().st_size for f in tmp_path.glob("*.json"))
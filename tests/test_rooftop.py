@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from functions.GCP_h_Less_than_60 import get_roof_gcp_data
+from functions.rooftop_loads import (PV_GAP, PV_MAX_COLS, PV_MAX_ROWS, PV_PANEL_LENGTH, PV_PANEL_WIDTH,
+                                     default_solar_array, layout_solar_array, roof_gcp_array, solar_panel_loads)
+
+
+def _array():
+    # 120 x 80 ft roof, 5 ft square panels from (10, 10) to (110, 70)
+    return layout_solar_array(120, 80, 10, 10, 20, 12, 5, 5)
+
+
+def test_asce7_16_panels_are_zoned_with_0_6h_bands():
+    panels = _array()
+    df = solar_panel_loads(panels, 30.0, 30.0, 120, 80, 5, 5, edition="ASCE 7-16")
+    zone = df["Roof Zone"].to_numpy()
+    x0, y0 = panels["x0"], panels["y0"]
+    # h = 30 ft: Zone 2 band 18 ft, Zone 3 strips 6 ft deep, so no Zone 3 from 10 ft in
+    assert not (zone == 3).any()
+    assert (zone[(x0 >= 20) & (x0 <= 95) & (y0 >= 20) & (y0 <= 55)] == 1).all()
+    assert (zone[(x0 == 10) | (y0 == 10)] == 2).all()
+
+
+def test_asce7_10_panels_are_zoned_with_a():
+    panels = layout_solar_array(120, 80, 0, 0, 24, 16, 5, 5)
+    df = solar_panel_loads(panels, 30.0, 30.0, 120, 80, 5, 5, edition="ASCE 7-10")
+    zone = df["Roof Zone"].to_numpy()
+    # a = 8 ft: corner panels reaching into the 8 x 8 squares are Zone 3
+    corner = ((panels["x0"] < 8) | (panels["x1"] > 112)) & ((panels["y0"] < 8) | (panels["y1"] > 72))
+    np.testing.assert_array_equal(zone == 3, corner)
+
+
+@pytest.mark.parametrize("edition", ["ASCE 7-10", "ASCE 7-16"])
+def test_roof_gcp_array_uses_the_edition(edition):
+    table = get_roof_gcp_data(edition)
+    positive, negative = roof_gcp_array(np.array([10.0, 10.0, 10.0]), np.array([1, 2, 3]), edition)
+    np.testing.assert_allclose(negative, table.loc[table["Area (sf)"] == 10, ["Zone 1 Negative", "Zone 2 Negative",
+                                                                             "Zone 3 Negative"]].to_numpy()[0])
+    assert positive[0] == pytest.approx(table.loc[table["Area (sf)"] == 10, "Zone 1 Positive"].iloc[0])
+
+
+@pytest.mark.parametrize("length, width", [(80, 60), (60, 80), (120, 80), (400, 300), (30, 20), (12, 8)])
+def test_default_array_fits_the_roof(length, width):
+    n_cols, n_rows, x0, y0 = default_solar_array(length, width)
+    panels = layout_solar_array(length, width, x0, y0, n_cols, n_rows, PV_PANEL_LENGTH, PV_PANEL_WIDTH, PV_GAP)
+    assert panels["x1"].max() <= length and panels["y1"].max() <= width
+    assert n_cols <= PV_MAX_COLS and n_rows <= PV_MAX_ROWS
+
+
+def test_default_array_on_the_default_building():
+    # 80 x 60 ft: 8 and 6 ft setbacks, 11 columns of 5.5 ft and 10 rows of 3.4 ft
+    assert default_solar_array(80, 60) == (11, 10, 8.0, 6.0)
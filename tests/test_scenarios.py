@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+import functions.result_cache as result_cache
+from functions.result_cache import ResultCache, cached_wind_loads, wind_loads_key
+from functions.scenarios import compare_scenarios, scenario_inputs, scenario_results
+from functions.wind_load_results import compute_wind_loads
+
+BASE = {"height": 30.0, "V": 115.0, "exposure": "C", "Kd": 0.85, "enclosure": "Enclosed Building",
+        "gcpi_positive": 0.18, "gcpi_negative": -0.18, "edition": "ASCE 7-16"}
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    monkeypatch.setattr(result_cache, "_cache", cache)
+    return cache
+
+
+def _full(s):
+    return compute_wind_loads(s["height"], s["V"], s["exposure"], s["Kd"], s["gcpi_positive"],
+                              s["gcpi_negative"], s["edition"])
+
+
+def _assert_same(results, expected):
+    assert results["Kz"] == pytest.approx(expected["Kz"])
+    assert results["q"] == pytest.approx(expected["q"])
+    for k in ("wall_gcp", "roof_gcp", "wall_pressure"):
+        pd.testing.assert_frame_equal(results[k].reset_index(drop=True), expected[k].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("overrides", [
+    {"edition": "ASCE 7-10"},
+    {"edition": "ASCE 7-22"},
+    {"exposure": "D"},
+    {"enclosure": "Partially Enclosed Building"},
+    {"height": 45.0, "V": 140.0},
+])
+def test_scenarios_match_the_full_calculation(overrides):
+    base_results = _full(BASE)
+    results = scenario_results(BASE, base_results, overrides)
+    _assert_same(results, _full(scenario_inputs(BASE, overrides)))
+
+
+def test_edition_scenario_rebuilds_the_gcp_tables():
+    base_results = _full(BASE)
+    results = scenario_results(BASE, base_results, {"edition": "ASCE 7-10"})
+    assert not results["roof_gcp"].equals(base_results["roof_gcp"])
+
+
+def test_enclosure_scenario_reuses_the_base_tables():
+    base_results = _full(BASE)
+    results = scenario_results(BASE, base_results, {"enclosure": "Partially Enclosed Building"})
+    assert results["wall_gcp"] is base_results["wall_gcp"] and results["roof_gcp"] is base_results["roof_gcp"]
+    assert scenario_inputs(BASE, {"enclosure": "Partially Enclosed Building"})["gcpi_positive"] == 0.55
+
+
+def test_derived_results_never_fill_the_canonical_key(cache):
+    s = scenario_inputs(BASE, {"edition": "ASCE 7-10"})
+    scenario_results(BASE, _full(BASE), {"edition": "ASCE 7-10"})
+    key = wind_loads_key(s["height"], s["V"], s["exposure"], s["Kd"], s["gcpi_positive"], s["gcpi_negative"],
+                         s["edition"])
+    assert cache.get(key) is None
+    _assert_same(cached_wind_loads(s["height"], s["V"], s["exposure"], s["Kd"], s["gcpi_positive"],
+                                   s["gcpi_negative"], s["edition"]), _full(s))
+
+
+def test_unknown_classification_is_reported_in_the_comparison():
+    df = compare_scenarios(BASE, _full(BASE), {"Open": {"enclosure": "Nonexistent"}}, 10)
+    assert df.loc[1, "Changes"].startswith("“Nonexistent”")
+    assert df.loc[0, "Scenario"] == "Base"
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import functions.wind_regions as wind_regions
+from functions.portfolio import compute_portfolio_chunk, prepare_portfolio
+from functions.wind_regions import RegionIndex, classify_sites, read_region_files, site_flags
+
+
+def _square(x0, y0, size):
+    return np.array([[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size]], dtype=float)
+
+
+@pytest.fixture
+def index():
+    # A 4 x 4 degree debris region with a 1 x 1 hole, and a special wind region across cells
+    return RegionIndex([
+        ("wind_borne_debris", "Coast", [[_square(-82, 26, 4), _square(-81, 27, 1)]]),
+        ("special_wind_region", "Ridge", [[_square(-79.5, 26.5, 2.5)]]),
+    ])
+
+
+def test_index_finds_sites_by_polygon_and_hole(index):
+    lon = np.array([-81.5, -80.5, -77.5, -90.0, np.nan])
+    lat = np.array([26.5, 27.5, 28.0, 40.0, 27.0])
+    df = index.classify(lon, lat)
+    assert df["wind_borne_debris"].tolist() == [True, False, False, False, False]
+    assert df["special_wind_region"].tolist() == [False, False, True, False, False]
+    assert df.loc[0, "wind_borne_debris name"] == "Coast"
+
+
+def test_index_matches_brute_force(index):
+    rng = np.random.default_rng(1)
+    lon, lat = rng.uniform(-83, -76, 5000), rng.uniform(25, 31, 5000)
+    df = index.classify(lon, lat)
+    in_outer = (lon >= -82) & (lon <= -78) & (lat >= 26) & (lat <= 30)
+    in_hole = (lon > -81) & (lon < -80) & (lat > 27) & (lat < 28)
+    np.testing.assert_array_equal(df["wind_borne_debris"], in_outer & ~in_hole)
+
+
+def test_region_files_are_read(tmp_path):
+    feature = {"type": "Feature", "properties": {"name": "Keys"},
+               "geometry": {"type": "Polygon", "coordinates": [_square(-82, 24, 1).tolist()]}}
+    (tmp_path / "hurricane_prone.geojson").write_text(json.dumps({"features": [feature]}))
+    [(kind, name, polygons)] = read_region_files(tmp_path)
+    assert (kind, name, len(polygons)) == ("hurricane_prone", "Keys", 1)
+
+
+@pytest.mark.parametrize("state", ["HI", "PR", "GU", "VI", "AS"])
+def test_islands_are_hurricane_prone_at_any_speed(index, state):
+    df = classify_sites(np.array([0.0, 0.0]), np.array([0.0, 0.0]), np.array([100.0, 135.0]), state, index=index)
+    assert df["hurricane_prone"].all()
+    assert df["debris_if_coastal"].tolist() == [False, True]
+
+
+def test_coast_states_need_the_speed(index):
+    df = classify_sites(np.zeros(2), np.zeros(2), np.array([110.0, 150.0]), "FL", index=index)
+    assert df["hurricane_prone"].tolist() == [False, True]
+    assert df["wind_borne_debris"].tolist() == [False, True]
+
+
+def test_no_lookup_without_coordinates(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("region index loaded")
+
+    monkeypatch.setattr(wind_regions, "load_region_index", fail)
+    assert site_flags(None, None, V=150.0, state="FL") == []
+    assert site_flags(43.0, None, state="FL", risk_category="IV") == []
+
+
+def test_portfolio_carries_debris_if_coastal(monkeypatch, index):
+    monkeypatch.setattr(wind_regions, "load_region_index", lambda *args: index)
+    df = pd.DataFrame({"name": ["san juan", "milwaukee"], "height": [30.0, 30.0], "V": [135.0, 115.0],
+                       "exposure": ["C", "C"], "lat": [18.4, 43.0], "lon": [-66.1, -87.9], "state": ["PR", "WI"]})
+    rows = compute_portfolio_chunk(prepare_portfolio(df))
+    assert [r["debris_if_coastal"] for r in rows] == [True, False]
+    assert [r["hurricane_prone"] for r in rows] == [True, False]
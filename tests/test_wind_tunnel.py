@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from functions.wind_tunnel import process_tap_record, server_record_path, server_records
+
+
+def test_only_records_in_the_data_directory_can_be_opened(tmp_path):
+    (tmp_path / "run1.csv").write_text("T1\n0.1\n")
+    (tmp_path / "notes.md").write_text("not a record")
+    assert server_records(str(tmp_path)) == ["run1.csv"]
+    assert server_record_path("run1.csv", str(tmp_path)) == str(tmp_path / "run1.csv")
+    for name in ("/etc/passwd", "../run1.csv", "notes.md", "missing.csv"):
+        with pytest.raises(ValueError):
+            server_record_path(name, str(tmp_path))
+
+
+def test_no_server_records_without_a_data_directory():
+    assert server_records(None) == []
+    with pytest.raises(ValueError):
+        server_record_path("run1.csv", None)
+
+
+def test_binary_record_is_streamed_in_blocks(tmp_path):
+    rng = np.random.default_rng(0)
+    data = rng.normal(-1.0, 0.2, size=(10_000, 3)).astype("<f4")
+    path = tmp_path / "run.bin"
+    data.tofile(path)
+    seen = []
+    taps, groups = process_tap_record(str(path), n_taps=3, n_segments=4, chunk_rows=1024,
+                                      progress=lambda done, total: seen.append(done))
+    assert groups is None
+    assert seen == [min(n, 10_000) for n in range(1024, 11_264, 1024)]
+    np.testing.assert_allclose(taps["Mean Cp"], data.mean(axis=0), rtol=1e-4)
+    np.testing.assert_allclose(taps["Min Cp"], data.min(axis=0))
@@ -0,0 +1,96 @@
+import time
+
+import numpy as np
+import pytest
+
+from functions.cc_zones import GRID_LINES, contains, rect_roof_zones, roof_zone, roof_zone_cells, roof_zone_widths
+from functions.create_building_visualisation import create_pressure_visualisation
+from functions.footprint import (footprint_properties, normalize_rings, preset_footprint, signed_area,
+                                 wall_segments)
+from functions.wind_load_results import governing_zone_pressures
+
+
+def test_roof_zone_widths_per_edition():
+    # 120 x 80 ft, h = 30 ft: a = min(0.1 * 80, 0.4 * 30) = 8 ft
+    assert roof_zone_widths(80, 30, "ASCE 7-10") == (8.0, 8.0, 8.0)
+    assert roof_zone_widths(80, 30, "ASCE 7-16") == pytest.approx((18.0, 6.0, 18.0))
+    assert roof_zone_widths(80, 30, "ASCE 7-22") == pytest.approx((18.0, 6.0, 18.0))
+
+
+def test_asce7_16_roof_zones_use_0_6h_geometry():
+    w = roof_zone_widths(80, 30, "ASCE 7-16")
+    # (distance to x edge, distance to y edge)
+    d = [[3, 15], [15, 3], [10, 10], [3, 40], [17, 40], [19, 40], [40, 40]]
+    assert roof_zone(d, w).tolist() == [3, 3, 2, 2, 2, 1, 1]
+
+
+def test_asce7_10_roof_zones_use_a():
+    w = roof_zone_widths(80, 30, "ASCE 7-10")
+    d = [[3, 7], [7, 9], [10, 10], [40, 40]]
+    assert roof_zone(d, w).tolist() == [3, 2, 1, 1]
+
+
+def test_rect_zones_take_the_governing_zone_of_a_panel():
+    w = roof_zone_widths(80, 30, "ASCE 7-16")
+    # A panel from 20 to 30 ft is Zone 1; one reaching to 17 ft touches Zone 2
+    zones = rect_roof_zones([20, 17, 100], [20, 20, 76], [30, 30, 110], [30, 30, 79], 120, 80, w)
+    assert zones.tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("shape", ["Rectangle", "L-shape", "U-shape", "Courtyard"])
+def test_roof_cells_tile_the_footprint(shape):
+    rings = preset_footprint(shape, 120, 80)
+    cells = np.array(roof_zone_cells(rings, roof_zone_widths(80, 30, "ASCE 7-16")))
+    area = ((cells[:, 2] - cells[:, 1]) * (cells[:, 4] - cells[:, 3])).sum()
+    assert area == pytest.approx(sum(signed_area(r) for r in rings))
+    centers = np.column_stack([(cells[:, 1] + cells[:, 2]) / 2, (cells[:, 3] + cells[:, 4]) / 2])
+    assert contains(rings, centers).all()
+
+
+def test_rectangle_roof_is_a_handful_of_quads():
+    rings = preset_footprint("Rectangle", 1200, 800)
+    w = roof_zone_widths(800, 50, "ASCE 7-16")
+    fig = create_pressure_visualisation(rings, 50, wall_segments(rings, 20), w,
+                                        {f"Zone {i}": -float(i) for i in range(1, 6)})
+    # 15 roof rectangles and 12 wall pieces, 4 vertices each
+    assert sum(len(t.x) for t in fig.data) == 4 * (15 + 12)
+
+
+def test_polygon_pressure_map_follows_the_footprint():
+    rings = preset_footprint("L-shape", 120, 80)
+    fig = create_pressure_visualisation(rings, 30, wall_segments(rings, 8), roof_zone_widths(80, 30),
+                                        {f"Zone {i}": -float(i) for i in range(1, 6)})
+    xyz = np.concatenate([np.column_stack([t.x, t.y, t.z]) for t in fig.data])
+    roof = xyz[xyz[:, 2] == 30]
+    # Nothing is drawn over the notch of the L (x > 60, y > 40)
+    notch = (roof[:, 0] > 60 + 1e-9) & (roof[:, 1] > 40 + 1e-9)
+    assert not notch.any()
+
+
+def test_governing_zone_pressures_use_the_gcp_source():
+    def tunnel(area):
+        return 0.5, -0.5, -3.0
+
+    p = governing_zone_pressures(30.0, 0.18, -0.18, 10, gcp_source=tunnel)
+    assert p["Zone 5"] == pytest.approx(0.6 * 30.0 * (-3.0 - 0.18))
+    assert p["Zone 1"] == governing_zone_pressures(30.0, 0.18, -0.18, 10)["Zone 1"]
+
+
+def test_detailed_footprint_map_stays_bounded():
+    # 400-vertex wavy round footprint, about 400 ft across
+    t = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    r = 200 + 15 * np.sin(7 * t)
+    rings = normalize_rings([np.column_stack([250 + r * np.cos(t), 250 + r * np.sin(t)])])
+    props = footprint_properties(rings, 30.0)
+    widths = roof_zone_widths(props["least"], 30.0, "ASCE 7-16")
+
+    cells = roof_zone_cells(rings, widths)
+    assert len(cells) < GRID_LINES ** 2
+    area = sum((x1 - x0) * (y1 - y0) for _, x0, x1, y0, y1 in cells)
+    assert area == pytest.approx(props["area"], rel=0.02)
+
+    t0 = time.perf_counter()
+    fig = create_pressure_visualisation(rings, 30.0, wall_segments(rings, props["a"]), widths,
+                                        {f"Zone {i}": -10.0 * i for i in range(1, 6)})
+    assert time.perf_counter() - t0 < 3.0
+    assert sum(len(trace.x) for trace in fig.data) < 10_000